@@ -3,19 +3,58 @@ Comprehensive backup and rollback system for Spark.
 
 This module provides advanced backup and recovery capabilities to ensure
 safe integration of discoveries with full rollback capabilities.
+
+Backups are stored in a content-addressed object store shared by all backups:
+
+    .spark/backups/objects/ab/cdef...     file contents, named by their SHA-256
+    .spark/backups/<backup_id>/manifest.json
+                                          path -> hash, size, mode and mtime
+
+Identical contents are stored once, however many files or backups contain them.
+Snapshots reuse the hashes of the previous snapshot for files whose size and mtime
+haven't changed, so only modified files are read. Blobs no longer referenced by any
+manifest are removed by collect_garbage(), which cleanup_old_backups() runs.
 """
 
 import os
 import json
+import stat
+import time
 import shutil
 import hashlib
+import tempfile
+import threading
 import subprocess
-from typing import Dict, List, Optional, Any, Set
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from pathlib import Path
 from enum import Enum
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Read size for hashing and copying file contents
+BLOB_CHUNK_SIZE = 1024 * 1024
+
+# Files modified this close to the previous snapshot may have changed again within
+# the same mtime tick, so their cached hashes aren't trusted
+STAT_CACHE_RACY_NS = 2_000_000_000
+
+# Unreferenced blobs younger than this may belong to a backup still being written
+GC_GRACE_SECONDS = 3600
+
+# Linux ioctl that makes a copy-on-write clone of a file (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
 
 class BackupType(Enum):
     """Types of backups that can be created."""
@@ -63,6 +102,25 @@ class RestorePoint:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+@lru_cache(maxsize=32)
+def _compile_exclude_patterns(patterns: Tuple[str, ...]) -> Tuple[Tuple[str, ...], Tuple[str, ...], frozenset]:
+    """Split exclude patterns into directory prefixes, file suffixes and exact paths."""
+    
+    directories = tuple(p[:-2].rstrip('/') for p in patterns if p.endswith('/*'))
+    suffixes = tuple(p[1:] for p in patterns if p.startswith('*.'))
+    exact = frozenset(p for p in patterns if not p.endswith('/*') and not p.startswith('*.'))
+    return directories, suffixes, exact
+
+
+def _is_excluded(rel_path: str, patterns: Tuple[Tuple[str, ...], Tuple[str, ...], frozenset]) -> bool:
+    """Check a project-relative, '/'-separated path against compiled exclude patterns."""
+    
+    directories, suffixes, exact = patterns
+    if rel_path in exact or rel_path.endswith(suffixes):
+        return True
+    return any(rel_path == d or rel_path.startswith(d + '/') for d in directories)
+
+
 class BackupSystem:
     """Advanced backup and rollback system."""
     
@@ -70,10 +128,19 @@ class BackupSystem:
         self.project_root = Path(project_root) if project_root else Path.cwd()
         self.backup_root = self.project_root / ".spark" / "backups"
         self.metadata_dir = self.backup_root / "metadata"
+        self.objects_dir = self.backup_root / "objects"
         
         # Create directories
         self.backup_root.mkdir(parents=True, exist_ok=True)
         self.metadata_dir.mkdir(parents=True, exist_ok=True)
+        (self.objects_dir / "tmp").mkdir(parents=True, exist_ok=True)
+        
+        # Hashing and copying is I/O bound; hashlib releases the GIL on large reads
+        self.max_workers = min(32, (os.cpu_count() or 1) + 4)
+        
+        # Held from storing a backup's blobs until its manifest references them, so
+        # garbage collection in this process never sees them unreferenced
+        self._store_lock = threading.Lock()
         
         # Track active backups
         self.active_backups: Dict[str, BackupMetadata] = {}
@@ -106,28 +173,18 @@ class BackupSystem:
         metadata.git_branch = self._get_git_branch()
         
         # Backup affected files
-        total_size = 0
-        file_count = 0
-        
-        for file_path in affected_files:
-            if os.path.exists(file_path):
-                # Create relative path for backup
-                rel_path = os.path.relpath(file_path, self.project_root)
-                backup_file_path = backup_dir / "files" / rel_path
-                
-                # Ensure backup directory exists
-                backup_file_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Copy file with metadata
-                shutil.copy2(file_path, backup_file_path)
-                
-                # Track size and count
-                total_size += os.path.getsize(file_path)
-                file_count += 1
+        files = {
+            Path(os.path.relpath(file_path, self.project_root)).as_posix(): file_path
+            for file_path in affected_files
+            if os.path.isfile(file_path)
+        }
+        with self._store_lock:
+            entries = self._store_files(files)
+            self._write_manifest(backup_dir, backup_id, entries)
         
         # Update metadata
-        metadata.size_bytes = total_size
-        metadata.file_count = file_count
+        metadata.size_bytes = sum(entry['size'] for entry in entries.values())
+        metadata.file_count = len(entries)
         metadata.checksum = self._calculate_backup_checksum(backup_dir)
         
         # Save metadata
@@ -143,7 +200,12 @@ class BackupSystem:
         description: str = "",
         exclude_patterns: Optional[List[str]] = None
     ) -> BackupMetadata:
-        """Create full project snapshot."""
+        """
+        Create full project snapshot.
+        
+        Only files whose size or mtime changed since the previous snapshot are read;
+        the rest reuse their recorded hashes. New contents are added to the object store.
+        """
         
         backup_id = f"snapshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         backup_dir = self.backup_root / backup_id
@@ -168,36 +230,15 @@ class BackupSystem:
         metadata.git_commit_hash = self._get_git_commit_hash()
         metadata.git_branch = self._get_git_branch()
         
-        # Copy entire project (excluding patterns)
-        total_size = 0
-        file_count = 0
-        
-        for root, dirs, files in os.walk(self.project_root):
-            # Skip excluded directories
-            dirs[:] = [d for d in dirs if not self._should_exclude(os.path.join(root, d), exclude_patterns)]
-            
-            for file in files:
-                file_path = os.path.join(root, file)
-                
-                if self._should_exclude(file_path, exclude_patterns):
-                    continue
-                
-                # Create backup path
-                rel_path = os.path.relpath(file_path, self.project_root)
-                backup_file_path = backup_dir / "snapshot" / rel_path
-                backup_file_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Copy file
-                try:
-                    shutil.copy2(file_path, backup_file_path)
-                    total_size += os.path.getsize(file_path)
-                    file_count += 1
-                except (IOError, OSError):
-                    continue  # Skip files that can't be copied
+        # Store entire project (excluding patterns), reusing unchanged files' hashes
+        files = self._list_project_files(exclude_patterns)
+        with self._store_lock:
+            entries = self._store_files(files, self._load_stat_cache())
+            self._write_manifest(backup_dir, backup_id, entries)
         
         # Update metadata
-        metadata.size_bytes = total_size
-        metadata.file_count = file_count
+        metadata.size_bytes = sum(entry['size'] for entry in entries.values())
+        metadata.file_count = len(entries)
         metadata.checksum = self._calculate_backup_checksum(backup_dir)
         
         # Save metadata
@@ -250,9 +291,17 @@ class BackupSystem:
         self,
         backup_id: str,
         file_paths: Optional[List[str]] = None,
-        create_pre_restore_backup: bool = True
+        create_pre_restore_backup: bool = True,
+        hardlink: bool = False
     ) -> bool:
-        """Restore files from backup."""
+        """
+        Restore files from backup.
+        
+        Files are cloned from the object store with a copy-on-write reflink where the
+        file system supports it, and copied otherwise. With hardlink=True they are
+        hard-linked to the stored blobs instead: restoring is then nearly free, but the
+        restored files are read-only and must be replaced rather than edited in place.
+        """
         
         if backup_id not in self.active_backups:
             raise ValueError(f"Backup {backup_id} not found")
@@ -272,8 +321,12 @@ class BackupSystem:
             self.create_project_snapshot("Pre-restore snapshot")
         
         try:
-            # Determine restore scope
-            if file_paths is None:
+            manifest = self._load_manifest(backup_dir)
+            if manifest is not None:
+                self._restore_manifest_files(manifest, file_paths, hardlink)
+            
+            # Backups made before the object store hold plain copies of the files
+            elif file_paths is None:
                 # Restore all files from backup
                 if backup_metadata.backup_type == BackupType.SNAPSHOT:
                     restore_dir = backup_dir / "snapshot"
@@ -401,7 +454,12 @@ class BackupSystem:
         return restore_points
     
     def delete_backup(self, backup_id: str) -> bool:
-        """Delete a backup and its metadata."""
+        """
+        Delete a backup and its metadata.
+        
+        Stored contents only referenced by this backup are removed by the next
+        collect_garbage().
+        """
         
         if backup_id not in self.active_backups:
             return False
@@ -426,7 +484,7 @@ class BackupSystem:
         older_than_days: int = 30,
         keep_count: int = 5
     ) -> List[str]:
-        """Clean up old backups based on age and count."""
+        """Clean up old backups based on age and count, then free their unreferenced contents."""
         
         cutoff_date = datetime.now() - timedelta(days=older_than_days)
         
@@ -446,14 +504,68 @@ class BackupSystem:
                 if self.delete_backup(backup.backup_id):
                     deleted_backups.append(backup.backup_id)
         
+        self.collect_garbage()
+        
         return deleted_backups
     
+    def collect_garbage(self, grace_seconds: float = GC_GRACE_SECONDS) -> Dict[str, int]:
+        """
+        Remove stored contents that no backup references anymore.
+        
+        Args:
+            grace_seconds: Keep unreferenced blobs younger than this, as they may
+                belong to a backup another process is still writing
+        
+        Returns:
+            Number of blobs removed and bytes freed
+        """
+        
+        stats = {'blobs_removed': 0, 'bytes_freed': 0}
+        
+        with self._store_lock:
+            referenced = self._referenced_blobs()
+            if referenced is None:
+                return stats  # A manifest is unreadable; removing anything could lose data
+            
+            cutoff = time.time() - grace_seconds
+            for fanout in os.scandir(self.objects_dir):
+                if not fanout.is_dir(follow_symlinks=False):
+                    continue
+                is_tmp = fanout.name == "tmp"
+                
+                for blob in os.scandir(fanout.path):
+                    try:
+                        blob_stat = blob.stat(follow_symlinks=False)
+                        if blob_stat.st_mtime >= cutoff:
+                            continue
+                        if not is_tmp and fanout.name + blob.name in referenced:
+                            continue
+                        os.unlink(blob.path)
+                    except OSError:
+                        continue
+                    stats['blobs_removed'] += 1
+                    stats['bytes_freed'] += blob_stat.st_size
+                
+                if not is_tmp:
+                    try:
+                        os.rmdir(fanout.path)  # Only succeeds once the directory is empty
+                    except OSError:
+                        pass
+        
+        return stats
+    
     def get_backup_info(self, backup_id: str) -> Optional[BackupMetadata]:
         """Get detailed information about a backup."""
         return self.active_backups.get(backup_id)
     
-    def verify_backup_integrity(self, backup_id: str) -> bool:
-        """Verify integrity of a backup."""
+    def verify_backup_integrity(self, backup_id: str, deep: bool = False) -> bool:
+        """
+        Verify integrity of a backup.
+        
+        Checks the manifest against its recorded checksum and that every blob it
+        references is stored with the right size. With deep=True the blobs are also
+        re-hashed.
+        """
         
         if backup_id not in self.active_backups:
             return False
@@ -461,7 +573,7 @@ class BackupSystem:
         backup_metadata = self.active_backups[backup_id]
         backup_dir = self.backup_root / backup_id
         
-        return self._verify_backup_integrity(backup_metadata, backup_dir)
+        return self._verify_backup_integrity(backup_metadata, backup_dir, deep)
     
     def get_backup_statistics(self) -> Dict[str, Any]:
         """Get statistics about backup system."""
@@ -479,10 +591,21 @@ class BackupSystem:
         week_ago = datetime.now() - timedelta(days=7)
         recent_backups = [b for b in self.active_backups.values() if b.created_at >= week_ago]
         
+        # Bytes actually on disk, after deduplication
+        stored_size = 0
+        for root, dirs, files in os.walk(self.objects_dir):
+            for file in files:
+                try:
+                    stored_size += os.path.getsize(os.path.join(root, file))
+                except OSError:
+                    continue
+        
         return {
             'total_backups': total_backups,
             'total_size_bytes': total_size,
             'total_size_mb': round(total_size / (1024 * 1024), 2),
+            'stored_size_bytes': stored_size,
+            'stored_size_mb': round(stored_size / (1024 * 1024), 2),
             'backup_types': type_counts,
             'recent_backups': len(recent_backups),
             'oldest_backup': min((b.created_at for b in self.active_backups.values()), default=None),
@@ -565,7 +688,16 @@ class BackupSystem:
             return None
     
     def _calculate_backup_checksum(self, backup_dir: Path) -> str:
-        """Calculate checksum for backup verification."""
+        """
+        Calculate checksum for backup verification.
+        
+        For object-store backups this is the checksum of the manifest, which in turn
+        names every stored blob by its hash.
+        """
+        
+        manifest_path = backup_dir / MANIFEST_NAME
+        if manifest_path.exists():
+            return self._hash_file(manifest_path)[0]
         
         hasher = hashlib.sha256()
         
@@ -578,42 +710,300 @@ class BackupSystem:
                 file_path = os.path.join(root, file)
                 try:
                     with open(file_path, 'rb') as f:
-                        for chunk in iter(lambda: f.read(4096), b""):
+                        for chunk in iter(lambda: f.read(BLOB_CHUNK_SIZE), b""):
                             hasher.update(chunk)
                 except IOError:
                     continue
         
         return hasher.hexdigest()
     
-    def _verify_backup_integrity(self, metadata: BackupMetadata, backup_dir: Path) -> bool:
+    def _verify_backup_integrity(self, metadata: BackupMetadata, backup_dir: Path, deep: bool = False) -> bool:
         """Verify backup integrity using checksum."""
         
-        if not metadata.checksum:
-            return True  # No checksum to verify
+        if metadata.checksum and self._calculate_backup_checksum(backup_dir) != metadata.checksum:
+            return False
         
-        current_checksum = self._calculate_backup_checksum(backup_dir)
-        return current_checksum == metadata.checksum
+        manifest = self._load_manifest(backup_dir)
+        if manifest is None:
+            # Backups made before the object store are covered by the checksum alone
+            return not (backup_dir / MANIFEST_NAME).exists()
+        
+        blobs = {entry['hash']: entry['size'] for entry in manifest['files'].values()}
+        for digest, size in blobs.items():
+            try:
+                if self._blob_path(digest).stat().st_size != size:
+                    return False
+            except OSError:
+                return False
+        
+        if deep:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                hashes = executor.map(lambda digest: self._hash_file(self._blob_path(digest))[0], blobs)
+                return all(actual == expected for actual, expected in zip(hashes, blobs))
+        
+        return True
     
     def _should_exclude(self, file_path: str, exclude_patterns: List[str]) -> bool:
         """Check if file should be excluded based on patterns."""
         
-        rel_path = os.path.relpath(file_path, self.project_root)
-        
-        for pattern in exclude_patterns:
-            if pattern.endswith('/*'):
-                # Directory pattern
-                dir_pattern = pattern[:-2]
-                if rel_path.startswith(dir_pattern):
-                    return True
-            elif pattern.startswith('*.'):
-                # Extension pattern
-                if rel_path.endswith(pattern[1:]):
-                    return True
-            elif rel_path == pattern:
-                # Exact match
-                return True
-        
-        return False
+        rel_path = Path(os.path.relpath(file_path, self.project_root)).as_posix()
+        return _is_excluded(rel_path, _compile_exclude_patterns(tuple(exclude_patterns)))
+    
+    def _list_project_files(self, exclude_patterns: List[str]) -> Dict[str, str]:
+        """Map the relative path of every regular, non-excluded project file to its path."""
+        
+        patterns = _compile_exclude_patterns(tuple(exclude_patterns))
+        backup_root = str(self.backup_root)
+        files = {}
+        
+        for root, dirs, names in os.walk(self.project_root):
+            rel_root = Path(os.path.relpath(root, self.project_root)).as_posix()
+            prefix = "" if rel_root == "." else rel_root + "/"
+            
+            # Skip excluded directories, and always the backups themselves
+            dirs[:] = [
+                d for d in dirs
+                if not _is_excluded(prefix + d, patterns) and os.path.join(root, d) != backup_root
+            ]
+            
+            for name in names:
+                rel_path = prefix + name
+                if not _is_excluded(rel_path, patterns):
+                    files[rel_path] = os.path.join(root, name)
+        
+        return files
+    
+    def _store_files(
+        self,
+        files: Dict[str, str],
+        stat_cache: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Add files to the object store.
+        
+        Args:
+            files: Relative path -> path of each file to store
+            stat_cache: Manifest entries of a previous backup; files whose size and
+                mtime still match are not read again
+        
+        The caller holds _store_lock until the returned entries are in a manifest.
+        
+        Returns:
+            Manifest entries (hash, size, mode, mtime_ns) by relative path
+        """
+        
+        stat_cache = stat_cache or {}
+        entries: Dict[str, Dict[str, Any]] = {}
+        to_store: Dict[str, os.stat_result] = {}
+        
+        for rel_path, file_path in files.items():
+            try:
+                file_stat = os.stat(file_path)
+            except OSError:
+                continue  # Skip files that vanished or can't be read
+            if not stat.S_ISREG(file_stat.st_mode):
+                continue
+            
+            cached = stat_cache.get(rel_path)
+            if (
+                cached is not None
+                and cached['size'] == file_stat.st_size
+                and cached['mtime_ns'] == file_stat.st_mtime_ns
+                and self._touch_blob(cached['hash'])
+            ):
+                entries[rel_path] = self._manifest_entry(cached['hash'], file_stat)
+            else:
+                to_store[rel_path] = file_stat
+        
+        def store(rel_path: str) -> Tuple[str, Optional[str]]:
+            try:
+                return rel_path, self._store_blob(files[rel_path])
+            except (IOError, OSError):
+                return rel_path, None  # Skip files that can't be copied
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for rel_path, digest in executor.map(store, to_store):
+                if digest is not None:
+                    entries[rel_path] = self._manifest_entry(digest, to_store[rel_path])
+        
+        return dict(sorted(entries.items()))
+    
+    def _store_blob(self, file_path: str) -> str:
+        """Copy a file into the object store, unless its contents are already there, and return its hash."""
+        
+        hasher = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.objects_dir / "tmp")
+        try:
+            # Hash while copying, so the blob matches its name even if the file changes
+            with open(file_path, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+                while chunk := src.read(BLOB_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    dst.write(chunk)
+            
+            digest = hasher.hexdigest()
+            blob_path = self._blob_path(digest)
+            if self._touch_blob(digest):
+                os.unlink(tmp_path)
+            else:
+                blob_path.parent.mkdir(exist_ok=True)
+                os.chmod(tmp_path, 0o444)
+                os.replace(tmp_path, blob_path)
+            return digest
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    
+    def _touch_blob(self, digest: str) -> bool:
+        """Mark a stored blob as in use for collect_garbage(); False if it isn't stored."""
+        
+        try:
+            os.utime(self._blob_path(digest))
+            return True
+        except FileNotFoundError:
+            return False
+    
+    def _restore_manifest_files(
+        self,
+        manifest: Dict[str, Any],
+        file_paths: Optional[List[str]],
+        hardlink: bool
+    ):
+        """Restore files of an object-store backup into the project."""
+        
+        entries = manifest['files']
+        if file_paths is not None:
+            wanted = {Path(os.path.relpath(file_path, self.project_root)).as_posix() for file_path in file_paths}
+            entries = {rel_path: entry for rel_path, entry in entries.items() if rel_path in wanted}
+        
+        def restore(item: Tuple[str, Dict[str, Any]]):
+            rel_path, entry = item
+            self._materialize_blob(entry, self.project_root / rel_path, hardlink)
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(restore, entries.items()))
+    
+    def _materialize_blob(self, entry: Dict[str, Any], target_path: Path, hardlink: bool):
+        """Write a stored blob to target_path, replacing it atomically."""
+        
+        blob_path = self._blob_path(entry['hash'])
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target_path.with_name(f".{target_path.name}.spark-restore")
+        if tmp_path.exists():
+            tmp_path.unlink()
+        
+        if hardlink:
+            try:
+                os.link(blob_path, tmp_path)
+                os.replace(tmp_path, target_path)
+                return
+            except OSError:
+                pass  # E.g. the project is on another file system; copy instead
+        
+        self._clone_file(blob_path, tmp_path)
+        os.chmod(tmp_path, stat.S_IMODE(entry['mode']))
+        os.utime(tmp_path, ns=(entry['mtime_ns'], entry['mtime_ns']))
+        os.replace(tmp_path, target_path)
+    
+    def _clone_file(self, source: Path, target: Path):
+        """Copy a file, as a copy-on-write reflink where the file system supports it."""
+        
+        if fcntl is not None:
+            try:
+                with open(source, 'rb') as src, open(target, 'wb') as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                return
+            except OSError:
+                pass
+        
+        shutil.copyfile(source, target)
+    
+    def _load_stat_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Manifest entries of the latest snapshot that can be trusted without re-hashing."""
+        
+        snapshots = sorted(
+            (b for b in self.active_backups.values() if b.backup_type == BackupType.SNAPSHOT),
+            key=lambda b: b.created_at,
+            reverse=True
+        )
+        
+        for backup in snapshots:
+            manifest = self._load_manifest(self.backup_root / backup.backup_id)
+            if manifest is None:
+                continue
+            
+            # A file written in the same mtime tick as the snapshot may have changed after it
+            racy_after = manifest['created_ns'] - STAT_CACHE_RACY_NS
+            return {
+                rel_path: entry for rel_path, entry in manifest['files'].items()
+                if entry['mtime_ns'] < racy_after
+            }
+        
+        return {}
+    
+    def _write_manifest(self, backup_dir: Path, backup_id: str, entries: Dict[str, Dict[str, Any]]):
+        """Atomically write a backup's manifest."""
+        
+        manifest_path = backup_dir / MANIFEST_NAME
+        tmp_path = manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'version': MANIFEST_VERSION,
+                'backup_id': backup_id,
+                'created_ns': time.time_ns(),
+                'files': entries
+            }, f, separators=(',', ':'))
+        os.replace(tmp_path, manifest_path)
+    
+    def _load_manifest(self, backup_dir: Path) -> Optional[Dict[str, Any]]:
+        """Load a backup's manifest, or None for legacy or unreadable backups."""
+        
+        try:
+            with open(backup_dir / MANIFEST_NAME, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != MANIFEST_VERSION or not isinstance(manifest.get('files'), dict):
+                return None
+            return manifest
+        except (OSError, json.JSONDecodeError, AttributeError):
+            return None
+    
+    def _referenced_blobs(self) -> Optional[Set[str]]:
+        """Hashes referenced by any manifest on disk, or None if a manifest can't be read."""
+        
+        referenced: Set[str] = set()
+        for manifest_path in self.backup_root.glob(f"*/{MANIFEST_NAME}"):
+            manifest = self._load_manifest(manifest_path.parent)
+            if manifest is None:
+                return None
+            referenced.update(entry['hash'] for entry in manifest['files'].values())
+        return referenced
+    
+    def _blob_path(self, digest: str) -> Path:
+        """Location of a blob in the object store."""
+        return self.objects_dir / digest[:2] / digest[2:]
+    
+    def _hash_file(self, file_path: Path) -> Tuple[str, int]:
+        """SHA-256 and size of a file."""
+        
+        hasher = hashlib.sha256()
+        size = 0
+        with open(file_path, 'rb') as f:
+            while chunk := f.read(BLOB_CHUNK_SIZE):
+                hasher.update(chunk)
+                size += len(chunk)
+        return hasher.hexdigest(), size
+    
+    @staticmethod
+    def _manifest_entry(digest: str, file_stat: os.stat_result) -> Dict[str, Any]:
+        """Manifest entry for a stored file."""
+        return {
+            'hash': digest,
+            'size': file_stat.st_size,
+            'mode': file_stat.st_mode,
+            'mtime_ns': file_stat.st_mtime_ns
+        }
     
     def _restore_git_state(self, backup_metadata: BackupMetadata):
         """Restore git state from backup metadata."""
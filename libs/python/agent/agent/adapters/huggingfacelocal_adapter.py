@@ -1,8 +1,12 @@
 import asyncio
-import functools
+import gc
+import threading
+import time
 import warnings
-from concurrent.futures import ThreadPoolExecutor
-from typing import Iterator, AsyncIterator, Dict, List, Any, Optional
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Iterator, AsyncIterator, Deque, Dict, List, Any, Optional
 from litellm.types.utils import GenericStreamingChunk, ModelResponse
 from litellm.llms.custom_llm import CustomLLM
 from litellm import completion, acompletion
@@ -16,22 +20,76 @@ except ImportError:
     HF_AVAILABLE = False
 
 
+@dataclass
+class _GenerationRequest:
+    """A pending generation, completed by the batching worker."""
+    model_name: str
+    messages: List[Dict[str, Any]]
+    max_new_tokens: int
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
 class HuggingFaceLocalAdapter(CustomLLM):
-    """HuggingFace Local Adapter for running vision-language models locally."""
-    
-    def __init__(self, device: str = "auto", **kwargs):
+    """HuggingFace Local Adapter for running vision-language models locally.
+
+    Generations run on a single worker thread. Concurrent requests for the same model that
+    arrive within max_wait seconds of each other are padded into one batch and run through
+    a single generate call. Loaded models are kept in an LRU and unloaded when their total
+    memory footprint exceeds max_memory_gb.
+    """
+
+    _shared: Optional["HuggingFaceLocalAdapter"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        device: str = "auto",
+        max_batch_size: int = 8,
+        max_wait: float = 0.02,
+        max_memory_gb: Optional[float] = None,
+        **kwargs
+    ):
         """Initialize the adapter.
         
         Args:
             device: Device to load model on ("auto", "cuda", "cpu", etc.)
+            max_batch_size: Maximum number of requests generated together
+            max_wait: Seconds the oldest queued request waits for others to batch with
+            max_memory_gb: Memory budget for loaded models; least recently used models are
+                unloaded to stay within it. None keeps every model loaded.
             **kwargs: Additional arguments
         """
         super().__init__()
         self.device = device
-        self.models = {}  # Cache for loaded models
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self.max_memory_bytes = int(max_memory_gb * 1024 ** 3) if max_memory_gb is not None else None
+        self.models: "OrderedDict[str, Any]" = OrderedDict()  # Loaded models, least recently used first
         self.processors = {}  # Cache for loaded processors
-        self._executor = ThreadPoolExecutor(max_workers=1)  # Single thread pool
-        
+        self._footprints: Dict[str, int] = {}  # Memory footprint of each model loaded so far
+
+        # Batching scheduler state
+        self._queue: Deque[_GenerationRequest] = deque()
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+
+        # Metrics
+        self._requests = 0
+        self._batch_sizes: Counter = Counter()
+        self._total_queue_wait = 0.0
+
+    @classmethod
+    def shared(cls, **kwargs) -> "HuggingFaceLocalAdapter":
+        """Get the adapter shared by all agents in this process, so their requests batch together.
+
+        Keyword arguments are only used when the shared adapter is first created.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(**kwargs)
+            return cls._shared
+
     def _load_model_and_processor(self, model_name: str):
         """Load model and processor if not already cached.
         
@@ -41,7 +99,14 @@ class HuggingFaceLocalAdapter(CustomLLM):
         Returns:
             Tuple of (model, processor)
         """
-        if model_name not in self.models:
+        if model_name in self.models:
+            self.models.move_to_end(model_name)
+        else:
+            # Make room before loading. A model loaded before needs the footprint it had
+            # then; for a new one the largest footprint seen so far is the best guess
+            estimate = self._footprints.get(model_name, max(self._footprints.values(), default=0))
+            self._evict(needed=estimate)
+
             # Load model
             model = AutoModelForImageTextToText.from_pretrained(
                 model_name,
@@ -57,12 +122,65 @@ class HuggingFaceLocalAdapter(CustomLLM):
                 max_pixels=4096 * 2160,
                 device_map=self.device
             )
+            # Batched generation needs prompts padded on the left
+            tokenizer = getattr(processor, "tokenizer", None)
+            if tokenizer is not None:
+                tokenizer.padding_side = "left"
             
             # Cache them
             self.models[model_name] = model
             self.processors[model_name] = processor
+            # Evict again now the real footprint is known; the estimate may have been short
+            self._footprints[model_name] = self._measure_footprint(model)
+            self._evict(keep=model_name)
             
         return self.models[model_name], self.processors[model_name]
+
+    @staticmethod
+    def _measure_footprint(model: Any) -> int:
+        """Bytes taken by a model's parameters and buffers."""
+        if hasattr(model, "get_memory_footprint"):
+            return model.get_memory_footprint()
+        tensors = list(model.parameters()) + list(model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+
+    def _memory_used(self) -> int:
+        return sum(self._footprints.get(name, 0) for name in self.models)
+
+    def _evict(self, needed: int = 0, keep: Optional[str] = None) -> None:
+        """Unload least recently used models until needed more bytes fit in the memory budget."""
+        if self.max_memory_bytes is None:
+            return
+        while self._memory_used() + needed > self.max_memory_bytes:
+            victim = next((name for name in self.models if name != keep), None)
+            if victim is None:
+                break
+            del self.models[victim]
+            del self.processors[victim]
+            gc.collect()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+
+    def stats(self) -> Dict[str, Any]:
+        """Scheduler and model cache metrics.
+
+        Returns:
+            Dict with the current queue size, request and batch counts, batch size
+            histogram, mean time requests waited in the queue, and loaded models.
+        """
+        with self._condition:
+            queue_size = len(self._queue)
+        batches = sum(self._batch_sizes.values())
+        return {
+            "queue_size": queue_size,
+            "requests": self._requests,
+            "batches": batches,
+            "mean_batch_size": self._requests / batches if batches else 0.0,
+            "batch_sizes": dict(self._batch_sizes),
+            "mean_queue_wait": self._total_queue_wait / self._requests if self._requests else 0.0,
+            "loaded_models": list(self.models),
+            "memory_used": self._memory_used(),
+        }
     
     def _convert_messages(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Convert OpenAI format messages to HuggingFace format.
@@ -108,14 +226,14 @@ class HuggingFaceLocalAdapter(CustomLLM):
             
         return converted_messages
     
-    def _generate(self, **kwargs) -> str:
-        """Generate response using the local HuggingFace model.
+    def _submit(self, **kwargs) -> Future:
+        """Queue a generation for the batching worker.
         
         Args:
             **kwargs: Keyword arguments containing messages and model info
             
         Returns:
-            Generated text response
+            Future resolving to the generated text
         """
         if not HF_AVAILABLE:
             raise ImportError(
@@ -132,18 +250,113 @@ class HuggingFaceLocalAdapter(CustomLLM):
         ignored_kwargs = set(kwargs.keys()) - {'messages', 'model', 'max_tokens'}
         if ignored_kwargs:
             warnings.warn(f"Ignoring unsupported kwargs: {ignored_kwargs}")
+
+        request = _GenerationRequest(model_name, messages, max_new_tokens)
+        with self._condition:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._worker_loop, name="huggingface-local", daemon=True
+                )
+                self._worker.start()
+            self._queue.append(request)
+            self._condition.notify()
+        return request.future
+
+    def _generate(self, **kwargs) -> str:
+        """Generate response using the local HuggingFace model.
+        
+        Args:
+            **kwargs: Keyword arguments containing messages and model info
+            
+        Returns:
+            Generated text response
+        """
+        return self._submit(**kwargs).result()
+
+    async def _agenerate(self, **kwargs) -> str:
+        # Wait on the worker without blocking the event loop
+        return await asyncio.wrap_future(self._submit(**kwargs))
+
+    def _next_batch(self) -> List[_GenerationRequest]:
+        """Wait for the next batch: requests for the oldest request's model, up to max_batch_size."""
+        with self._condition:
+            while not self._queue:
+                self._condition.wait()
+
+            first = self._queue[0]
+            deadline = first.enqueued_at + self.max_wait
+            while True:
+                batch = [r for r in self._queue if r.model_name == first.model_name][:self.max_batch_size]
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self.max_batch_size or remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            for request in batch:
+                self._queue.remove(request)
+            return batch
+
+    def _worker_loop(self) -> None:
+        while True:
+            batch: List[_GenerationRequest] = []
+            try:
+                batch = self._next_batch()
+                self._run_batch(batch)
+            except Exception as e:
+                # Never leave callers waiting on a batch the worker gave up on
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+
+    def _run_batch(self, batch: List[_GenerationRequest]) -> None:
+        """Generate a batch and complete the futures of its requests."""
+        now = time.monotonic()
+        self._requests += len(batch)
+        self._batch_sizes[len(batch)] += 1
+        self._total_queue_wait += sum(now - r.enqueued_at for r in batch)
+
+        try:
+            outputs = self._generate_batch(batch)
+        except Exception:
+            if len(batch) == 1:
+                raise
+            # Some processors can't batch these inputs; fall back to one at a time
+            outputs = []
+            for request in batch:
+                try:
+                    outputs.extend(self._generate_batch([request]))
+                except Exception as error:
+                    outputs.append(error)
+
+        for request, output in zip(batch, outputs):
+            if request.future.done():
+                continue  # Cancelled by its caller
+            if isinstance(output, Exception):
+                request.future.set_exception(output)
+            else:
+                request.future.set_result(output)
+
+    def _generate_batch(self, batch: List[_GenerationRequest]) -> List[str]:
+        """Generate responses for requests to the same model with one generate call.
         
+        Args:
+            batch: Requests to generate for
+            
+        Returns:
+            Generated text for each request
+        """
         # Load model and processor
-        model, processor = self._load_model_and_processor(model_name)
+        model, processor = self._load_model_and_processor(batch[0].model_name)
         
         # Convert messages to HuggingFace format
-        hf_messages = self._convert_messages(messages)
+        hf_conversations = [self._convert_messages(request.messages) for request in batch]
         
-        # Apply chat template and tokenize
+        # Apply chat template and tokenize, padding the prompts to a common length
         inputs = processor.apply_chat_template(
-            hf_messages,
+            hf_conversations,
             add_generation_prompt=True,
             tokenize=True,
+            padding=True,
             return_dict=True,
             return_tensors="pt"
         )
@@ -152,22 +365,22 @@ class HuggingFaceLocalAdapter(CustomLLM):
         inputs = inputs.to(model.device)
         
         # Generate response
+        max_new_tokens = [request.max_new_tokens for request in batch]
         with torch.no_grad():
-            generated_ids = model.generate(**inputs, max_new_tokens=max_new_tokens)
+            generated_ids = model.generate(**inputs, max_new_tokens=max(max_new_tokens))
             
-        # Trim input tokens from output
+        # Trim input tokens from output, and each output to its own token limit
         generated_ids_trimmed = [
-            out_ids[len(in_ids):] for in_ids, out_ids in zip(inputs.input_ids, generated_ids)
+            out_ids[len(in_ids):len(in_ids) + limit]
+            for in_ids, out_ids, limit in zip(inputs.input_ids, generated_ids, max_new_tokens)
         ]
         
         # Decode output
-        output_text = processor.batch_decode(
+        return processor.batch_decode(
             generated_ids_trimmed, 
             skip_special_tokens=True, 
             clean_up_tokenization_spaces=False
         )
-        
-        return output_text[0] if output_text else ""
     
     def completion(self, *args, **kwargs) -> ModelResponse:
         """Synchronous completion method.
@@ -188,12 +401,7 @@ class HuggingFaceLocalAdapter(CustomLLM):
         Returns:
             ModelResponse with generated text
         """
-        # Run _generate in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        generated_text = await loop.run_in_executor(
-            self._executor, 
-            functools.partial(self._generate, **kwargs)
-        )
+        generated_text = await self._agenerate(**kwargs)
         
         return await acompletion(
             model=f"huggingface-local/{kwargs['model']}",
@@ -225,12 +433,7 @@ class HuggingFaceLocalAdapter(CustomLLM):
         Returns:
             AsyncIterator of GenericStreamingChunk
         """
-        # Run _generate in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        generated_text = await loop.run_in_executor(
-            self._executor, 
-            functools.partial(self._generate, **kwargs)
-        )
+        generated_text = await self._agenerate(**kwargs)
         
         generic_streaming_chunk: GenericStreamingChunk = {
             "finish_reason": "stop",
@@ -214,7 +214,9 @@ class ComputerAgent:
 
         # Add image retention callback if only_n_most_recent_images is set
         if self.only_n_most_recent_images:
-            self.callbacks.append(ImageRetentionCallback(self.only_n_most_recent_images))
+            # With prompt caching, prune old images in batches so the cached prefix stays valid between prunes
+            prune_stride = max(1, self.only_n_most_recent_images // 2) if self.use_prompt_caching else 1
+            self.callbacks.append(ImageRetentionCallback(self.only_n_most_recent_images, prune_stride=prune_stride))
         
         # Add trajectory saver callback if trajectory_dir is set
         if self.trajectory_dir:
@@ -229,8 +231,9 @@ class ComputerAgent:
         
         # == Enable local model providers w/ LiteLLM ==
 
-        # Register local model providers
-        hf_adapter = HuggingFaceLocalAdapter(
+        # Register local model providers; the HuggingFace adapter is shared so that
+        # concurrent agents batch their requests to the same local model
+        hf_adapter = HuggingFaceLocalAdapter.shared(
             device="auto"
         )
         human_adapter = HumanAdapter()
@@ -2,138 +2,185 @@
 Image retention callback handler that limits the number of recent images in message history.
 """
 
-from typing import List, Dict, Any, Optional
+import base64
+import io
+import json
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Set
+
+from PIL import Image
+
 from .base import AsyncCallbackHandler
 
+# Text sent in place of screenshots that are too old to keep
+STUB_TEXT = "[Screenshot omitted]"
+
 
 class ImageRetentionCallback(AsyncCallbackHandler):
     """
     Callback handler that applies image retention policy to limit the number
     of recent images in message history to prevent context window overflow.
+
+    Screenshots are kept in up to three tiers, from most to least recent:
+    - full: the N most recent screenshots, unchanged
+    - thumbnail: the next screenshots, downscaled and recompressed as small JPEGs
+    - oldest: either removed along with their computer calls (default) or, with
+      stub_old_images, replaced by a text stub while the actions stay in the history
     """
-    
-    def __init__(self, only_n_most_recent_images: Optional[int] = None):
+
+    # Number of transcoded thumbnails kept in memory
+    THUMBNAIL_CACHE_SIZE = 256
+
+    def __init__(
+        self,
+        only_n_most_recent_images: Optional[int] = None,
+        prune_stride: int = 1,
+        thumbnail_images: int = 0,
+        thumbnail_max_size: int = 512,
+        thumbnail_quality: int = 50,
+        stub_old_images: bool = False,
+    ):
         """
         Initialize the image retention callback.
-        
+
         Args:
             only_n_most_recent_images: If set, only keep the N most recent images in message history
+            prune_stride: Drop old images in groups of this many. The history prefix then changes
+                          only once every prune_stride new images instead of on every step, which
+                          keeps prompt caches valid; between N and N + prune_stride - 1 images are kept.
+            thumbnail_images: Number of screenshots older than the N most recent to keep as thumbnails
+            thumbnail_max_size: Longest side of a thumbnail in pixels
+            thumbnail_quality: JPEG quality of thumbnails (1-95)
+            stub_old_images: If True, replace screenshots older than the thumbnails with a text stub
+                             and keep their actions, instead of removing them with their calls
         """
         self.only_n_most_recent_images = only_n_most_recent_images
-    
+        self.prune_stride = max(1, prune_stride)
+        self.thumbnail_images = max(0, thumbnail_images)
+        self.thumbnail_max_size = thumbnail_max_size
+        self.thumbnail_quality = thumbnail_quality
+        self.stub_old_images = stub_old_images
+        # image_url -> derived output item; returning the same object on every step lets
+        # downstream conversion caches recognize it
+        self._thumbnails: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
     async def on_llm_start(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Apply image retention policy to messages before sending to agent loop.
-        
+
         Args:
             messages: List of message dictionaries
-            
+
         Returns:
             List of messages with image retention policy applied
         """
         if self.only_n_most_recent_images is None:
             return messages
-        
+
         return self._apply_image_retention(messages)
-    
+
     def _apply_image_retention(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Apply image retention policy to keep only the N most recent images.
-        
-        Removes computer_call_output items with image_url and their corresponding computer_call items,
-        keeping only the most recent N image pairs based on only_n_most_recent_images setting.
-        
+        """Apply image retention policy to the screenshots in computer_call_output items.
+
+        Keeps the most recent N screenshots, thumbnails the next ones and removes (or stubs)
+        the rest. Removed screenshots take their computer_call and reasoning items with them.
+
         Args:
             messages: List of message dictionaries
-            
+
         Returns:
             Filtered list of messages with image retention applied
         """
         if self.only_n_most_recent_images is None:
             return messages
-        
-        # First pass: Assign call_id to reasoning items based on the next computer_call
-        messages_with_call_ids = []
-        for i, msg in enumerate(messages):
-            msg_copy = msg.copy() if isinstance(msg, dict) else msg
-            
-            # If this is a reasoning item without a call_id, find the next computer_call
-            if (msg_copy.get("type") == "reasoning" and 
-                not msg_copy.get("call_id")):
-                # Look ahead for the next computer_call
-                for j in range(i + 1, len(messages)):
-                    next_msg = messages[j]
-                    if (next_msg.get("type") == "computer_call" and 
-                        next_msg.get("call_id")):
-                        msg_copy["call_id"] = next_msg.get("call_id")
-                        break
-            
-            messages_with_call_ids.append(msg_copy)
-        
-        # Find all computer_call_output items with images and their call_ids
-        image_call_ids = []
-        for msg in reversed(messages_with_call_ids):  # Process in reverse to get most recent first
-            if (msg.get("type") == "computer_call_output" and 
-                isinstance(msg.get("output"), dict) and 
-                "image_url" in msg.get("output", {})):
+
+        # Call ids of screenshot outputs, most recent first
+        image_call_ids: List[str] = []
+        seen: Set[str] = set()
+        for msg in reversed(messages):
+            if _is_image_output(msg):
                 call_id = msg.get("call_id")
-                if call_id and call_id not in image_call_ids:
+                if call_id and call_id not in seen:
+                    seen.add(call_id)
                     image_call_ids.append(call_id)
-                    if len(image_call_ids) >= self.only_n_most_recent_images:
-                        break
-        
-        # Keep the most recent N image call_ids (reverse to get chronological order)
-        keep_call_ids = set(image_call_ids[:self.only_n_most_recent_images])
-        
-        # Filter messages: remove computer_call, computer_call_output, and reasoning for old images
-        filtered_messages = []
-        for msg in messages_with_call_ids:
+
+        # Keep the most recent N image call_ids, moving older ones down a tier in whole strides
+        excess = max(0, len(image_call_ids) - self.only_n_most_recent_images)
+        num_full = len(image_call_ids) - (excess // self.prune_stride) * self.prune_stride
+        num_thumbnails = min(self.thumbnail_images, len(image_call_ids) - num_full)
+        thumbnail_call_ids = set(image_call_ids[num_full:num_full + num_thumbnails])
+        old_call_ids = set(image_call_ids[num_full + num_thumbnails:])
+        if not thumbnail_call_ids and not old_call_ids:
+            return messages
+
+        # Reasoning items belong to the next computer_call; assign them in one backward pass
+        reasoning_call_ids: Dict[int, Optional[str]] = {}
+        next_call_id: Optional[str] = None
+        for i in range(len(messages) - 1, -1, -1):
+            msg = messages[i]
+            if msg.get("type") == "computer_call" and msg.get("call_id"):
+                next_call_id = msg.get("call_id")
+            elif msg.get("type") == "reasoning" and not msg.get("call_id"):
+                reasoning_call_ids[i] = next_call_id
+
+        result = []
+        for i, msg in enumerate(messages):
             msg_type = msg.get("type")
-            call_id = msg.get("call_id")
-            
-            # Remove old computer_call items
-            if msg_type == "computer_call" and call_id not in keep_call_ids:
-                # Check if this call_id corresponds to an image call
-                has_image_output = any(
-                    m.get("type") == "computer_call_output" and 
-                    m.get("call_id") == call_id and
-                    isinstance(m.get("output"), dict) and
-                    "image_url" in m.get("output", {})
-                    for m in messages_with_call_ids
-                )
-                if has_image_output:
-                    continue  # Skip this computer_call
-            
-            # Remove old computer_call_output items with images
-            if (msg_type == "computer_call_output" and 
-                call_id not in keep_call_ids and
-                isinstance(msg.get("output"), dict) and 
-                "image_url" in msg.get("output", {})):
-                continue  # Skip this computer_call_output
-            
-            # Remove old reasoning items that are paired with removed computer calls
-            if (msg_type == "reasoning" and 
-                call_id and call_id not in keep_call_ids):
-                # Check if this call_id corresponds to an image call that's being removed
-                has_image_output = any(
-                    m.get("type") == "computer_call_output" and 
-                    m.get("call_id") == call_id and
-                    isinstance(m.get("output"), dict) and
-                    "image_url" in m.get("output", {})
-                    for m in messages_with_call_ids
-                )
-                if has_image_output:
-                    continue  # Skip this reasoning item
-            
-            filtered_messages.append(msg)
-        
-        # Clean up: Remove call_id from reasoning items before returning
-        final_messages = []
-        for msg in filtered_messages:
-            if msg.get("type") == "reasoning" and "call_id" in msg:
-                # Create a copy without call_id for reasoning items
-                cleaned_msg = {k: v for k, v in msg.items() if k != "call_id"}
-                final_messages.append(cleaned_msg)
+            call_id = reasoning_call_ids.get(i) if msg_type == "reasoning" else msg.get("call_id")
+
+            if call_id in thumbnail_call_ids and _is_image_output(msg):
+                result.append({**msg, "output": self._thumbnail(msg["output"])})
+            elif call_id in old_call_ids and msg_type in ("computer_call", "computer_call_output", "reasoning"):
+                if not self.stub_old_images:
+                    continue  # Drop the screenshot along with its call and reasoning
+                if msg_type == "computer_call":
+                    # Screenshot stubs are text, which computer_call_output can't carry
+                    result.append({
+                        "type": "function_call",
+                        "id": msg.get("id", f"fc_{call_id}"),
+                        "call_id": call_id,
+                        "name": "computer",
+                        "arguments": json.dumps(msg.get("action", {})),
+                    })
+                elif msg_type == "computer_call_output":
+                    result.append({
+                        "type": "function_call_output",
+                        "call_id": call_id,
+                        "output": STUB_TEXT,
+                    })
+                else:
+                    result.append(msg)
             else:
-                final_messages.append(msg)
-        
-        return final_messages
\ No newline at end of file
+                result.append(msg)
+
+        return result
+
+    def _thumbnail(self, output: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a downscaled JPEG version of a screenshot output, transcoding each image once."""
+        image_url = output.get("image_url", "")
+        cached = self._thumbnails.get(image_url)
+        if cached is not None:
+            self._thumbnails.move_to_end(image_url)
+            return cached
+
+        try:
+            encoded = image_url.split(",", 1)[1] if image_url.startswith("data:") else image_url
+            image = Image.open(io.BytesIO(base64.b64decode(encoded)))
+            image.thumbnail((self.thumbnail_max_size, self.thumbnail_max_size))
+            buffer = io.BytesIO()
+            image.convert("RGB").save(buffer, format="JPEG", quality=self.thumbnail_quality, optimize=True)
+            thumbnail_url = "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+            derived = {**output, "image_url": thumbnail_url}
+        except Exception:
+            # Not a decodable image (e.g. already "[omitted]"); keep it as is
+            derived = output
+
+        self._thumbnails[image_url] = derived
+        if len(self._thumbnails) > self.THUMBNAIL_CACHE_SIZE:
+            self._thumbnails.popitem(last=False)
+        return derived
+
+
+def _is_image_output(msg: Dict[str, Any]) -> bool:
+    output = msg.get("output")
+    return msg.get("type") == "computer_call_output" and isinstance(output, dict) and "image_url" in output
@@ -2,8 +2,7 @@
 Trajectory saving callback handler for ComputerAgent.
 """
 
-import os
-import json
+import asyncio
 import uuid
 from datetime import datetime
 import base64
@@ -12,6 +11,7 @@ from typing import List, Dict, Any, Optional, Union, override
 from PIL import Image, ImageDraw
 import io
 from .base import AsyncCallbackHandler
+from .trajectory_store import ContentAddressedStore, TrajectoryStore, TurnDirectoryStore
 
 def sanitize_image_urls(data: Any) -> Any:
     """
@@ -47,11 +47,13 @@ class TrajectorySaverCallback(AsyncCallbackHandler):
     """
     Callback handler that saves agent trajectories to disk.
     
-    Saves each run as a separate trajectory with unique ID, and each turn
-    within the trajectory gets its own folder with screenshots and responses.
+    Saves each run as a separate trajectory with unique ID. Artifacts are written in the
+    background; with the default "turns" layout each turn within the trajectory gets its
+    own folder with screenshots and responses, while the "store" layout keeps an event log
+    per trajectory and stores each distinct screenshot once (see trajectory_store).
     """
     
-    def __init__(self, trajectory_dir: str, reset_on_run: bool = True):
+    def __init__(self, trajectory_dir: str, reset_on_run: bool = True, layout: str = "turns", max_queue: int = 256):
         """
         Initialize trajectory saver.
         
@@ -59,6 +61,10 @@ class TrajectorySaverCallback(AsyncCallbackHandler):
             trajectory_dir: Base directory to save trajectories
             reset_on_run: If True, reset trajectory_id/turn/artifact on each run.
                          If False, continue using existing trajectory_id if set.
+            layout: "turns" for one file per artifact in turn_XXX folders (the layout read
+                    by the trajectory viewer), or "store" for an event log with deduplicated
+                    screenshots, which ContentAddressedStore.export_turns converts back
+            max_queue: Maximum number of artifacts waiting to be written before callbacks wait
         """
         self.trajectory_dir = Path(trajectory_dir)
         self.trajectory_id: Optional[str] = None
@@ -67,35 +73,26 @@ class TrajectorySaverCallback(AsyncCallbackHandler):
         self.model: Optional[str] = None
         self.total_usage: Dict[str, Any] = {}
         self.reset_on_run = reset_on_run
+        self.metadata: Dict[str, Any] = {}
         
         # Ensure trajectory directory exists
         self.trajectory_dir.mkdir(parents=True, exist_ok=True)
-    
-    def _get_turn_dir(self) -> Path:
-        """Get the directory for the current turn."""
-        if not self.trajectory_id:
-            raise ValueError("Trajectory not initialized - call _on_run_start first")
-        
-        # format: trajectory_id/turn_000
-        turn_dir = self.trajectory_dir / self.trajectory_id / f"turn_{self.current_turn:03d}"
-        turn_dir.mkdir(parents=True, exist_ok=True)
-        return turn_dir
 
-    def _save_artifact(self, name: str, artifact: Union[str, bytes, Dict[str, Any]]) -> None:
-        """Save an artifact to the current turn directory."""
-        turn_dir = self._get_turn_dir()
-        if isinstance(artifact, bytes):
-            # format: turn_000/0000_name.png
-            artifact_filename = f"{self.current_artifact:04d}_{name}"
-            artifact_path = turn_dir / f"{artifact_filename}.png"
-            with open(artifact_path, "wb") as f:
-                f.write(artifact)
+        if layout == "turns":
+            self.store: TrajectoryStore = TurnDirectoryStore(self.trajectory_dir, max_queue)
+        elif layout == "store":
+            self.store = ContentAddressedStore(self.trajectory_dir, max_queue)
         else:
-            # format: turn_000/0000_name.json
-            artifact_filename = f"{self.current_artifact:04d}_{name}"
-            artifact_path = turn_dir / f"{artifact_filename}.json"
-            with open(artifact_path, "w") as f:
-                json.dump(sanitize_image_urls(artifact), f, indent=2)
+            raise ValueError(f"Unknown trajectory layout: {layout}")
+
+    async def _save_artifact(self, name: str, artifact: Union[bytes, Dict[str, Any]]) -> None:
+        """Queue an artifact for the current turn."""
+        if not self.trajectory_id:
+            raise ValueError("Trajectory not initialized - call _on_run_start first")
+        if not isinstance(artifact, bytes):
+            # Copy while sanitizing, so later changes to the items don't reach the writer
+            artifact = sanitize_image_urls(artifact)
+        await self.store.save_artifact(self.trajectory_id, self.current_turn, self.current_artifact, name, artifact)
         self.current_artifact += 1
 
     def _update_usage(self, usage: Dict[str, Any]) -> None:
@@ -131,20 +128,14 @@ class TrajectorySaverCallback(AsyncCallbackHandler):
             self.model = model
             self.total_usage = {}
             
-            # Create trajectory directory
-            trajectory_path = self.trajectory_dir / self.trajectory_id
-            trajectory_path.mkdir(parents=True, exist_ok=True)
-            
             # Save trajectory metadata
-            metadata = {
+            self.metadata = {
                 "trajectory_id": self.trajectory_id,
                 "created_at": str(uuid.uuid1().time),
                 "status": "running",
-                "kwargs": kwargs,
+                "kwargs": sanitize_image_urls(kwargs),
             }
-            
-            with open(trajectory_path / "metadata.json", "w") as f:
-                json.dump(metadata, f, indent=2)
+            await self.store.save_metadata(self.trajectory_id, dict(self.metadata))
         else:
             # Continue with existing trajectory - just update model if needed
             self.model = model
@@ -155,19 +146,8 @@ class TrajectorySaverCallback(AsyncCallbackHandler):
         if not self.trajectory_id:
             return
         
-        # Update metadata with completion status, total usage, and new items
-        trajectory_path = self.trajectory_dir / self.trajectory_id
-        metadata_path = trajectory_path / "metadata.json"
-        
-        # Read existing metadata
-        if metadata_path.exists():
-            with open(metadata_path, "r") as f:
-                metadata = json.load(f)
-        else:
-            metadata = {}
-        
         # Update metadata with completion info
-        metadata.update({
+        self.metadata.update({
             "status": "completed",
             "completed_at": str(uuid.uuid1().time),
             "total_usage": self.total_usage,
@@ -175,16 +155,16 @@ class TrajectorySaverCallback(AsyncCallbackHandler):
             "total_turns": self.current_turn
         })
         
-        # Save updated metadata
-        with open(metadata_path, "w") as f:
-            json.dump(metadata, f, indent=2)
+        # Save updated metadata, and wait for everything from this run to be written
+        await self.store.save_metadata(self.trajectory_id, dict(self.metadata))
+        await self.store.flush()
     
     @override 
     async def on_api_start(self, kwargs: Dict[str, Any]) -> None:
         if not self.trajectory_id:
             return
         
-        self._save_artifact("api_start", { "kwargs": kwargs })
+        await self._save_artifact("api_start", { "kwargs": kwargs })
     
     @override
     async def on_api_end(self, kwargs: Dict[str, Any], result: Any) -> None:
@@ -192,14 +172,14 @@ class TrajectorySaverCallback(AsyncCallbackHandler):
         if not self.trajectory_id:
             return
         
-        self._save_artifact("api_result", { "kwargs": kwargs, "result": result })
+        await self._save_artifact("api_result", { "kwargs": kwargs, "result": result })
 
     @override
     async def on_screenshot(self, screenshot: Union[str, bytes], name: str = "screenshot") -> None:
         """Save a screenshot."""
         if isinstance(screenshot, str):
             screenshot = base64.b64decode(screenshot)
-        self._save_artifact(name, screenshot)
+        await self._save_artifact(name, screenshot)
 
     @override
     async def on_usage(self, usage: Dict[str, Any]) -> None:
@@ -213,7 +193,6 @@ class TrajectorySaverCallback(AsyncCallbackHandler):
             return
         
         # Save responses
-        turn_dir = self._get_turn_dir()
         response_data = {
             "timestamp": str(uuid.uuid1().time),
             "model": self.model,
@@ -221,7 +200,7 @@ class TrajectorySaverCallback(AsyncCallbackHandler):
             "response": responses
         }
         
-        self._save_artifact("agent_response", response_data)
+        await self._save_artifact("agent_response", response_data)
         
         # Increment turn counter
         self.current_turn += 1
@@ -270,7 +249,7 @@ class TrajectorySaverCallback(AsyncCallbackHandler):
         if not self.trajectory_id:
             return
         
-        self._save_artifact("computer_call_result", { "item": item, "result": result })
+        await self._save_artifact("computer_call_result", { "item": item, "result": result })
         
         # Check if action has x/y coordinates and there's a screenshot in the result
         action = item.get("action", {})
@@ -295,14 +274,15 @@ class TrajectorySaverCallback(AsyncCallbackHandler):
                         image_bytes = base64.b64decode(base64_data)
                         
                         # Draw crosshair at the action coordinates
-                        annotated_image = self._draw_crosshair_on_image(
+                        annotated_image = await asyncio.to_thread(
+                            self._draw_crosshair_on_image,
                             image_bytes, 
                             int(action["x"]), 
                             int(action["y"])
                         )
                         
                         # Save as screenshot_action
-                        self._save_artifact("screenshot_action", annotated_image)
+                        await self._save_artifact("screenshot_action", annotated_image)
                         
                     except Exception as e:
                         # If annotation fails, just log and continue
@@ -0,0 +1,198 @@
+"""
+Storage backends for saved agent trajectories.
+
+Artifacts are written by a background task through a bounded queue, so callbacks never
+block the event loop on disk and a slow disk applies backpressure instead of growing
+memory. Two layouts are supported:
+
+- TurnDirectoryStore: one file per artifact under trajectory_id/turn_XXX/, the layout
+  read by the trajectory viewer
+- ContentAddressedStore: an append-only events.jsonl per trajectory, with screenshots
+  stored once per distinct image under images/ and shared by all trajectories
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+Artifact = Union[bytes, Dict[str, Any]]
+
+
+class TrajectoryStore:
+    """Base class for trajectory storage backends.
+
+    Subclasses implement the synchronous _write_* methods, which run on a worker thread.
+    The public methods queue writes and return immediately unless the queue is full.
+    """
+
+    def __init__(self, root: Union[str, Path], max_queue: int = 256):
+        """
+        Args:
+            root: Base directory for trajectories
+            max_queue: Maximum number of writes waiting for the background writer
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    async def save_artifact(self, trajectory_id: str, turn: int, index: int, name: str, artifact: Artifact) -> None:
+        """Queue an artifact (PNG bytes or a JSON-serializable dict) for the given turn."""
+        await self._submit(self._write_artifact, trajectory_id, turn, index, name, artifact)
+
+    async def save_metadata(self, trajectory_id: str, metadata: Dict[str, Any]) -> None:
+        """Queue a write of the trajectory's metadata.json."""
+        await self._submit(self._write_metadata, trajectory_id, metadata)
+
+    async def flush(self) -> None:
+        """Wait until every queued write is on disk."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Flush queued writes and stop the background writer."""
+        await self.flush()
+        if self._writer is not None:
+            self._writer.cancel()
+            self._writer = None
+            self._queue = None
+
+    async def _submit(self, fn: Callable[..., None], *args: Any) -> None:
+        if self._writer is None or self._writer.done():
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._writer = asyncio.create_task(self._write_loop(self._queue))
+        await self._queue.put((fn, args))
+
+    async def _write_loop(self, queue: asyncio.Queue) -> None:
+        while True:
+            fn, args = await queue.get()
+            try:
+                await asyncio.to_thread(fn, *args)
+            except Exception as e:
+                logger.warning(f"Failed to save trajectory data: {e}")
+            finally:
+                queue.task_done()
+
+    def _write_artifact(self, trajectory_id: str, turn: int, index: int, name: str, artifact: Artifact) -> None:
+        raise NotImplementedError
+
+    def _write_metadata(self, trajectory_id: str, metadata: Dict[str, Any]) -> None:
+        trajectory_path = self.root / trajectory_id
+        trajectory_path.mkdir(parents=True, exist_ok=True)
+        with open(trajectory_path / "metadata.json", "w") as f:
+            json.dump(metadata, f, indent=2)
+
+
+class TurnDirectoryStore(TrajectoryStore):
+    """Stores each artifact as its own file under trajectory_id/turn_XXX/."""
+
+    def _write_artifact(self, trajectory_id: str, turn: int, index: int, name: str, artifact: Artifact) -> None:
+        write_turn_artifact(self.root / trajectory_id, turn, index, name, artifact)
+
+
+class ContentAddressedStore(TrajectoryStore):
+    """Stores an append-only event log per trajectory and deduplicated screenshots.
+
+    Layout:
+        images/ab/abcdef....png          one file per distinct image (sha256 of its bytes)
+        <trajectory_id>/metadata.json
+        <trajectory_id>/events.jsonl     one line per artifact, in order
+    """
+
+    def __init__(self, root: Union[str, Path], max_queue: int = 256):
+        super().__init__(root, max_queue)
+        self._known_images: Set[str] = set()
+
+    def _write_artifact(self, trajectory_id: str, turn: int, index: int, name: str, artifact: Artifact) -> None:
+        event: Dict[str, Any] = {"turn": turn, "index": index, "name": name}
+        if isinstance(artifact, bytes):
+            event["image"] = self._write_image(artifact)
+        else:
+            event["data"] = artifact
+
+        trajectory_path = self.root / trajectory_id
+        trajectory_path.mkdir(parents=True, exist_ok=True)
+        with open(trajectory_path / "events.jsonl", "a") as f:
+            f.write(json.dumps(event) + "\n")
+
+    def _write_image(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        if digest in self._known_images:
+            return digest
+        path = self.image_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial image
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        self._known_images.add(digest)
+        return digest
+
+    def image_path(self, digest: str) -> Path:
+        """Get the path of a stored image from its hash."""
+        return self.root / "images" / digest[:2] / f"{digest}.png"
+
+    def read_image(self, digest: str) -> bytes:
+        """Read a stored image by its hash."""
+        return self.image_path(digest).read_bytes()
+
+    def iter_events(self, trajectory_id: str) -> Iterator[Dict[str, Any]]:
+        """Iterate over a trajectory's events in the order they were saved.
+
+        Image events carry the image hash under "image"; use read_image to load them.
+        A line cut short by an interrupted run ends the iteration.
+        """
+        events_path = self.root / trajectory_id / "events.jsonl"
+        if not events_path.exists():
+            return
+        with open(events_path, "r") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    return
+
+    def export_turns(self, trajectory_id: str, dest: Union[str, Path]) -> Path:
+        """Export a trajectory to the turn directory layout read by the trajectory viewer.
+
+        Args:
+            trajectory_id: Trajectory to export
+            dest: Base directory to export into
+
+        Returns:
+            Path of the exported trajectory directory
+        """
+        source = self.root / trajectory_id
+        target = Path(dest) / trajectory_id
+        target.mkdir(parents=True, exist_ok=True)
+        if (source / "metadata.json").exists():
+            (target / "metadata.json").write_bytes((source / "metadata.json").read_bytes())
+
+        for event in self.iter_events(trajectory_id):
+            artifact = self.read_image(event["image"]) if "image" in event else event["data"]
+            write_turn_artifact(target, event["turn"], event["index"], event["name"], artifact)
+        return target
+
+
+def write_turn_artifact(trajectory_path: Path, turn: int, index: int, name: str, artifact: Artifact) -> None:
+    """Write an artifact in the turn directory layout."""
+    # format: trajectory_id/turn_000
+    turn_dir = trajectory_path / f"turn_{turn:03d}"
+    turn_dir.mkdir(parents=True, exist_ok=True)
+
+    # format: turn_000/0000_name.png or turn_000/0000_name.json
+    artifact_filename = f"{index:04d}_{name}"
+    if isinstance(artifact, bytes):
+        with open(turn_dir / f"{artifact_filename}.png", "wb") as f:
+            f.write(artifact)
+    else:
+        with open(turn_dir / f"{artifact_filename}.json", "w") as f:
+            json.dump(artifact, f, indent=2)
@@ -0,0 +1,76 @@
+"""
+Incremental conversion of Responses items to completion messages.
+
+Agent loops convert the whole history on every step, so without caching the work per
+step grows with the length of the trajectory. ConversionCache memoizes the converted
+fragment of each history item across steps so that only newly appended items are
+converted. Keys are built from an item's top-level fields without walking or hashing
+its payload, so base64 screenshots are never re-read or copied.
+
+History items are treated as immutable once they are part of the history: loops and
+callbacks create new items (or shallow copies) rather than editing nested values in place.
+"""
+
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def item_key(item: Dict[str, Any]) -> Hashable:
+    """Build a hashable key for a history item from its top-level fields.
+
+    Scalar fields (type, call_id, role, ...) are compared by value; nested values
+    (action, output, content) by identity, which holds across the shallow copies made
+    by callbacks. The cache keeps the item alive, so those identities cannot be reused.
+    """
+    return tuple(
+        (key, value if isinstance(value, _SCALARS) else ("id", id(value)))
+        for key, value in item.items()
+    )
+
+
+class ConversionCache:
+    """Per-item memo of converted history fragments, kept for the current history only.
+
+    Each call to convert() starts a new generation: entries for items that are no longer
+    part of the history (e.g. screenshots dropped by image retention) are released.
+    """
+
+    def __init__(self):
+        # key -> (item, fragment); the item is held so identities in its key stay valid
+        self._entries: Dict[Hashable, Tuple[Dict[str, Any], Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def convert(self, items: List[Dict[str, Any]], convert_item: Callable[[Dict[str, Any]], Any], *variant: Hashable) -> List[Any]:
+        """Convert every item, reusing fragments from the previous call where possible.
+
+        Args:
+            items: History items in order
+            convert_item: Converts one item into a fragment. Fragments are shared between
+                calls, so neither the converter nor the caller may mutate them later.
+            variant: Extra values that change the conversion (e.g. converter options)
+
+        Returns:
+            List of fragments, one per item
+        """
+        previous = self._entries
+        current: Dict[Hashable, Tuple[Dict[str, Any], Any]] = {}
+        fragments = []
+
+        for item in items:
+            key = (variant, item_key(item))
+            entry = current.get(key) or previous.get(key)
+            if entry is None:
+                entry = (item, convert_item(item))
+                self.misses += 1
+            else:
+                self.hits += 1
+            current[key] = entry
+            fragments.append(entry[1])
+
+        self._entries = current
+        return fragments
+
+    def clear(self) -> None:
+        self._entries = {}
@@ -11,6 +11,7 @@ from litellm.responses.litellm_completion_transformation.transformation import L
 from ..decorators import register_agent
 from ..types import Messages, AgentResponse, Tools, AgentCapability
 from ..loops.base import AsyncAgentConfig
+from ..conversion_cache import ConversionCache
 from ..responses import (
     make_reasoning_item,
     make_output_text_item,
@@ -115,534 +116,556 @@ async def _prepare_tools_for_anthropic(tool_schemas: List[Dict[str, Any]], model
     
     return anthropic_tools
 
-def _convert_responses_items_to_completion_messages(messages: Messages) -> List[Dict[str, Any]]:
-    """Convert responses_items message format to liteLLM completion format."""
+def _convert_responses_items_to_completion_messages(
+    messages: Messages, cache: Optional[ConversionCache] = None
+) -> List[Dict[str, Any]]:
+    """Convert responses_items message format to liteLLM completion format.
+
+    Args:
+        messages: Responses items to convert
+        cache: Optional ConversionCache reused across steps, so only items that were not
+               in the previous call's history are converted.
+    """
+    if cache is not None:
+        fragments = cache.convert(messages, _convert_responses_item, "anthropic")
+    else:
+        fragments = [_convert_responses_item(message) for message in messages]
+
     completion_messages = []
     call_id_to_fn_name = {}
 
-    for message in messages:
-        msg_type = message.get("type")
-        role = message.get("role")
-        
-        # Handle user messages (both with and without explicit type)
-        if role == "user" or msg_type == "user":
-            content = message.get("content", "")
-            if isinstance(content, list):
-                # Multi-modal content - convert input_image to image format
-                converted_content = []
-                for item in content:
-                    if isinstance(item, dict) and item.get("type") == "input_image":
-                        # Convert input_image to Anthropic image format
-                        image_url = item.get("image_url", "")
-                        if image_url and image_url != "[omitted]":
-                            # Extract base64 data from data URL
-                            if "," in image_url:
-                                base64_data = image_url.split(",")[-1]
-                            else:
-                                base64_data = image_url
-                            
-                            converted_content.append({
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": "image/png",
-                                    "data": base64_data
-                                }
-                            })
-                    else:
-                        # Keep other content types as-is
-                        converted_content.append(item)
-                
-                completion_messages.append({
-                    "role": "user",
-                    "content": converted_content if converted_content else content
-                })
-            else:
-                # Text content
-                completion_messages.append({
-                    "role": "user",
-                    "content": content
-                })
-        
-        # Handle assistant messages
-        elif role == "assistant":
-            content = message.get("content", [])
-            if isinstance(content, str):
-                content = [{ "type": "output_text", "text": content }]
-            
-            content = "\n".join(item.get("text", "") for item in content)
+    for message, (tool_calls, converted) in zip(messages, fragments):
+        if message.get("type") == "function_call":
+            call_id_to_fn_name[message.get("call_id", "call_1")] = message.get("name")
+
+        if tool_calls is None:
+            # Shallow copies keep cached fragments safe from callers that edit messages
+            for completion_message in converted:
+                completion_message = dict(completion_message)
+                if message.get("type") == "function_call_output":
+                    completion_message["name"] = call_id_to_fn_name.get(completion_message["tool_call_id"], "computer")
+                completion_messages.append(completion_message)
+        elif completion_messages and completion_messages[-1].get("role") == "assistant":
+            # If the last completion message is an assistant message, extend the tool_calls
+            last = completion_messages[-1]
+            last["tool_calls"] = last.get("tool_calls", []) + tool_calls
+        else:
+            # Create new assistant message with tool calls
             completion_messages.append({
                 "role": "assistant",
+                "content": None,
+                "tool_calls": list(tool_calls)
+            })
+
+    return completion_messages
+
+def _convert_responses_item(message: Dict[str, Any]) -> Tuple[Optional[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """Convert one responses item.
+
+    Returns:
+        (tool_calls, messages): tool_calls is set for function and computer calls, which are
+        attached to the preceding assistant message; otherwise messages holds the new messages.
+    """
+    completion_messages = []
+    msg_type = message.get("type")
+    role = message.get("role")
+    
+    # Handle user messages (both with and without explicit type)
+    if role == "user" or msg_type == "user":
+        content = message.get("content", "")
+        if isinstance(content, list):
+            # Multi-modal content - convert input_image to image format
+            converted_content = []
+            for item in content:
+                if isinstance(item, dict) and item.get("type") == "input_image":
+                    # Convert input_image to Anthropic image format
+                    image_url = item.get("image_url", "")
+                    if image_url and image_url != "[omitted]":
+                        # Extract base64 data from data URL
+                        if "," in image_url:
+                            base64_data = image_url.split(",")[-1]
+                        else:
+                            base64_data = image_url
+                        
+                        converted_content.append({
+                            "type": "image",
+                            "source": {
+                                "type": "base64",
+                                "media_type": "image/png",
+                                "data": base64_data
+                            }
+                        })
+                else:
+                    # Keep other content types as-is
+                    converted_content.append(item)
+            
+            completion_messages.append({
+                "role": "user",
+                "content": converted_content if converted_content else content
+            })
+        else:
+            # Text content
+            completion_messages.append({
+                "role": "user",
                 "content": content
             })
+    
+    # Handle assistant messages
+    elif role == "assistant":
+        content = message.get("content", [])
+        if isinstance(content, str):
+            content = [{ "type": "output_text", "text": content }]
         
-        elif msg_type == "reasoning":
-            # Reasoning becomes part of assistant message
-            summary = message.get("summary", [])
-            reasoning_text = ""
-            
-            if isinstance(summary, list) and summary:
-                # Extract text from summary items
-                for item in summary:
-                    if isinstance(item, dict) and item.get("type") == "summary_text":
-                        reasoning_text = item.get("text", "")
-                        break
-            else:
-                # Fallback to direct reasoning field
-                reasoning_text = message.get("reasoning", "")
-            
-            if reasoning_text:
-                completion_messages.append({
-                    "role": "assistant",
-                    "content": reasoning_text
-                })
+        content = "\n".join(item.get("text", "") for item in content)
+        completion_messages.append({
+            "role": "assistant",
+            "content": content
+        })
+    
+    elif msg_type == "reasoning":
+        # Reasoning becomes part of assistant message
+        summary = message.get("summary", [])
+        reasoning_text = ""
         
-        elif msg_type == "function_call":
-            fn_name = message.get("name")
-            fn_args = message.get("arguments", "{}")
-            call_id = message.get("call_id", "call_1")
-            call_id_to_fn_name[call_id] = fn_name
-            openai_tool_calls = [{
-                "id": call_id,
-                "type": "function",
-                "function": {
-                    "name": fn_name,
-                    "arguments": fn_args
-                }
-            }]            # If the last completion message is an assistant message, extend the tool_calls
-            if completion_messages and completion_messages[-1].get("role") == "assistant":
-                if "tool_calls" not in completion_messages[-1]:
-                    completion_messages[-1]["tool_calls"] = []
-                completion_messages[-1]["tool_calls"].extend(openai_tool_calls)
-            else:
-                # Create new assistant message with tool calls
-                completion_messages.append({
-                    "role": "assistant",
-                    "content": None,
-                    "tool_calls": openai_tool_calls
-                })
+        if isinstance(summary, list) and summary:
+            # Extract text from summary items
+            for item in summary:
+                if isinstance(item, dict) and item.get("type") == "summary_text":
+                    reasoning_text = item.get("text", "")
+                    break
+        else:
+            # Fallback to direct reasoning field
+            reasoning_text = message.get("reasoning", "")
         
-        elif msg_type == "function_call_output":
-            call_id = message.get("call_id", "call_1")
-            fn_output = message.get("output", "")
-            fn_name = call_id_to_fn_name.get(call_id, "computer")
-
+        if reasoning_text:
             completion_messages.append({
-                "role": "function",
+                "role": "assistant",
+                "content": reasoning_text
+            })
+    
+    elif msg_type == "function_call":
+        fn_name = message.get("name")
+        fn_args = message.get("arguments", "{}")
+        call_id = message.get("call_id", "call_1")
+        return [{
+            "id": call_id,
+            "type": "function",
+            "function": {
                 "name": fn_name,
-                "tool_call_id": call_id,
-                "content": str(fn_output)
+                "arguments": fn_args
+            }
+        }], []
+    
+    elif msg_type == "function_call_output":
+        call_id = message.get("call_id", "call_1")
+        fn_output = message.get("output", "")
+
+        # The function name is filled in from the matching function_call when assembling
+        completion_messages.append({
+            "role": "function",
+            "name": "computer",
+            "tool_call_id": call_id,
+            "content": str(fn_output)
+        })
+        
+    elif msg_type == "computer_call":
+        # Computer call becomes tool use in assistant message
+        action = message.get("action", {})
+        action_type = action.get("type")
+        call_id = message.get("call_id", "call_1")
+        
+        tool_use_content = []
+        
+        # Basic actions (all versions)
+        if action_type == "click":
+            # Input:
+            # {
+            #     "type": "computer_call",
+            #     "call_id": "call_1",
+            #     "action": {
+            #         "type": "click",
+            #         "x": 100,
+            #         "y": 200
+            #     }
+            # }
+            
+            # Output:
+            # {
+            #     "function": {
+            #         "name": "computer",
+            #         "arguments": json.dumps({
+            #             "action": "click",
+            #             "coordinate": [100, 200]
+            #         })
+            #     },
+            #     "id": "call_1",
+            #     "type": "function"
+            # }
+            button = action.get("button", "left")
+            action_name = "right_click" if button == "right" else "middle_click" if button == "wheel" else "left_click"
+            tool_use_content.append({
+                "type": "tool_use",
+                "id": call_id,
+                "name": "computer",
+                "input": {
+                    "action": action_name,
+                    "coordinate": [action.get("x", 0), action.get("y", 0)]
+                }
             })
+        elif action_type == "double_click":
+            # Input:
+            # {
+            #     "type": "computer_call",
+            #     "call_id": "call_1",
+            #     "action": {
+            #         "type": "double_click",
+            #         "x": 160,
+            #         "y": 240
+            #     }
+            # }
             
-        elif msg_type == "computer_call":
-            # Computer call becomes tool use in assistant message
-            action = message.get("action", {})
-            action_type = action.get("type")
-            call_id = message.get("call_id", "call_1")
+            # Output:
+            # {
+            #     "function": {
+            #         "name": "computer",
+            #         "arguments": json.dumps({
+            #             "action": "double_click",
+            #             "coordinate": [160, 240]
+            #         })
+            #     },
+            #     "id": "call_1",
+            #     "type": "function"
+            # }
+            tool_use_content.append({
+                "type": "tool_use",
+                "id": call_id,
+                "name": "computer",
+                "input": {
+                    "action": "double_click",
+                    "coordinate": [action.get("x", 0), action.get("y", 0)]
+                }
+            })
+        elif action_type == "type":
+            # Input:
+            # {
+            #     "type": "computer_call",
+            #     "call_id": "call_1",
+            #     "action": {
+            #         "type": "type",
+            #         "text": "Hello World"
+            #     }
+            # }
             
-            tool_use_content = []
+            # Output:
+            # {
+            #     "function": {
+            #         "name": "computer",
+            #         "arguments": json.dumps({
+            #             "action": "type",
+            #             "text": "Hello World"
+            #         })
+            #     },
+            #     "id": "call_1",
+            #     "type": "function"
+            # }
+            tool_use_content.append({
+                "type": "tool_use",
+                "id": call_id,
+                "name": "computer",
+                "input": {
+                    "action": "type",
+                    "text": action.get("text", "")
+                }
+            })
+        elif action_type == "keypress":
+            # Input:
+            # {
+            #     "type": "computer_call",
+            #     "call_id": "call_1",
+            #     "action": {
+            #         "type": "keypress",
+            #         "keys": ["ctrl", "c"]
+            #     }
+            # }
             
-            # Basic actions (all versions)
-            if action_type == "click":
-                # Input:
-                # {
-                #     "type": "computer_call",
-                #     "call_id": "call_1",
-                #     "action": {
-                #         "type": "click",
-                #         "x": 100,
-                #         "y": 200
-                #     }
-                # }
-                
-                # Output:
-                # {
-                #     "function": {
-                #         "name": "computer",
-                #         "arguments": json.dumps({
-                #             "action": "click",
-                #             "coordinate": [100, 200]
-                #         })
-                #     },
-                #     "id": "call_1",
-                #     "type": "function"
-                # }
-                button = action.get("button", "left")
-                action_name = "right_click" if button == "right" else "middle_click" if button == "wheel" else "left_click"
-                tool_use_content.append({
-                    "type": "tool_use",
-                    "id": call_id,
-                    "name": "computer",
-                    "input": {
-                        "action": action_name,
-                        "coordinate": [action.get("x", 0), action.get("y", 0)]
-                    }
-                })
-            elif action_type == "double_click":
-                # Input:
-                # {
-                #     "type": "computer_call",
-                #     "call_id": "call_1",
-                #     "action": {
-                #         "type": "double_click",
-                #         "x": 160,
-                #         "y": 240
-                #     }
-                # }
-                
-                # Output:
-                # {
-                #     "function": {
-                #         "name": "computer",
-                #         "arguments": json.dumps({
-                #             "action": "double_click",
-                #             "coordinate": [160, 240]
-                #         })
-                #     },
-                #     "id": "call_1",
-                #     "type": "function"
-                # }
-                tool_use_content.append({
-                    "type": "tool_use",
-                    "id": call_id,
-                    "name": "computer",
-                    "input": {
-                        "action": "double_click",
-                        "coordinate": [action.get("x", 0), action.get("y", 0)]
-                    }
-                })
-            elif action_type == "type":
-                # Input:
-                # {
-                #     "type": "computer_call",
-                #     "call_id": "call_1",
-                #     "action": {
-                #         "type": "type",
-                #         "text": "Hello World"
-                #     }
-                # }
-                
-                # Output:
-                # {
-                #     "function": {
-                #         "name": "computer",
-                #         "arguments": json.dumps({
-                #             "action": "type",
-                #             "text": "Hello World"
-                #         })
-                #     },
-                #     "id": "call_1",
-                #     "type": "function"
-                # }
-                tool_use_content.append({
-                    "type": "tool_use",
-                    "id": call_id,
-                    "name": "computer",
-                    "input": {
-                        "action": "type",
-                        "text": action.get("text", "")
-                    }
-                })
-            elif action_type == "keypress":
-                # Input:
-                # {
-                #     "type": "computer_call",
-                #     "call_id": "call_1",
-                #     "action": {
-                #         "type": "keypress",
-                #         "keys": ["ctrl", "c"]
-                #     }
-                # }
-                
-                # Output:
-                # {
-                #     "function": {
-                #         "name": "computer",
-                #         "arguments": json.dumps({
-                #             "action": "key",
-                #             "text": "ctrl+c"
-                #         })
-                #     },
-                #     "id": "call_1",
-                #     "type": "function"
-                # }
-                tool_use_content.append({
-                    "type": "tool_use",
-                    "id": call_id,
-                    "name": "computer",
-                    "input": {
-                        "action": "key",
-                        "text": "+".join(action.get("keys", []))
-                    }
-                })
-            elif action_type in ["mouse_move", "move"]:
-                # Input:
-                # {
-                #     "type": "computer_call",
-                #     "call_id": "call_1",
-                #     "action": {
-                #         "type": "move",
-                #         "x": 150,
-                #         "y": 250
-                #     }
-                # }
-                
-                # Output:
-                # {
-                #     "function": {
-                #         "name": "computer",
-                #         "arguments": json.dumps({
-                #             "action": "mouse_move",
-                #             "coordinate": [150, 250]
-                #         })
-                #     },
-                #     "id": "call_1",
-                #     "type": "function"
-                # }
-                tool_use_content.append({
-                    "type": "tool_use",
-                    "id": call_id,
-                    "name": "computer",
-                    "input": {
-                        "action": "mouse_move",
-                        "coordinate": [action.get("x", 0), action.get("y", 0)]
-                    }
-                })
-            elif action_type == "scroll":
-                # Input:
-                # {
-                #     "type": "computer_call",
-                #     "call_id": "call_1",
-                #     "action": {
-                #         "type": "scroll",
-                #         "x": 300,
-                #         "y": 400,
-                #         "scroll_x": 0,
-                #         "scroll_y": -5
-                #     }
-                # }
-                
-                # Output:
-                # {
-                #     "function": {
-                #         "name": "computer",
-                #         "arguments": json.dumps({
-                #             "action": "scroll",
-                #             "coordinate": [300, 400],
-                #             "scroll_direction": "down",
-                #             "scroll_amount": 5
-                #         })
-                #     },
-                #     "id": "call_1",
-                #     "type": "function"
-                # }
-                scroll_x = action.get("scroll_x", 0)
-                scroll_y = action.get("scroll_y", 0)
-                # Determine direction and amount from scroll values
-                if scroll_x > 0:
-                    direction = "left"
-                    amount = scroll_x
-                elif scroll_x < 0:
-                    direction = "right"
-                    amount = -scroll_x
-                elif scroll_y > 0:
-                    direction = "up"
-                    amount = scroll_y
-                elif scroll_y < 0:
-                    direction = "down"
-                    amount = -scroll_y
-                else:
-                    direction = "down"
-                    amount = 3
-                
-                tool_use_content.append({
-                    "type": "tool_use",
-                    "id": call_id,
-                    "name": "computer",
-                    "input": {
-                        "action": "scroll",
-                        "coordinate": [action.get("x", 0), action.get("y", 0)],
-                        "scroll_direction": direction,
-                        "scroll_amount": amount
-                    }
-                })
-            elif action_type == "drag":
-                # Input:
-                # {
-                #     "type": "computer_call",
-                #     "call_id": "call_1",
-                #     "action": {
-                #         "type": "drag",
-                #         "path": [
-                #             {"x": 100, "y": 150},
-                #             {"x": 200, "y": 250}
-                #         ]
-                #     }
-                # }
-                
-                # Output:
-                # {
-                #     "function": {
-                #         "name": "computer",
-                #         "arguments": json.dumps({
-                #             "action": "left_click_drag",
-                #             "start_coordinate": [100, 150],
-                #             "end_coordinate": [200, 250]
-                #         })
-                #     },
-                #     "id": "call_1",
-                #     "type": "function"
-                # }
-                path = action.get("path", [])
-                start_coord = [0, 0]
-                end_coord = [0, 0]
-                if isinstance(path, list) and len(path) >= 2:
-                    start_coord = [path[0].get("x", 0), path[0].get("y", 0)]
-                    end_coord = [path[-1].get("x", 0), path[-1].get("y", 0)]
-                
-                tool_use_content.append({
-                    "type": "tool_use",
-                    "id": call_id,
-                    "name": "computer",
-                    "input": {
-                        "action": "left_click_drag",
-                        "start_coordinate": start_coord,
-                        "end_coordinate": end_coord
-                    }
-                })
-            elif action_type == "wait":
-                # Input:
-                # {
-                #     "type": "computer_call",
-                #     "call_id": "call_1",
-                #     "action": {
-                #         "type": "wait"
-                #     }
-                # }
-                
-                # Output:
-                # {
-                #     "function": {
-                #         "name": "computer",
-                #         "arguments": json.dumps({
-                #             "action": "wait"
-                #         })
-                #     },
-                #     "id": "call_1",
-                #     "type": "function"
-                # }
-                tool_use_content.append({
-                    "type": "tool_use",
-                    "id": call_id,
-                    "name": "computer",
-                    "input": {
-                        "action": "wait"
-                    }
-                })
-            elif action_type == "screenshot":
-                # Input:
-                # {
-                #     "type": "computer_call",
-                #     "call_id": "call_1",
-                #     "action": {
-                #         "type": "screenshot"
-                #     }
-                # }
-                
-                # Output:
-                # {
-                #     "function": {
-                #         "name": "computer",
-                #         "arguments": json.dumps({
-                #             "action": "screenshot"
-                #         })
-                #     },
-                #     "id": "call_1",
-                #     "type": "function"
-                # }
-                tool_use_content.append({
-                    "type": "tool_use",
-                    "id": call_id,
-                    "name": "computer",
-                    "input": {
-                        "action": "screenshot"
-                    }
-                })
-            elif action_type == "left_mouse_down":
-                tool_use_content.append({
-                    "type": "tool_use",
-                    "id": call_id,
-                    "name": "computer",
-                    "input": {
-                        "action": "left_mouse_down",
-                        "coordinate": [action.get("x", None), action.get("y", None)]
-                    }
-                })
-            elif action_type == "left_mouse_up":
-                tool_use_content.append({
-                    "type": "tool_use",
-                    "id": call_id,
-                    "name": "computer",
-                    "input": {
-                        "action": "left_mouse_up",
-                        "coordinate": [action.get("x", None), action.get("y", None)]
-                    }
-                })
+            # Output:
+            # {
+            #     "function": {
+            #         "name": "computer",
+            #         "arguments": json.dumps({
+            #             "action": "key",
+            #             "text": "ctrl+c"
+            #         })
+            #     },
+            #     "id": "call_1",
+            #     "type": "function"
+            # }
+            tool_use_content.append({
+                "type": "tool_use",
+                "id": call_id,
+                "name": "computer",
+                "input": {
+                    "action": "key",
+                    "text": "+".join(action.get("keys", []))
+                }
+            })
+        elif action_type in ["mouse_move", "move"]:
+            # Input:
+            # {
+            #     "type": "computer_call",
+            #     "call_id": "call_1",
+            #     "action": {
+            #         "type": "move",
+            #         "x": 150,
+            #         "y": 250
+            #     }
+            # }
             
-            # Convert tool_use_content to OpenAI tool_calls format
-            openai_tool_calls = []
-            for tool_use in tool_use_content:
-                openai_tool_calls.append({
-                    "id": tool_use["id"],
-                    "type": "function",
-                    "function": {
-                        "name": tool_use["name"],
-                        "arguments": json.dumps(tool_use["input"])
-                    }
-                })
+            # Output:
+            # {
+            #     "function": {
+            #         "name": "computer",
+            #         "arguments": json.dumps({
+            #             "action": "mouse_move",
+            #             "coordinate": [150, 250]
+            #         })
+            #     },
+            #     "id": "call_1",
+            #     "type": "function"
+            # }
+            tool_use_content.append({
+                "type": "tool_use",
+                "id": call_id,
+                "name": "computer",
+                "input": {
+                    "action": "mouse_move",
+                    "coordinate": [action.get("x", 0), action.get("y", 0)]
+                }
+            })
+        elif action_type == "scroll":
+            # Input:
+            # {
+            #     "type": "computer_call",
+            #     "call_id": "call_1",
+            #     "action": {
+            #         "type": "scroll",
+            #         "x": 300,
+            #         "y": 400,
+            #         "scroll_x": 0,
+            #         "scroll_y": -5
+            #     }
+            # }
             
-            # If the last completion message is an assistant message, extend the tool_calls
-            if completion_messages and completion_messages[-1].get("role") == "assistant":
-                if "tool_calls" not in completion_messages[-1]:
-                    completion_messages[-1]["tool_calls"] = []
-                completion_messages[-1]["tool_calls"].extend(openai_tool_calls)
+            # Output:
+            # {
+            #     "function": {
+            #         "name": "computer",
+            #         "arguments": json.dumps({
+            #             "action": "scroll",
+            #             "coordinate": [300, 400],
+            #             "scroll_direction": "down",
+            #             "scroll_amount": 5
+            #         })
+            #     },
+            #     "id": "call_1",
+            #     "type": "function"
+            # }
+            scroll_x = action.get("scroll_x", 0)
+            scroll_y = action.get("scroll_y", 0)
+            # Determine direction and amount from scroll values
+            if scroll_x > 0:
+                direction = "left"
+                amount = scroll_x
+            elif scroll_x < 0:
+                direction = "right"
+                amount = -scroll_x
+            elif scroll_y > 0:
+                direction = "up"
+                amount = scroll_y
+            elif scroll_y < 0:
+                direction = "down"
+                amount = -scroll_y
             else:
-                # Create new assistant message with tool calls
-                completion_messages.append({
-                    "role": "assistant",
-                    "content": None,
-                    "tool_calls": openai_tool_calls
-                })
-        
-        elif msg_type == "computer_call_output":
-            # Computer call output becomes OpenAI function result
-            output = message.get("output", {})
-            call_id = message.get("call_id", "call_1")
+                direction = "down"
+                amount = 3
             
-            if output.get("type") == "input_image":
-                # Screenshot result - convert to OpenAI format with image_url content
-                image_url = output.get("image_url", "")
-                completion_messages.append({
-                    "role": "function",
-                    "name": "computer",
-                    "tool_call_id": call_id,
-                    "content": [{
-                        "type": "image_url",
-                        "image_url": {
-                            "url": image_url
-                        }
-                    }]
-                })
-            else:
-                # Text result - convert to OpenAI format
-                completion_messages.append({
-                    "role": "function",
-                    "name": "computer",
-                    "tool_call_id": call_id,
-                    "content": str(output)
-                })
+            tool_use_content.append({
+                "type": "tool_use",
+                "id": call_id,
+                "name": "computer",
+                "input": {
+                    "action": "scroll",
+                    "coordinate": [action.get("x", 0), action.get("y", 0)],
+                    "scroll_direction": direction,
+                    "scroll_amount": amount
+                }
+            })
+        elif action_type == "drag":
+            # Input:
+            # {
+            #     "type": "computer_call",
+            #     "call_id": "call_1",
+            #     "action": {
+            #         "type": "drag",
+            #         "path": [
+            #             {"x": 100, "y": 150},
+            #             {"x": 200, "y": 250}
+            #         ]
+            #     }
+            # }
+            
+            # Output:
+            # {
+            #     "function": {
+            #         "name": "computer",
+            #         "arguments": json.dumps({
+            #             "action": "left_click_drag",
+            #             "start_coordinate": [100, 150],
+            #             "end_coordinate": [200, 250]
+            #         })
+            #     },
+            #     "id": "call_1",
+            #     "type": "function"
+            # }
+            path = action.get("path", [])
+            start_coord = [0, 0]
+            end_coord = [0, 0]
+            if isinstance(path, list) and len(path) >= 2:
+                start_coord = [path[0].get("x", 0), path[0].get("y", 0)]
+                end_coord = [path[-1].get("x", 0), path[-1].get("y", 0)]
+            
+            tool_use_content.append({
+                "type": "tool_use",
+                "id": call_id,
+                "name": "computer",
+                "input": {
+                    "action": "left_click_drag",
+                    "start_coordinate": start_coord,
+                    "end_coordinate": end_coord
+                }
+            })
+        elif action_type == "wait":
+            # Input:
+            # {
+            #     "type": "computer_call",
+            #     "call_id": "call_1",
+            #     "action": {
+            #         "type": "wait"
+            #     }
+            # }
+            
+            # Output:
+            # {
+            #     "function": {
+            #         "name": "computer",
+            #         "arguments": json.dumps({
+            #             "action": "wait"
+            #         })
+            #     },
+            #     "id": "call_1",
+            #     "type": "function"
+            # }
+            tool_use_content.append({
+                "type": "tool_use",
+                "id": call_id,
+                "name": "computer",
+                "input": {
+                    "action": "wait"
+                }
+            })
+        elif action_type == "screenshot":
+            # Input:
+            # {
+            #     "type": "computer_call",
+            #     "call_id": "call_1",
+            #     "action": {
+            #         "type": "screenshot"
+            #     }
+            # }
+            
+            # Output:
+            # {
+            #     "function": {
+            #         "name": "computer",
+            #         "arguments": json.dumps({
+            #             "action": "screenshot"
+            #         })
+            #     },
+            #     "id": "call_1",
+            #     "type": "function"
+            # }
+            tool_use_content.append({
+                "type": "tool_use",
+                "id": call_id,
+                "name": "computer",
+                "input": {
+                    "action": "screenshot"
+                }
+            })
+        elif action_type == "left_mouse_down":
+            tool_use_content.append({
+                "type": "tool_use",
+                "id": call_id,
+                "name": "computer",
+                "input": {
+                    "action": "left_mouse_down",
+                    "coordinate": [action.get("x", None), action.get("y", None)]
+                }
+            })
+        elif action_type == "left_mouse_up":
+            tool_use_content.append({
+                "type": "tool_use",
+                "id": call_id,
+                "name": "computer",
+                "input": {
+                    "action": "left_mouse_up",
+                    "coordinate": [action.get("x", None), action.get("y", None)]
+                }
+            })
+        
+        # Convert tool_use_content to OpenAI tool_calls format
+        openai_tool_calls = []
+        for tool_use in tool_use_content:
+            openai_tool_calls.append({
+                "id": tool_use["id"],
+                "type": "function",
+                "function": {
+                    "name": tool_use["name"],
+                    "arguments": json.dumps(tool_use["input"])
+                }
+            })
+        
+        return openai_tool_calls, []
     
-    return completion_messages
+    elif msg_type == "computer_call_output":
+        # Computer call output becomes OpenAI function result
+        output = message.get("output", {})
+        call_id = message.get("call_id", "call_1")
+        
+        if output.get("type") == "input_image":
+            # Screenshot result - convert to OpenAI format with image_url content
+            image_url = output.get("image_url", "")
+            completion_messages.append({
+                "role": "function",
+                "name": "computer",
+                "tool_call_id": call_id,
+                "content": [{
+                    "type": "image_url",
+                    "image_url": {
+                        "url": image_url
+                    }
+                }]
+            })
+        else:
+            # Text result - convert to OpenAI format
+            completion_messages.append({
+                "role": "function",
+                "name": "computer",
+                "tool_call_id": call_id,
+                "content": str(output)
+            })
+
+    return None, completion_messages
 
 def _convert_completion_to_responses_items(response: Any) -> List[Dict[str, Any]]:
     """Convert liteLLM completion response to responses_items message format."""
@@ -1308,18 +1331,74 @@ def _convert_completion_to_responses_items(response: Any) -> List[Dict[str, Any]
     
     return responses_items
 
-def _add_cache_control(completion_messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Add cache control to completion messages"""
-    num_writes = 0
-    for message in completion_messages:
-        message["cache_control"] = { "type": "ephemeral" }
-        num_writes += 1
-        # Cache control has a maximum of 4 blocks
-        if num_writes >= 4:
-            break
+# Anthropic allows at most 4 cache_control breakpoints per request
+MAX_CACHE_BREAKPOINTS = 4
+
+class PromptCachePlanner:
+    """Places prompt-cache breakpoints at the end of the stable prefix of a growing history.
+
+    Each request gets up to four breakpoints, in priority order:
+    - the last message, so the whole prompt is written for the next step to read
+    - the previous request's last message, which is read back while the history only grows
+    - a checkpoint that advances every `stride` messages, stable across several steps
+    - the end of the initial prompt, which survives pruning of old screenshots
+    Breakpoints that don't match a cached prefix only cost a cache write of the new tokens.
+    """
+
+    def __init__(self, stride: int = 8):
+        self.stride = stride
+        self._previous_tail: Optional[int] = None
+
+    def plan(self, completion_messages: List[Dict[str, Any]]) -> List[int]:
+        """Return the message indices that should carry a cache breakpoint."""
+        count = len(completion_messages)
+        if count == 0:
+            return []
+
+        # End of the leading user/system messages (the task prompt)
+        anchor = 0
+        while anchor + 1 < count and completion_messages[anchor + 1].get("role") in ("user", "system"):
+            anchor += 1
+
+        candidates = [
+            count - 1,
+            self._previous_tail,
+            ((count - 1) // self.stride) * self.stride - 1,
+            anchor,
+        ]
+        self._previous_tail = count - 1
+
+        breakpoints: List[int] = []
+        for index in candidates:
+            if index is not None and 0 <= index < count and index not in breakpoints:
+                breakpoints.append(index)
+        return sorted(breakpoints[:MAX_CACHE_BREAKPOINTS])
+
+def _add_cache_control(completion_messages: List[Dict[str, Any]], breakpoints: List[int]) -> List[Dict[str, Any]]:
+    """Add cache control to the completion messages at the given indices"""
+    for index in breakpoints:
+        completion_messages[index]["cache_control"] = { "type": "ephemeral" }
     
     return completion_messages
 
+def _get_cache_usage(usage: Any) -> Dict[str, int]:
+    """Extract prompt-cache read/write token counts from a liteLLM usage object"""
+    def read(*names: str) -> int:
+        for name in names:
+            value = getattr(usage, name, None)
+            if value:
+                return int(value)
+        return 0
+
+    cache_read = read("cache_read_input_tokens", "_cache_read_input_tokens")
+    if not cache_read:
+        details = getattr(usage, "prompt_tokens_details", None)
+        cache_read = int(getattr(details, "cached_tokens", 0) or 0)
+    return {
+        "cache_read_input_tokens": cache_read,
+        "cache_creation_input_tokens": read("cache_creation_input_tokens", "_cache_creation_input_tokens"),
+    }
+
 def _combine_completion_messages(completion_messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Combine completion messages with the same role"""
     if not completion_messages:
@@ -1393,6 +1472,11 @@ def _merge_consecutive_text(content_list: List[Dict[str, Any]]) -> List[Dict[str
 class AnthropicHostedToolsConfig(AsyncAgentConfig):
     """Anthropic hosted tools agent configuration implementing AsyncAgentConfig protocol."""
     
+    def __init__(self):
+        # Converted history items, reused across steps of a run
+        self._conversion_cache = ConversionCache()
+        self._cache_planner = PromptCachePlanner()
+    
     async def predict_step(
         self,
         messages: Messages,
@@ -1422,12 +1506,12 @@ class AnthropicHostedToolsConfig(AsyncAgentConfig):
         anthropic_tools = await _prepare_tools_for_anthropic(tools, model)
         
         # Convert responses_items messages to completion format
-        completion_messages = _convert_responses_items_to_completion_messages(messages)
+        completion_messages = _convert_responses_items_to_completion_messages(messages, cache=self._conversion_cache)
         if use_prompt_caching:
             # First combine messages to reduce number of blocks
             completion_messages = _combine_completion_messages(completion_messages)
             # Then add cache control, anthropic requires explicit "cache_control" dicts
-            completion_messages = _add_cache_control(completion_messages)
+            completion_messages = _add_cache_control(completion_messages, self._cache_planner.plan(completion_messages))
         
         # Prepare API call kwargs
         api_kwargs = {
@@ -1463,6 +1547,7 @@ class AnthropicHostedToolsConfig(AsyncAgentConfig):
         responses_usage = { 
             **LiteLLMCompletionResponsesConfig._transform_chat_completion_usage_to_responses_usage(response.usage).model_dump(),
             "response_cost": response._hidden_params.get("response_cost", 0.0),
+            **_get_cache_usage(response.usage),
         }
         if _on_usage:
             await _on_usage(responses_usage)
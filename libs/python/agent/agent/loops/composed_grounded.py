@@ -22,6 +22,7 @@ from ..responses import (
     convert_computer_calls_desc2xy,
     get_all_element_descriptions
 )
+from ..conversion_cache import ConversionCache
 from ..agent import find_agent_config
 
 GROUNDED_COMPUTER_TOOL_SCHEMA = {
@@ -126,6 +127,8 @@ class ComposedGroundedConfig:
     
     def __init__(self):
         self.desc2xy: Dict[str, Tuple[float, float]] = {}
+        # Converted history items, reused across steps of a run
+        self._conversion_cache = ConversionCache()
     
     async def predict_step(
         self,
@@ -213,7 +216,8 @@ class ComposedGroundedConfig:
         # Step 2: Convert responses items to completion messages
         completion_messages = convert_responses_items_to_completion_messages(
             messages_with_descriptions, 
-            allow_images_in_tool_results=False
+            allow_images_in_tool_results=False,
+            cache=self._conversion_cache,
         )
         
         # Step 3: Call thinking model with litellm.acompletion
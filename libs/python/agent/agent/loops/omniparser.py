@@ -5,7 +5,12 @@ Code: https://github.com/microsoft/OmniParser
 """
 
 import asyncio
+import hashlib
 import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Dict, List, Any, AsyncGenerator, Union, Optional, Tuple
 import litellm
 import inspect
@@ -92,6 +97,112 @@ def get_parser():
     if OMNIPARSER_SINGLETON is None:
         OMNIPARSER_SINGLETON = OmniParser()
     return OMNIPARSER_SINGLETON
+
+
+def _parse_in_worker(image_b64: str, session: Optional[str] = None):
+    """Parse a screenshot with the parser of the current (worker) process."""
+    return get_parser().parse(image_b64, ocr_session=session)
+
+
+class OmniParserService:
+    """Runs OmniParser off the event loop with a shared, bounded result cache.
+
+    Parses run one at a time on a dedicated worker thread (default) or worker process,
+    so the event loop and other agents in the process stay responsive. Results are kept
+    in an LRU cache keyed by a hash of the screenshot, and concurrent requests for the
+    same screenshot share a single parse. Futures are loop-independent, so the service
+    can be shared by agents running on different event loops.
+    """
+
+    def __init__(self, worker: str = "thread", cache_size: int = 32):
+        """
+        Args:
+            worker: "thread" to parse on a worker thread, "process" to parse in a worker
+                    process (avoids contention for the GIL with the agent process)
+            cache_size: Number of parse results to keep
+        """
+        if worker not in ("thread", "process"):
+            raise ValueError(f"Unknown OmniParser worker type: {worker}")
+        self.worker = worker
+        self.cache_size = cache_size
+        self._executor: Optional[Executor] = None
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    async def parse(self, image_b64: str, session: Optional[str] = None):
+        """Parse a base64 screenshot, reusing a cached or in-flight result for the same image.
+
+        Args:
+            image_b64: Base64 encoded screenshot
+            session: Identifies a sequence of screenshots (e.g. one agent's trajectory) so OCR
+                     only re-reads the parts that changed since the session's previous screenshot
+        """
+        key = hashlib.sha256(image_b64.encode("ascii", "ignore")).hexdigest()
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return result
+
+            future = self._inflight.get(key)
+            if future is None:
+                self.misses += 1
+                future = self._get_executor().submit(_parse_in_worker, image_b64, session)
+                self._inflight[key] = future
+                future.add_done_callback(lambda f: self._on_done(key, f))
+
+        # A cancelled caller must not cancel the parse other callers are waiting on
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def _on_done(self, key: str, future: Future) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+            if future.cancelled() or future.exception() is not None:
+                return
+            self._cache[key] = future.result()
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            # One parse at a time: the models are loaded once per worker and not thread-safe
+            if self.worker == "process":
+                self._executor = ProcessPoolExecutor(max_workers=1)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="omniparser")
+        return self._executor
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def shutdown(self) -> None:
+        """Stop the worker. Parses already submitted still complete."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+OMNIPARSER_SERVICE: Optional[OmniParserService] = None
+
+def get_parse_service() -> OmniParserService:
+    """Get the process-wide OmniParser service.
+
+    The worker type and cache size are read from the CUA_OMNIPARSER_WORKER ("thread" or
+    "process") and CUA_OMNIPARSER_CACHE_SIZE environment variables.
+    """
+    global OMNIPARSER_SERVICE
+    if OMNIPARSER_SERVICE is None:
+        OMNIPARSER_SERVICE = OmniParserService(
+            worker=os.environ.get("CUA_OMNIPARSER_WORKER", "thread"),
+            cache_size=int(os.environ.get("CUA_OMNIPARSER_CACHE_SIZE", "32")),
+        )
+    return OMNIPARSER_SERVICE
     
 def get_last_computer_call_output(messages: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     """Get the last computer_call_output message from a messages list.
@@ -289,8 +400,8 @@ class OmniparserConfig(AsyncAgentConfig):
             image_url = last_computer_call_output.get("output", {}).get("image_url", "")
             image_data = image_url.split(",")[-1]
             if image_data:
-                parser = get_parser()
-                result = parser.parse(image_data)
+                # Successive screenshots of this agent mostly overlap; OCR only re-reads what changed
+                result = await get_parse_service().parse(image_data, session=f"agent-{id(self)}")
                 if _on_screenshot:
                     await _on_screenshot(result.annotated_image_base64, "annotated_image")
                 for element in result.elements:
@@ -363,8 +474,7 @@ class OmniparserConfig(AsyncAgentConfig):
             return None
         
         # Parse the image with OmniParser to get annotated image and elements
-        parser = get_parser()
-        result = parser.parse(image_b64)
+        result = await get_parse_service().parse(image_b64)
         
         # Extract the LLM model from composed model string
         llm_model = model.split('+')[-1]
@@ -6,7 +6,7 @@ Based on the OpenAI spec for Responses API items.
 import base64
 import json
 import uuid
-from typing import List, Dict, Any, Literal, Union, Optional
+from typing import List, Dict, Any, Literal, Union, Optional, Tuple
 
 from openai.types.responses.response_computer_tool_call_param import (
     ResponseComputerToolCallParam, 
@@ -30,6 +30,8 @@ from openai.types.responses.response_output_message_param import ResponseOutputM
 from openai.types.responses.easy_input_message_param import EasyInputMessageParam
 from openai.types.responses.response_input_image_param import ResponseInputImageParam
 
+from .conversion_cache import ConversionCache
+
 def random_id():
     return str(uuid.uuid4())
 
@@ -288,10 +290,11 @@ def replace_failed_computer_calls_with_function_calls(messages: List[Dict[str, A
             action = msg.get("action", {})
             call_id = msg.get("call_id")
             
-            # Create function_call replacement
+            # Create function_call replacement. The id is derived from the call_id so the
+            # replacement is identical on every step and stays cacheable
             messages[i] = {
                 "type": "function_call",
-                "id": msg.get("id", random_id()),
+                "id": msg.get("id", f"fc_{call_id}"),
                 "call_id": call_id,
                 "name": "computer",
                 "arguments": json.dumps(action),
@@ -431,79 +434,107 @@ def get_all_element_descriptions(responses_items: List[Dict[str, Any]]) -> List[
 
 
 # Conversion functions between responses_items and completion messages formats
-def convert_responses_items_to_completion_messages(messages: List[Dict[str, Any]], allow_images_in_tool_results: bool = True) -> List[Dict[str, Any]]:
+def convert_responses_items_to_completion_messages(
+    messages: List[Dict[str, Any]],
+    allow_images_in_tool_results: bool = True,
+    cache: Optional[ConversionCache] = None,
+) -> List[Dict[str, Any]]:
     """Convert responses_items message format to liteLLM completion format.
     
     Args:
         messages: List of responses_items format messages
         allow_images_in_tool_results: If True, include images in tool role messages.
                                     If False, send tool message + separate user message with image.
+        cache: Optional ConversionCache reused across steps, so only items that were not
+               in the previous call's history are converted.
+    """
+    if cache is not None:
+        fragments = cache.convert(
+            messages,
+            lambda message: _convert_responses_item(message, allow_images_in_tool_results),
+            "completion",
+            allow_images_in_tool_results,
+        )
+    else:
+        fragments = [_convert_responses_item(message, allow_images_in_tool_results) for message in messages]
+
+    completion_messages: List[Dict[str, Any]] = []
+    for tool_calls, converted in fragments:
+        if tool_calls is None:
+            # Shallow copies keep cached fragments safe from callers that edit messages
+            completion_messages.extend(dict(message) for message in converted)
+        elif completion_messages and completion_messages[-1]["role"] == "assistant":
+            # Add tool call to last assistant message
+            last = completion_messages[-1]
+            last["tool_calls"] = last.get("tool_calls", []) + tool_calls
+        else:
+            completion_messages.append({
+                "role": "assistant",
+                "content": "",
+                "tool_calls": list(tool_calls)
+            })
+
+    return completion_messages
+
+
+def _convert_responses_item(
+    message: Dict[str, Any], allow_images_in_tool_results: bool
+) -> Tuple[Optional[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """Convert one responses item.
+
+    Returns:
+        (tool_calls, messages): tool_calls is set for function and computer calls, which are
+        attached to the preceding assistant message; otherwise messages holds the new messages.
     """
     completion_messages = []
+    msg_type = message.get("type")
+    role = message.get("role")
     
-    for message in messages:
-        msg_type = message.get("type")
-        role = message.get("role")
-        
-        # Handle user messages (both with and without explicit type)
-        if role == "user" or msg_type == "user":
-            content = message.get("content", "")
-            if isinstance(content, list):
-                # Handle list content (images, text blocks)
-                completion_content = []
-                for item in content:
-                    if item.get("type") == "input_image":
-                        completion_content.append({
-                            "type": "image_url",
-                            "image_url": {
-                                "url": item.get("image_url")
-                            }
-                        })
-                    elif item.get("type") == "input_text":
-                        completion_content.append({
-                            "type": "text",
-                            "text": item.get("text")
-                        })
-                    elif item.get("type") == "text":
-                        completion_content.append({
-                            "type": "text",
-                            "text": item.get("text")
-                        })
-                
-                completion_messages.append({
-                    "role": "user",
-                    "content": completion_content
-                })
-            elif isinstance(content, str):
-                # Handle string content
-                completion_messages.append({
-                    "role": "user",
-                    "content": content
-                })
-        
-        # Handle assistant messages
-        elif role == "assistant" or msg_type == "message":
-            content = message.get("content", [])
-            if isinstance(content, list):
-                text_parts = []
-                for item in content:
-                    if item.get("type") == "output_text":
-                        text_parts.append(item.get("text", ""))
-                    elif item.get("type") == "text":
-                        text_parts.append(item.get("text", ""))
-                
-                if text_parts:
-                    completion_messages.append({
-                        "role": "assistant",
-                        "content": "\n".join(text_parts)
+    # Handle user messages (both with and without explicit type)
+    if role == "user" or msg_type == "user":
+        content = message.get("content", "")
+        if isinstance(content, list):
+            # Handle list content (images, text blocks)
+            completion_content = []
+            for item in content:
+                if item.get("type") == "input_image":
+                    completion_content.append({
+                        "type": "image_url",
+                        "image_url": {
+                            "url": item.get("image_url")
+                        }
                     })
-        
-        # Handle reasoning items (convert to assistant message)
-        elif msg_type == "reasoning":
-            summary = message.get("summary", [])
+                elif item.get("type") == "input_text":
+                    completion_content.append({
+                        "type": "text",
+                        "text": item.get("text")
+                    })
+                elif item.get("type") == "text":
+                    completion_content.append({
+                        "type": "text",
+                        "text": item.get("text")
+                    })
+            
+            completion_messages.append({
+                "role": "user",
+                "content": completion_content
+            })
+        elif isinstance(content, str):
+            # Handle string content
+            completion_messages.append({
+                "role": "user",
+                "content": content
+            })
+    
+    # Handle assistant messages
+    elif role == "assistant" or msg_type == "message":
+        content = message.get("content", [])
+        if isinstance(content, list):
             text_parts = []
-            for item in summary:
-                if item.get("type") == "summary_text":
+            for item in content:
+                if item.get("type") == "output_text":
+                    text_parts.append(item.get("text", ""))
+                elif item.get("type") == "text":
                     text_parts.append(item.get("text", ""))
             
             if text_parts:
@@ -511,94 +542,86 @@ def convert_responses_items_to_completion_messages(messages: List[Dict[str, Any]
                     "role": "assistant",
                     "content": "\n".join(text_parts)
                 })
+    
+    # Handle reasoning items (convert to assistant message)
+    elif msg_type == "reasoning":
+        summary = message.get("summary", [])
+        text_parts = []
+        for item in summary:
+            if item.get("type") == "summary_text":
+                text_parts.append(item.get("text", ""))
         
-        # Handle function calls
-        elif msg_type == "function_call":
-            # Add tool call to last assistant message or create new one
-            if not completion_messages or completion_messages[-1]["role"] != "assistant":
-                completion_messages.append({
-                    "role": "assistant",
-                    "content": "",
-                    "tool_calls": []
-                })
-            
-            if "tool_calls" not in completion_messages[-1]:
-                completion_messages[-1]["tool_calls"] = []
-            
-            completion_messages[-1]["tool_calls"].append({
-                "id": message.get("call_id"),
-                "type": "function",
-                "function": {
-                    "name": message.get("name"),
-                    "arguments": message.get("arguments")
-                }
+        if text_parts:
+            completion_messages.append({
+                "role": "assistant",
+                "content": "\n".join(text_parts)
             })
+    
+    # Handle function calls
+    elif msg_type == "function_call":
+        return [{
+            "id": message.get("call_id"),
+            "type": "function",
+            "function": {
+                "name": message.get("name"),
+                "arguments": message.get("arguments")
+            }
+        }], []
+    
+    # Handle computer calls
+    elif msg_type == "computer_call":
+        action = message.get("action", {})
+        return [{
+            "id": message.get("call_id"),
+            "type": "function",
+            "function": {
+                "name": "computer",
+                "arguments": json.dumps(action)
+            }
+        }], []
+    
+    # Handle function/computer call outputs
+    elif msg_type in ["function_call_output", "computer_call_output"]:
+        output = message.get("output")
+        call_id = message.get("call_id")
         
-        # Handle computer calls
-        elif msg_type == "computer_call":
-            # Add tool call to last assistant message or create new one
-            if not completion_messages or completion_messages[-1]["role"] != "assistant":
+        if isinstance(output, dict) and output.get("type") == "input_image":
+            if allow_images_in_tool_results:
+                # Handle image output as tool response (may not work with all APIs)
                 completion_messages.append({
-                    "role": "assistant",
-                    "content": "",
-                    "tool_calls": []
-                })
-            
-            if "tool_calls" not in completion_messages[-1]:
-                completion_messages[-1]["tool_calls"] = []
-            
-            action = message.get("action", {})
-            completion_messages[-1]["tool_calls"].append({
-                "id": message.get("call_id"),
-                "type": "function",
-                "function": {
-                    "name": "computer",
-                    "arguments": json.dumps(action)
-                }
-            })
-        
-        # Handle function/computer call outputs
-        elif msg_type in ["function_call_output", "computer_call_output"]:
-            output = message.get("output")
-            call_id = message.get("call_id")
-            
-            if isinstance(output, dict) and output.get("type") == "input_image":
-                if allow_images_in_tool_results:
-                    # Handle image output as tool response (may not work with all APIs)
-                    completion_messages.append({
-                        "role": "tool",
-                        "tool_call_id": call_id,
-                        "content": [{
-                            "type": "image_url",
-                            "image_url": {
-                                "url": output.get("image_url")
-                            }
-                        }]
-                    })
-                else:
-                    # Send tool message + separate user message with image (OpenAI compatible)
-                    completion_messages += [{
-                        "role": "tool",
-                        "tool_call_id": call_id,
-                        "content": "[Execution completed. See screenshot below]"
-                    }, {
-                        "role": "user",
-                        "content": [{
-                            "type": "image_url",
-                            "image_url": {
-                                "url": output.get("image_url")
-                            }
-                        }]
+                    "role": "tool",
+                    "tool_call_id": call_id,
+                    "content": [{
+                        "type": "image_url",
+                        "image_url": {
+                            "url": output.get("image_url")
+                        }
                     }]
+                })
             else:
-                # Handle text output as tool response
-                completion_messages.append({
+                # Send tool message + separate user message with image (OpenAI compatible)
+                completion_messages += [{
                     "role": "tool",
                     "tool_call_id": call_id,
-                    "content": str(output)
-                })
+                    "content": "[Execution completed. See screenshot below]"
+                }, {
+                    "role": "user",
+                    "content": [{
+                        "type": "image_url",
+                        "image_url": {
+                            "url": output.get("image_url")
+                        }
+                    }]
+                }]
+        else:
+            # Handle text output as tool response
+            completion_messages.append({
+                "role": "tool",
+                "tool_call_id": call_id,
+                "content": str(output)
+            })
     
-    return completion_messages
+    return None, completion_messages
 
 
 def convert_completion_messages_to_responses_items(completion_messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -8,13 +8,16 @@ dotenv.load_dotenv()
 
 import asyncio
 import base64
+import hashlib
+import json
 import os
 import sys
 import subprocess as sp
 import statistics
+import time
 from datetime import datetime
 from io import BytesIO
-from typing import List, Union, Tuple, Optional
+from typing import Dict, List, Union, Tuple, Optional
 
 from PIL import Image, ImageDraw
 from tqdm import tqdm
@@ -221,6 +224,251 @@ class ModelWrapper:
             return result
 
 
+# Model string prefixes of providers that run on the local GPU/CPU
+LOCAL_MODEL_PREFIXES = ("huggingface-local/", "mlx/", "ollama/", "ollama_chat/")
+
+
+def is_local_model(model: Union[str, ModelProtocol]) -> bool:
+    """
+    Check whether a model runs locally, in which case its samples are evaluated one at a time.
+    
+    Args:
+        model: Model string or model class
+        
+    Returns:
+        True for reference model classes and model strings with a local component
+    """
+    if not isinstance(model, str):
+        return True
+    return any(part.startswith(LOCAL_MODEL_PREFIXES) for part in model.split('+'))
+
+
+def sample_key(sample: dict) -> str:
+    """
+    Build a stable key for a sample, independent of its position in the shuffled dataset.
+    
+    The screenshot is identified by its img_filename when the dataset has one
+    (ScreenSpot-Pro), otherwise by a hash of its pixels (ScreenSpot-v2).
+    
+    Args:
+        sample: Sample dict with image, bbox, instruction keys
+        
+    Returns:
+        Hex digest identifying the sample
+    """
+    image = sample['image']
+    screenshot = sample.get('img_filename') or hashlib.sha1(image.tobytes()).hexdigest()
+    parts = [screenshot, sample['instruction'], json.dumps(list(sample['bbox'])), str(image.size)]
+    return hashlib.sha1("\n".join(map(str, parts)).encode('utf-8')).hexdigest()
+
+
+def latency_stats(times: List[float]) -> dict:
+    """
+    Summarize prediction latencies.
+    
+    Args:
+        times: Prediction times in seconds
+        
+    Returns:
+        Dictionary with avg, median, min, max, p50, p95 and p99 latency
+    """
+    if not times:
+        return {key: 0.0 for key in ('avg', 'median', 'min', 'max', 'p50', 'p95', 'p99')}
+    
+    ordered = sorted(times)
+    
+    def percentile(p: float) -> float:
+        # Nearest-rank percentile
+        return ordered[max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered))) - 1))]
+    
+    return {
+        'avg': sum(ordered) / len(ordered),
+        'median': statistics.median(ordered),
+        'min': ordered[0],
+        'max': ordered[-1],
+        'p50': percentile(50),
+        'p95': percentile(95),
+        'p99': percentile(99),
+    }
+
+
+def results_path(results_dir: str, model_name: str) -> str:
+    """Get the JSONL file that stores a model's per-sample results."""
+    safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in model_name)
+    return os.path.join(results_dir, f"{safe_name}.jsonl")
+
+
+def load_cached_results(path: str) -> Dict[str, dict]:
+    """
+    Load completed sample results from a results JSONL file.
+    
+    Failed predictions are not returned, so they are retried on the next run.
+    
+    Args:
+        path: Results JSONL file
+        
+    Returns:
+        Dictionary mapping sample keys to their latest successful result
+    """
+    cached: Dict[str, dict] = {}
+    if not os.path.exists(path):
+        return cached
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Line cut short by an interrupted run
+            if not record.get('failed'):
+                cached[record['key']] = record
+    return cached
+
+
+async def evaluate_model(
+    model_wrapper: ModelWrapper,
+    samples: List[dict],
+    max_samples: Optional[int] = None,
+    results_dir: str = "results",
+    concurrency: int = 8,
+    use_cache: bool = True,
+) -> dict:
+    """
+    Evaluate a model on a list of samples.
+    
+    Results are appended to a per-model JSONL file as they complete, and samples with a
+    cached result from an earlier run are not evaluated again. API models evaluate up to
+    `concurrency` samples at once; local models evaluate them one at a time.
+    
+    Args:
+        model_wrapper: ModelWrapper instance
+        samples: List of dicts with keys: image, bbox, instruction
+        max_samples: Maximum number of samples to evaluate (None for all)
+        results_dir: Directory for the per-model results JSONL files
+        concurrency: Maximum concurrent predictions for API models
+        use_cache: Reuse results from earlier runs
+        
+    Returns:
+        Dictionary with evaluation results
+    """
+    print(f"\nEvaluating model: {model_wrapper.model_name}")
+    
+    sample_list = list(samples)
+    if max_samples is not None:
+        sample_list = sample_list[:max_samples]
+    total_samples = len(sample_list)
+    keys = [sample_key(sample) for sample in sample_list]
+    
+    os.makedirs(results_dir, exist_ok=True)
+    path = results_path(results_dir, model_wrapper.model_name)
+    cached = load_cached_results(path) if use_cache else {}
+    pending = [i for i, key in enumerate(keys) if key not in cached]
+    print(f"  {total_samples - len(pending)} cached, {len(pending)} to evaluate")
+    
+    records: Dict[str, dict] = {key: cached[key] for key in keys if key in cached}
+    run_time = 0.0
+    
+    if pending:
+        # Load model
+        await model_wrapper.load_model()
+        
+        limit = 1 if is_local_model(model_wrapper.model) else max(1, concurrency)
+        semaphore = asyncio.Semaphore(limit)
+        progress = tqdm(total=len(pending), desc=f"Evaluating {model_wrapper.model_name}")
+        
+        with open(path, 'a', encoding='utf-8') as results_file:
+            async def evaluate_sample(i: int) -> None:
+                sample = sample_list[i]
+                bbox = list(sample['bbox'])  # [x1, y1, x2, y2]
+                async with semaphore:
+                    # Predict click coordinates with timing
+                    start_time = time.time()
+                    error = None
+                    try:
+                        click_coords = await model_wrapper.predict_click(sample['image'], sample['instruction'])
+                    except Exception as e:
+                        click_coords = None
+                        error = str(e)
+                    prediction_time = time.time() - start_time
+                
+                record = {
+                    'key': keys[i],
+                    'instruction': sample['instruction'],
+                    'bbox': bbox,
+                    'predicted_coords': list(click_coords) if click_coords is not None else None,
+                    'is_correct': is_click_in_bbox(click_coords, bbox),
+                    'failed': error is not None,
+                    'error': error,
+                    'prediction_time': prediction_time,
+                }
+                if 'img_filename' in sample:
+                    record['id'] = sample['img_filename']
+                records[keys[i]] = record
+                
+                # Stream each result so interrupted runs keep their progress
+                results_file.write(json.dumps(record) + "\n")
+                results_file.flush()
+                progress.update(1)
+            
+            run_start = time.time()
+            await asyncio.gather(*(evaluate_sample(i) for i in pending))
+            run_time = time.time() - run_start
+        progress.close()
+        
+        # Unload model
+        await model_wrapper.unload_model()
+    
+    results = [{**records[key], 'sample_idx': i} for i, key in enumerate(keys)]
+    
+    # Calculate metrics
+    correct_predictions = sum(1 for r in results if r['is_correct'])
+    error_predictions = sum(1 for r in results if r['failed'])
+    accuracy = correct_predictions / total_samples if total_samples > 0 else 0.0
+    error_rate = error_predictions / total_samples if total_samples > 0 else 0.0
+    
+    # Calculate timing statistics
+    latency = latency_stats([r['prediction_time'] for r in results if not r['failed']])
+    throughput = len(pending) / run_time if run_time > 0 else 0.0
+    
+    # Get VRAM statistics
+    vram_stats = model_wrapper.get_vram_stats()
+    
+    return {
+        'model_name': model_wrapper.model_name,
+        'total_samples': total_samples,
+        'correct_predictions': correct_predictions,
+        'failed_predictions': error_predictions,
+        'accuracy': accuracy,
+        'failure_rate': error_rate,
+        'avg_prediction_time': latency['avg'],
+        'median_prediction_time': latency['median'],
+        'min_prediction_time': latency['min'],
+        'max_prediction_time': latency['max'],
+        'p50_prediction_time': latency['p50'],
+        'p95_prediction_time': latency['p95'],
+        'p99_prediction_time': latency['p99'],
+        'throughput': throughput,
+        'vram_max_mb': vram_stats['max_mb'],
+        'vram_avg_mb': vram_stats['avg_mb'],
+        'results': results
+    }
+
+
+def print_result_summary(result: dict) -> None:
+    """Print the summary of one model's evaluation."""
+    print(f"\n{result['model_name']} Results:")
+    print(f"  Accuracy: {result['accuracy']*100:.2f}%")
+    print(f"  Correct: {result['correct_predictions']}/{result['total_samples']}")
+    print(f"  Errors: {result['failed_predictions']}")
+    print(f"  Error Rate: {result['failure_rate']*100:.2f}%")
+    print(f"  Avg Time: {result['avg_prediction_time']:.2f}s")
+    print(f"  Median Time: {result['median_prediction_time']:.2f}s")
+    print(f"  Latency p50/p95/p99: {result['p50_prediction_time']:.2f}s / {result['p95_prediction_time']:.2f}s / {result['p99_prediction_time']:.2f}s")
+    print(f"  Time Range: {result['min_prediction_time']:.2f}s - {result['max_prediction_time']:.2f}s")
+    print(f"  Throughput: {result['throughput']:.2f} samples/s")
+    print(f"  VRAM Max: {result['vram_max_mb']:.1f}MB")
+    print(f"  VRAM Avg: {result['vram_avg_mb']:.1f}MB")
+
+
 def save_results_to_markdown(all_results: List[dict],output_file: str = "screenspot_pro_results.md", title: str = "ScreenSpot-Pro Benchmark Results") -> None:
     """
     Save evaluation results to a markdown table.
@@ -235,8 +483,8 @@ def save_results_to_markdown(all_results: List[dict],output_file: str = "screens
         
         # Summary table
         f.write("## Summary\n\n")
-        f.write("| Model | Total Samples | Correct | Errors | Accuracy | Error Rate | Avg Time (s) | Median Time (s) | Time Range (s) | VRAM Max (GB) | VRAM Avg (GB) |\n")
-        f.write("|-------|---------------|---------|--------|----------|------------|--------------|-----------------|----------------|---------------|---------------|\n")
+        f.write("| Model | Total Samples | Correct | Errors | Accuracy | Error Rate | Avg Time (s) | Median Time (s) | p95 Time (s) | p99 Time (s) | Time Range (s) | Throughput (samples/s) | VRAM Max (GB) | VRAM Avg (GB) |\n")
+        f.write("|-------|---------------|---------|--------|----------|------------|--------------|-----------------|--------------|--------------|----------------|------------------------|---------------|---------------|\n")
         
         for result in all_results:
             model_name = result['model_name']
@@ -249,11 +497,14 @@ def save_results_to_markdown(all_results: List[dict],output_file: str = "screens
             median_time = result.get('median_prediction_time', 0.0)
             min_time = result.get('min_prediction_time', 0.0)
             max_time = result.get('max_prediction_time', 0.0)
+            p95_time = result.get('p95_prediction_time', 0.0)
+            p99_time = result.get('p99_prediction_time', 0.0)
             time_range = f"{min_time:.2f} - {max_time:.2f}"
+            throughput = result.get('throughput', 0.0)
             vram_max = result.get('vram_max_mb', 0.0) / 1024
             vram_avg = result.get('vram_avg_mb', 0.0) / 1024
             
-            f.write(f"| {model_name} | {total} | {correct} | {errors} | {accuracy:.2f}% | {error_rate:.2f}% | {avg_time:.2f} | {median_time:.2f} | {time_range} | {vram_max:.1f} | {vram_avg:.1f} |\n")
+            f.write(f"| {model_name} | {total} | {correct} | {errors} | {accuracy:.2f}% | {error_rate:.2f}% | {avg_time:.2f} | {median_time:.2f} | {p95_time:.2f} | {p99_time:.2f} | {time_range} | {throughput:.2f} | {vram_max:.1f} | {vram_avg:.1f} |\n")
         
         # Detailed results for each model
         for result in all_results:
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator
 
 class BaseAccessibilityHandler(ABC):
     """Abstract base class for OS-specific accessibility handlers."""
@@ -217,4 +217,62 @@ class BaseAutomationHandler(ABC):
     @abstractmethod
     async def run_command(self, command: str) -> Dict[str, Any]:
         """Run a command and return the output."""
-        pass
\ No newline at end of file
+        pass
+
+class BaseProcessHandler(ABC):
+    """Abstract base class for long-running process handlers.
+
+    Processes are started in the background and addressed by a process id.
+    Output is kept in a bounded ring buffer so it can be streamed live or
+    read later by clients that attach after the fact.
+    """
+
+    @abstractmethod
+    async def process_start(self, command: str, cwd: Optional[str] = None,
+                            env: Optional[Dict[str, str]] = None,
+                            timeout: Optional[float] = None,
+                            stdin: bool = False,
+                            buffer_size: Optional[int] = None) -> Dict[str, Any]:
+        """Start a shell command in the background and return its process id."""
+        pass
+
+    @abstractmethod
+    def process_stream(self, process_id: str, since: int = 0,
+                       heartbeat: float = 15.0) -> AsyncIterator[Dict[str, Any]]:
+        """Stream output events for a process until it exits."""
+        pass
+
+    @abstractmethod
+    async def process_read(self, process_id: str, since: int = 0, wait: float = 0.0) -> Dict[str, Any]:
+        """Read buffered output after a sequence number, optionally waiting for new output."""
+        pass
+
+    @abstractmethod
+    async def process_write(self, process_id: str, data: str, eof: bool = False) -> Dict[str, Any]:
+        """Write data to the stdin of a process."""
+        pass
+
+    @abstractmethod
+    async def process_signal(self, process_id: str, signal: str = "SIGTERM") -> Dict[str, Any]:
+        """Send a signal to a process."""
+        pass
+
+    @abstractmethod
+    async def process_kill(self, process_id: str) -> Dict[str, Any]:
+        """Forcefully kill a process."""
+        pass
+
+    @abstractmethod
+    async def process_wait(self, process_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait for a process to exit and return its exit code."""
+        pass
+
+    @abstractmethod
+    async def process_list(self) -> Dict[str, Any]:
+        """List known processes."""
+        pass
+
+    @abstractmethod
+    async def process_remove(self, process_id: str) -> Dict[str, Any]:
+        """Forget a finished process and release its output buffer."""
+        pass
@@ -1,7 +1,7 @@
 import platform
 import subprocess
 from typing import Tuple, Type
-from .base import BaseAccessibilityHandler, BaseAutomationHandler, BaseFileHandler
+from .base import BaseAccessibilityHandler, BaseAutomationHandler, BaseFileHandler, BaseProcessHandler
 from computer_server.diorama.base import BaseDioramaHandler
 
 # Conditionally import platform-specific handlers
@@ -14,7 +14,7 @@ elif system == 'linux':
 elif system == 'windows':
     from .windows import WindowsAccessibilityHandler, WindowsAutomationHandler
 
-from .generic import GenericFileHandler
+from .generic import GenericFileHandler, GenericProcessHandler
 
 class HandlerFactory:
     """Factory for creating OS-specific handlers."""
@@ -45,12 +45,12 @@ class HandlerFactory:
             raise RuntimeError(f"Failed to determine current OS: {str(e)}")
     
     @staticmethod
-    def create_handlers() -> Tuple[BaseAccessibilityHandler, BaseAutomationHandler, BaseDioramaHandler, BaseFileHandler]:
+    def create_handlers() -> Tuple[BaseAccessibilityHandler, BaseAutomationHandler, BaseDioramaHandler, BaseFileHandler, BaseProcessHandler]:
         """Create and return appropriate handlers for the current OS.
         
         Returns:
-            Tuple[BaseAccessibilityHandler, BaseAutomationHandler, BaseDioramaHandler, BaseFileHandler]: A tuple containing
-            the appropriate accessibility, automation, diorama, and file handlers for the current OS.
+            Tuple[BaseAccessibilityHandler, BaseAutomationHandler, BaseDioramaHandler, BaseFileHandler, BaseProcessHandler]: A tuple containing
+            the appropriate accessibility, automation, diorama, file, and process handlers for the current OS.
         
         Raises:
             NotImplementedError: If the current OS is not supported
@@ -59,10 +59,10 @@ class HandlerFactory:
         os_type = HandlerFactory._get_current_os()
         
         if os_type == 'darwin':
-            return MacOSAccessibilityHandler(), MacOSAutomationHandler(), MacOSDioramaHandler(), GenericFileHandler()
+            return MacOSAccessibilityHandler(), MacOSAutomationHandler(), MacOSDioramaHandler(), GenericFileHandler(), GenericProcessHandler()
         elif os_type == 'linux':
-            return LinuxAccessibilityHandler(), LinuxAutomationHandler(), BaseDioramaHandler(), GenericFileHandler()
+            return LinuxAccessibilityHandler(), LinuxAutomationHandler(), BaseDioramaHandler(), GenericFileHandler(), GenericProcessHandler()
         elif os_type == 'windows':
-            return WindowsAccessibilityHandler(), WindowsAutomationHandler(), BaseDioramaHandler(), GenericFileHandler()
+            return WindowsAccessibilityHandler(), WindowsAutomationHandler(), BaseDioramaHandler(), GenericFileHandler(), GenericProcessHandler()
         else:
             raise NotImplementedError(f"OS '{os_type}' is not supported")
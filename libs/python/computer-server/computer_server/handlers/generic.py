@@ -3,13 +3,22 @@ Generic handlers for all OSes.
 
 Includes:
 - FileHandler
+- ProcessHandler
 
 """
 
 from pathlib import Path
-from typing import Dict, Any, Optional
-from .base import BaseFileHandler
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
+from collections import deque
+from .base import BaseFileHandler, BaseProcessHandler
+import asyncio
 import base64
+import codecs
+import os
+import signal as signal_module
+import sys
+import time
+import uuid
 
 def resolve_path(path: str) -> Path:
     """Resolve a path to its absolute path. Expand ~ to the user's home directory."""
@@ -100,3 +109,302 @@ class GenericFileHandler(BaseFileHandler):
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
+
+
+class OutputRingBuffer:
+    """Bounded buffer of process output chunks addressed by sequence number.
+
+    Chunks are numbered from 0 in arrival order. When the total buffered size
+    exceeds ``max_bytes`` the oldest chunks are dropped; readers asking for a
+    sequence number that has already been dropped are told their view is truncated.
+    """
+
+    def __init__(self, max_bytes: int = 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._chunks: deque = deque()
+        self._size = 0
+        self.first_seq = 0
+        self.next_seq = 0
+        self.closed = False
+        self._cond = asyncio.Condition()
+
+    async def append(self, stream: str, data: str) -> None:
+        async with self._cond:
+            self._chunks.append((self.next_seq, stream, data))
+            self.next_seq += 1
+            self._size += len(data)
+            while self._size > self.max_bytes and len(self._chunks) > 1:
+                _, _, dropped = self._chunks.popleft()
+                self._size -= len(dropped)
+                self.first_seq += 1
+            self._cond.notify_all()
+
+    async def close(self) -> None:
+        async with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def read(self, since: int = 0) -> Tuple[List[Dict[str, Any]], bool]:
+        """Return chunks with ``seq >= since`` and whether older output was dropped."""
+        truncated = since < self.first_seq
+        start = max(since, self.first_seq) - self.first_seq
+        chunks = [
+            {"seq": seq, "stream": stream, "data": data}
+            for seq, stream, data in list(self._chunks)[start:]
+        ]
+        return chunks, truncated
+
+    async def wait(self, since: int, timeout: Optional[float]) -> bool:
+        """Wait until a chunk with ``seq >= since`` exists or the buffer is closed."""
+        async with self._cond:
+            try:
+                await asyncio.wait_for(
+                    self._cond.wait_for(lambda: self.next_seq > since or self.closed),
+                    timeout,
+                )
+                return True
+            except asyncio.TimeoutError:
+                return False
+
+
+class ManagedProcess:
+    """A background process tracked by :class:`GenericProcessHandler`."""
+
+    def __init__(self, process_id: str, command: str, process: asyncio.subprocess.Process,
+                 buffer: OutputRingBuffer, timeout: Optional[float] = None):
+        self.process_id = process_id
+        self.command = command
+        self.process = process
+        self.buffer = buffer
+        self.timeout = timeout
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.return_code: Optional[int] = None
+        self.timed_out = False
+        self.done = asyncio.Event()
+        self.tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return not self.done.is_set()
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "process_id": self.process_id,
+            "pid": self.process.pid,
+            "command": self.command,
+            "running": self.running,
+            "return_code": self.return_code,
+            "timed_out": self.timed_out,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class GenericProcessHandler(BaseProcessHandler):
+    """Runs shell commands in the background with streamed, bounded output."""
+
+    # Seconds between SIGTERM and SIGKILL when a process times out
+    KILL_GRACE_PERIOD = 5.0
+    # Default size of each process output buffer (characters)
+    DEFAULT_BUFFER_SIZE = 1024 * 1024
+    # Number of finished processes kept around for late readers
+    MAX_FINISHED_PROCESSES = 64
+
+    def __init__(self):
+        self.processes: Dict[str, ManagedProcess] = {}
+
+    def _get(self, process_id: str) -> ManagedProcess:
+        proc = self.processes.get(process_id)
+        if proc is None:
+            raise KeyError(f"Unknown process: {process_id}")
+        return proc
+
+    def _evict_finished(self) -> None:
+        finished = [p for p in self.processes.values() if not p.running]
+        excess = len(finished) - self.MAX_FINISHED_PROCESSES
+        if excess > 0:
+            finished.sort(key=lambda p: p.finished_at or 0)
+            for proc in finished[:excess]:
+                self.processes.pop(proc.process_id, None)
+
+    def _send_signal(self, proc: ManagedProcess, sig: int) -> None:
+        if proc.process.returncode is not None:
+            return
+        if sys.platform != "win32":
+            # Processes are started in their own session so the whole group is signalled
+            try:
+                os.killpg(proc.process.pid, sig)
+                return
+            except ProcessLookupError:
+                return
+            except Exception:
+                pass
+        proc.process.send_signal(sig)
+
+    async def _pump(self, proc: ManagedProcess, reader: asyncio.StreamReader, stream: str) -> None:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            data = await reader.read(4096)
+            if not data:
+                tail = decoder.decode(b"", final=True)
+                if tail:
+                    await proc.buffer.append(stream, tail)
+                return
+            text = decoder.decode(data)
+            if text:
+                await proc.buffer.append(stream, text)
+
+    async def _supervise(self, proc: ManagedProcess, pumps: List[asyncio.Task]) -> None:
+        try:
+            if proc.timeout is not None:
+                try:
+                    await asyncio.wait_for(proc.process.wait(), proc.timeout)
+                except asyncio.TimeoutError:
+                    proc.timed_out = True
+                    self._send_signal(proc, signal_module.SIGTERM)
+                    try:
+                        await asyncio.wait_for(proc.process.wait(), self.KILL_GRACE_PERIOD)
+                    except asyncio.TimeoutError:
+                        self._send_signal(proc, getattr(signal_module, "SIGKILL", signal_module.SIGTERM))
+            await proc.process.wait()
+            await asyncio.gather(*pumps, return_exceptions=True)
+        finally:
+            proc.return_code = proc.process.returncode
+            proc.finished_at = time.time()
+            proc.done.set()
+            await proc.buffer.close()
+            self._evict_finished()
+
+    async def process_start(self, command: str, cwd: Optional[str] = None,
+                            env: Optional[Dict[str, str]] = None,
+                            timeout: Optional[float] = None,
+                            stdin: bool = False,
+                            buffer_size: Optional[int] = None) -> Dict[str, Any]:
+        try:
+            process_env = None
+            if env:
+                process_env = os.environ.copy()
+                process_env.update(env)
+            kwargs: Dict[str, Any] = {}
+            if sys.platform != "win32":
+                kwargs["start_new_session"] = True
+            process = await asyncio.create_subprocess_shell(
+                command,
+                stdin=asyncio.subprocess.PIPE if stdin else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=str(resolve_path(cwd)) if cwd else None,
+                env=process_env,
+                **kwargs,
+            )
+            proc = ManagedProcess(
+                process_id=uuid.uuid4().hex,
+                command=command,
+                process=process,
+                buffer=OutputRingBuffer(buffer_size or self.DEFAULT_BUFFER_SIZE),
+                timeout=timeout,
+            )
+            pumps = [
+                asyncio.create_task(self._pump(proc, process.stdout, "stdout")),
+                asyncio.create_task(self._pump(proc, process.stderr, "stderr")),
+            ]
+            proc.tasks = pumps + [asyncio.create_task(self._supervise(proc, pumps))]
+            self.processes[proc.process_id] = proc
+            return {"success": True, "process_id": proc.process_id, "pid": process.pid}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def process_stream(self, process_id: str, since: int = 0,
+                             heartbeat: float = 15.0) -> AsyncIterator[Dict[str, Any]]:
+        proc = self._get(process_id)
+        cursor = since
+        while True:
+            chunks, truncated = proc.buffer.read(cursor)
+            if truncated:
+                yield {"event": "truncated", "first_seq": proc.buffer.first_seq}
+            for chunk in chunks:
+                yield {"event": "output", **chunk}
+            cursor = max(cursor, proc.buffer.next_seq)
+            if proc.buffer.closed and cursor >= proc.buffer.next_seq:
+                yield {"event": "exit", "return_code": proc.return_code, "timed_out": proc.timed_out}
+                return
+            # Heartbeats keep idle streams alive through client receive timeouts
+            if not await proc.buffer.wait(cursor, heartbeat):
+                yield {"event": "heartbeat", "running": proc.running}
+
+    async def process_read(self, process_id: str, since: int = 0, wait: float = 0.0) -> Dict[str, Any]:
+        try:
+            proc = self._get(process_id)
+            if wait > 0 and since >= proc.buffer.next_seq and not proc.buffer.closed:
+                await proc.buffer.wait(since, wait)
+            chunks, truncated = proc.buffer.read(since)
+            return {
+                "success": True,
+                "chunks": chunks,
+                "next_seq": proc.buffer.next_seq,
+                "truncated": truncated,
+                "running": proc.running,
+                "return_code": proc.return_code,
+                "timed_out": proc.timed_out,
+            }
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def process_write(self, process_id: str, data: str, eof: bool = False) -> Dict[str, Any]:
+        try:
+            proc = self._get(process_id)
+            writer = proc.process.stdin
+            if writer is None:
+                raise RuntimeError("Process was started without stdin; pass stdin=True to process_start")
+            if data:
+                writer.write(data.encode("utf-8"))
+                await writer.drain()
+            if eof:
+                writer.close()
+            return {"success": True}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def process_signal(self, process_id: str, signal: str = "SIGTERM") -> Dict[str, Any]:
+        try:
+            proc = self._get(process_id)
+            sig = getattr(signal_module, signal.upper(), None)
+            if sig is None:
+                raise ValueError(f"Unknown signal: {signal}")
+            self._send_signal(proc, sig)
+            return {"success": True}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def process_kill(self, process_id: str) -> Dict[str, Any]:
+        try:
+            proc = self._get(process_id)
+            self._send_signal(proc, getattr(signal_module, "SIGKILL", signal_module.SIGTERM))
+            return {"success": True}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def process_wait(self, process_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        try:
+            proc = self._get(process_id)
+            try:
+                await asyncio.wait_for(proc.done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            return {"success": True, **proc.info()}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def process_list(self) -> Dict[str, Any]:
+        return {"success": True, "processes": [p.info() for p in self.processes.values()]}
+
+    async def process_remove(self, process_id: str) -> Dict[str, Any]:
+        try:
+            proc = self._get(process_id)
+            if proc.running:
+                raise RuntimeError("Process is still running; kill it before removing")
+            del self.processes[process_id]
+            return {"success": True}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
@@ -1,5 +1,5 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, HTTPException, Header
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, JSONResponse, PlainTextResponse
 from typing import List, Dict, Any, Optional
 import uvicorn
 import logging
@@ -10,6 +10,7 @@ import inspect
 from contextlib import redirect_stdout, redirect_stderr
 from io import StringIO
 from .handlers.factory import HandlerFactory
+from .metrics import CommandTimer, metrics
 import os
 import aiohttp
 import hashlib
@@ -42,7 +43,7 @@ except Exception:
     except Exception:
         package_version = "unknown"
 
-accessibility_handler, automation_handler, diorama_handler, file_handler = HandlerFactory.create_handlers()
+accessibility_handler, automation_handler, diorama_handler, file_handler, process_handler = HandlerFactory.create_handlers()
 handlers = {
     "version": lambda: {"protocol": protocol_version, "package": package_version},
     # App-Use commands
@@ -52,6 +53,16 @@ handlers = {
     "find_element": accessibility_handler.find_element,
     # Shell commands
     "run_command": automation_handler.run_command,
+    # Process commands (background processes with streamed output)
+    "process_start": process_handler.process_start,
+    "process_stream": process_handler.process_stream,
+    "process_read": process_handler.process_read,
+    "process_write": process_handler.process_write,
+    "process_signal": process_handler.process_signal,
+    "process_kill": process_handler.process_kill,
+    "process_wait": process_handler.process_wait,
+    "process_list": process_handler.process_list,
+    "process_remove": process_handler.process_remove,
     # File system commands
     "file_exists": file_handler.file_exists,
     "directory_exists": file_handler.directory_exists,
@@ -93,6 +104,105 @@ handlers = {
 }
 
 
+class CommandSpec:
+    """A handler with its signature introspected once at startup."""
+
+    __slots__ = ("func", "params", "is_async", "is_stream")
+
+    def __init__(self, func):
+        self.func = func
+        self.params = frozenset(inspect.signature(func).parameters)
+        self.is_async = asyncio.iscoroutinefunction(func)
+        self.is_stream = inspect.isasyncgenfunction(func)
+
+    def filter_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only the params accepted by the handler function."""
+        return {k: v for k, v in params.items() if k in self.params}
+
+
+def build_dispatch_table(handler_map: Dict[str, Any]) -> Dict[str, CommandSpec]:
+    return {name: CommandSpec(func) for name, func in handler_map.items()}
+
+
+async def call_handler(spec: CommandSpec, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Call a non-streaming handler with only the params it accepts."""
+    filtered_params = spec.filter_params(params)
+
+    # Handle both sync and async functions
+    if spec.is_async:
+        return await spec.func(**filtered_params)
+    # Run sync functions in thread pool to avoid blocking event loop
+    return await asyncio.to_thread(spec.func, **filtered_params)
+
+
+async def run_batch(
+    actions: List[Dict[str, Any]],
+    delay: float = 0.0,
+    stop_on_error: bool = True,
+    screenshot: bool = False,
+) -> Dict[str, Any]:
+    """Run an ordered list of commands server-side in a single round trip.
+
+    Args:
+        actions: Steps of the form {"command": str, "params": dict, "delay": float}.
+            The pseudo-command "wait" sleeps for params["seconds"].
+        delay: Default delay in seconds after each step, overridden by a step's own "delay"
+        stop_on_error: Stop at the first failing step; remaining steps are reported as skipped
+        screenshot: Take a screenshot after the last executed step and include it as image_data
+    """
+    results: List[Dict[str, Any]] = []
+    failed = False
+
+    for index, action in enumerate(actions):
+        command = action.get("command")
+        params = action.get("params") or {}
+
+        if failed and stop_on_error:
+            results.append({"index": index, "command": command, "success": False, "skipped": True})
+            continue
+
+        start = time.perf_counter()
+        try:
+            if command == "wait":
+                await asyncio.sleep(float(params.get("seconds", 0)))
+                result = {"success": True}
+            elif command in dispatch_table and command != "batch" and not dispatch_table[command].is_stream:
+                result = await call_handler(dispatch_table[command], params)
+            else:
+                result = {"success": False, "error": f"Command not allowed in batch: {command}"}
+        except Exception as step_error:
+            logger.error(f"Error executing batch step {index} ({command}): {str(step_error)}")
+            result = {"success": False, "error": str(step_error)}
+
+        step = {"success": True, **(result or {})}
+        step.update({"index": index, "command": command, "duration": time.perf_counter() - start})
+        results.append(step)
+
+        if not step["success"]:
+            failed = True
+            if stop_on_error:
+                continue
+
+        step_delay = action.get("delay", delay)
+        if step_delay and index < len(actions) - 1:
+            await asyncio.sleep(step_delay)
+
+    response: Dict[str, Any] = {"success": not failed, "results": results}
+    if failed:
+        first_error = next(r for r in results if not r["success"] and not r.get("skipped"))
+        response["error"] = f"Batch step {first_error['index']} ({first_error['command']}) failed: {first_error.get('error')}"
+    if screenshot:
+        shot = await automation_handler.screenshot()
+        response["image_data"] = shot.get("image_data")
+    return response
+
+
+handlers["batch"] = run_batch
+
+# Precompute handler signatures so requests don't pay for inspect.signature
+dispatch_table = build_dispatch_table(handlers)
+
+
 class AuthenticationManager:
     def __init__(self):
         self.sessions: Dict[str, Dict[str, Any]] = {}
@@ -189,9 +299,11 @@ class ConnectionManager:
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
         self.active_connections.append(websocket)
+        metrics.connection_opened()
 
     def disconnect(self, websocket: WebSocket):
         self.active_connections.remove(websocket)
+        metrics.connection_closed()
 
 
 manager = ConnectionManager()
@@ -200,8 +312,6 @@ auth_manager = AuthenticationManager()
 
 @app.websocket("/ws", name="websocket_endpoint")
 async def websocket_endpoint(websocket: WebSocket):
-    global handlers
-
     # WebSocket message size is configured at the app or endpoint level, not on the instance
     await manager.connect(websocket)
     
@@ -250,7 +360,10 @@ async def websocket_endpoint(websocket: WebSocket):
                 return
             
             # Use AuthenticationManager for validation
-            is_authenticated = await auth_manager.auth(client_container_name, client_api_key)
+            with metrics.track(CommandTimer("authenticate", "ws")) as timer:
+                is_authenticated = await auth_manager.auth(client_container_name, client_api_key)
+                timer.phase("auth")
+                timer.success = is_authenticated
             if not is_authenticated:
                 await websocket.send_json({
                     "success": False,
@@ -280,32 +393,49 @@ async def websocket_endpoint(websocket: WebSocket):
         while True:
             try:
                 data = await websocket.receive_json()
+                received_at = time.perf_counter()
                 command = data.get("command")
                 params = data.get("params", {})
 
-                if command not in handlers:
+                spec = dispatch_table.get(command)
+                if spec is None:
                     await websocket.send_json(
                         {"success": False, "error": f"Unknown command: {command}"}
                     )
                     continue
 
-                try:
-                    # Filter params to only include those accepted by the handler function
-                    handler_func = handlers[command]
-                    sig = inspect.signature(handler_func)
-                    filtered_params = {k: v for k, v in params.items() if k in sig.parameters}
-                    
-                    # Handle both sync and async functions
-                    if asyncio.iscoroutinefunction(handler_func):
-                        result = await handler_func(**filtered_params)
-                    else:
-                        # Run sync functions in thread pool to avoid blocking event loop
-                        result = await asyncio.to_thread(handler_func, **filtered_params)
-                    await websocket.send_json({"success": True, **result})
-                except Exception as cmd_error:
-                    logger.error(f"Error executing command {command}: {str(cmd_error)}")
-                    logger.error(traceback.format_exc())
-                    await websocket.send_json({"success": False, "error": str(cmd_error)})
+                with metrics.track(CommandTimer(command, "ws", received_at)) as timer:
+                    try:
+                        # Streaming commands send one message per event, then a "done" message
+                        if spec.is_stream:
+                            filtered_params = spec.filter_params(params)
+                            timer.phase("queue")
+                            async for event in spec.func(**filtered_params):
+                                timer.phase("execute")
+                                message = json.dumps({"success": True, **event})
+                                timer.phase("encode")
+                                timer.add_bytes(len(message))
+                                await websocket.send_text(message)
+                                timer.skip()
+                            await websocket.send_json({"success": True, "event": "done"})
+                            continue
+
+                        timer.phase("queue")
+                        result = await call_handler(spec, params)
+                        timer.phase("execute")
+                        timer.success = result.get("success", True) is not False
+                        message = json.dumps({"success": True, **result})
+                        timer.phase("encode")
+                        timer.add_bytes(len(message))
+                        await websocket.send_text(message)
+                    except Exception as cmd_error:
+                        timer.success = False
+                        logger.error(f"Error executing command {command}: {str(cmd_error)}")
+                        logger.error(traceback.format_exc())
+                        error_data = {"success": False, "error": str(cmd_error)}
+                        if spec.is_stream:
+                            error_data["event"] = "done"
+                        await websocket.send_json(error_data)
 
             except WebSocketDisconnect:
                 raise
@@ -332,6 +462,28 @@ async def websocket_endpoint(websocket: WebSocket):
         manager.disconnect(websocket)
 
 
+async def authenticate_rest(container_name: Optional[str], api_key: Optional[str]) -> None:
+    """Authenticate a REST request from its headers, raising HTTPException on failure."""
+    # Check if CONTAINER_NAME is set (indicating cloud provider)
+    server_container_name = os.environ.get("CONTAINER_NAME")
+    
+    # If cloud provider, perform authentication
+    if server_container_name:
+        logger.info(f"Cloud provider detected. CONTAINER_NAME: {server_container_name}. Performing authentication...")
+        
+        # Validate required headers
+        if not container_name:
+            raise HTTPException(status_code=401, detail="Container name required")
+        
+        if not api_key:
+            raise HTTPException(status_code=401, detail="API key required")
+        
+        # Validate with AuthenticationManager
+        is_authenticated = await auth_manager.auth(container_name, api_key)
+        if not is_authenticated:
+            raise HTTPException(status_code=401, detail="Authentication failed")
+
+
 @app.post("/cmd")
 async def cmd_endpoint(
     request: Request,
@@ -352,7 +504,7 @@ async def cmd_endpoint(
         "params": {...}
     }
     """
-    global handlers
+    received_at = time.perf_counter()
     
     # Parse request body
     try:
@@ -365,54 +517,55 @@ async def cmd_endpoint(
     if not command:
         raise HTTPException(status_code=400, detail="Command is required")
     
-    # Check if CONTAINER_NAME is set (indicating cloud provider)
-    server_container_name = os.environ.get("CONTAINER_NAME")
-    
-    # If cloud provider, perform authentication
-    if server_container_name:
-        logger.info(f"Cloud provider detected. CONTAINER_NAME: {server_container_name}. Performing authentication...")
-        
-        # Validate required headers
-        if not container_name:
-            raise HTTPException(status_code=401, detail="Container name required")
-        
-        if not api_key:
-            raise HTTPException(status_code=401, detail="API key required")
-        
-        # Validate with AuthenticationManager
-        is_authenticated = await auth_manager.auth(container_name, api_key)
-        if not is_authenticated:
-            raise HTTPException(status_code=401, detail="Authentication failed")
+    timer = CommandTimer(command, "rest", received_at)
+    timer.phase("queue")
+    await authenticate_rest(container_name, api_key)
+    timer.phase("auth")
     
-    if command not in handlers:
+    spec = dispatch_table.get(command)
+    if spec is None:
         raise HTTPException(status_code=400, detail=f"Unknown command: {command}")
     
     async def generate_response():
         """Generate streaming response for the command execution"""
-        try:
-            # Filter params to only include those accepted by the handler function
-            handler_func = handlers[command]
-            sig = inspect.signature(handler_func)
-            filtered_params = {k: v for k, v in params.items() if k in sig.parameters}
-            
-            # Handle both sync and async functions
-            if asyncio.iscoroutinefunction(handler_func):
-                result = await handler_func(**filtered_params)
-            else:
-                # Run sync functions in thread pool to avoid blocking event loop
-                result = await asyncio.to_thread(handler_func, **filtered_params)
-            
-            # Stream the successful result
-            response_data = {"success": True, **result}
-            yield f"data: {json.dumps(response_data)}\n\n"
-            
-        except Exception as cmd_error:
-            logger.error(f"Error executing command {command}: {str(cmd_error)}")
-            logger.error(traceback.format_exc())
-            
-            # Stream the error result
-            error_data = {"success": False, "error": str(cmd_error)}
-            yield f"data: {json.dumps(error_data)}\n\n"
+        with metrics.track(timer):
+            try:
+                # Streaming commands yield one event per chunk, then a "done" event
+                if spec.is_stream:
+                    filtered_params = spec.filter_params(params)
+                    timer.phase("queue")
+                    async for event in spec.func(**filtered_params):
+                        timer.phase("execute")
+                        message = f"data: {json.dumps({'success': True, **event})}\n\n"
+                        timer.phase("encode")
+                        timer.add_bytes(len(message))
+                        yield message
+                        timer.skip()
+                    yield f"data: {json.dumps({'success': True, 'event': 'done'})}\n\n"
+                    return
+                
+                timer.phase("queue")
+                result = await call_handler(spec, params)
+                timer.phase("execute")
+                timer.success = result.get("success", True) is not False
+                
+                # Stream the successful result
+                response_data = {"success": True, **result}
+                message = f"data: {json.dumps(response_data)}\n\n"
+                timer.phase("encode")
+                timer.add_bytes(len(message))
+                yield message
+                
+            except Exception as cmd_error:
+                timer.success = False
+                logger.error(f"Error executing command {command}: {str(cmd_error)}")
+                logger.error(traceback.format_exc())
+                
+                # Stream the error result
+                error_data = {"success": False, "error": str(cmd_error)}
+                if spec.is_stream:
+                    error_data["event"] = "done"
+                yield f"data: {json.dumps(error_data)}\n\n"
     
     return StreamingResponse(
         generate_response(),
@@ -427,5 +580,23 @@ async def cmd_endpoint(
     )
 
 
+@app.get("/metrics")
+async def metrics_endpoint(
+    format: str = "prometheus",
+    container_name: Optional[str] = Header(None, alias="X-Container-Name"),
+    api_key: Optional[str] = Header(None, alias="X-API-Key")
+):
+    """
+    Per-command latency, response size and concurrency metrics.
+    
+    Query parameters:
+    - format: "prometheus" (default) for the Prometheus text format, or "json" for a JSON snapshot
+    """
+    await authenticate_rest(container_name, api_key)
+    if format == "json":
+        return JSONResponse(metrics.snapshot())
+    return PlainTextResponse(metrics.prometheus(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
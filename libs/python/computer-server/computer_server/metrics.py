@@ -0,0 +1,246 @@
+"""
+Per-command latency and size metrics for the Computer API server.
+
+Every command is timed in four phases:
+- queue: from receipt of the request until the handler is invoked (parsing, lookup, param filtering)
+- auth: per-request authentication (REST only; WebSocket auth is recorded once per connection)
+- execute: the handler call itself
+- encode: serializing the response to JSON
+
+Metrics are kept in fixed-bucket histograms so recording is O(1) and memory stays constant.
+They are exposed in Prometheus text format and as a JSON snapshot.
+"""
+
+import bisect
+import math
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+PHASES = ("queue", "auth", "execute", "encode")
+
+# Latency buckets in seconds
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+# Response size buckets in bytes
+SIZE_BUCKETS: Tuple[float, ...] = (
+    256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus semantics."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation within the matching bucket."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                fraction = (rank - cumulative) / bucket_count
+                return min(lower + (upper - lower) * fraction, self.max)
+            cumulative += bucket_count
+        return self.max
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        result = []
+        running = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            running += bucket_count
+            result.append((_format_number(bound), running))
+        result.append(("+Inf", self.count))
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "max": self.max if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class CommandStats:
+    """Histograms and counters for a single command."""
+
+    def __init__(self):
+        self.phases = {phase: Histogram(LATENCY_BUCKETS) for phase in PHASES}
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+        self.count = 0
+        self.errors = 0
+
+
+class CommandTimer:
+    """Collects phase timings for one command invocation."""
+
+    __slots__ = ("command", "transport", "received_at", "_mark", "durations", "response_bytes", "success")
+
+    def __init__(self, command: str, transport: str, received_at: Optional[float] = None):
+        self.command = command
+        self.transport = transport
+        self.received_at = received_at if received_at is not None else time.perf_counter()
+        self._mark = self.received_at
+        self.durations: Dict[str, float] = {}
+        self.response_bytes = 0
+        self.success = True
+
+    def phase(self, name: str) -> None:
+        """End the current phase, attributing the time since the previous mark to ``name``."""
+        now = time.perf_counter()
+        self.durations[name] = self.durations.get(name, 0.0) + (now - self._mark)
+        self._mark = now
+
+    def skip(self) -> None:
+        """Discard the time since the previous mark (e.g. time spent sending)."""
+        self._mark = time.perf_counter()
+
+    def add_bytes(self, size: int) -> None:
+        self.response_bytes += size
+
+
+class MetricsRegistry:
+    """Process-wide registry of command metrics and concurrency gauges."""
+
+    def __init__(self):
+        self.commands: Dict[Tuple[str, str], CommandStats] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections = 0
+        self.started_at = time.time()
+
+    def _stats(self, command: str, transport: str) -> CommandStats:
+        key = (command, transport)
+        stats = self.commands.get(key)
+        if stats is None:
+            stats = self.commands[key] = CommandStats()
+        return stats
+
+    @contextmanager
+    def track(self, timer: CommandTimer) -> Iterator[CommandTimer]:
+        """Track one command invocation; its phases are recorded when the block exits."""
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            yield timer
+        except BaseException:
+            timer.success = False
+            raise
+        finally:
+            self.in_flight -= 1
+            self.record(timer)
+
+    def record(self, timer: CommandTimer) -> None:
+        stats = self._stats(timer.command, timer.transport)
+        for phase in PHASES:
+            if phase in timer.durations:
+                stats.phases[phase].observe(timer.durations[phase])
+        stats.response_bytes.observe(timer.response_bytes)
+        stats.count += 1
+        if not timer.success:
+            stats.errors += 1
+
+    def connection_opened(self) -> None:
+        self.connections += 1
+
+    def connection_closed(self) -> None:
+        self.connections = max(0, self.connections - 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all metrics as a JSON-serializable dict."""
+        commands: Dict[str, Any] = {}
+        for (command, transport), stats in sorted(self.commands.items()):
+            commands.setdefault(command, {})[transport] = {
+                "count": stats.count,
+                "errors": stats.errors,
+                "phases": {phase: hist.snapshot() for phase, hist in stats.phases.items() if hist.count},
+                "response_bytes": stats.response_bytes.snapshot(),
+            }
+        return {
+            "uptime_seconds": time.time() - self.started_at,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "websocket_connections": self.connections,
+            "commands": commands,
+        }
+
+    def prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP computer_server_command_phase_seconds Command latency by phase.",
+            "# TYPE computer_server_command_phase_seconds histogram",
+        ]
+        for (command, transport), stats in sorted(self.commands.items()):
+            for phase, hist in stats.phases.items():
+                if not hist.count:
+                    continue
+                labels = f'command="{command}",transport="{transport}",phase="{phase}"'
+                lines.extend(_histogram_lines("computer_server_command_phase_seconds", labels, hist))
+
+        lines += [
+            "# HELP computer_server_response_bytes Size of command responses in bytes.",
+            "# TYPE computer_server_response_bytes histogram",
+        ]
+        for (command, transport), stats in sorted(self.commands.items()):
+            labels = f'command="{command}",transport="{transport}"'
+            lines.extend(_histogram_lines("computer_server_response_bytes", labels, stats.response_bytes))
+
+        lines += [
+            "# HELP computer_server_command_errors_total Commands that raised or returned success=false.",
+            "# TYPE computer_server_command_errors_total counter",
+        ]
+        for (command, transport), stats in sorted(self.commands.items()):
+            lines.append(
+                f'computer_server_command_errors_total{{command="{command}",transport="{transport}"}} {stats.errors}'
+            )
+
+        lines += [
+            "# HELP computer_server_in_flight Commands currently executing.",
+            "# TYPE computer_server_in_flight gauge",
+            f"computer_server_in_flight {self.in_flight}",
+            "# HELP computer_server_max_in_flight Highest number of concurrently executing commands.",
+            "# TYPE computer_server_max_in_flight gauge",
+            f"computer_server_max_in_flight {self.max_in_flight}",
+            "# HELP computer_server_websocket_connections Open WebSocket connections.",
+            "# TYPE computer_server_websocket_connections gauge",
+            f"computer_server_websocket_connections {self.connections}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _format_number(value: float) -> str:
+    if math.isfinite(value) and value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _histogram_lines(name: str, labels: str, hist: Histogram) -> List[str]:
+    lines = [f'{name}_bucket{{{labels},le="{bound}"}} {count}' for bound, count in hist.cumulative()]
+    lines.append(f"{name}_sum{{{labels}}} {hist.sum}")
+    lines.append(f"{name}_count{{{labels}}} {hist.count}")
+    return lines
+
+
+metrics = MetricsRegistry()
@@ -1,7 +1,9 @@
-from typing import Optional, List, Literal, Dict, Any, Union, TYPE_CHECKING, cast
+from typing import Optional, List, Literal, Dict, Any, Union, Callable, TYPE_CHECKING, cast
 import asyncio
 from .models import Computer as ComputerConfig, Display
 from .interface.factory import InterfaceFactory
+from .interface.models import CommandResult, ProcessOutput
+from .venv_worker import VenvWorker, function_source
 import time
 from PIL import Image
 import io
@@ -25,6 +27,9 @@ SYSTEM_INFO = {
 from .providers.base import VMProviderType
 from .providers.factory import VMProviderFactory
 
+if TYPE_CHECKING:
+    from .providers.docker import DockerContainerPool
+
 OSType = Literal["macos", "linux", "windows"]
 
 class Computer:
@@ -63,7 +68,8 @@ class Computer:
         storage: Optional[str] = None,
         ephemeral: bool = False,
         api_key: Optional[str] = None,
-        experiments: Optional[List[str]] = None
+        experiments: Optional[List[str]] = None,
+        container_pool: Optional["DockerContainerPool"] = None,
     ):
         """Initialize a new Computer instance.
 
@@ -91,6 +97,8 @@ class Computer:
             ephemeral: Whether to use ephemeral storage
             api_key: Optional API key for cloud providers
             experiments: Optional list of experimental features to enable (e.g. ["app-use"])
+            container_pool: Optional warm container pool (Docker provider). The computer
+                leases a container from the pool on run() and returns it on stop() or disconnect()
         """
 
         self.logger = Logger("computer", verbosity)
@@ -114,6 +122,7 @@ class Computer:
         
         self.api_key = api_key
         self.experiments = experiments or []
+        self.container_pool = container_pool
         
         if "app-use" in self.experiments:
             assert self.os_type == "macos", "App use experiment is only supported on macOS"
@@ -199,6 +208,9 @@ class Computer:
         self._interface = None
         self.use_host_computer_server = use_host_computer_server
 
+        # Persistent Python workers used by venv_exec, keyed by virtual environment name
+        self._venv_workers: Dict[str, VenvWorker] = {}
+
         # Record initialization in telemetry (if enabled)
         if telemetry_enabled and is_telemetry_enabled():
             record_event("computer_initialized", SYSTEM_INFO)
@@ -331,6 +343,7 @@ class Computer:
                                     verbose=verbose,
                                     ephemeral=ephemeral,
                                     noVNC_port=noVNC_port,
+                                    pool=self.container_pool,
                                 )
                             else:
                                 raise ValueError(f"Unsupported provider type: {self.provider_type}")
@@ -482,6 +495,10 @@ class Computer:
                     ),
                 )
 
+            # Pooled containers publish computer-server on a port chosen by Docker
+            if self.config.vm_provider is not None and not self.use_host_computer_server:
+                self._interface.api_port = self.config.vm_provider.get_api_port(self.config.name)
+
             # Wait for the WebSocket interface to be ready
             self.logger.info("Connecting to WebSocket interface...")
 
@@ -523,8 +540,13 @@ class Computer:
     
     async def disconnect(self) -> None:
         """Disconnect from the computer's WebSocket interface."""
+        await self._stop_venv_workers()
         if self._interface:
             self._interface.close()
+        # A pooled container goes back to the pool rather than being left running
+        if self.container_pool is not None and self._provider_context and self.config.vm_provider is not None:
+            await self.config.vm_provider.stop_vm(name=self.config.name)
+            self._initialized = False
 
     async def stop(self) -> None:
         """Disconnect from the computer's WebSocket interface and stop the computer."""
@@ -533,6 +555,9 @@ class Computer:
         try:
             self.logger.info("Stopping Computer...")
 
+            # Stop venv workers while the computer-server is still reachable
+            await self._stop_venv_workers()
+
             # In VM mode, first explicitly stop the VM, then exit the provider context
             if not self.use_host_computer_server and self._provider_context and self.config.vm_provider is not None:
                 try:
@@ -806,14 +831,28 @@ class Computer:
         # Install packages
         requirements_str = " ".join(requirements)
         install_cmd = f". {venv_path}/bin/activate && pip install {requirements_str}"
-        return await self.interface.run_command(install_cmd)
+        result = await self.interface.run_command(install_cmd)
+
+        # Restart the worker on next use so it doesn't keep stale modules imported
+        worker = self._venv_workers.pop(venv_name, None)
+        if worker:
+            await worker.stop()
+        return result
     
-    async def venv_cmd(self, venv_name: str, command: str):
+    async def venv_cmd(
+        self,
+        venv_name: str,
+        command: str,
+        timeout: Optional[float] = None,
+        on_output: Optional[Callable[[ProcessOutput], Any]] = None,
+    ):
         """Execute a shell command in a virtual environment.
         
         Args:
             venv_name: Name of the virtual environment
             command: Shell command to execute in the virtual environment
+            timeout: Optional seconds after which the command is terminated
+            on_output: Optional callback invoked with each ProcessOutput chunk as it is produced
             
         Returns:
             Tuple of (stdout, stderr) from the command execution
@@ -829,11 +868,49 @@ class Computer:
         
         # Activate virtual environment and run command
         full_command = f". {venv_path}/bin/activate && {command}"
-        return await self.interface.run_command(full_command)
+        if timeout is None and on_output is None:
+            return await self.interface.run_command(full_command)
+
+        # Stream through a background process so long commands neither time out nor buffer everything
+        process = await self.interface.start_process(full_command, timeout=timeout)
+        stdout, stderr = [], []
+        async for chunk in process.stream():
+            (stdout if chunk.stream == "stdout" else stderr).append(chunk.data)
+            if on_output is not None:
+                callback_result = on_output(chunk)
+                if asyncio.iscoroutine(callback_result):
+                    await callback_result
+        returncode = process.returncode if process.returncode is not None else await process.wait()
+        return CommandResult(stdout="".join(stdout), stderr="".join(stderr), returncode=returncode)
     
+    async def _get_venv_worker(self, venv_name: str) -> Optional[VenvWorker]:
+        """Get a running persistent worker for a virtual environment, starting it on first use.
+
+        Returns None if the worker cannot be started, e.g. on servers without the process API.
+        """
+        worker = self._venv_workers.get(venv_name)
+        if worker is None:
+            worker = self._venv_workers[venv_name] = VenvWorker(self.interface, venv_name, self.logger)
+        try:
+            await worker.start()
+            return worker
+        except Exception as e:
+            self.logger.warning(f"Could not start venv worker for '{venv_name}', running a one-off script instead: {e}")
+            self._venv_workers.pop(venv_name, None)
+            return None
+
+    async def _stop_venv_workers(self) -> None:
+        workers, self._venv_workers = list(self._venv_workers.values()), {}
+        for worker in workers:
+            await worker.stop()
+
     async def venv_exec(self, venv_name: str, python_func, *args, **kwargs):
         """Execute Python function in a virtual environment using source code extraction.
         
+        Calls run in a persistent worker process inside the virtual environment, which
+        is started on first use and keeps defined functions and imported modules warm.
+        If the worker is unavailable, the function runs in a fresh interpreter instead.
+        
         Args:
             venv_name: Name of the virtual environment
             python_func: A callable function to execute
@@ -843,32 +920,31 @@ class Computer:
         Returns:
             The result of the function execution, or raises any exception that occurred
         """
+        worker = await self._get_venv_worker(venv_name)
+        if worker is not None:
+            output_payload = await worker.call(python_func, *args, **kwargs)
+        else:
+            output_payload = await self._venv_exec_script(venv_name, python_func, *args, **kwargs)
+
+        if output_payload["success"]:
+            return output_payload["result"]
+        else:
+            # Recreate and raise the original exception
+            error_info = output_payload["error"]
+            error_class = eval(error_info["type"])
+            raise error_class(error_info["message"])
+
+    async def _venv_exec_script(self, venv_name: str, python_func, *args, **kwargs) -> Dict[str, Any]:
+        """Execute a Python function in a fresh interpreter and return its output payload."""
         import base64
-        import inspect
         import json
         import textwrap
         
-        try:
-            # Get function source code using inspect.getsource
-            source = inspect.getsource(python_func)
-            # Remove common leading whitespace (dedent)
-            func_source = textwrap.dedent(source).strip()
-            
-            # Remove decorators
-            while func_source.lstrip().startswith("@"):
-                func_source = func_source.split("\n", 1)[1].strip()
-            
-            # Get function name for execution
-            func_name = python_func.__name__
-            
-            # Serialize args and kwargs as JSON (safer than dill for cross-version compatibility)
-            args_json = json.dumps(args, default=str)
-            kwargs_json = json.dumps(kwargs, default=str)
-            
-        except OSError as e:
-            raise Exception(f"Cannot retrieve source code for function {python_func.__name__}: {e}")
-        except Exception as e:
-            raise Exception(f"Failed to reconstruct function source: {e}")
+        func_name, func_source = function_source(python_func)
+        
+        # Serialize args and kwargs as JSON (safer than dill for cross-version compatibility)
+        args_json = json.dumps(args, default=str)
+        kwargs_json = json.dumps(kwargs, default=str)
         
         # Create Python code that will define and execute the function
         python_code = f'''
@@ -938,17 +1014,9 @@ print(f"<<<VENV_EXEC_START>>>{{output_json}}<<<VENV_EXEC_END>>>")
 
                 try:
                     # Decode and deserialize the output payload from JSON
-                    output_payload = json.loads(output_json)
+                    return json.loads(output_json)
                 except Exception as e:
                     raise Exception(f"Failed to decode output payload: {e}")
-                
-                if output_payload["success"]:
-                    return output_payload["result"]
-                else:
-                    # Recreate and raise the original exception
-                    error_info = output_payload["error"]
-                    error_class = eval(error_info["type"])
-                    raise error_class(error_info["message"])
             else:
                 raise Exception("Invalid output format: markers found but no content between them")
         else:
@@ -4,6 +4,8 @@ from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any, Tuple, List
 from ..logger import Logger, LogLevel
 from .models import MouseButton, CommandResult
+from .process import ProcessHandle
+from .batch import ActionBatch
 
 class BaseComputerInterface(ABC):
     """Base class for computer control interfaces."""
@@ -24,6 +26,10 @@ class BaseComputerInterface(ABC):
         self.api_key = api_key
         self.vm_name = vm_name
         self.logger = Logger("cua.interface", LogLevel.NORMAL)
+
+        # Port of the Computer API Server when it isn't the default (e.g. a published
+        # container port)
+        self.api_port: Optional[int] = None
         
         # Optional default delay time between commands (in seconds)
         self.delay: float = 0.0
@@ -424,6 +430,70 @@ class BaseComputerInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    async def start_process(
+        self,
+        command: str,
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        stdin: bool = False,
+        buffer_size: Optional[int] = None,
+    ) -> ProcessHandle:
+        """Start a shell command in the background and return a handle immediately.
+
+        Unlike run_command, output is streamed while the command runs and nothing
+        is buffered beyond a bounded ring buffer on the server.
+
+        Args:
+            command: The shell command to execute
+            cwd: Optional working directory for the command
+            env: Optional environment variables added to the server environment
+            timeout: Optional seconds after which the process is terminated
+            stdin: Whether to open stdin so the handle can write to it
+            buffer_size: Optional size of the server-side output ring buffer in characters
+
+        Returns:
+            ProcessHandle: Handle to stream output, write stdin, signal, kill and wait
+
+        Raises:
+            RuntimeError: If the process could not be started
+
+        Example:
+            proc = await interface.start_process("pytest -x", cwd="~/project", timeout=600)
+            async for chunk in proc.stream():
+                print(chunk.data, end="")
+            print(f"Exit code: {proc.returncode}")
+        """
+        pass
+
+    # Action batches
+    @abstractmethod
+    def batch(self, delay: Optional[float] = None, stop_on_error: bool = True, screenshot: bool = False) -> ActionBatch:
+        """Create a batch that queues actions and runs them server-side in one round trip.
+
+        The returned ActionBatch exposes the same action methods as this interface
+        (without await). Queued actions are sent as a single ``batch`` command when
+        the ``async with`` block exits or when ``execute()`` is awaited.
+
+        Args:
+            delay: Delay in seconds after each step. Defaults to the interface delay.
+            stop_on_error: Stop at the first failing step and raise RuntimeError
+            screenshot: Capture a screenshot after the last step, available as ``batch.screenshot``
+
+        Returns:
+            ActionBatch: The batch builder
+
+        Example:
+            async with interface.batch(screenshot=True) as batch:
+                batch.move_cursor(100, 200)
+                batch.left_click()
+                batch.type_text("hello")
+                batch.press("enter")
+            image = batch.screenshot
+        """
+        pass
+
     # Accessibility Actions
     @abstractmethod
     async def get_accessibility_tree(self) -> Dict:
@@ -0,0 +1,192 @@
+"""
+Client-side builder for server-side action batches.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from ..utils import decode_base64_image
+from .models import Key, KeyType, MouseButton
+
+if TYPE_CHECKING:
+    from .generic import GenericComputerInterface
+
+
+class ActionBatch:
+    """Queues interface actions and sends them to the server as one ``batch`` command.
+
+    Actions run in order on the server with a single network round trip. Use it as an
+    async context manager to flush automatically, or call :meth:`execute` yourself.
+
+    Example:
+        ```python
+        async with computer.interface.batch(screenshot=True) as batch:
+            batch.move_cursor(100, 200)
+            batch.left_click()
+            batch.type_text("hello")
+            batch.press(Key.ENTER)
+            batch.wait(0.5)
+        image = batch.screenshot
+        ```
+    """
+
+    def __init__(
+        self,
+        interface: "GenericComputerInterface",
+        delay: Optional[float] = None,
+        stop_on_error: bool = True,
+        screenshot: bool = False,
+    ):
+        """Initialize the batch.
+
+        Args:
+            interface: The interface the batch is sent through
+            delay: Delay in seconds after each step. Defaults to the interface delay.
+            stop_on_error: Stop at the first failing step and raise RuntimeError
+            screenshot: Capture a screenshot after the last step
+        """
+        self.interface = interface
+        self.delay = interface.delay if delay is None else delay
+        self.stop_on_error = stop_on_error
+        self.take_screenshot = screenshot
+        self.actions: List[Dict[str, Any]] = []
+        self.results: List[Dict[str, Any]] = []
+        self.screenshot: Optional[bytes] = None
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    async def __aenter__(self) -> "ActionBatch":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        # Don't send a half-built batch if the block raised
+        if exc_type is None:
+            await self.execute()
+
+    def _add(self, command: str, params: Optional[Dict[str, Any]] = None, delay: Optional[float] = None) -> "ActionBatch":
+        action: Dict[str, Any] = {"command": command, "params": params or {}}
+        if delay is not None:
+            action["delay"] = delay
+        self.actions.append(action)
+        return self
+
+    # Mouse actions
+    def mouse_down(self, x: Optional[int] = None, y: Optional[int] = None, button: "MouseButton" = "left", delay: Optional[float] = None) -> "ActionBatch":
+        return self._add("mouse_down", {"x": x, "y": y, "button": button}, delay)
+
+    def mouse_up(self, x: Optional[int] = None, y: Optional[int] = None, button: "MouseButton" = "left", delay: Optional[float] = None) -> "ActionBatch":
+        return self._add("mouse_up", {"x": x, "y": y, "button": button}, delay)
+
+    def left_click(self, x: Optional[int] = None, y: Optional[int] = None, delay: Optional[float] = None) -> "ActionBatch":
+        return self._add("left_click", {"x": x, "y": y}, delay)
+
+    def right_click(self, x: Optional[int] = None, y: Optional[int] = None, delay: Optional[float] = None) -> "ActionBatch":
+        return self._add("right_click", {"x": x, "y": y}, delay)
+
+    def double_click(self, x: Optional[int] = None, y: Optional[int] = None, delay: Optional[float] = None) -> "ActionBatch":
+        return self._add("double_click", {"x": x, "y": y}, delay)
+
+    def move_cursor(self, x: int, y: int, delay: Optional[float] = None) -> "ActionBatch":
+        return self._add("move_cursor", {"x": x, "y": y}, delay)
+
+    def drag_to(self, x: int, y: int, button: "MouseButton" = "left", duration: float = 0.5, delay: Optional[float] = None) -> "ActionBatch":
+        return self._add("drag_to", {"x": x, "y": y, "button": button, "duration": duration}, delay)
+
+    def drag(self, path: List[Tuple[int, int]], button: "MouseButton" = "left", duration: float = 0.5, delay: Optional[float] = None) -> "ActionBatch":
+        return self._add("drag", {"path": path, "button": button, "duration": duration}, delay)
+
+    # Keyboard actions
+    def key_down(self, key: "KeyType", delay: Optional[float] = None) -> "ActionBatch":
+        return self._add("key_down", {"key": key}, delay)
+
+    def key_up(self, key: "KeyType", delay: Optional[float] = None) -> "ActionBatch":
+        return self._add("key_up", {"key": key}, delay)
+
+    def type_text(self, text: str, delay: Optional[float] = None) -> "ActionBatch":
+        # Mirror GenericComputerInterface.type_text: Unicode text goes through the clipboard
+        if any(ord(char) > 127 for char in text):
+            self.set_clipboard(text)
+            return self.hotkey(Key.COMMAND, 'v', delay=delay)
+        return self._add("type_text", {"text": text}, delay)
+
+    def press(self, key: "KeyType", delay: Optional[float] = None) -> "ActionBatch":
+        return self._add("press_key", {"key": self.interface._resolve_key(key)}, delay)
+
+    def hotkey(self, *keys: "KeyType", delay: Optional[float] = None) -> "ActionBatch":
+        return self._add("hotkey", {"keys": [self.interface._resolve_key(key) for key in keys]}, delay)
+
+    # Scrolling actions
+    def scroll(self, x: int, y: int, delay: Optional[float] = None) -> "ActionBatch":
+        return self._add("scroll", {"x": x, "y": y}, delay)
+
+    def scroll_down(self, clicks: int = 1, delay: Optional[float] = None) -> "ActionBatch":
+        return self._add("scroll_down", {"clicks": clicks}, delay)
+
+    def scroll_up(self, clicks: int = 1, delay: Optional[float] = None) -> "ActionBatch":
+        return self._add("scroll_up", {"clicks": clicks}, delay)
+
+    # Clipboard actions
+    def set_clipboard(self, text: str, delay: Optional[float] = None) -> "ActionBatch":
+        return self._add("set_clipboard", {"text": text}, delay)
+
+    def wait(self, seconds: float) -> "ActionBatch":
+        """Sleep on the server between the surrounding steps."""
+        return self._add("wait", {"seconds": seconds}, 0)
+
+    async def execute(self) -> List[Dict[str, Any]]:
+        """Send the queued actions as one batch and clear the queue.
+
+        Returns:
+            List[Dict[str, Any]]: Per-step results, each with ``index``, ``command``,
+            ``success``, ``duration`` and any data returned by the command
+
+        Raises:
+            RuntimeError: If stop_on_error is set and a step failed
+        """
+        actions, self.actions = self.actions, []
+        if not actions and not self.take_screenshot:
+            self.results = []
+            return self.results
+
+        result = await self.interface._send_command("batch", {
+            "actions": actions,
+            "delay": self.delay,
+            "stop_on_error": self.stop_on_error,
+            "screenshot": self.take_screenshot,
+        })
+
+        if "results" not in result and "Unknown command" in str(result.get("error", "")):
+            # Older servers without batch support: fall back to one round trip per step
+            result = await self._execute_sequentially(actions)
+
+        self.results = result.get("results", [])
+        if result.get("image_data"):
+            self.screenshot = decode_base64_image(result["image_data"])
+        if self.stop_on_error and not result.get("success", False):
+            raise RuntimeError(result.get("error", "Failed to execute batch"))
+        return self.results
+
+    async def _execute_sequentially(self, actions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        results: List[Dict[str, Any]] = []
+        success = True
+        for index, action in enumerate(actions):
+            if action["command"] == "wait":
+                await self.interface._handle_delay(float(action["params"].get("seconds", 0)))
+                step = {"success": True}
+            else:
+                step = await self.interface._send_command(action["command"], action["params"])
+            results.append({**step, "index": index, "command": action["command"]})
+            if not step.get("success", False):
+                success = False
+                if self.stop_on_error:
+                    break
+            await self.interface._handle_delay(action.get("delay", self.delay))
+
+        response: Dict[str, Any] = {"success": success, "results": results}
+        if not success:
+            failed = next(r for r in results if not r.get("success", False))
+            response["error"] = f"Batch step {failed['index']} ({failed['command']}) failed: {failed.get('error')}"
+        if self.take_screenshot:
+            shot = await self.interface._send_command("screenshot")
+            response["image_data"] = shot.get("image_data")
+        return response
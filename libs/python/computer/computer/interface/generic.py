@@ -1,7 +1,7 @@
 import asyncio
 import json
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from PIL import Image
 
 import websockets
@@ -11,6 +11,8 @@ from ..logger import Logger, LogLevel
 from .base import BaseComputerInterface
 from ..utils import decode_base64_image, encode_base64_image, bytes_to_image, draw_box, resize_image
 from .models import Key, KeyType, MouseButton, CommandResult
+from .process import ProcessHandle
+from .batch import ActionBatch
 
 
 class GenericComputerInterface(BaseComputerInterface):
@@ -56,7 +58,7 @@ class GenericComputerInterface(BaseComputerInterface):
             WebSocket URI for the Computer API Server
         """
         protocol = "wss" if self.api_key else "ws"
-        port = "8443" if self.api_key else "8000"
+        port = self.api_port or ("8443" if self.api_key else "8000")
         return f"{protocol}://{self.ip_address}:{port}/ws"
     
     @property
@@ -67,7 +69,7 @@ class GenericComputerInterface(BaseComputerInterface):
             REST URI for the Computer API Server
         """
         protocol = "https" if self.api_key else "http"
-        port = "8443" if self.api_key else "8000"
+        port = self.api_port or ("8443" if self.api_key else "8000")
         return f"{protocol}://{self.ip_address}:{port}/cmd"
 
     # Mouse actions
@@ -128,6 +130,17 @@ class GenericComputerInterface(BaseComputerInterface):
             await self._send_command("type_text", {"text": text})
         await self._handle_delay(delay)
 
+    @staticmethod
+    def _resolve_key(key: "KeyType") -> str:
+        """Convert a Key enum or key string to the key value sent to the server."""
+        if isinstance(key, Key):
+            return key.value
+        if isinstance(key, str):
+            # Try to convert to enum if it matches a known key
+            key_or_enum = Key.from_string(key)
+            return key_or_enum.value if isinstance(key_or_enum, Key) else key_or_enum
+        raise ValueError(f"Invalid key type: {type(key)}. Must be Key enum or string.")
+
     async def press(self, key: "KeyType", delay: Optional[float] = None) -> None:
         """Press a single key.
 
@@ -154,16 +167,7 @@ class GenericComputerInterface(BaseComputerInterface):
         Raises:
             ValueError: If the key type is invalid or the key is not recognized
         """
-        if isinstance(key, Key):
-            actual_key = key.value
-        elif isinstance(key, str):
-            # Try to convert to enum if it matches a known key
-            key_or_enum = Key.from_string(key)
-            actual_key = key_or_enum.value if isinstance(key_or_enum, Key) else key_or_enum
-        else:
-            raise ValueError(f"Invalid key type: {type(key)}. Must be Key enum or string.")
-
-        await self._send_command("press_key", {"key": actual_key})
+        await self._send_command("press_key", {"key": self._resolve_key(key)})
         await self._handle_delay(delay)
 
     async def press_key(self, key: "KeyType", delay: Optional[float] = None) -> None:
@@ -196,17 +200,7 @@ class GenericComputerInterface(BaseComputerInterface):
         Raises:
             ValueError: If any key type is invalid or not recognized
         """
-        actual_keys = []
-        for key in keys:
-            if isinstance(key, Key):
-                actual_keys.append(key.value)
-            elif isinstance(key, str):
-                # Try to convert to enum if it matches a known key
-                key_or_enum = Key.from_string(key)
-                actual_keys.append(key_or_enum.value if isinstance(key_or_enum, Key) else key_or_enum)
-            else:
-                raise ValueError(f"Invalid key type: {type(key)}. Must be Key enum or string.")
-        
+        actual_keys = [self._resolve_key(key) for key in keys]
         await self._send_command("hotkey", {"keys": actual_keys})
         await self._handle_delay(delay)
 
@@ -451,6 +445,33 @@ class GenericComputerInterface(BaseComputerInterface):
             returncode=result.get("return_code", 0)
         )
 
+    async def start_process(
+        self,
+        command: str,
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        stdin: bool = False,
+        buffer_size: Optional[int] = None,
+    ) -> ProcessHandle:
+        params: Dict[str, Any] = {"command": command, "stdin": stdin}
+        if cwd is not None:
+            params["cwd"] = cwd
+        if env is not None:
+            params["env"] = env
+        if timeout is not None:
+            params["timeout"] = timeout
+        if buffer_size is not None:
+            params["buffer_size"] = buffer_size
+        result = await self._send_command("process_start", params)
+        if not result.get("success", False):
+            raise RuntimeError(result.get("error", "Failed to start process"))
+        return ProcessHandle(self, result["process_id"], result.get("pid"), command)
+
+    # Action batches
+    def batch(self, delay: Optional[float] = None, stop_on_error: bool = True, screenshot: bool = False) -> ActionBatch:
+        return ActionBatch(self, delay=delay, stop_on_error=stop_on_error, screenshot=screenshot)
+
     # Accessibility Actions
     async def get_accessibility_tree(self) -> Dict[str, Any]:
         """Get the accessibility tree of the current screen."""
@@ -800,6 +821,69 @@ class GenericComputerInterface(BaseComputerInterface):
         
         return result
 
+    async def _send_command_stream_ws(self, command: str, params: Optional[Dict] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Send a streaming command through WebSocket and yield events until "done".
+
+        The receive lock is held for the whole stream, so other WebSocket commands wait
+        until it finishes. The server sends heartbeats, so the receive timeout only
+        applies between events.
+        """
+        await self._ensure_connection()
+        if not self._ws:
+            raise ConnectionError("WebSocket connection is not established")
+
+        message = {"command": command, "params": params or {}}
+        async with self._recv_lock:
+            await self._ws.send(json.dumps(message))
+            while True:
+                event = json.loads(await asyncio.wait_for(self._ws.recv(), timeout=120))
+                if not event.get("success", False):
+                    raise RuntimeError(event.get("error", f"Streaming command '{command}' failed"))
+                if event.get("event") == "done":
+                    return
+                yield event
+
+    async def _send_command_stream(self, command: str, params: Optional[Dict] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Send a streaming command using REST API with WebSocket fallback.
+
+        Yields each event sent by the server until the terminating "done" event.
+        Falls back to WebSocket only if the REST request fails before any event arrived.
+        """
+        payload = {"command": command, "params": params or {}}
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["X-API-Key"] = self.api_key
+        if self.vm_name:
+            headers["X-Container-Name"] = self.vm_name
+
+        received_any = False
+        try:
+            # No total timeout: streams last as long as the process. Heartbeats bound idle reads.
+            timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=120)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with session.post(self.rest_uri, json=payload, headers=headers) as response:
+                    async for raw_line in response.content:
+                        line = raw_line.decode("utf-8").strip()
+                        if not line.startswith("data: "):
+                            continue
+                        event = json.loads(line[6:])
+                        received_any = True
+                        if not event.get("success", False):
+                            raise RuntimeError(event.get("error", f"Streaming command '{command}' failed"))
+                        if event.get("event") == "done":
+                            return
+                        yield event
+            raise ConnectionError("Stream ended before the server finished")
+        except RuntimeError:
+            raise
+        except Exception as e:
+            if received_any:
+                raise
+            self.logger.warning(f"REST streaming failed for command '{command}', trying WebSocket fallback: {e}")
+
+        async for event in self._send_command_stream_ws(command, params):
+            yield event
+
     async def wait_for_ready(self, timeout: int = 60, interval: float = 1.0):
         """Wait for Computer API Server to be ready by testing version command."""
 
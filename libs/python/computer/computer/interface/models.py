@@ -13,6 +13,13 @@ class CommandResult:
         self.stderr = stderr
         self.returncode = returncode
 
+@dataclass
+class ProcessOutput:
+    """A chunk of output from a background process started with start_process."""
+    seq: int
+    stream: Literal['stdout', 'stderr']
+    data: str
+
 # Navigation key literals
 NavigationKey = Literal['pagedown', 'pageup', 'home', 'end', 'left', 'right', 'up', 'down']
 
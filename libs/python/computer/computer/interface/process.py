@@ -0,0 +1,141 @@
+"""
+Handles for background processes running on the computer-server.
+"""
+
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
+
+from .models import CommandResult, ProcessOutput
+
+if TYPE_CHECKING:
+    from .generic import GenericComputerInterface
+
+
+class ProcessHandle:
+    """A handle to a process started with ``interface.start_process``.
+
+    The process keeps running on the server independently of this handle. Output is
+    held in a bounded ring buffer on the server, so it can be streamed live with
+    :meth:`stream`, polled with :meth:`read`, or collected with :meth:`communicate`.
+
+    Example:
+        ```python
+        proc = await computer.interface.start_process("make test", timeout=1800)
+        async for chunk in proc.stream():
+            print(chunk.data, end="")
+        print("exit code:", proc.returncode)
+        ```
+    """
+
+    def __init__(self, interface: "GenericComputerInterface", process_id: str, pid: Optional[int], command: str):
+        self.interface = interface
+        self.process_id = process_id
+        self.pid = pid
+        self.command = command
+        self.returncode: Optional[int] = None
+        self.timed_out = False
+        self._cursor = 0
+
+    def __repr__(self) -> str:
+        return f"ProcessHandle(process_id={self.process_id!r}, pid={self.pid}, command={self.command!r})"
+
+    async def _call(self, command: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        result = await self.interface._send_command(command, {"process_id": self.process_id, **(params or {})})
+        if not result.get("success", False):
+            raise RuntimeError(result.get("error", f"Failed to run {command}"))
+        return result
+
+    def _update_exit(self, result: Dict[str, Any]) -> None:
+        if result.get("return_code") is not None:
+            self.returncode = result["return_code"]
+        self.timed_out = bool(result.get("timed_out", self.timed_out))
+
+    async def stream(self, since: Optional[int] = None) -> AsyncIterator[ProcessOutput]:
+        """Stream output chunks as they are produced until the process exits.
+
+        Args:
+            since: Sequence number to start from. Defaults to the first chunk not yet
+                seen by this handle. Pass 0 to replay everything still buffered.
+
+        Yields:
+            ProcessOutput: Output chunks in the order they were produced
+        """
+        start = self._cursor if since is None else since
+        async for event in self.interface._send_command_stream(
+            "process_stream", {"process_id": self.process_id, "since": start}
+        ):
+            kind = event.get("event")
+            if kind == "output":
+                self._cursor = max(self._cursor, event["seq"] + 1)
+                yield ProcessOutput(seq=event["seq"], stream=event["stream"], data=event["data"])
+            elif kind == "truncated":
+                self.interface.logger.warning(
+                    f"Output of process {self.process_id} was truncated before seq {event.get('first_seq')}"
+                )
+            elif kind == "exit":
+                self._update_exit(event)
+
+    async def read(self, wait: float = 0.0) -> List[ProcessOutput]:
+        """Read output produced since the last read.
+
+        Args:
+            wait: Seconds to wait for new output if none is buffered yet
+
+        Returns:
+            List[ProcessOutput]: Output chunks not yet seen by this handle
+        """
+        result = await self._call("process_read", {"since": self._cursor, "wait": wait})
+        self._cursor = result.get("next_seq", self._cursor)
+        if not result.get("running", True):
+            self._update_exit(result)
+        return [ProcessOutput(**chunk) for chunk in result.get("chunks", [])]
+
+    async def write(self, data: str) -> None:
+        """Write text to the process stdin. The process must be started with ``stdin=True``."""
+        await self._call("process_write", {"data": data})
+
+    async def close_stdin(self) -> None:
+        """Close the process stdin, signalling end of input."""
+        await self._call("process_write", {"data": "", "eof": True})
+
+    async def send_signal(self, signal: str = "SIGTERM") -> None:
+        """Send a signal by name (e.g. ``"SIGINT"``) to the process group."""
+        await self._call("process_signal", {"signal": signal})
+
+    async def terminate(self) -> None:
+        """Ask the process to exit with SIGTERM."""
+        await self.send_signal("SIGTERM")
+
+    async def kill(self) -> None:
+        """Forcefully kill the process."""
+        await self._call("process_kill")
+
+    async def wait(self, timeout: Optional[float] = None) -> Optional[int]:
+        """Wait for the process to exit.
+
+        Args:
+            timeout: Maximum seconds to wait. None waits until exit.
+
+        Returns:
+            Optional[int]: The exit code, or None if the process is still running
+        """
+        result = await self._call("process_wait", {"timeout": timeout})
+        self._update_exit(result)
+        return self.returncode if not result.get("running", False) else None
+
+    async def communicate(self) -> CommandResult:
+        """Stream the remaining output to completion and return it as a CommandResult."""
+        stdout: List[str] = []
+        stderr: List[str] = []
+        async for chunk in self.stream():
+            (stdout if chunk.stream == "stdout" else stderr).append(chunk.data)
+        if self.returncode is None:
+            await self.wait()
+        return CommandResult(
+            stdout="".join(stdout),
+            stderr="".join(stderr),
+            returncode=self.returncode if self.returncode is not None else -1,
+        )
+
+    async def remove(self) -> None:
+        """Release the server-side record and output buffer of a finished process."""
+        await self._call("process_remove")
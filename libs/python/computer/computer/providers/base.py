@@ -105,3 +105,14 @@ class BaseVMProvider(AsyncContextManager):
             IP address of the VM when it becomes available
         """
         pass
+
+    def get_api_port(self, name: str) -> Optional[int]:
+        """Get the port computer-server is reachable on, if it isn't the default.
+
+        Args:
+            name: Name of the VM
+
+        Returns:
+            The port to connect to, or None to use the interface's default port
+        """
+        return None
@@ -1,6 +1,7 @@
 """Docker provider for running containers with computer-server."""
 
 from .provider import DockerProvider
+from .pool import DockerContainerPool, PooledContainer
 
 # Check if Docker is available
 try:
@@ -10,4 +11,4 @@ try:
 except (subprocess.SubprocessError, FileNotFoundError):
     HAS_DOCKER = False
 
-__all__ = ["DockerProvider", "HAS_DOCKER"]
+__all__ = ["DockerProvider", "DockerContainerPool", "PooledContainer", "HAS_DOCKER"]
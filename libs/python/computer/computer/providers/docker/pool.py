@@ -0,0 +1,477 @@
+"""
+Warm container pool for the Docker provider.
+
+Starting a CUA container and waiting for computer-server to come up takes tens of
+seconds. The pool keeps a number of pre-started, health-checked containers per image
+and hands them out with lease/return semantics, so acquiring a computer takes
+milliseconds whenever a warm container is available.
+
+Returned containers are either recreated from the image (the default, which gives
+every lease a pristine filesystem) or reset in place with a cleanup script. Containers
+are recycled after a maximum number of uses, and surplus idle containers are evicted
+after an idle timeout.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+POOL_LABEL = "cua.pool"
+API_PORT = 8000
+VNC_PORT = 6901
+
+# Pooled containers are reached through ports published on the host: container IPs
+# aren't routable from the host on Docker Desktop (macOS, Windows, WSL2)
+HOST_ADDRESS = "localhost"
+
+
+@dataclass
+class PooledContainer:
+    """A container owned by a DockerContainerPool."""
+
+    name: str
+    container_id: str
+    ip_address: str  # Address on the Docker network
+    image: str
+    api_port: int  # Host port published for computer-server
+    vnc_port: Optional[int] = None  # Host port published for VNC
+    created_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    uses: int = 0
+
+    def to_vm_info(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """Describe the container in the format returned by DockerProvider.get_vm."""
+        return {
+            "name": name or self.name,
+            "status": "running",
+            "ip_address": self.ip_address,
+            "ports": self.ports,
+            "image": self.image,
+            "provider": "docker",
+            "container_id": self.container_id[:12],
+            "pooled_container": self.name,
+            "uses": self.uses,
+        }
+
+    @property
+    def ports(self) -> Dict[str, str]:
+        """Published ports, in the format of DockerProvider.get_vm."""
+        ports = {f"{API_PORT}/tcp": str(self.api_port)}
+        if self.vnc_port:
+            ports[f"{VNC_PORT}/tcp"] = str(self.vnc_port)
+        return ports
+
+
+class DockerContainerPool:
+    """A pool of warm CUA containers for one image."""
+
+    RESET_MODES = ("recreate", "script")
+
+    def __init__(
+        self,
+        image: str = "trycua/cua-ubuntu:latest",
+        min_size: int = 1,
+        max_size: int = 4,
+        max_uses: int = 20,
+        idle_timeout: float = 600.0,
+        reset: str = "recreate",
+        cleanup_script: Optional[str] = None,
+        run_opts: Optional[Dict[str, Any]] = None,
+        network: Optional[str] = None,
+        name_prefix: str = "cua-pool",
+        health_timeout: float = 120.0,
+        check_interval: float = 30.0,
+    ):
+        """Initialize the pool. Containers are started by start().
+
+        Args:
+            image: Docker image to run (default: "trycua/cua-ubuntu:latest")
+            min_size: Number of warm, idle containers to keep ready at all times
+            max_size: Maximum number of containers (idle, leased and starting)
+            max_uses: Leases after which a container is removed instead of reset
+            idle_timeout: Seconds after which idle containers above min_size are evicted
+            reset: How returned containers are reset: "recreate" replaces them with a
+                fresh container from the image, "script" runs cleanup_script in place
+            cleanup_script: Shell script run with `docker exec` when reset is "script"
+            run_opts: Container options: memory (e.g. "4GB"), cpu and env (dict)
+            network: Optional Docker network to attach containers to
+            name_prefix: Prefix for container names
+            health_timeout: Seconds to wait for computer-server in a new container
+            check_interval: Seconds between idle eviction and health check passes
+        """
+        if reset not in self.RESET_MODES:
+            raise ValueError(f"reset must be one of {self.RESET_MODES}, got {reset!r}")
+        if reset == "script" and not cleanup_script:
+            raise ValueError("cleanup_script is required when reset is 'script'")
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+
+        self.image = image
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.idle_timeout = idle_timeout
+        self.reset = reset
+        self.cleanup_script = cleanup_script
+        self.run_opts = run_opts or {}
+        self.network = network
+        self.name_prefix = name_prefix
+        self.health_timeout = health_timeout
+        self.check_interval = check_interval
+
+        self.pool_id = uuid.uuid4().hex[:8]
+        self._idle: Deque[PooledContainer] = deque()
+        self._leased: Dict[str, PooledContainer] = {}
+        self._starting = 0
+        self._waiters = 0
+        self._tasks: Set[asyncio.Task] = set()
+        self._condition: Optional[asyncio.Condition] = None
+        self._maintenance: Optional[asyncio.Task] = None
+        self._closed = False
+        self.last_error: Optional[str] = None
+
+    async def __aenter__(self) -> "DockerContainerPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
+        await self.close()
+        return False
+
+    @property
+    def started(self) -> bool:
+        return self._condition is not None
+
+    async def start(self, wait: bool = False) -> None:
+        """Start warming containers and the maintenance loop.
+
+        Args:
+            wait: If True, return only once min_size containers are warm
+        """
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+            self._maintenance = asyncio.create_task(self._maintenance_loop())
+            async with self._condition:
+                self._replenish()
+        if wait:
+            async with self._condition:
+                await self._condition.wait_for(lambda: len(self._idle) >= self.min_size or self._closed)
+
+    async def lease(self, timeout: Optional[float] = None) -> PooledContainer:
+        """Take a warm container out of the pool, starting one if none is idle.
+
+        Args:
+            timeout: Maximum seconds to wait for a container (default: wait indefinitely)
+
+        Raises:
+            TimeoutError: If no container became available in time
+            RuntimeError: If the pool is closed
+        """
+        await self.start()
+        assert self._condition is not None
+        async with self._condition:
+            self._waiters += 1
+            try:
+                self._replenish()
+                await asyncio.wait_for(
+                    self._condition.wait_for(lambda: bool(self._idle) or self._closed), timeout
+                )
+            except asyncio.TimeoutError:
+                detail = f" Last error: {self.last_error}" if self.last_error else ""
+                raise TimeoutError(f"No warm container for {self.image} became available in {timeout}s.{detail}")
+            finally:
+                self._waiters -= 1
+
+            if self._closed:
+                raise RuntimeError("Container pool is closed")
+
+            # Most recently returned first: its caches are the warmest
+            container = self._idle.pop()
+            container.uses += 1
+            container.last_used = time.time()
+            self._leased[container.name] = container
+            self._replenish()
+
+        logger.info(f"Leased container {container.name} (use {container.uses}/{self.max_uses})")
+        return container
+
+    async def release(self, container: PooledContainer, discard: bool = False) -> None:
+        """Return a leased container to the pool.
+
+        Args:
+            container: The container returned by lease()
+            discard: Remove the container instead of resetting it (e.g. it is broken)
+        """
+        assert self._condition is not None
+        async with self._condition:
+            if self._leased.pop(container.name, None) is None:
+                logger.warning(f"Container {container.name} is not leased from this pool")
+                return
+            container.last_used = time.time()
+            reuse = (
+                not discard
+                and not self._closed
+                and self.reset == "script"
+                and container.uses < self.max_uses
+            )
+            if reuse:
+                # Count the container as starting while it is being reset
+                self._starting += 1
+                self._spawn(self._reset_container(container))
+            else:
+                self._spawn(self._remove(container.name))
+            self._replenish()
+
+    @asynccontextmanager
+    async def container(self, timeout: Optional[float] = None) -> AsyncIterator[PooledContainer]:
+        """Lease a container for the duration of a with block."""
+        container = await self.lease(timeout)
+        try:
+            yield container
+        finally:
+            await self.release(container)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of the pool state."""
+        return {
+            "image": self.image,
+            "idle": len(self._idle),
+            "leased": len(self._leased),
+            "starting": self._starting,
+            "waiters": self._waiters,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "last_error": self.last_error,
+        }
+
+    async def close(self) -> None:
+        """Stop maintenance and remove every container owned by the pool."""
+        if self._condition is None or self._closed:
+            self._closed = True
+            return
+        async with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._maintenance:
+            self._maintenance.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        names = [c.name for c in self._idle] + list(self._leased)
+        self._idle.clear()
+        self._leased.clear()
+        # Also catches containers that were still starting when their task was cancelled
+        result = await _docker("ps", "-aq", "--filter", f"label={POOL_LABEL}={self.pool_id}")
+        names += [line for line in result.stdout.split() if line]
+        await asyncio.gather(*(self._remove(name) for name in set(names)), return_exceptions=True)
+        logger.info(f"Closed container pool for {self.image}")
+
+    def _total(self) -> int:
+        return len(self._idle) + len(self._leased) + self._starting
+
+    def _replenish(self) -> None:
+        """Start containers to cover min_size and waiting leases. Caller holds the condition."""
+        if self._closed:
+            return
+        wanted = self.min_size + self._waiters - len(self._idle) - self._starting
+        capacity = self.max_size - self._total()
+        for _ in range(max(0, min(wanted, capacity))):
+            self._starting += 1
+            self._spawn(self._start_container())
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _add_idle(self, container: Optional[PooledContainer]) -> None:
+        assert self._condition is not None
+        async with self._condition:
+            self._starting -= 1
+            if container is not None and not self._closed:
+                self._idle.append(container)
+            self._condition.notify_all()
+            self._replenish()
+
+    async def _start_container(self) -> None:
+        name = f"{self.name_prefix}-{self.pool_id}-{uuid.uuid4().hex[:8]}"
+        container = None
+        try:
+            container = await self._run(name)
+            if not await self._wait_healthy(container):
+                raise RuntimeError(f"computer-server did not become ready within {self.health_timeout}s")
+            logger.info(f"Warm container {name} ready at {HOST_ADDRESS}:{container.api_port}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.last_error = f"Failed to start container {name}: {e}"
+            logger.error(self.last_error)
+            await self._remove(name)
+            container = None
+            # Hold the slot for a moment so a broken image doesn't spin
+            await asyncio.sleep(5)
+        finally:
+            if not self._closed:
+                await self._add_idle(container)
+
+    async def _run(self, name: str) -> PooledContainer:
+        from .provider import DockerProvider
+
+        cmd = ["run", "-d", "--name", name, "--label", f"{POOL_LABEL}={self.pool_id}"]
+        # Publish on host ports chosen by Docker, so any number of containers can run
+        cmd.extend(["-p", f"0:{API_PORT}", "-p", f"0:{VNC_PORT}"])
+        if "memory" in self.run_opts:
+            cmd.extend(["--memory", DockerProvider._parse_memory(self.run_opts["memory"])])
+        if "cpu" in self.run_opts:
+            cmd.extend(["--cpus", str(self.run_opts["cpu"])])
+        if self.network:
+            cmd.extend(["--network", self.network])
+        env = {"VNC_PW": "password", "VNCOPTIONS": "-disableBasicAuth", **self.run_opts.get("env", {})}
+        for key, value in env.items():
+            cmd.extend(["-e", f"{key}={value}"])
+        cmd.append(self.image)
+
+        result = await _docker(*cmd)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip())
+        container_id = result.stdout.strip()
+
+        inspect = await _docker("inspect", container_id)
+        if inspect.returncode != 0:
+            raise RuntimeError(inspect.stderr.strip())
+        network_settings = json.loads(inspect.stdout)[0]["NetworkSettings"]
+        networks = network_settings.get("Networks") or {}
+        ip_address = next((n["IPAddress"] for n in networks.values() if n.get("IPAddress")), "")
+        published = network_settings.get("Ports") or {}
+        api_port = _host_port(published, API_PORT)
+        if api_port is None:
+            raise RuntimeError(f"container port {API_PORT} was not published")
+
+        return PooledContainer(
+            name=name,
+            container_id=container_id,
+            ip_address=ip_address,
+            image=self.image,
+            api_port=api_port,
+            vnc_port=_host_port(published, VNC_PORT),
+        )
+
+    async def _reset_container(self, container: PooledContainer) -> None:
+        try:
+            assert self.cleanup_script is not None
+            result = await _docker("exec", container.name, "sh", "-c", self.cleanup_script)
+            if result.returncode != 0:
+                raise RuntimeError(f"cleanup script exited with {result.returncode}: {result.stderr.strip()}")
+            if not await self._wait_healthy(container, timeout=30.0):
+                raise RuntimeError("computer-server is not healthy after reset")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Discarding container {container.name}: {e}")
+            await self._remove(container.name)
+            container = None
+        await self._add_idle(container)
+
+    async def _wait_healthy(self, container: PooledContainer, timeout: Optional[float] = None) -> bool:
+        deadline = time.monotonic() + (timeout if timeout is not None else self.health_timeout)
+        while time.monotonic() < deadline:
+            if await _is_healthy(container.api_port):
+                return True
+            await asyncio.sleep(1)
+        return False
+
+    async def _maintenance_loop(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self._evict_idle()
+                await self._check_idle_health()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Container pool maintenance failed: {e}")
+
+    async def _evict_idle(self) -> None:
+        assert self._condition is not None
+        now = time.time()
+        async with self._condition:
+            surplus = len(self._idle) - self.min_size
+            # Oldest-returned containers sit at the left of the deque
+            evicted: List[PooledContainer] = []
+            while surplus > 0 and self._idle and now - self._idle[0].last_used > self.idle_timeout:
+                evicted.append(self._idle.popleft())
+                surplus -= 1
+        for container in evicted:
+            logger.info(f"Evicting idle container {container.name}")
+            self._spawn(self._remove(container.name))
+
+    async def _check_idle_health(self) -> None:
+        assert self._condition is not None
+        idle = list(self._idle)
+        healthy = await asyncio.gather(*(_is_healthy(c.api_port) for c in idle))
+        async with self._condition:
+            for container, ok in zip(idle, healthy):
+                if not ok and container in self._idle:
+                    logger.warning(f"Removing unhealthy idle container {container.name}")
+                    self._idle.remove(container)
+                    self._spawn(self._remove(container.name))
+            self._replenish()
+
+    async def _remove(self, name: str) -> None:
+        result = await _docker("rm", "-f", name)
+        if result.returncode != 0 and "No such container" not in result.stderr:
+            logger.warning(f"Failed to remove container {name}: {result.stderr.strip()}")
+
+
+@dataclass
+class _DockerResult:
+    returncode: int
+    stdout: str
+    stderr: str
+
+
+async def _docker(*args: str) -> _DockerResult:
+    """Run a docker CLI command without blocking the event loop."""
+    process = await asyncio.create_subprocess_exec(
+        "docker", *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+    return _DockerResult(process.returncode or 0, stdout.decode(errors="replace"), stderr.decode(errors="replace"))
+
+
+def _host_port(published: Dict[str, Any], container_port: int) -> Optional[int]:
+    """Host port a container port is published on, from `docker inspect` port bindings."""
+    for binding in published.get(f"{container_port}/tcp") or []:
+        if binding.get("HostPort"):
+            return int(binding["HostPort"])
+    return None
+
+
+async def _is_healthy(api_port: int) -> bool:
+    """Check that computer-server answers a version command on its published port."""
+    try:
+        timeout = aiohttp.ClientTimeout(total=3)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.post(
+                f"http://{HOST_ADDRESS}:{api_port}/cmd", json={"command": "version", "params": {}}
+            ) as response:
+                if response.status != 200:
+                    return False
+                text = await response.text()
+        for line in text.splitlines():
+            if line.startswith("data: "):
+                return bool(json.loads(line[6:]).get("success"))
+    except Exception:
+        pass
+    return False
@@ -15,6 +15,7 @@ import time
 import re
 
 from ..base import BaseVMProvider, VMProviderType
+from .pool import HOST_ADDRESS, DockerContainerPool, PooledContainer
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -45,6 +46,7 @@ class DockerProvider(BaseVMProvider):
         verbose: bool = False,
         ephemeral: bool = False,
         vnc_port: Optional[int] = 6901,
+        pool: Optional[DockerContainerPool] = None,
     ):
         """Initialize the Docker VM Provider.
         
@@ -57,6 +59,8 @@ class DockerProvider(BaseVMProvider):
             verbose: Enable verbose logging
             ephemeral: Use ephemeral (temporary) storage
             vnc_port: Port for VNC interface (default: 6901)
+            pool: Optional warm container pool. When set, run_vm leases a container
+                  from the pool and stop_vm returns it instead of stopping it.
         """
         self.host = host
         self.api_port = 8000
@@ -74,13 +78,16 @@ class DockerProvider(BaseVMProvider):
         self.verbose = verbose
         self._container_id = None
         self._running_containers = {}  # Track running containers by name
+        self.pool = pool
+        self._leases: Dict[str, PooledContainer] = {}  # Pooled containers leased by VM name
         
     @property
     def provider_type(self) -> VMProviderType:
         """Return the provider type."""
         return VMProviderType.DOCKER
     
-    def _parse_memory(self, memory_str: str) -> str:
+    @staticmethod
+    def _parse_memory(memory_str: str) -> str:
         """Parse memory string to Docker format.
         
         Examples:
@@ -118,6 +125,20 @@ class DockerProvider(BaseVMProvider):
         Returns:
             Dictionary with VM information including status, IP address, etc.
         """
+        if self.pool is not None:
+            # With a pool, a VM name only exists while a container is leased for it
+            lease = self._leases.get(name)
+            if lease is not None:
+                return lease.to_vm_info(name)
+            return {
+                "name": name,
+                "status": "not_found",
+                "ip_address": None,
+                "ports": {},
+                "image": self.pool.image,
+                "provider": "docker"
+            }
+
         try:
             # Check if container exists and get its status
             cmd = ["docker", "inspect", name]
@@ -233,6 +254,9 @@ class DockerProvider(BaseVMProvider):
         Returns:
             Dictionary with VM status information
         """
+        if self.pool is not None:
+            return await self._lease_vm(name)
+
         try:
             # Check if container already exists
             existing_vm = await self.get_vm(name, storage)
@@ -331,6 +355,26 @@ class DockerProvider(BaseVMProvider):
                 "provider": "docker"
             }
     
+    async def _lease_vm(self, name: str) -> Dict[str, Any]:
+        """Lease a warm container from the pool for the given VM name."""
+        lease = self._leases.get(name)
+        if lease is not None:
+            return lease.to_vm_info(name)
+        try:
+            lease = await self.pool.lease()
+        except Exception as e:
+            error_msg = f"Failed to lease container for {name}: {e}"
+            logger.error(error_msg)
+            return {
+                "name": name,
+                "status": "error",
+                "error": error_msg,
+                "provider": "docker"
+            }
+        self._leases[name] = lease
+        logger.info(f"Using pooled container {lease.name} for {name}")
+        return lease.to_vm_info(name)
+
     async def _wait_for_container_ready(self, container_name: str, timeout: int = 60) -> bool:
         """Wait for the Docker container to be fully ready.
         
@@ -365,7 +409,20 @@ class DockerProvider(BaseVMProvider):
         return False
     
     async def stop_vm(self, name: str, storage: Optional[str] = None) -> Dict[str, Any]:
-        """Stop a running VM by stopping the Docker container."""
+        """Stop a running VM by stopping the Docker container.
+
+        Pooled containers are returned to the pool instead.
+        """
+        lease = self._leases.pop(name, None)
+        if lease is not None:
+            await self.pool.release(lease)
+            return {
+                "name": name,
+                "status": "stopped",
+                "message": f"Container {lease.name} returned to pool",
+                "provider": "docker"
+            }
+
         try:
             logger.info(f"Stopping container {name}")
             
@@ -418,6 +475,18 @@ class DockerProvider(BaseVMProvider):
             "provider": "docker"
         }
     
+    def get_api_port(self, name: str) -> Optional[int]:
+        """Get the host port computer-server is published on for a pooled container.
+
+        Args:
+            name: Name of the VM
+
+        Returns:
+            The leased container's published API port, or None for the default port
+        """
+        lease = self._leases.get(name)
+        return lease.api_port if lease is not None else None
+
     async def get_ip(self, name: str, storage: Optional[str] = None, retry_delay: int = 2) -> str:
         """Get the IP address of a VM, waiting indefinitely until it's available.
         
@@ -429,6 +498,12 @@ class DockerProvider(BaseVMProvider):
         Returns:
             IP address of the VM when it becomes available
         """
+        lease = self._leases.get(name)
+        if lease is not None:
+            # Like other containers, pooled ones are reached through ports published on
+            # localhost; get_api_port() tells the client which one
+            return HOST_ADDRESS
+
         logger.info(f"Getting IP address for container {name}")
         
         total_attempts = 0
@@ -491,10 +566,10 @@ class DockerProvider(BaseVMProvider):
         """
         logger.debug(f"Exiting DockerProvider context, handling exceptions: {exc_type}")
         try:
-            # Optionally stop running containers on context exit
-            # For now, we'll leave containers running as they might be needed
-            # Users can manually stop them if needed
-            pass
+            # Return leased containers to the pool; other containers are left
+            # running as they might be needed. Users can manually stop them if needed
+            for name in list(self._leases):
+                await self.stop_vm(name)
         except Exception as e:
             logger.error(f"Error during DockerProvider cleanup: {e}")
             if exc_type is None:
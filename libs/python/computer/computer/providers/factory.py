@@ -150,7 +150,8 @@ class VMProviderFactory:
                     image=image or "trycua/cua-ubuntu:latest",
                     verbose=verbose,
                     ephemeral=ephemeral,
-                    vnc_port=noVNC_port
+                    vnc_port=noVNC_port,
+                    pool=kwargs.get("pool"),
                 )
             except ImportError as e:
                 logger.error(f"Failed to import DockerProvider: {e}")
@@ -0,0 +1,268 @@
+"""
+Client for a persistent Python worker running inside a virtual environment on the computer.
+
+The worker (see venv_worker_script.py) is started once per virtual environment as a
+background process through the computer-server process API. Calls are sent as JSON
+lines on its stdin and results come back as framed lines on its stdout, so repeated
+venv_exec calls skip interpreter startup, re-imports and shell round trips.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import re
+import textwrap
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .venv_worker_script import FRAME_PREFIX
+
+if TYPE_CHECKING:
+    from .interface.base import BaseComputerInterface
+    from .interface.process import ProcessHandle
+
+# Sentinel returned when the worker doesn't know a function definition yet
+_UNDEFINED = object()
+
+# Finds the call id of a frame that can't be decoded
+_FRAME_ID = re.compile(r'"id":\s*"([0-9a-f]+)"')
+
+
+def function_source(python_func: Callable) -> Tuple[str, str]:
+    """Get the name and dedented, undecorated source code of a function.
+
+    Raises:
+        Exception: If the source code cannot be retrieved
+    """
+    try:
+        # Get function source code using inspect.getsource
+        source = inspect.getsource(python_func)
+        # Remove common leading whitespace (dedent)
+        func_source = textwrap.dedent(source).strip()
+
+        # Remove decorators
+        while func_source.lstrip().startswith("@"):
+            func_source = func_source.split("\n", 1)[1].strip()
+
+        return python_func.__name__, func_source
+    except OSError as e:
+        raise Exception(f"Cannot retrieve source code for function {python_func.__name__}: {e}")
+    except Exception as e:
+        raise Exception(f"Failed to reconstruct function source: {e}")
+
+
+class VenvWorker:
+    """A long-lived Python worker process inside one virtual environment."""
+
+    # Server-side output buffer for the worker process; results are framed in 256KB chunks
+    BUFFER_SIZE = 8 * 1024 * 1024
+
+    def __init__(self, interface: "BaseComputerInterface", venv_name: str, logger: Any, poll_interval: float = 10.0):
+        """Initialize the worker client.
+
+        Args:
+            interface: Computer interface used to start and talk to the worker process
+            venv_name: Name of the virtual environment under ~/.venvs
+            logger: Logger for worker diagnostics
+            poll_interval: Seconds each long-poll read waits for new worker output
+        """
+        self.interface = interface
+        self.venv_name = venv_name
+        self.logger = logger
+        self.poll_interval = poll_interval
+        self.process: Optional["ProcessHandle"] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+        self._start_lock = asyncio.Lock()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._chunks: Dict[str, List[str]] = {}
+        self._defined: Set[str] = set()
+        self._line_buffer = ""
+
+    @property
+    def venv_path(self) -> str:
+        return f"~/.venvs/{self.venv_name}"
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self._reader is not None and not self._reader.done()
+
+    async def start(self, timeout: float = 30.0) -> None:
+        """Upload and start the worker if it is not already running."""
+        async with self._start_lock:
+            if self.alive:
+                return
+
+            if not await self.interface.directory_exists(self.venv_path):
+                raise RuntimeError(
+                    f"Virtual environment '{self.venv_name}' does not exist. Create it first using venv_install."
+                )
+
+            script = Path(__file__).with_name("venv_worker_script.py").read_text()
+            script_path = f"{self.venv_path}/.cua_venv_worker.py"
+            await self.interface.write_text(script_path, script)
+
+            self._ready.clear()
+            self._defined.clear()
+            self._chunks.clear()
+            self._line_buffer = ""
+            self.process = await self.interface.start_process(
+                f". {self.venv_path}/bin/activate && exec python -u {script_path}",
+                stdin=True,
+                buffer_size=self.BUFFER_SIZE,
+            )
+            self._reader = asyncio.create_task(self._read_loop(self.process))
+
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                await self.stop()
+                raise RuntimeError(f"Worker for virtual environment '{self.venv_name}' did not start in {timeout}s")
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Ask the worker to exit, killing it if it doesn't within the timeout."""
+        process, self.process = self.process, None
+        if process is None:
+            return
+        try:
+            await process.write(json.dumps({"op": "shutdown"}) + "\n")
+            if await process.wait(timeout) is None:
+                await process.kill()
+        except Exception as e:
+            self.logger.debug(f"Error stopping venv worker '{self.venv_name}': {e}")
+        if self._reader:
+            self._reader.cancel()
+        self._fail_pending(RuntimeError(f"Worker for virtual environment '{self.venv_name}' was stopped"))
+
+    async def call(self, python_func: Callable, *args, **kwargs) -> Dict[str, Any]:
+        """Run a function in the worker.
+
+        Returns:
+            Dict[str, Any]: The payload {"success", "result", "error"} produced by the worker
+        """
+        await self.start()
+        func_name, func_source = function_source(python_func)
+        key = hashlib.sha256(func_source.encode("utf-8")).hexdigest()
+
+        request = {
+            "op": "call",
+            "key": key,
+            "name": func_name,
+            # Serialize args and kwargs as JSON (safer than dill for cross-version compatibility)
+            "args": json.loads(json.dumps(args, default=str)),
+            "kwargs": json.loads(json.dumps(kwargs, default=str)),
+        }
+
+        # Send the source only until the worker has it; resend if it reports it unknown
+        for include_source in (key not in self._defined, True):
+            if include_source:
+                request["source"] = func_source
+            response = await self._request(request)
+            if response is _UNDEFINED:
+                self._defined.discard(key)
+                continue
+            self._defined.add(key)
+            payload_json, stdout = response
+            if stdout:
+                print(stdout, end="")
+            try:
+                return json.loads(payload_json)
+            except Exception as e:
+                raise Exception(f"Failed to decode output payload: {e}")
+
+        raise RuntimeError(f"Worker could not define function {func_name}")
+
+    async def _request(self, request: Dict[str, Any]) -> Any:
+        if not self.alive:
+            raise RuntimeError(f"Worker for virtual environment '{self.venv_name}' is not running")
+        call_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending[call_id] = future
+        try:
+            await self.process.write(json.dumps({**request, "id": call_id}) + "\n")
+            return await future
+        finally:
+            self._pending.pop(call_id, None)
+            self._chunks.pop(call_id, None)
+
+    async def _read_loop(self, process: "ProcessHandle") -> None:
+        try:
+            while True:
+                chunks = await process.read(wait=self.poll_interval)
+                for chunk in chunks:
+                    if chunk.stream == "stdout":
+                        self._feed(chunk.data)
+                    else:
+                        self.logger.debug(f"[venv worker {self.venv_name}] {chunk.data.rstrip()}")
+                if not chunks and process.returncode is not None:
+                    break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.warning(f"Lost connection to venv worker '{self.venv_name}': {e}")
+            # Don't leave a worker running that nothing reads from any more
+            try:
+                await process.kill()
+            except Exception as kill_error:
+                self.logger.debug(f"Error killing venv worker '{self.venv_name}': {kill_error}")
+        finally:
+            if self.process is process:
+                self.process = None
+            self._fail_pending(RuntimeError(f"Worker for virtual environment '{self.venv_name}' exited"))
+
+    def _feed(self, data: str) -> None:
+        self._line_buffer += data
+        *lines, self._line_buffer = self._line_buffer.split("\n")
+        for line in lines:
+            if line.startswith(FRAME_PREFIX):
+                frame = line[len(FRAME_PREFIX):]
+                try:
+                    self._dispatch(json.loads(frame))
+                except Exception as e:
+                    self._fail_frame(frame, e)
+            elif line:
+                # Output written directly to the stdout file descriptor, e.g. by C extensions
+                self.logger.debug(f"[venv worker {self.venv_name}] {line}")
+
+    def _dispatch(self, frame: Dict[str, Any]) -> None:
+        kind = frame.get("type")
+        if kind == "ready":
+            self._ready.set()
+            return
+
+        future = self._pending.get(frame.get("id"))
+        if future is None or future.done():
+            if kind == "error":
+                self.logger.warning(f"Venv worker '{self.venv_name}' error: {frame.get('message')}")
+        elif kind == "chunk":
+            self._chunks.setdefault(frame["id"], []).append(frame["data"])
+        elif kind == "done":
+            future.set_result(("".join(self._chunks.pop(frame["id"], [])), frame.get("stdout", "")))
+        elif kind == "undefined":
+            future.set_result(_UNDEFINED)
+        elif kind == "error":
+            future.set_exception(RuntimeError(frame.get("message", "Venv worker error")))
+
+    def _fail_frame(self, frame: str, error: Exception) -> None:
+        """Fail the call a corrupt frame belongs to; other calls keep running."""
+        match = _FRAME_ID.search(frame)
+        if match:
+            call_id = match.group(1)
+        elif len(self._pending) == 1:
+            call_id = next(iter(self._pending))
+        else:
+            call_id = None
+
+        future = self._pending.get(call_id)
+        if future is None or future.done():
+            self.logger.warning(f"Dropped corrupt frame from venv worker '{self.venv_name}': {error}")
+            return
+        self._chunks.pop(call_id, None)
+        future.set_exception(RuntimeError(f"Corrupt response from venv worker '{self.venv_name}': {error}"))
+
+    def _fail_pending(self, error: Exception) -> None:
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
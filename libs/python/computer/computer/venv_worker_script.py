@@ -0,0 +1,131 @@
+"""
+Persistent Python worker that runs inside a virtual environment on the remote computer.
+
+This file is uploaded to the computer and started by computer.venv_worker.VenvWorker.
+It must only depend on the standard library.
+
+Protocol:
+- Requests are JSON objects, one per line on stdin.
+- Responses are frames written to stdout as single lines starting with FRAME_PREFIX
+  followed by a JSON object. Anything else on stdout is not part of the protocol.
+- A call request is {"id", "op": "call", "key", "name", "source"?, "args", "kwargs"}.
+  ``key`` identifies a function definition; ``source`` is only needed the first time.
+  The worker answers {"id", "type": "undefined"} if it does not know ``key`` yet.
+- Results are sent as one or more {"id", "type": "chunk", "data"} frames holding the
+  JSON payload, followed by {"id", "type": "done", "stdout"} with captured prints.
+- {"op": "shutdown"} stops the worker.
+"""
+
+import io
+import json
+import os
+import sys
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+FRAME_PREFIX = "\x1e@cua-rpc "
+CHUNK_SIZE = 256 * 1024
+
+_real_stdout = sys.stdout
+_write_lock = threading.Lock()
+_functions = {}
+_functions_lock = threading.Lock()
+_local = threading.local()
+
+
+class _CallOutput(io.TextIOBase):
+    """Routes print() output to the buffer of the call running on the current thread."""
+
+    def write(self, text):
+        buffer = getattr(_local, "buffer", None)
+        if buffer is None:
+            return sys.__stderr__.write(text)
+        buffer.append(text)
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def send(frame):
+    line = FRAME_PREFIX + json.dumps(frame, default=str) + "\n"
+    with _write_lock:
+        _real_stdout.write(line)
+        _real_stdout.flush()
+
+
+def resolve(request):
+    key = request["key"]
+    with _functions_lock:
+        func = _functions.get(key)
+        if func is None and request.get("source") is not None:
+            # Each definition gets its own module namespace; imports stay warm in sys.modules
+            namespace = {"__name__": "__main__"}
+            exec(compile(request["source"], f"<venv_exec:{request['name']}>", "exec"), namespace)
+            func = _functions[key] = namespace[request["name"]]
+    return func
+
+
+def handle_call(request):
+    call_id = request["id"]
+    func = resolve(request)
+    if func is None:
+        send({"id": call_id, "type": "undefined"})
+        return
+
+    _local.buffer = []
+    try:
+        result = func(*request.get("args", []), **request.get("kwargs", {}))
+        payload = json.dumps({"success": True, "result": result, "error": None}, default=str)
+    except Exception as e:
+        payload = json.dumps({
+            "success": False,
+            "result": None,
+            "error": {
+                "type": type(e).__name__,
+                "message": str(e),
+                "traceback": traceback.format_exc(),
+            },
+        })
+    finally:
+        output = "".join(_local.buffer)
+        _local.buffer = None
+
+    for start in range(0, len(payload), CHUNK_SIZE):
+        send({"id": call_id, "type": "chunk", "data": payload[start:start + CHUNK_SIZE]})
+    send({"id": call_id, "type": "done", "stdout": output})
+
+
+def safe_handle_call(request):
+    try:
+        handle_call(request)
+    except Exception as e:
+        send({"id": request.get("id"), "type": "error", "message": f"{type(e).__name__}: {e}"})
+
+
+def main():
+    max_workers = int(os.environ.get("CUA_VENV_WORKER_THREADS", "8"))
+    sys.stdout = _CallOutput()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    send({"type": "ready", "pid": os.getpid(), "python": sys.version})
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            send({"type": "error", "message": f"Invalid request: {e}"})
+            continue
+        if request.get("op") == "shutdown":
+            break
+        if request.get("op") == "call":
+            executor.submit(safe_handle_call, request)
+
+    executor.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    main()
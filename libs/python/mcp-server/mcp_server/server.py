@@ -5,7 +5,8 @@ import os
 import sys
 from tabnanny import verbose
 import traceback
-from typing import Any, Dict, List, Optional, Union, Tuple
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Union, Tuple
 
 # Configure logging to output to stderr for debug visibility
 logging.basicConfig(
@@ -46,6 +47,122 @@ def get_env_bool(key: str, default: bool = False) -> bool:
     return os.getenv(key, str(default)).lower() in ("true", "1", "yes")
 
 
+class ComputerPool:
+    """Computers leased to parallel task workers, created on first use and kept for reuse.
+
+    Parallel tasks need computers of their own. By default they are Docker containers
+    leased from a warm DockerContainerPool; with CUA_PARALLEL_PROVIDER set to another
+    provider, each computer holds a slot i and uses the VM named
+    "<CUA_PARALLEL_VM_PREFIX>-<i>". A slot is only reused once its computer is stopped,
+    so no two live computers share a VM.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._created = 0
+        self._free_slots: Set[int] = set()  # Slots of retired computers, reused first
+        self._next_slot = 0
+        self._slots: Dict[int, int] = {}  # id(computer) -> slot
+        self._lock = asyncio.Lock()
+        self._container_pool = None
+
+    def resize(self, max_size: int) -> None:
+        """Allow up to max_size computers; existing computers are kept when shrinking."""
+        self.max_size = max_size
+        if self._container_pool is not None:
+            self._container_pool.max_size = max(max_size, self._container_pool.min_size)
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Computer]:
+        """Lease a running computer for the duration of one task.
+
+        The computer goes back to the pool only if the task finished without raising;
+        otherwise it is stopped, as it may be left in any state.
+        """
+        computer = await self._acquire()
+        try:
+            yield computer
+        except BaseException:
+            await self._retire(computer)
+            raise
+        self._idle.put_nowait(computer)
+
+    async def _acquire(self) -> Computer:
+        while True:
+            async with self._lock:
+                index = None
+                if self._idle.empty() and self._created < self.max_size:
+                    # Reserve a slot, then boot outside the lock so computers start concurrently
+                    self._created += 1
+                    if self._free_slots:
+                        index = min(self._free_slots)
+                        self._free_slots.remove(index)
+                    else:
+                        index = self._next_slot
+                        self._next_slot += 1
+            if index is not None:
+                break
+            computer = await self._idle.get()
+            if computer is not None:
+                return computer
+            # None wakes a waiter after a slot was freed; try to take it
+        try:
+            computer = await self._create(index)
+        except BaseException:
+            await self._release_slot(index)
+            raise
+        self._slots[id(computer)] = index
+        return computer
+
+    async def _retire(self, computer: Computer) -> None:
+        try:
+            await computer.stop()
+        except Exception as e:
+            logger.warning(f"Error stopping pooled computer: {e}")
+        finally:
+            # Free the slot only now, so a replacement never boots the VM still being stopped
+            await self._release_slot(self._slots.pop(id(computer)))
+
+    async def _release_slot(self, index: int) -> None:
+        async with self._lock:
+            self._created -= 1
+            self._free_slots.add(index)
+        self._idle.put_nowait(None)
+
+    async def _create(self, index: int) -> Computer:
+        provider = os.getenv("CUA_PARALLEL_PROVIDER", "docker")
+        if provider == "docker":
+            from computer.providers.docker import DockerContainerPool
+
+            if self._container_pool is None:
+                self._container_pool = DockerContainerPool(
+                    image=os.getenv("CUA_PARALLEL_IMAGE", "trycua/cua-ubuntu:latest"),
+                    min_size=0,
+                    max_size=self.max_size,
+                )
+                await self._container_pool.start(wait=False)
+            computer = Computer(
+                os_type="linux",
+                provider_type="docker",
+                container_pool=self._container_pool,
+                verbosity=logging.INFO,
+            )
+        else:
+            computer = Computer(
+                os_type=os.getenv("CUA_PARALLEL_OS", "macos"),  # type: ignore
+                provider_type=provider,
+                name=f"{os.getenv('CUA_PARALLEL_VM_PREFIX', 'cua-mcp-worker')}-{index}",
+                verbosity=logging.INFO,
+            )
+        await computer.run()
+        return computer
+
+
+# Pool of computers for parallel tasks, created on first use
+computer_pool: Optional[ComputerPool] = None
+
+
 def serve() -> FastMCP:
     """Create and configure the MCP server."""
     server = FastMCP("cua-agent")
@@ -71,6 +188,96 @@ def serve() -> FastMCP:
             data=screenshot
         )
 
+    async def get_global_computer() -> Computer:
+        global global_computer
+        if global_computer is None:
+            global_computer = Computer(verbosity=logging.INFO)
+            await global_computer.run()
+        return global_computer
+
+    async def execute_task(ctx: Context, task: str, computer: Computer) -> Tuple[str, Image]:
+        """Run one task on the given computer. Errors are raised to the caller."""
+        logger.info(f"Starting CUA task: {task}")
+
+        # Get model name - this now determines the loop and provider
+        model_name = os.getenv("CUA_MODEL_NAME", "anthropic/claude-3-5-sonnet-20241022")
+        
+        logger.info(f"Using model: {model_name}")
+
+        # Create agent with the new v0.4.x API
+        agent = ComputerAgent(
+            model=model_name,
+            only_n_most_recent_images=int(os.getenv("CUA_MAX_IMAGES", "3")),
+            verbosity=logging.INFO,
+            tools=[computer]
+        )
+
+        # Create messages in the new v0.4.x format
+        messages = [{"role": "user", "content": task}]
+        
+        # Collect all results
+        full_result = ""
+        async for result in agent.run(messages):
+            logger.info(f"Agent processing step")
+            await ctx.info(f"Agent processing step")
+
+            # Process output if available
+            outputs = result.get("output", [])
+            for output in outputs:
+                output_type = output.get("type")
+                if output_type == "message":
+                    logger.debug(f"Message: {output}")
+                    content = output.get("content", [])
+                    for content_part in content:
+                        if content_part.get("text"):
+                            full_result += f"Message: {content_part.get('text', '')}\n"
+                elif output_type == "tool_use":
+                    logger.debug(f"Tool use: {output}")
+                    tool_name = output.get("name", "")
+                    full_result += f"Tool: {tool_name}\n"
+                elif output_type == "tool_result":
+                    logger.debug(f"Tool result: {output}")
+                    result_content = output.get("content", "")
+                    if isinstance(result_content, list):
+                        for item in result_content:
+                            if item.get("type") == "text":
+                                full_result += f"Result: {item.get('text', '')}\n"
+                    else:
+                        full_result += f"Result: {result_content}\n"
+
+            # Add separator between steps
+            full_result += "\n" + "-" * 20 + "\n"
+
+        logger.info(f"CUA task completed successfully")
+        await ctx.info(f"CUA task completed successfully")
+        return (
+            full_result or "Task completed with no text output.",
+            Image(
+                format="png",
+                data=await computer.interface.screenshot()
+            )
+        )
+
+    async def error_result(ctx: Context, e: Exception, computer: Optional[Computer]) -> Tuple[str, Image]:
+        error_msg = f"Error running CUA task: {str(e)}\n{traceback.format_exc()}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        # Return tuple with error message and a screenshot if possible
+        try:
+            if computer is not None:
+                screenshot = await computer.interface.screenshot()
+                return (
+                    f"Error during task execution: {str(e)}",
+                    Image(format="png", data=screenshot)
+                )
+        except:
+            pass
+        # If we can't get a screenshot, return a placeholder
+        return (
+            f"Error during task execution: {str(e)}",
+            Image(format="png", data=b"")
+        )
+
     @server.tool()
     async def run_cua_task(ctx: Context, task: str) -> Tuple[str, Image]:
         """
@@ -83,116 +290,105 @@ def serve() -> FastMCP:
         Returns:
             A tuple containing the agent's response and the final screenshot
         """
-        global global_computer
-
         try:
-            logger.info(f"Starting CUA task: {task}")
-
             # Initialize computer if needed
-            if global_computer is None:
-                global_computer = Computer(verbosity=logging.INFO)
-                await global_computer.run()
-
-            # Get model name - this now determines the loop and provider
-            model_name = os.getenv("CUA_MODEL_NAME", "anthropic/claude-3-5-sonnet-20241022")
-            
-            logger.info(f"Using model: {model_name}")
-
-            # Create agent with the new v0.4.x API
-            agent = ComputerAgent(
-                model=model_name,
-                only_n_most_recent_images=int(os.getenv("CUA_MAX_IMAGES", "3")),
-                verbosity=logging.INFO,
-                tools=[global_computer]
-            )
-
-            # Create messages in the new v0.4.x format
-            messages = [{"role": "user", "content": task}]
-            
-            # Collect all results
-            full_result = ""
-            async for result in agent.run(messages):
-                logger.info(f"Agent processing step")
-                ctx.info(f"Agent processing step")
-
-                # Process output if available
-                outputs = result.get("output", [])
-                for output in outputs:
-                    output_type = output.get("type")
-                    if output_type == "message":
-                        logger.debug(f"Message: {output}")
-                        content = output.get("content", [])
-                        for content_part in content:
-                            if content_part.get("text"):
-                                full_result += f"Message: {content_part.get('text', '')}\n"
-                    elif output_type == "tool_use":
-                        logger.debug(f"Tool use: {output}")
-                        tool_name = output.get("name", "")
-                        full_result += f"Tool: {tool_name}\n"
-                    elif output_type == "tool_result":
-                        logger.debug(f"Tool result: {output}")
-                        result_content = output.get("content", "")
-                        if isinstance(result_content, list):
-                            for item in result_content:
-                                if item.get("type") == "text":
-                                    full_result += f"Result: {item.get('text', '')}\n"
-                        else:
-                            full_result += f"Result: {result_content}\n"
-
-                # Add separator between steps
-                full_result += "\n" + "-" * 20 + "\n"
-
-            logger.info(f"CUA task completed successfully")
-            ctx.info(f"CUA task completed successfully")
-            return (
-                full_result or "Task completed with no text output.",
-                Image(
-                    format="png",
-                    data=await global_computer.interface.screenshot()
-                )
-            )
-
+            computer = await get_global_computer()
+            return await execute_task(ctx, task, computer)
         except Exception as e:
-            error_msg = f"Error running CUA task: {str(e)}\n{traceback.format_exc()}"
-            logger.error(error_msg)
-            ctx.error(error_msg)
-            # Return tuple with error message and a screenshot if possible
-            try:
-                if global_computer is not None:
-                    screenshot = await global_computer.interface.screenshot()
-                    return (
-                        f"Error during task execution: {str(e)}",
-                        Image(format="png", data=screenshot)
-                    )
-            except:
-                pass
-            # If we can't get a screenshot, return a placeholder
-            return (
-                f"Error during task execution: {str(e)}",
-                Image(format="png", data=b"")
-            )
+            return await error_result(ctx, e, global_computer)
 
     @server.tool()
-    async def run_multi_cua_tasks(ctx: Context, tasks: List[str]) -> List:
+    async def run_multi_cua_tasks(
+        ctx: Context,
+        tasks: List[str],
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+        fail_fast: bool = False,
+    ) -> List:
         """
-        Run multiple CUA tasks in a MacOS VM in sequence and return the combined results.
+        Run multiple CUA tasks and return the combined results in task order.
+
+        By default the tasks run in sequence in the same MacOS VM, for tasks that build on
+        each other's state. With parallel=True, independent tasks run at the same time,
+        each on its own computer leased from a pool.
 
         Args:
             ctx: The MCP context
-            tasks: List of tasks to run in sequence
+            tasks: List of tasks to run
+            parallel: Run the tasks concurrently on separate computers
+            max_workers: Maximum number of tasks running at once in parallel mode
+                (defaults to the CUA_MAX_PARALLEL_TASKS environment variable, or 4)
+            fail_fast: Stop starting new tasks once a task fails; skipped tasks report so
 
         Returns:
             Combined results from all tasks
         """
+        global computer_pool
+
+        total = len(tasks)
+        outcomes: List[Optional[Tuple[str, Image]]] = [None] * total
+        completed = 0
+        failed = asyncio.Event()
+
+        async def finish(i: int, outcome: Tuple[str, Image], ok: bool) -> None:
+            nonlocal completed
+            outcomes[i] = outcome
+            completed += 1
+            if not ok:
+                failed.set()
+            status = "completed" if ok else "failed"
+            await ctx.info(f"Task {i+1}/{total} {status}: {tasks[i]}")
+            await ctx.report_progress(completed, total)
+
+        if not parallel:
+            for i, task in enumerate(tasks):
+                if fail_fast and failed.is_set():
+                    break
+                logger.info(f"Running task {i+1}/{total}: {task}")
+                await ctx.info(f"Running task {i+1}/{total}: {task}")
+                computer = None
+                try:
+                    computer = await get_global_computer()
+                    await finish(i, await execute_task(ctx, task, computer), True)
+                except Exception as e:
+                    await finish(i, await error_result(ctx, e, computer), False)
+        else:
+            workers = max_workers or int(os.getenv("CUA_MAX_PARALLEL_TASKS", "4"))
+            if computer_pool is None:
+                computer_pool = ComputerPool(max_size=workers)
+            elif computer_pool.max_size != workers:
+                computer_pool.resize(workers)
+            semaphore = asyncio.Semaphore(max(1, workers))
+
+            async def run_one(i: int, task: str) -> None:
+                async with semaphore:
+                    if fail_fast and failed.is_set():
+                        return
+                    logger.info(f"Running task {i+1}/{total} in parallel: {task}")
+                    await ctx.info(f"Running task {i+1}/{total}: {task}")
+                    outcome = None
+                    try:
+                        async with computer_pool.lease() as computer:
+                            try:
+                                outcome, ok = await execute_task(ctx, task, computer), True
+                            except Exception as e:
+                                # Screenshot while still leased; the pool then retires the computer
+                                outcome, ok = await error_result(ctx, e, computer), False
+                                raise
+                    except Exception as e:
+                        if outcome is None:
+                            # No computer could be leased
+                            outcome, ok = await error_result(ctx, e, None), False
+                    await finish(i, outcome, ok)
+
+            await asyncio.gather(*(run_one(i, task) for i, task in enumerate(tasks)))
+
+        # Assemble results in task order
         results = []
-        for i, task in enumerate(tasks):
-            logger.info(f"Running task {i+1}/{len(tasks)}: {task}")
-            ctx.info(f"Running task {i+1}/{len(tasks)}: {task}")
-            
-            ctx.report_progress(i / len(tasks))
-            results.extend(await run_cua_task(ctx, task))
-            ctx.report_progress((i + 1) / len(tasks))
-            
+        for outcome in outcomes:
+            if outcome is None:
+                outcome = ("Skipped: an earlier task failed", Image(format="png", data=b""))
+            results.extend(outcome)
         return results
 
     return server
@@ -1,8 +1,6 @@
 from pathlib import Path
-from typing import Union, List, Dict, Any, Tuple, Optional, cast
+from typing import Union, List, Dict, Any, Tuple, Optional
 import logging
-import torch
-import torchvision.ops
 import cv2
 import numpy as np
 import time
@@ -12,6 +10,7 @@ import io
 import base64
 import argparse
 import signal
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from contextlib import contextmanager
 
 from ultralytics import YOLO
@@ -19,7 +18,8 @@ from huggingface_hub import hf_hub_download
 import supervision as sv
 from supervision.detection.core import Detections
 
-from .detection import DetectionProcessor
+from .detection import DetectionProcessor, IconDetections
+from .geometry import as_boxes, contains_any_center, nms
 from .ocr import OCRProcessor
 from .visualization import BoxAnnotator
 from .models import BoundingBox, UIElement, IconElement, TextElement, ParserMetadata, ParseResult
@@ -158,6 +158,8 @@ class OmniParser:
         )
         self.ocr = OCRProcessor()
         self.visualizer = BoxAnnotator()
+        # OCR runs on its own thread, concurrently with icon detection
+        self._ocr_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="som-ocr")
 
     def process_image(
         self,
@@ -165,6 +167,8 @@ class OmniParser:
         box_threshold: float = 0.3,
         iou_threshold: float = 0.1,
         use_ocr: bool = True,
+        ocr_session: Optional[str] = None,
+        ocr_timeout_seconds: float = 5,
     ) -> Tuple[Image.Image, List[UIElement]]:
         """Process an image to detect UI elements and optionally text.
 
@@ -173,122 +177,86 @@ class OmniParser:
             box_threshold: Confidence threshold for detection
             iou_threshold: IOU threshold for NMS
             use_ocr: Whether to enable OCR processing
+            ocr_session: If set, OCR only reads the parts of the image that changed since
+                         the previous image processed with the same session
+            ocr_timeout_seconds: Maximum time to wait for OCR; text is left out if it takes longer
 
         Returns:
             Tuple of (annotated image, list of detections)
         """
-        try:
-            logger.info("Starting UI element detection...")
+        return self.process_images(
+            [image],
+            box_threshold=box_threshold,
+            iou_threshold=iou_threshold,
+            use_ocr=use_ocr,
+            ocr_session=ocr_session,
+            ocr_timeout_seconds=ocr_timeout_seconds,
+        )[0]
+
+    def process_images(
+        self,
+        images: List[Image.Image],
+        box_threshold: float = 0.3,
+        iou_threshold: float = 0.1,
+        use_ocr: bool = True,
+        ocr_session: Optional[str] = None,
+        ocr_timeout_seconds: float = 5,
+    ) -> List[Tuple[Image.Image, List[UIElement]]]:
+        """Process several images, running icon detection over all of them in one batch.
 
-            # Detect icons
-            icon_detections = self.detector.detect_icons(
-                image=image, box_threshold=box_threshold, iou_threshold=iou_threshold
-            )
-            logger.info(f"Found {len(icon_detections)} interactive elements")
+        OCR runs on a separate worker while the icons are detected.
 
-            # Convert icon detections to typed objects
-            elements: List[UIElement] = cast(
-                List[UIElement],
-                [
-                    IconElement(
-                        id=i + 1,
-                        bbox=BoundingBox(
-                            x1=det["bbox"][0],
-                            y1=det["bbox"][1],
-                            x2=det["bbox"][2],
-                            y2=det["bbox"][3],
-                        ),
-                        confidence=det["confidence"],
-                        scale=det.get("scale"),
-                    )
-                    for i, det in enumerate(icon_detections)
-                ],
-            )
+        Args:
+            images: Input PIL Images
+            box_threshold: Confidence threshold for detection
+            iou_threshold: IOU threshold for NMS
+            use_ocr: Whether to enable OCR processing
+            ocr_session: If set, the images are successive frames of one session and OCR only
+                         reads the parts of each that changed since the previous frame
+            ocr_timeout_seconds: Maximum time OCR may take per image; text is left out of
+                                 images it doesn't finish in time
 
-            # Run OCR if enabled
+        Returns:
+            List of (annotated image, list of detections), one per image
+        """
+        try:
+            # Start OCR first so it runs while icons are detected
+            ocr_futures = []
+            ocr_started = time.monotonic()
             if use_ocr:
                 logger.info("Running OCR detection...")
-                text_detections = self.ocr.detect_text(image=image, confidence_threshold=0.5)
-                if text_detections is None:
-                    text_detections = []
-                logger.info(f"Found {len(text_detections)} text regions")
-
-                # Convert text detections to typed objects
-                text_elements = cast(
-                    List[UIElement],
-                    [
-                        TextElement(
-                            id=len(elements) + i + 1,
-                            bbox=BoundingBox(
-                                x1=det["bbox"][0],
-                                y1=det["bbox"][1],
-                                x2=det["bbox"][2],
-                                y2=det["bbox"][3],
-                            ),
-                            content=det["content"],
-                            confidence=det["confidence"],
-                        )
-                        for i, det in enumerate(text_detections)
-                    ],
-                )
-                
-                if elements and text_elements:
-                    # Filter out non-OCR elements that have OCR elements with center points colliding with them
-                    filtered_elements = []
-                    for elem in elements:  # elements at this point contains only non-OCR elements
-                        should_keep = True
-                        for text_elem in text_elements:
-                            # Calculate center point of the text element
-                            center_x = (text_elem.bbox.x1 + text_elem.bbox.x2) / 2
-                            center_y = (text_elem.bbox.y1 + text_elem.bbox.y2) / 2
-                            
-                            # Check if this center point is inside the non-OCR element
-                            if (center_x >= elem.bbox.x1 and center_x <= elem.bbox.x2 and 
-                                center_y >= elem.bbox.y1 and center_y <= elem.bbox.y2):
-                                should_keep = False
-                                break
-                        
-                        if should_keep:
-                            filtered_elements.append(elem)
-                    elements = filtered_elements
-                    
-                    # Merge detections using NMS
-                    all_elements = elements + text_elements
-                    boxes = torch.tensor([elem.bbox.coordinates for elem in all_elements])
-                    scores = torch.tensor([elem.confidence for elem in all_elements])
-                    keep_indices = torchvision.ops.nms(boxes, scores, iou_threshold)
-                    elements = [all_elements[i] for i in keep_indices]
-                else:
-                    # Just add text elements to the list if IOU doesn't need to be applied
-                    elements.extend(text_elements)
-
-            # Calculate drawing parameters based on image size
-            box_overlay_ratio = max(image.size) / 3200
-            draw_config = {
-                "font_size": int(12 * box_overlay_ratio),
-                "box_thickness": max(int(2 * box_overlay_ratio), 1),
-                "text_padding": max(int(3 * box_overlay_ratio), 1),
-            }
+                ocr_futures = [
+                    self._ocr_executor.submit(self._detect_text, image, ocr_session) for image in images
+                ]
 
-            # Convert elements back to dict format for visualization
-            detection_dicts = [
-                {
-                    "type": elem.type,
-                    "bbox": elem.bbox.coordinates,
-                    "confidence": elem.confidence,
-                    "content": elem.content if isinstance(elem, TextElement) else None,
-                }
-                for elem in elements
-            ]
+            logger.info("Starting UI element detection...")
 
-            # Create visualization
-            logger.info("Creating visualization...")
-            annotated_image = self.visualizer.draw_boxes(
-                image=image.copy(), detections=detection_dicts, draw_config=draw_config
+            # Detect icons
+            icon_batches = self.detector.detect_icons_batch(
+                images=images, box_threshold=box_threshold, iou_threshold=iou_threshold
             )
-            logger.info("Visualization complete")
 
-            return annotated_image, elements
+            results = []
+            for i, (image, icons) in enumerate(zip(images, icon_batches)):
+                logger.info(f"Found {len(icons.scores)} interactive elements")
+
+                text_detections: List[Dict[str, Any]] = []
+                if use_ocr:
+                    # OCR reads the images one after another, each within its own budget
+                    deadline = ocr_started + ocr_timeout_seconds * (i + 1)
+                    try:
+                        text_detections = (
+                            ocr_futures[i].result(timeout=max(0.0, deadline - time.monotonic())) or []
+                        )
+                        logger.info(f"Found {len(text_detections)} text regions")
+                    except FutureTimeoutError:
+                        ocr_futures[i].cancel()
+                        logger.warning(f"OCR timed out after {ocr_timeout_seconds}s; skipping text")
+
+                elements = self._merge_elements(icons, text_detections, iou_threshold)
+                results.append((self._annotate(image, elements), elements))
+
+            return results
 
         except Exception as e:
             logger.error(f"Error in process_image: {str(e)}")
@@ -297,12 +265,109 @@ class OmniParser:
             logger.error(traceback.format_exc())
             raise
 
+    def _detect_text(self, image: Image.Image, ocr_session: Optional[str]) -> List[Dict[str, Any]]:
+        if ocr_session is None:
+            return self.ocr.detect_text(image=image, confidence_threshold=0.5)
+        return self.ocr.detect_text_incremental(
+            image=image, session=ocr_session, confidence_threshold=0.5
+        )
+
+    def _merge_elements(
+        self,
+        icons: IconDetections,
+        text_detections: List[Dict[str, Any]],
+        iou_threshold: float,
+    ) -> List[UIElement]:
+        """Merge icon and text detections and build the typed elements.
+
+        Icons containing the center of a text box are dropped, then the remaining boxes
+        are merged with NMS. Only the boxes that survive are turned into elements.
+        """
+        icon_boxes, icon_scores, icon_scales = icons
+        text_boxes = as_boxes([det["bbox"] for det in text_detections])
+        text_scores = np.array([float(det["confidence"]) for det in text_detections])
+
+        if len(icon_boxes) and len(text_boxes):
+            # Filter out non-OCR elements that have OCR elements with center points colliding with them
+            kept_icons = ~contains_any_center(icon_boxes, text_boxes)
+            icon_boxes, icon_scores, icon_scales = (
+                icon_boxes[kept_icons],
+                icon_scores[kept_icons],
+                icon_scales[kept_icons],
+            )
+
+            # Merge detections using NMS
+            order = nms(
+                np.concatenate([icon_boxes, text_boxes]),
+                np.concatenate([icon_scores, text_scores]),
+                iou_threshold,
+            )
+        else:
+            # Just add text elements after the icons if IOU doesn't need to be applied
+            order = np.arange(len(icon_boxes) + len(text_boxes))
+
+        num_icons = len(icon_boxes)
+        elements: List[UIElement] = []
+        for i in order.tolist():
+            if i < num_icons:
+                x1, y1, x2, y2 = icon_boxes[i].tolist()
+                elements.append(
+                    IconElement(
+                        id=len(elements) + 1,
+                        bbox=BoundingBox(x1=x1, y1=y1, x2=x2, y2=y2),
+                        confidence=float(icon_scores[i]),
+                        scale=int(icon_scales[i]),
+                    )
+                )
+            else:
+                det = text_detections[i - num_icons]
+                x1, y1, x2, y2 = det["bbox"]
+                elements.append(
+                    TextElement(
+                        id=len(elements) + 1,
+                        bbox=BoundingBox(x1=x1, y1=y1, x2=x2, y2=y2),
+                        content=det["content"],
+                        confidence=det["confidence"],
+                    )
+                )
+        return elements
+
+    def _annotate(self, image: Image.Image, elements: List[UIElement]) -> Image.Image:
+        """Draw the element boxes and their numbers on a copy of the image."""
+        # Calculate drawing parameters based on image size
+        box_overlay_ratio = max(image.size) / 3200
+        draw_config = {
+            "font_size": int(12 * box_overlay_ratio),
+            "box_thickness": max(int(2 * box_overlay_ratio), 1),
+            "text_padding": max(int(3 * box_overlay_ratio), 1),
+        }
+
+        # Convert elements back to dict format for visualization
+        detection_dicts = [
+            {
+                "type": elem.type,
+                "bbox": elem.bbox.coordinates,
+                "confidence": elem.confidence,
+                "content": elem.content if isinstance(elem, TextElement) else None,
+            }
+            for elem in elements
+        ]
+
+        # Create visualization
+        logger.info("Creating visualization...")
+        annotated_image = self.visualizer.draw_boxes(
+            image=image.copy(), detections=detection_dicts, draw_config=draw_config
+        )
+        logger.info("Visualization complete")
+        return annotated_image
+
     def parse(
         self,
         screenshot_data: Union[bytes, str],
         box_threshold: float = 0.3,
         iou_threshold: float = 0.1,
         use_ocr: bool = True,
+        ocr_session: Optional[str] = None,
     ) -> ParseResult:
         """Parse a UI screenshot to detect interactive elements and text.
 
@@ -311,89 +376,66 @@ class OmniParser:
             box_threshold: Confidence threshold for detection
             iou_threshold: IOU threshold for NMS
             use_ocr: Whether to enable OCR processing
+            ocr_session: If set, OCR only reads the parts of the screenshot that changed since
+                         the previous screenshot parsed with the same session
 
         Returns:
             ParseResult object containing elements, annotated image, and metadata
         """
+        return self.parse_batch(
+            [screenshot_data],
+            box_threshold=box_threshold,
+            iou_threshold=iou_threshold,
+            use_ocr=use_ocr,
+            ocr_session=ocr_session,
+        )[0]
+
+    def parse_batch(
+        self,
+        screenshots: List[Union[bytes, str]],
+        box_threshold: float = 0.3,
+        iou_threshold: float = 0.1,
+        use_ocr: bool = True,
+        ocr_session: Optional[str] = None,
+    ) -> List[ParseResult]:
+        """Parse several UI screenshots, running icon detection over all of them in one batch.
+
+        Args:
+            screenshots: Raw bytes or base64 strings of the screenshots
+            box_threshold: Confidence threshold for detection
+            iou_threshold: IOU threshold for NMS
+            use_ocr: Whether to enable OCR processing
+            ocr_session: If set, the screenshots are successive frames of one session and OCR
+                         only reads the parts of each that changed since the previous frame
+
+        Returns:
+            ParseResult objects in the order of the screenshots. The latency in their
+            metadata is the time taken by the whole batch.
+        """
         try:
             start_time = time.time()
 
-            # Convert input to PIL Image
-            if isinstance(screenshot_data, str):
-                screenshot_data = base64.b64decode(screenshot_data)
-            image = Image.open(io.BytesIO(screenshot_data)).convert("RGB")
+            # Convert input to PIL Images
+            images = []
+            for screenshot_data in screenshots:
+                if isinstance(screenshot_data, str):
+                    screenshot_data = base64.b64decode(screenshot_data)
+                images.append(Image.open(io.BytesIO(screenshot_data)).convert("RGB"))
 
-            # Process image
-            annotated_image, elements = self.process_image(
-                image=image,
+            # Process images
+            processed = self.process_images(
+                images=images,
                 box_threshold=box_threshold,
                 iou_threshold=iou_threshold,
                 use_ocr=use_ocr,
+                ocr_session=ocr_session,
             )
 
-            # Convert annotated image to base64
-            buffered = io.BytesIO()
-            annotated_image.save(buffered, format="PNG")
-            annotated_image_base64 = base64.b64encode(buffered.getvalue()).decode("utf-8")
-
-            # Generate screen info text
-            screen_info = []
-            parsed_content_list = []
-
-            # Set element IDs and generate human-readable descriptions
-            for i, elem in enumerate(elements):
-                # Set the ID (1-indexed)
-                elem.id = i + 1
-
-                if isinstance(elem, IconElement):
-                    screen_info.append(
-                        f"Box #{i+1}: Icon (confidence={elem.confidence:.3f}, bbox={elem.bbox.coordinates})"
-                    )
-                    parsed_content_list.append(
-                        {
-                            "id": i + 1,
-                            "type": "icon",
-                            "bbox": elem.bbox.coordinates,
-                            "confidence": elem.confidence,
-                            "content": None,
-                        }
-                    )
-                elif isinstance(elem, TextElement):
-                    screen_info.append(
-                        f"Box #{i+1}: Text '{elem.content}' (confidence={elem.confidence:.3f}, bbox={elem.bbox.coordinates})"
-                    )
-                    parsed_content_list.append(
-                        {
-                            "id": i + 1,
-                            "type": "text",
-                            "bbox": elem.bbox.coordinates,
-                            "confidence": elem.confidence,
-                            "content": elem.content,
-                        }
-                    )
-
-            # Calculate metadata
             latency = time.time() - start_time
-            width, height = image.size
-
-            # Create ParseResult object with enhanced properties
-            result = ParseResult(
-                elements=elements,
-                annotated_image_base64=annotated_image_base64,
-                screen_info=screen_info,
-                parsed_content_list=parsed_content_list,
-                metadata=ParserMetadata(
-                    image_size=(width, height),
-                    num_icons=len([e for e in elements if isinstance(e, IconElement)]),
-                    num_text=len([e for e in elements if isinstance(e, TextElement)]),
-                    device=self.detector.device,
-                    ocr_enabled=use_ocr,
-                    latency=latency,
-                ),
-            )
-
-            # Return the ParseResult object directly
-            return result
+            return [
+                self._build_result(image, annotated_image, elements, use_ocr, latency)
+                for image, (annotated_image, elements) in zip(images, processed)
+            ]
 
         except Exception as e:
             logger.error(f"Error in parse: {str(e)}")
@@ -402,6 +444,75 @@ class OmniParser:
             logger.error(traceback.format_exc())
             raise
 
+    def _build_result(
+        self,
+        image: Image.Image,
+        annotated_image: Image.Image,
+        elements: List[UIElement],
+        use_ocr: bool,
+        latency: float,
+    ) -> ParseResult:
+        """Assemble the ParseResult for one processed image."""
+        # Convert annotated image to base64
+        buffered = io.BytesIO()
+        annotated_image.save(buffered, format="PNG")
+        annotated_image_base64 = base64.b64encode(buffered.getvalue()).decode("utf-8")
+
+        # Generate screen info text
+        screen_info = []
+        parsed_content_list = []
+
+        # Set element IDs and generate human-readable descriptions
+        for i, elem in enumerate(elements):
+            # Set the ID (1-indexed)
+            elem.id = i + 1
+
+            if isinstance(elem, IconElement):
+                screen_info.append(
+                    f"Box #{i+1}: Icon (confidence={elem.confidence:.3f}, bbox={elem.bbox.coordinates})"
+                )
+                parsed_content_list.append(
+                    {
+                        "id": i + 1,
+                        "type": "icon",
+                        "bbox": elem.bbox.coordinates,
+                        "confidence": elem.confidence,
+                        "content": None,
+                    }
+                )
+            elif isinstance(elem, TextElement):
+                screen_info.append(
+                    f"Box #{i+1}: Text '{elem.content}' (confidence={elem.confidence:.3f}, bbox={elem.bbox.coordinates})"
+                )
+                parsed_content_list.append(
+                    {
+                        "id": i + 1,
+                        "type": "text",
+                        "bbox": elem.bbox.coordinates,
+                        "confidence": elem.confidence,
+                        "content": elem.content,
+                    }
+                )
+
+        # Calculate metadata
+        width, height = image.size
+
+        # Create ParseResult object with enhanced properties
+        return ParseResult(
+            elements=elements,
+            annotated_image_base64=annotated_image_base64,
+            screen_info=screen_info,
+            parsed_content_list=parsed_content_list,
+            metadata=ParserMetadata(
+                image_size=(width, height),
+                num_icons=len([e for e in elements if isinstance(e, IconElement)]),
+                num_text=len([e for e in elements if isinstance(e, TextElement)]),
+                device=self.detector.device,
+                ocr_enabled=use_ocr,
+                latency=latency,
+            ),
+        )
+
 
 def main():
     """Command line interface for UI element detection."""
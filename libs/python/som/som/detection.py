@@ -1,16 +1,25 @@
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, NamedTuple
 import logging
 import torch
-import torchvision
 from PIL import Image
 import numpy as np
 from ultralytics import YOLO
 from huggingface_hub import hf_hub_download
 from pathlib import Path
 
+from .geometry import nms
+
 logger = logging.getLogger(__name__)
 
 
+class IconDetections(NamedTuple):
+    """Icon detections for one image as flat arrays."""
+
+    boxes: np.ndarray  # (N, 4) normalized [x1, y1, x2, y2]
+    scores: np.ndarray  # (N,)
+    scales: np.ndarray  # (N,) detection scale of each box
+
+
 class DetectionProcessor:
     """Class for handling YOLO-based icon detection."""
 
@@ -141,6 +150,38 @@ class DetectionProcessor:
         Returns:
             List of icon detection dictionaries
         """
+        detections = self.detect_icons_batch([image], box_threshold, iou_threshold, multi_scale)[0]
+        return [
+            {
+                "type": "icon",
+                "confidence": float(score),
+                "bbox": box.tolist(),
+                "scale": int(scale),
+                "interactivity": True,
+            }
+            for box, score, scale in zip(detections.boxes, detections.scores, detections.scales)
+        ]
+
+    def detect_icons_batch(
+        self,
+        images: List[Image.Image],
+        box_threshold: float = 0.05,
+        iou_threshold: float = 0.1,
+        multi_scale: bool = True,
+    ) -> List[IconDetections]:
+        """Detect icons in several images with one model forward pass per scale.
+
+        Args:
+            images: PIL Images to process
+            box_threshold: Confidence threshold for detection
+            iou_threshold: IOU threshold for NMS
+            multi_scale: Whether to use multi-scale detection
+
+        Returns:
+            Icon detections for each image, in decreasing order of confidence
+        """
+        empty = IconDetections(np.zeros((0, 4)), np.zeros(0), np.zeros(0, dtype=np.int64))
+
         # Load model if not already loaded
         if self.model is None:
             self.load_model()
@@ -148,10 +189,10 @@ class DetectionProcessor:
         # Double-check the model was successfully loaded
         if self.model is None:
             logger.error("Model failed to load and is still None")
-            return []  # Return empty list instead of crashing
+            return [empty for _ in images]  # Return no detections instead of crashing
 
-        img_width, img_height = image.size
-        all_detections = []
+        if not images:
+            return []
 
         # Define detection scales
         scales = (
@@ -167,6 +208,9 @@ class DetectionProcessor:
         if not multi_scale:
             scales = [scales[0]]
 
+        # Per image, the box/score/scale arrays found at each scale
+        found: List[List[IconDetections]] = [[] for _ in images]
+
         # Run detection at each scale
         for scale in scales:
             try:
@@ -175,7 +219,7 @@ class DetectionProcessor:
                     continue
 
                 results = self.model.predict(
-                    source=image,
+                    source=list(images),
                     conf=scale["conf"],
                     iou=iou_threshold,
                     max_det=1000,
@@ -186,8 +230,8 @@ class DetectionProcessor:
                     device=self.device,
                 )
 
-                # Process results
-                for r in results:
+                # Process results, one per image
+                for index, (image, r) in enumerate(zip(images, results)):
                     boxes = r.boxes
                     if not hasattr(boxes, "conf") or not hasattr(boxes, "xyxy"):
                         logger.warning("Boxes object missing expected attributes")
@@ -202,39 +246,32 @@ class DetectionProcessor:
                     if hasattr(coords, "cpu"):
                         coords = coords.cpu()
 
-                    for conf, bbox in zip(confidences, coords):
-                        # Normalize coordinates
-                        x1, y1, x2, y2 = bbox.tolist()
-                        norm_bbox = [
-                            x1 / img_width,
-                            y1 / img_height,
-                            x2 / img_width,
-                            y2 / img_height,
-                        ]
-
-                        all_detections.append(
-                            {
-                                "type": "icon",
-                                "confidence": conf.item(),
-                                "bbox": norm_bbox,
-                                "scale": scale["size"],
-                                "interactivity": True,
-                            }
+                    # Normalize coordinates
+                    img_width, img_height = image.size
+                    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 4)
+                    coords = coords / np.array([img_width, img_height, img_width, img_height])
+                    confidences = np.asarray(confidences, dtype=np.float64).reshape(-1)
+
+                    found[index].append(
+                        IconDetections(
+                            coords, confidences, np.full(len(confidences), scale["size"], dtype=np.int64)
                         )
+                    )
 
             except Exception as e:
                 logger.warning(f"Detection failed at scale {scale['size']}: {str(e)}")
                 continue
 
-        # Merge detections using NMS
-        if len(all_detections) > 0:
-            boxes = torch.tensor([d["bbox"] for d in all_detections])
-            scores = torch.tensor([d["confidence"] for d in all_detections])
-
-            keep_indices = torchvision.ops.nms(boxes, scores, iou_threshold)
-
-            merged_detections = [all_detections[i] for i in keep_indices]
-        else:
-            merged_detections = []
+        # Merge detections across scales using NMS
+        merged = []
+        for parts in found:
+            if not parts:
+                merged.append(empty)
+                continue
+            boxes = np.concatenate([p.boxes for p in parts])
+            scores = np.concatenate([p.scores for p in parts])
+            sizes = np.concatenate([p.scales for p in parts])
+            keep = nms(boxes, scores, iou_threshold)
+            merged.append(IconDetections(boxes[keep], scores[keep], sizes[keep]))
 
-        return merged_detections
+        return merged
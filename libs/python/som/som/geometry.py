@@ -0,0 +1,58 @@
+"""Array-based box geometry used to merge detections.
+
+Boxes are float arrays of shape (N, 4) in [x1, y1, x2, y2] order. Working on flat
+arrays keeps merging cheap on dense screens; elements are only turned into Pydantic
+models once the final set of boxes is known.
+"""
+
+import numpy as np
+
+
+def as_boxes(boxes) -> np.ndarray:
+    """Convert a sequence of [x1, y1, x2, y2] boxes to an (N, 4) float array."""
+    return np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+
+
+def box_area(boxes: np.ndarray) -> np.ndarray:
+    """Area of each box."""
+    return np.clip(boxes[:, 2] - boxes[:, 0], 0, None) * np.clip(boxes[:, 3] - boxes[:, 1], 0, None)
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """Greedy non-maximum suppression.
+
+    Matches torchvision.ops.nms: boxes overlapping a higher scoring kept box with an
+    IoU above the threshold are discarded.
+
+    Returns:
+        Indices of the kept boxes, in decreasing order of score
+    """
+    order = np.argsort(-scores, kind="stable")
+    areas = box_area(boxes)
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        top_left = np.maximum(boxes[i, :2], boxes[rest, :2])
+        bottom_right = np.minimum(boxes[i, 2:], boxes[rest, 2:])
+        wh = np.clip(bottom_right - top_left, 0, None)
+        intersection = wh[:, 0] * wh[:, 1]
+        union = areas[i] + areas[rest] - intersection
+        iou = np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def contains_any_center(boxes: np.ndarray, other: np.ndarray) -> np.ndarray:
+    """Mask of the boxes that contain the center point of at least one of the other boxes."""
+    if len(boxes) == 0 or len(other) == 0:
+        return np.zeros(len(boxes), dtype=bool)
+    centers = (other[:, :2] + other[:, 2:]) / 2
+    inside = (
+        (centers[None, :, 0] >= boxes[:, None, 0])
+        & (centers[None, :, 0] <= boxes[:, None, 2])
+        & (centers[None, :, 1] >= boxes[:, None, 1])
+        & (centers[None, :, 1] <= boxes[:, None, 3])
+    )
+    return inside.any(axis=1)
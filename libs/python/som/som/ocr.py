@@ -1,4 +1,5 @@
-from typing import List, Dict, Any, Tuple, Union
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, Union
 import logging
 import signal
 from contextlib import contextmanager
@@ -34,7 +35,7 @@ def timeout(seconds: int):
             signal.signal(signal.SIGALRM, original_handler)
     else:
         # In a non-main thread, we can't use signal
-        logger.warning("Timeout function called from non-main thread; signal-based timeout disabled")
+        logger.debug("Timeout function called from non-main thread; signal-based timeout disabled")
         try:
             yield
         finally:
@@ -46,9 +47,21 @@ class OCRProcessor:
 
     _shared_reader = None  # Class-level shared reader instance
 
+    # Incremental OCR: tile size in pixels, per-pixel grayscale difference that marks a
+    # tile as changed, the changed fraction above which the whole frame is read, and the
+    # padding in pixels added around changed regions
+    TILE_SIZE = 64
+    DIFF_THRESHOLD = 8
+    MAX_CHANGED_FRACTION = 0.5
+    REGION_PADDING = 8
+    # Number of sessions whose previous frame is kept
+    MAX_SESSIONS = 16
+
     def __init__(self):
         """Initialize the OCR processor."""
         self.reader = None
+        # session -> (grayscale frame, detections with pixel boxes)
+        self._sessions: "OrderedDict[str, Tuple[np.ndarray, List[Dict[str, Any]]]]" = OrderedDict()
         # Determine best available device
         self.device = "cpu"
         if torch.cuda.is_available():
@@ -109,60 +122,234 @@ class OCRProcessor:
             List of text detection dictionaries
         """
         try:
-            # Try to initialize reader, catch any exceptions
-            try:
-                self._ensure_reader()
-            except Exception as e:
-                logger.error(f"Failed to initialize OCR reader: {str(e)}")
-                return []
+            # Convert PIL Image to numpy array
+            image_np = np.array(image)
+            detections = self._read(image_np, confidence_threshold, timeout_seconds)
+            return self._normalize(detections or [], image.size)
+        except Exception as e:
+            logger.error(f"Unexpected error in OCR processing: {str(e)}")
+            return []
+
+    def detect_text_incremental(
+        self,
+        image: Image.Image,
+        session: str,
+        confidence_threshold: float = 0.5,
+        timeout_seconds: int = 5,
+    ) -> List[Dict[str, Any]]:
+        """Detect text, only reading the parts of the image that changed since the session's previous frame.
 
-            # Ensure reader was properly initialized
-            if self.reader is None:
-                logger.error("OCR reader is None after initialization")
-                return []
+        The frame is compared with the previous one in tiles of TILE_SIZE pixels. Text found
+        outside the changed tiles is reused from the previous frame; the changed regions
+        (grown to cover any cached text they touch) are read again. The first frame, frames
+        of a different size and frames that changed almost entirely are read in full.
 
-            # Convert PIL Image to numpy array
+        Args:
+            image: PIL Image to process
+            session: Identifies the sequence of frames (e.g. one agent) the image belongs to
+            confidence_threshold: Minimum confidence for text detection
+            timeout_seconds: Maximum time to wait for OCR
+
+        Returns:
+            List of text detection dictionaries
+        """
+        try:
             image_np = np.array(image)
+            gray = np.asarray(image.convert("L"), dtype=np.int16)
+            previous = self._sessions.pop(session, None)
 
-            try:
-                with timeout(timeout_seconds):
-                    results = self.reader.readtext(
-                        image_np, paragraph=False, text_threshold=confidence_threshold
-                    )
-            except TimeoutException:
-                logger.warning("OCR timed out")
-                return []
-            except Exception as e:
-                logger.warning(f"OCR failed: {str(e)}")
-                return []
-
-            detections = []
-            img_width, img_height = image.size
-
-            for box, text, conf in results:
-                # Ensure conf is float
-                conf_float = float(conf)
-                if conf_float < confidence_threshold:
-                    continue
-
-                # Convert box format to [x1, y1, x2, y2]
-                # Ensure box points are properly typed as float
-                x1 = min(float(point[0]) for point in box) / img_width
-                y1 = min(float(point[1]) for point in box) / img_height
-                x2 = max(float(point[0]) for point in box) / img_width
-                y2 = max(float(point[1]) for point in box) / img_height
-
-                detections.append(
-                    {
-                        "type": "text",
-                        "bbox": [x1, y1, x2, y2],
-                        "content": text,
-                        "confidence": conf,
-                        "interactivity": False,  # Text is typically non-interactive
-                    }
+            regions = None
+            if previous is not None and previous[0].shape == gray.shape:
+                regions = self._changed_regions(previous[0], gray)
+
+            if regions is None:
+                detections = self._read(image_np, confidence_threshold, timeout_seconds)
+            else:
+                detections = self._reread_regions(
+                    image_np, previous[1], regions, confidence_threshold, timeout_seconds
                 )
 
-            return detections
+            # Failed reads aren't cached, so the next frame is read in full
+            if detections is not None:
+                self._sessions[session] = (gray, detections)
+                while len(self._sessions) > self.MAX_SESSIONS:
+                    self._sessions.popitem(last=False)
+            return self._normalize(detections or [], image.size)
         except Exception as e:
             logger.error(f"Unexpected error in OCR processing: {str(e)}")
             return []
+
+    def _changed_regions(
+        self, previous: np.ndarray, current: np.ndarray
+    ) -> Optional[List[List[int]]]:
+        """Pixel rectangles [x1, y1, x2, y2] covering the tiles that differ between two frames.
+
+        Returns None if so much changed that reading the whole frame is cheaper.
+        """
+        height, width = current.shape
+        tile = self.TILE_SIZE
+        rows, cols = -(-height // tile), -(-width // tile)
+
+        # Max pixel difference per tile, padding the frame to whole tiles
+        diff = np.zeros((rows * tile, cols * tile), dtype=np.int16)
+        diff[:height, :width] = np.abs(current - previous)
+        changed = diff.reshape(rows, tile, cols, tile).max(axis=(1, 3)) > self.DIFF_THRESHOLD
+
+        if changed.mean() > self.MAX_CHANGED_FRACTION:
+            return None
+
+        # One rectangle per group of touching changed tiles
+        regions = []
+        seen = np.zeros_like(changed)
+        for row, col in zip(*np.nonzero(changed)):
+            if seen[row, col]:
+                continue
+            seen[row, col] = True
+            stack = [(row, col)]
+            r1, c1, r2, c2 = row, col, row, col
+            while stack:
+                r, c = stack.pop()
+                r1, c1, r2, c2 = min(r1, r), min(c1, c), max(r2, r), max(c2, c)
+                for nr in range(max(r - 1, 0), min(r + 2, rows)):
+                    for nc in range(max(c - 1, 0), min(c + 2, cols)):
+                        if changed[nr, nc] and not seen[nr, nc]:
+                            seen[nr, nc] = True
+                            stack.append((nr, nc))
+            # Pad a little so glyphs that end just past a changed tile are read whole
+            regions.append(
+                [
+                    max(c1 * tile - self.REGION_PADDING, 0),
+                    max(r1 * tile - self.REGION_PADDING, 0),
+                    min((c2 + 1) * tile + self.REGION_PADDING, width),
+                    min((r2 + 1) * tile + self.REGION_PADDING, height),
+                ]
+            )
+        return regions
+
+    def _reread_regions(
+        self,
+        image_np: np.ndarray,
+        cached: List[Dict[str, Any]],
+        regions: List[List[int]],
+        confidence_threshold: float,
+        timeout_seconds: int,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Reuse cached detections outside the changed regions and read the regions again."""
+
+        def overlaps(box: List[float], region: List[int]) -> bool:
+            return box[0] < region[2] and box[2] > region[0] and box[1] < region[3] and box[3] > region[1]
+
+        def union(a: List[float], b: List[float]) -> List[int]:
+            return [
+                int(min(a[0], b[0])),
+                int(min(a[1], b[1])),
+                int(np.ceil(max(a[2], b[2]))),
+                int(np.ceil(max(a[3], b[3]))),
+            ]
+
+        # Grow the regions over the cached text they cut through, so that text is read
+        # whole, and merge regions that end up overlapping so nothing is read twice
+        kept = list(cached)
+        changed = True
+        while changed:
+            changed = False
+            for i, region in enumerate(regions):
+                for det in kept:
+                    if overlaps(det["bbox"], region):
+                        region = regions[i] = union(region, det["bbox"])
+                        changed = True
+                kept = [det for det in kept if not overlaps(det["bbox"], region)]
+
+            merged: List[List[int]] = []
+            for region in regions:
+                for i, other in enumerate(merged):
+                    if overlaps(region, other):
+                        merged[i] = union(region, other)
+                        changed = True
+                        break
+                else:
+                    merged.append(region)
+            regions = merged
+
+        detections = kept
+        for x1, y1, x2, y2 in regions:
+            found = self._read(image_np[y1:y2, x1:x2], confidence_threshold, timeout_seconds)
+            if found is None:
+                return None
+            for det in found:
+                bx1, by1, bx2, by2 = det["bbox"]
+                det["bbox"] = [bx1 + x1, by1 + y1, bx2 + x1, by2 + y1]
+            detections.extend(found)
+        return detections
+
+    def _read(
+        self, image_np: np.ndarray, confidence_threshold: float, timeout_seconds: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Run EasyOCR on an image array.
+
+        Returns:
+            Detections with pixel bounding boxes, or None if OCR failed
+        """
+        # Try to initialize reader, catch any exceptions
+        try:
+            self._ensure_reader()
+        except Exception as e:
+            logger.error(f"Failed to initialize OCR reader: {str(e)}")
+            return None
+
+        # Ensure reader was properly initialized
+        if self.reader is None:
+            logger.error("OCR reader is None after initialization")
+            return None
+
+        if image_np.size == 0:
+            return []
+
+        try:
+            with timeout(timeout_seconds):
+                results = self.reader.readtext(
+                    image_np, paragraph=False, text_threshold=confidence_threshold
+                )
+        except TimeoutException:
+            logger.warning("OCR timed out")
+            return None
+        except Exception as e:
+            logger.warning(f"OCR failed: {str(e)}")
+            return None
+
+        detections = []
+        for box, text, conf in results:
+            # Ensure conf is float
+            conf_float = float(conf)
+            if conf_float < confidence_threshold:
+                continue
+
+            # Convert box format to [x1, y1, x2, y2]
+            # Ensure box points are properly typed as float
+            x1 = min(float(point[0]) for point in box)
+            y1 = min(float(point[1]) for point in box)
+            x2 = max(float(point[0]) for point in box)
+            y2 = max(float(point[1]) for point in box)
+
+            detections.append({"bbox": [x1, y1, x2, y2], "content": text, "confidence": conf})
+        return detections
+
+    @staticmethod
+    def _normalize(detections: List[Dict[str, Any]], size: Tuple[int, int]) -> List[Dict[str, Any]]:
+        """Build text detection dictionaries with normalized coordinates."""
+        img_width, img_height = size
+        return [
+            {
+                "type": "text",
+                "bbox": [
+                    det["bbox"][0] / img_width,
+                    det["bbox"][1] / img_height,
+                    det["bbox"][2] / img_width,
+                    det["bbox"][3] / img_height,
+                ],
+                "content": det["content"],
+                "confidence": det["confidence"],
+                "interactivity": False,  # Text is typically non-interactive
+            }
+            for det in detections
+        ]
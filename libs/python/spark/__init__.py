@@ -8,6 +8,12 @@ and autonomously explores new coding possibilities.
 __version__ = "0.1.0"
 __author__ = "Icarus"
 
-from spark.cli.main import main
+__all__ = ["main"]
 
-__all__ = ["main"]
\ No newline at end of file
+
+def __getattr__(name):
+    # Importing the CLI pulls in rich; only do it when main is actually requested
+    if name == "main":
+        from spark.cli.main import main
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
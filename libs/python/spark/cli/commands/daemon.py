@@ -0,0 +1,120 @@
+"""
+Spark daemon command implementation.
+
+Starts, stops and inspects the resident Spark daemon.
+"""
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import List
+
+from spark.cli.terminal import get_console
+from spark.cli.errors import handle_async_cli_error
+from spark.cli.daemon import (
+    DaemonClient, DaemonError, SparkDaemon, daemon_log_path, daemon_socket_path, start_daemon_process
+)
+
+
+class DaemonCommand:
+    """Implementation of the 'spark daemon' command."""
+
+    def __init__(self):
+        self.console = get_console()
+
+    @handle_async_cli_error
+    async def execute(self, args: List[str]) -> int:
+        """Execute the daemon command."""
+        action = args[0] if args else 'status'
+
+        if action in ('start', '--start'):
+            return await self._start()
+        elif action in ('stop', '--stop'):
+            return self._stop()
+        elif action in ('status', '--status'):
+            return self._status()
+        elif action == 'run':
+            # Foreground mode, used by 'start' and for debugging
+            logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+            return await SparkDaemon().serve()
+
+        self.help()
+        return 1
+
+    async def _start(self) -> int:
+        if self._ping():
+            self.console.print_info("Spark daemon is already running")
+            return 0
+
+        with self.console.create_spinner("Starting Spark daemon...") as spinner:
+            spinner.add_task("Starting Spark daemon...")
+            started = await asyncio.to_thread(start_daemon_process)
+
+        if not started:
+            self.console.print_error("Spark daemon did not start", f"See {daemon_log_path()}")
+            return 1
+        self.console.print_success("Spark daemon started", f"Listening on {daemon_socket_path()}")
+        return 0
+
+    def _stop(self) -> int:
+        try:
+            with DaemonClient() as client:
+                client.call('shutdown')
+        except DaemonError:
+            self.console.print_info("Spark daemon is not running")
+            return 0
+        self.console.print_success("Spark daemon stopped")
+        return 0
+
+    def _status(self) -> int:
+        try:
+            with DaemonClient() as client:
+                stats = client.call('stats')
+        except DaemonError:
+            self.console.print_info("Spark daemon is not running", "Start it with 'spark daemon start'")
+            return 1
+
+        scheduler = stats.get('scheduler') or {}
+        items = [
+            self._row('Process', True, f"pid {stats['pid']}, up {timedelta(seconds=int(stats['uptime_seconds']))}"),
+            self._row('Requests', True, f"{stats['requests_served']} served"),
+            self._row('Scheduler', scheduler.get('is_running', False),
+                      f"{scheduler.get('total_tasks', 0)} tasks, {scheduler.get('active_sessions', 0)} active sessions"),
+            self._row('File monitor', 'monitored_paths' in stats, f"{stats.get('monitored_paths', 0)} paths"),
+            self._row('Session events', bool(stats.get('event_server')), stats.get('event_server') or ''),
+        ]
+        self.console.print_status_table(items, title="Spark Daemon")
+        return 0
+
+    def _row(self, name: str, running: bool, details: str) -> dict:
+        theme = self.console.theme
+        return {
+            'name': name,
+            'icon': theme.STATUS_READY if running else theme.STATUS_PENDING,
+            'style': theme.SUCCESS if running else theme.DIM,
+            'details': details
+        }
+
+    def _ping(self) -> bool:
+        try:
+            with DaemonClient() as client:
+                return client.call('ping') == 'pong'
+        except DaemonError:
+            return False
+
+    def help(self) -> None:
+        """Show help for the daemon command."""
+        help_text = """
+[bold cyan]spark daemon[/bold cyan] - Keep Spark resident in the background
+
+[bold]Usage:[/bold]
+  spark daemon start             Start the daemon in the background
+  spark daemon stop              Stop the daemon
+  spark daemon status            Show what the daemon is running
+  spark daemon run               Run the daemon in the foreground
+
+While the daemon runs, it keeps the scheduler, file monitor and analysis caches warm,
+and [cyan]spark status[/cyan] and [cyan]spark show[/cyan] are answered by it. Without it, commands
+run in-process as usual. Set SPARK_NO_DAEMON=1 to bypass a running daemon.
+        """
+        self.console.console.print(help_text)
@@ -16,6 +16,7 @@ from spark.discovery.presenter import DiscoveryPresenter
 from spark.storage.discovery_storage import DiscoveryStorage
 from spark.storage.patterns import PatternStorage
 from spark.core.config import SparkConfig
+from spark.core.event_bus import EventBusServer
 
 
 class ExploreCommand:
@@ -204,22 +205,23 @@ class ExploreCommand:
             
             self.console.console.print(f"\n⚡ [bold]Executing autonomous explorations...[/bold]")
             
-            # Execute each goal
+            # Execute each goal, serving progress events to 'spark status --watch'
             successful_sessions = 0
-            for goal in goals:
-                try:
-                    session = await self.orchestrator.start_manual_exploration(
-                        goal=goal.title,
-                        approaches=None,  # Let it generate approaches
-                        language=goal.preferred_languages[0] if goal.preferred_languages else None,
-                        context={"autonomous": True, "goal_id": goal.id}
-                    )
+            async with EventBusServer(self.orchestrator.event_bus):
+                for goal in goals:
+                    try:
+                        session = await self.orchestrator.start_manual_exploration(
+                            goal=goal.title,
+                            approaches=None,  # Let it generate approaches
+                            language=goal.preferred_languages[0] if goal.preferred_languages else None,
+                            context={"autonomous": True, "goal_id": goal.id}
+                        )
+                        
+                        if session.is_successful():
+                            successful_sessions += 1
                     
-                    if session.is_successful():
-                        successful_sessions += 1
-                
-                except Exception as e:
-                    self.console.console.print(f"[red]Goal failed: {goal.title} - {str(e)}[/red]")
+                    except Exception as e:
+                        self.console.console.print(f"[red]Goal failed: {goal.title} - {str(e)}[/red]")
             
             # Show results
             self.console.console.print(f"\n✅ [bold]Autonomous exploration completed![/bold]")
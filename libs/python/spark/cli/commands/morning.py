@@ -363,7 +363,7 @@ class MorningCommand:
         if Confirm.ask("\n[bold]Confirm integration?[/bold]"):
             # Configure integration
             config = IntegrationConfig(
-                strategy=IntegrationStrategy.FEATURE_BRANCH,
+                strategy=IntegrationStrategy.WORKTREE,
                 create_backup=True,
                 run_tests=True,
                 confirmation_required=False  # Already confirmed
@@ -13,6 +13,7 @@ from spark.core.config import SparkConfig
 from spark.storage.pattern_storage import PatternStorage
 from spark.cli.terminal import get_console, SparkTheme
 from spark.cli.errors import handle_async_cli_error, SparkLearningError
+from spark.core.event_bus import default_socket_path, subscribe_remote
 
 # Enhanced pattern analysis components
 from spark.learning.style_analyzer import MultiLanguageStyleAnalyzer
@@ -64,8 +65,14 @@ class StatusCommand:
             confidence = '--confidence' in args or '-c' in args
             preferences = '--preferences' in args or '--prefs' in args
             sessions = '--sessions' in args or '-s' in args
-            
-            if interactive:
+            watch = '--watch' in args or '-w' in args
+            
+            if watch:
+                flag_index = args.index('--watch') if '--watch' in args else args.index('-w')
+                following = args[flag_index + 1:flag_index + 2]
+                session_id = following[0] if following and not following[0].startswith('-') else None
+                return await self._watch_explorations(session_id)
+            elif interactive:
                 return await self._show_interactive_status(config)
             elif patterns:
                 return await self._show_patterns(config)
@@ -455,7 +462,8 @@ class StatusCommand:
             dashboard_config = DashboardConfig(
                 refresh_interval=1.0,
                 enable_colors=True,
-                enable_animations=True
+                enable_animations=True,
+                database_path=config.get_database_path()
             )
             
             self.console.console.print("🚀 [bold]Starting interactive dashboard...[/bold]")
@@ -682,6 +690,52 @@ class StatusCommand:
             self.console.print_error("Failed to analyze sessions", str(e))
             return 1
     
+    async def _watch_explorations(self, session_id: Optional[str] = None) -> int:
+        """Stream events of a background exploration as they happen."""
+        socket_path = default_socket_path()
+        if not socket_path.exists():
+            self.console.print_error(
+                "No background exploration is running",
+                "Start one with 'spark explore --autonomous'"
+            )
+            return 1
+        
+        self.console.print_header("Exploration Events", "Press Ctrl+C to stop watching")
+        
+        # Running totals folded from the event stream
+        discoveries = 0
+        errors = 0
+        try:
+            async for event in subscribe_remote(socket_path, session_id=session_id):
+                time_str = datetime.fromtimestamp(event.timestamp).strftime('%H:%M:%S')
+                prefix = f"[dim]{time_str}[/dim] [cyan]{event.session_id[:8]}[/cyan]"
+                data = event.data
+                
+                if event.kind == 'checkpoint':
+                    message = f"{data.get('phase', '').replace('_', ' ')} ({data.get('progress_percentage', 0):.0f}%)"
+                elif event.kind == 'progress':
+                    if 'event_type' not in data:
+                        continue  # Resource samples
+                    message = data['event_type'].replace('_', ' ')
+                elif event.kind == 'discovery':
+                    discoveries += 1
+                    message = f"[green]discovery:[/green] {data.get('title', '')}"
+                elif event.kind == 'error':
+                    errors += 1
+                    message = f"[red]error:[/red] {data.get('error', '')}"
+                elif event.kind == 'complete':
+                    message = f"[bold]{data.get('outcome', 'completed')}[/bold]"
+                else:
+                    continue
+                
+                self.console.console.print(f"{prefix} {message} [dim]({discoveries} discoveries, {errors} errors)[/dim]")
+        except OSError as e:
+            self.console.print_error("Could not connect to the background exploration", str(e))
+            return 1
+        
+        self.console.console.print("[dim]Exploration finished[/dim]")
+        return 0
+    
     def _collect_git_analyses(self, config: SparkConfig) -> List[Dict[str, Any]]:
         """Collect git analysis data from repositories."""
         # Placeholder - would integrate with git analysis
@@ -723,6 +777,7 @@ class StatusCommand:
   spark status --preferences     Show developer preference analysis
   spark status --sessions        Show development session analysis
   spark status --interactive     Show real-time interactive dashboard
+  spark status --watch [id]      Stream events of a background exploration
 
 [bold]Options:[/bold]
   -d, --detailed                 Include detailed pattern analysis
@@ -731,6 +786,7 @@ class StatusCommand:
       --preferences, --prefs     Developer preference and learning analysis
   -s, --sessions                 Development session and rhythm analysis
   -i, --interactive              Real-time interactive dashboard
+  -w, --watch                    Follow exploration events as they happen
 
 [bold]Examples:[/bold]
   spark status                   # Quick status check
@@ -0,0 +1,360 @@
+"""
+Resident Spark daemon and its thin client.
+
+`spark daemon start` runs a background process that keeps the CLI commands (and the
+analyzers, storage handles and caches they hold), the exploration scheduler, the file
+monitor and the session event server alive between invocations. CLI invocations of
+read-only commands are forwarded to it over a Unix socket and print the output it
+renders; when no daemon is running they execute in-process as before.
+
+Protocol: each message is a 4 byte big-endian length followed by a UTF-8 JSON object.
+Requests are {"method": ..., "params": {...}}; responses are {"result": ...} or
+{"error": "..."}.
+"""
+
+import asyncio
+import io
+import json
+import logging
+import os
+import shutil
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Commands whose output doesn't depend on an interactive terminal
+DAEMON_COMMANDS = {'status', 'show'}
+INTERACTIVE_FLAGS = {'-i', '--interactive', '-w', '--watch'}
+
+_HEADER = struct.Struct('>I')
+
+
+class DaemonError(Exception):
+    """The daemon is unreachable or failed to handle a request."""
+
+
+def daemon_socket_path() -> Path:
+    return Path.home() / ".spark" / "daemon.sock"
+
+
+def daemon_log_path() -> Path:
+    return Path.home() / ".spark" / "daemon.log"
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    payload = json.dumps(message, separators=(',', ':'), default=str).encode('utf-8')
+    return _HEADER.pack(len(payload)) + payload
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise DaemonError("Daemon closed the connection")
+        data.extend(chunk)
+    return bytes(data)
+
+
+class DaemonClient:
+    """Blocking client for the daemon; cheap enough to use once per CLI invocation."""
+
+    def __init__(self, path: Optional[Path] = None, connect_timeout: float = 0.2, timeout: Optional[float] = 300.0):
+        """
+        Connect to the daemon.
+
+        Args:
+            path: Daemon socket path (daemon_socket_path() if None)
+            connect_timeout: Seconds to wait for the connection
+            timeout: Seconds to wait for each response (None waits indefinitely)
+
+        Raises:
+            DaemonError: If no daemon is listening
+        """
+        self.path = path or daemon_socket_path()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(connect_timeout)
+        try:
+            self._sock.connect(str(self.path))
+        except OSError as e:
+            self._sock.close()
+            raise DaemonError(f"Daemon not running: {e}") from e
+        self._sock.settimeout(timeout)
+
+    def call(self, method: str, **params) -> Any:
+        """Call a daemon method and return its result."""
+        try:
+            self._sock.sendall(encode_message({'method': method, 'params': params}))
+            (size,) = _HEADER.unpack(_recv_exactly(self._sock, _HEADER.size))
+            response = json.loads(_recv_exactly(self._sock, size))
+        except OSError as e:
+            raise DaemonError(f"Daemon connection failed: {e}") from e
+        if 'error' in response:
+            raise DaemonError(response['error'])
+        return response.get('result')
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def __enter__(self) -> 'DaemonClient':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def can_run_in_daemon(args: List[str]) -> bool:
+    """Whether a command line can be executed by the daemon."""
+    command = args[0] if args else 'status'
+    return command in DAEMON_COMMANDS and not INTERACTIVE_FLAGS.intersection(args)
+
+
+def run_in_daemon(args: List[str]) -> Optional[int]:
+    """
+    Execute a command line in the daemon and print its output.
+
+    Returns:
+        The command's exit code, or None if it must run in-process (the daemon isn't
+        running or the command is interactive)
+    """
+    if not can_run_in_daemon(args) or not daemon_socket_path().exists():
+        return None
+    try:
+        with DaemonClient() as client:
+            result = client.call(
+                'run',
+                args=args,
+                width=shutil.get_terminal_size().columns,
+                color=sys.stdout.isatty()
+            )
+    except DaemonError as e:
+        logger.debug(f"Running in-process: {e}")
+        return None
+    sys.stdout.write(result['output'])
+    sys.stdout.flush()
+    return result['exit_code']
+
+
+def start_daemon_process(timeout: float = 30.0) -> bool:
+    """
+    Start the daemon as a detached background process.
+
+    Returns:
+        True once the daemon answers, False if it didn't come up within the timeout
+    """
+    log_path = daemon_log_path()
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, 'a') as log_file:
+        subprocess.Popen(
+            [sys.executable, '-m', 'spark', 'daemon', 'run'],
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with DaemonClient() as client:
+                client.call('ping')
+                return True
+        except DaemonError:
+            time.sleep(0.1)
+    return False
+
+
+class SparkDaemon:
+    """Serves CLI commands from warm state and hosts long-running background services."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or daemon_socket_path()
+        self.started_at = time.time()
+        self.requests_served = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._run_lock: Optional[asyncio.Lock] = None
+
+        self.cli = None
+        self.scheduler = None
+        self.file_monitor = None
+        self.event_server = None
+
+    async def serve(self) -> int:
+        """Start the background services and serve requests until stopped."""
+        if self.path.exists():
+            try:
+                DaemonClient(self.path).close()
+                logger.error(f"Another daemon is already listening on {self.path}")
+                return 1
+            except DaemonError:
+                self.path.unlink()  # Left behind by a daemon that didn't shut down cleanly
+
+        self._stopped = asyncio.Event()
+        self._run_lock = asyncio.Lock()
+        await self._start_services()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._server = await asyncio.start_unix_server(self._handle_client, path=str(self.path))
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._stopped.set)
+        logger.info(f"Spark daemon listening on {self.path} (pid {os.getpid()})")
+
+        try:
+            await self._stopped.wait()
+        finally:
+            self._server.close()
+            await self._server.wait_closed()
+            self.path.unlink(missing_ok=True)
+            await self._stop_services()
+        return 0
+
+    async def _start_services(self) -> None:
+        from spark.cli.main import SparkCLI
+        from spark.core.config import SparkConfig
+        from spark.core.event_bus import EventBusServer
+
+        # Commands are constructed once and stay warm across requests
+        self.cli = SparkCLI()
+        for error in self.cli.commands.load_all():
+            logger.warning(f"{error.message}: {error.details}")
+
+        self.event_server = EventBusServer()
+        if not await self.event_server.start():
+            self.event_server = None
+
+        explore = self.cli.commands.loaded().get('explore')
+        if explore is not None:
+            self.scheduler = explore.scheduler
+            await self.scheduler.start_scheduler()
+
+        try:
+            from spark.learning.file_monitor import FileSystemMonitor
+            config = SparkConfig()
+            if config.is_initialized():
+                config.load()
+                self.file_monitor = FileSystemMonitor()
+                for repo_path in config.config.repositories:
+                    if Path(repo_path).exists():
+                        self.file_monitor.add_path(Path(repo_path), recursive=True)
+                self.file_monitor.start_monitoring()
+        except Exception as e:
+            logger.warning(f"File monitoring unavailable: {e}")
+            self.file_monitor = None
+
+    async def _stop_services(self) -> None:
+        if self.scheduler is not None:
+            await self.scheduler.stop_scheduler()
+        if self.file_monitor is not None:
+            self.file_monitor.stop_monitoring()
+        if self.event_server is not None:
+            await self.event_server.close()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(_HEADER.size)
+                    (size,) = _HEADER.unpack(header)
+                    request = json.loads(await reader.readexactly(size))
+                except asyncio.IncompleteReadError:
+                    return
+
+                try:
+                    handler = getattr(self, f"_rpc_{request.get('method')}", None)
+                    if handler is None:
+                        raise DaemonError(f"Unknown method: {request.get('method')}")
+                    response = {'result': await handler(**request.get('params', {}))}
+                except Exception as e:
+                    response = {'error': f"{type(e).__name__}: {e}"}
+
+                writer.write(encode_message(response))
+                await writer.drain()
+                self.requests_served += 1
+        except (ConnectionError, ValueError) as e:
+            logger.debug(f"Client connection error: {e}")
+        finally:
+            writer.close()
+
+    async def _rpc_ping(self) -> str:
+        return 'pong'
+
+    async def _rpc_run(self, args: List[str], width: int = 80, color: bool = False) -> Dict[str, Any]:
+        """Run a CLI command and return its rendered output."""
+        if not can_run_in_daemon(args):
+            raise DaemonError(f"Command can't run in the daemon: {' '.join(args)}")
+
+        from rich.console import Console
+
+        # Commands share console objects, so requests run one at a time
+        async with self._run_lock:
+            buffer = io.StringIO()
+            console = Console(
+                file=buffer,
+                width=width,
+                force_terminal=color,
+                color_system='auto' if color else None
+            )
+            swapped = self._swap_consoles(console)
+            try:
+                with redirect_stdout(buffer):
+                    exit_code = await self.cli.run(args)
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else 1
+            except Exception as e:
+                console.print(f"❌ [red]Unexpected error: {e}[/red]")
+                exit_code = 1
+            finally:
+                for owner, original in swapped:
+                    owner.console = original
+
+        return {'exit_code': exit_code or 0, 'output': buffer.getvalue()}
+
+    def _swap_consoles(self, console) -> List[Any]:
+        """Point the consoles of the CLI and its commands at a request's console."""
+        from spark.cli.terminal import SparkConsole, get_console
+
+        owners = [self.cli, get_console()]
+        for command in self.cli.commands.loaded().values():
+            for value in vars(command).values() if hasattr(command, '__dict__') else []:
+                if isinstance(value, SparkConsole):
+                    owners.append(value)
+                elif isinstance(getattr(value, 'console', None), SparkConsole):
+                    owners.append(value.console)  # e.g. a presenter held by the command
+
+        swapped = []
+        seen = set()
+        for owner in owners:
+            if id(owner) in seen:
+                continue
+            seen.add(id(owner))
+            swapped.append((owner, owner.console))
+            owner.console = console
+        return swapped
+
+    async def _rpc_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {
+            'pid': os.getpid(),
+            'uptime_seconds': time.time() - self.started_at,
+            'requests_served': self.requests_served,
+            'commands': sorted(self.cli.commands.loaded()),
+            'event_server': str(self.event_server.path) if self.event_server else None,
+        }
+        if self.scheduler is not None:
+            stats['scheduler'] = await self.scheduler.get_status()
+        if self.file_monitor is not None:
+            stats['monitored_paths'] = len(self.file_monitor.monitored_paths)
+        return stats
+
+    async def _rpc_shutdown(self) -> bool:
+        self._stopped.set()
+        return True
@@ -21,6 +21,7 @@ class SparkErrorCode(Enum):
     UNKNOWN_ERROR = "SPARK_E001"
     INITIALIZATION_FAILED = "SPARK_E002"
     CONFIGURATION_ERROR = "SPARK_E003"
+    COMMAND_UNAVAILABLE = "SPARK_E004"
     
     # Learning errors
     LEARNING_FAILED = "SPARK_E100"
@@ -111,6 +112,22 @@ class SparkConfigurationError(SparkError):
         )
 
 
+class SparkCommandUnavailableError(SparkError):
+    """Raised when a command's implementation can't be loaded."""
+    
+    def __init__(self, command: str, cause: Exception):
+        super().__init__(
+            f"Command '{command}' is unavailable",
+            SparkErrorCode.COMMAND_UNAVAILABLE,
+            f"{type(cause).__name__}: {cause}",
+            suggestions=[
+                "Check that Spark's dependencies are installed",
+                "Run 'spark help' for the available commands"
+            ],
+            cause=cause
+        )
+
+
 class SparkLearningError(SparkError):
     """Raised when learning operations fail."""
     
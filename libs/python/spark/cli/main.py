@@ -5,6 +5,7 @@ This module provides the primary command-line interface for Spark, implementing
 the terminal-native experience for AI-powered coding exploration.
 """
 
+import os
 import sys
 import asyncio
 import argparse
@@ -18,16 +19,10 @@ from rich.text import Text
 from rich.table import Table
 from rich import print as rprint
 
-# Defer command imports to setup for better resilience
-
-# Core Spark modules
-try:
-    from spark.core.config import SparkConfig
-    from spark.core.initialization import initialize_spark
-except ImportError:
-    # Graceful fallback during development
-    SparkConfig = None
-    initialize_spark = None
+# Commands and core modules are imported when a command needs them, so that light
+# commands (help, version, and status answered by the daemon) start quickly
+from spark.cli.registry import CommandRegistry
+from spark.cli.errors import SparkCommandUnavailableError, get_error_handler
 
 
 class SparkCLI:
@@ -40,50 +35,22 @@ class SparkCLI:
     def __init__(self):
         self.console = Console()
         self.config = None
-        self.commands = {}
         self._setup_commands()
     
     def _setup_commands(self) -> None:
-        """Setup command registry with per-command import isolation."""
-        # Import each command independently so one failure doesn't block others
-        try:
-            from spark.cli.commands.status import StatusCommand  # type: ignore
-            self.commands['status'] = StatusCommand()
-        except Exception:
-            pass
-        try:
-            from spark.cli.commands.learn import LearnCommand  # type: ignore
-            self.commands['learn'] = LearnCommand()
-        except Exception:
-            pass
-        try:
-            from spark.cli.commands.explore import ExploreCommand  # type: ignore
-            self.commands['explore'] = ExploreCommand()
-        except Exception:
-            pass
-        try:
-            from spark.cli.commands.morning import MorningCommand  # type: ignore
-            self.commands['morning'] = MorningCommand()
-        except Exception:
-            pass
-        try:
-            from spark.cli.commands.show import ShowCommand  # type: ignore
-            self.commands['show'] = ShowCommand()
-        except Exception:
-            pass
-        try:
-            from spark.cli.commands.rate import RateCommand  # type: ignore
-            self.commands['rate'] = RateCommand()
-        except Exception:
-            pass
-        
-        # Add built-in commands
-        self.commands['help'] = self._help_command
-        self.commands['version'] = self._version_command
+        """Setup the command registry; commands are imported when first dispatched."""
+        self.commands = CommandRegistry()
     
     async def _initialize_if_needed(self) -> bool:
         """Initialize Spark on first run if needed."""
         try:
+            try:
+                from spark.core.config import SparkConfig
+                from spark.core.initialization import initialize_spark
+            except ImportError:
+                # Graceful fallback during development
+                SparkConfig = initialize_spark = None
+            
             if SparkConfig and initialize_spark:
                 self.config = SparkConfig()
                 if not self.config.is_initialized():
@@ -134,9 +101,9 @@ class SparkCLI:
         if not args or args[0] in ['', 'status']:
             # Default command - show status and auto-initialize
             await self._initialize_if_needed()
-            if 'status' in self.commands:
-                return await self.commands['status'].execute([])
-            else:
+            try:
+                return await self.commands['status'].execute(args[1:])
+            except SparkCommandUnavailableError:
                 self._show_development_status()
                 return 0
         
@@ -151,11 +118,13 @@ class SparkCLI:
         
         # Handle main commands
         if command_name in self.commands:
+            try:
+                command = self.commands[command_name]
+            except SparkCommandUnavailableError as e:
+                get_error_handler().handle_error(e)
+                return 1
             await self._initialize_if_needed()
-            if hasattr(self.commands[command_name], 'execute'):
-                return await self.commands[command_name].execute(command_args)
-            else:
-                return self.commands[command_name](command_args)
+            return await command.execute(command_args)
         else:
             self.console.print(f"❌ [red]Unknown command: {command_name}[/red]")
             self._help_command([])
@@ -165,7 +134,11 @@ class SparkCLI:
         """Display help information."""
         if args and args[0] in self.commands:
             # Command-specific help
-            command = self.commands[args[0]]
+            try:
+                command = self.commands[args[0]]
+            except SparkCommandUnavailableError as e:
+                get_error_handler().handle_error(e)
+                return 1
             if hasattr(command, 'help'):
                 command.help()
                 return 0
@@ -178,12 +151,7 @@ class SparkCLI:
         
         commands_info = [
             ("spark", "Show status and auto-initialize on first run", "✅"),
-            ("spark learn", "Start/stop background learning from git and files", "🚧"),
-            ("spark status", "Display learning progress and detected patterns", "🚧"),
-            ("spark explore", "Plan and schedule autonomous exploration", "🚧"),
-            ("spark morning", "Browse overnight discoveries", "⏳"),
-            ("spark show", "Browse historical discoveries and patterns", "✅"),
-            ("spark rate", "Rate and provide feedback for discoveries", "✅"),
+            *((f"spark {spec.name}", spec.description, spec.status) for spec in self.commands.specs.values()),
             ("spark help", "Show this help message", "✅"),
             ("spark version", "Show version information", "✅"),
         ]
@@ -222,8 +190,16 @@ class SparkCLI:
 def main() -> int:
     """Main CLI entry point."""
     try:
-        cli = SparkCLI()
         args = sys.argv[1:]  # Remove script name
+        
+        # Let a running daemon answer from its warm state before building the CLI here
+        if not os.environ.get('SPARK_NO_DAEMON'):
+            from spark.cli.daemon import run_in_daemon
+            exit_code = run_in_daemon(args)
+            if exit_code is not None:
+                return exit_code
+        
+        cli = SparkCLI()
         return asyncio.run(cli.run(args))
     except KeyboardInterrupt:
         print("\n👋 Goodbye!")
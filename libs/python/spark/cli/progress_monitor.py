@@ -3,10 +3,14 @@ Real-time progress monitoring and visualization for exploration sessions.
 
 This module provides comprehensive progress tracking with rich terminal output,
 real-time updates, and detailed session monitoring capabilities.
+
+Metrics are folded incrementally from the session events published on the event bus,
+so an idle monitor waits on its subscription instead of polling trajectories.
 """
 
 import asyncio
 import time
+from pathlib import Path
 from typing import Dict, List, Any, Optional, Set
 from datetime import datetime, timedelta
 from dataclasses import dataclass
@@ -24,7 +28,8 @@ from rich.text import Text
 from rich.align import Align
 
 from spark.discovery.models import ExplorationSession, ExplorationStatus
-from spark.core.session_manager import SessionManager, SessionCheckpoint
+from spark.core.session_manager import SessionManager, SessionCheckpoint, SessionTrajectory
+from spark.core.event_bus import EventBus, SessionEvent, Subscription, subscribe_remote
 
 
 @dataclass
@@ -45,14 +50,24 @@ class ProgressMetrics:
 class ProgressMonitor:
     """Real-time progress monitoring for exploration sessions."""
     
-    def __init__(self, session_manager: SessionManager):
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        event_bus: Optional[EventBus] = None,
+        socket_path: Optional[Path] = None
+    ):
         """
         Initialize ProgressMonitor.
         
         Args:
             session_manager: SessionManager instance for tracking sessions
+            event_bus: Bus to receive session events from (the session manager's if None)
+            socket_path: If set, receive events from the process serving this Unix socket
+                         (e.g. a background exploration) instead of the local bus
         """
         self.session_manager = session_manager
+        self.event_bus = event_bus or (EventBus() if socket_path else session_manager.event_bus)
+        self.socket_path = socket_path
         self.console = Console()
         self.active_monitors: Dict[str, Dict[str, Any]] = {}
         self.monitoring_tasks: Dict[str, asyncio.Task] = {}
@@ -64,6 +79,8 @@ class ProgressMonitor:
         self.session_progress: Dict[str, Progress] = {}
         self.session_tasks: Dict[str, TaskID] = {}
         self.session_metrics: Dict[str, ProgressMetrics] = {}
+        self.subscriptions: Dict[str, Subscription] = {}
+        self.relay_tasks: Dict[str, asyncio.Task] = {}
         
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -133,6 +150,12 @@ class ProgressMonitor:
             resource_usage={}
         )
         
+        # Subscribe before seeding so that no event is missed, then fold the current state once
+        self.subscriptions[session_id] = self.event_bus.subscribe(session_id)
+        if self.socket_path:
+            self.relay_tasks[session_id] = asyncio.create_task(self._relay_remote_events(session_id))
+        self._seed_metrics(session_id, trajectory)
+        
         # Start monitoring task
         monitor_task = asyncio.create_task(
             self._monitor_session_loop(session_id)
@@ -156,6 +179,12 @@ class ProgressMonitor:
             self.monitoring_tasks[session_id].cancel()
             del self.monitoring_tasks[session_id]
         
+        # Stop receiving events
+        if session_id in self.relay_tasks:
+            self.relay_tasks.pop(session_id).cancel()
+        if session_id in self.subscriptions:
+            self.subscriptions.pop(session_id).close()
+        
         # Cleanup progress tracking
         if session_id in self.session_progress:
             self.session_progress[session_id].stop()
@@ -185,6 +214,12 @@ class ProgressMonitor:
             if session_id in self.monitoring_tasks:
                 self.monitoring_tasks[session_id].cancel()
             
+            if session_id in self.relay_tasks:
+                self.relay_tasks[session_id].cancel()
+            
+            if session_id in self.subscriptions:
+                self.event_bus.unsubscribe(self.subscriptions[session_id])
+            
             if session_id in self.session_progress:
                 self.session_progress[session_id].stop()
         
@@ -199,6 +234,8 @@ class ProgressMonitor:
         self.session_progress.clear()
         self.session_tasks.clear()
         self.session_metrics.clear()
+        self.subscriptions.clear()
+        self.relay_tasks.clear()
     
     async def get_session_status_summary(self, session_id: str) -> Dict[str, Any]:
         """Get comprehensive status summary for a session."""
@@ -229,9 +266,11 @@ class ProgressMonitor:
         if latest_checkpoint and latest_checkpoint.resource_usage:
             status['current_resource_usage'] = latest_checkpoint.resource_usage
         
-        # Add error information
-        total_errors = sum(len(cp.errors) for cp in trajectory.checkpoints)
-        status['total_errors'] = total_errors
+        # Add error information, folded from events while the session is monitored
+        if session_id in self.session_metrics:
+            status['total_errors'] = self.session_metrics[session_id].error_count
+        else:
+            status['total_errors'] = sum(len(cp.errors) for cp in trajectory.checkpoints)
         
         if latest_checkpoint and latest_checkpoint.errors:
             status['recent_errors'] = latest_checkpoint.errors
@@ -337,12 +376,22 @@ class ProgressMonitor:
         return layout
     
     async def _monitor_session_loop(self, session_id: str):
-        """Main monitoring loop for a session."""
+        """Main monitoring loop for a session, driven by its events."""
+        
+        subscription = self.subscriptions[session_id]
         
         try:
             while not self.shutdown_requested and session_id in self.active_monitors:
-                # Update session metrics
-                await self._update_session_metrics(session_id)
+                # Wake up without events only to advance the clock of a live display
+                timeout = self.update_interval if self.live_display else None
+                event = await subscription.get(timeout=timeout)
+                
+                if event is not None:
+                    self._fold_event(session_id, event)
+                elif timeout is None or subscription.closed:
+                    break
+                
+                self._update_time_metrics(session_id)
                 
                 # Update progress display
                 await self._update_progress_display(session_id)
@@ -351,52 +400,89 @@ class ProgressMonitor:
                 if self.live_display and self.live_display.is_started:
                     await self._update_live_display()
                 
-                await asyncio.sleep(self.update_interval)
-                
         except asyncio.CancelledError:
             pass  # Normal cancellation
         except Exception as e:
             self.console.print(f"[red]Monitoring error for session {session_id}: {e}[/red]")
     
-    async def _update_session_metrics(self, session_id: str):
-        """Update metrics for a monitored session."""
-        
-        trajectory = await self.session_manager.get_session_trajectory(session_id)
-        if not trajectory:
-            return
-        
-        monitor_data = self.active_monitors[session_id]
-        current_time = time.time()
+    async def _relay_remote_events(self, session_id: str):
+        """Forward events of a session from another process onto the local bus."""
+        try:
+            async for event in subscribe_remote(self.socket_path, session_id=session_id):
+                self.event_bus.publish(event)
+        except asyncio.CancelledError:
+            pass
+        except OSError as e:
+            self.console.print(f"[red]Lost connection to exploration events: {e}[/red]")
+        finally:
+            if session_id in self.subscriptions:
+                self.subscriptions[session_id].close()
+    
+    def _seed_metrics(self, session_id: str, trajectory: SessionTrajectory):
+        """Initialize metrics from the trajectory recorded before monitoring started."""
         
-        # Get latest checkpoint
+        metrics = self.session_metrics[session_id]
         latest_checkpoint = trajectory.checkpoints[-1] if trajectory.checkpoints else None
         
         if latest_checkpoint:
-            # Update progress metrics
-            metrics = self.session_metrics[session_id]
             metrics.phase = latest_checkpoint.phase
             metrics.progress_percentage = latest_checkpoint.progress_percentage
-            metrics.elapsed_time = current_time - monitor_data['start_time']
-            metrics.error_count = sum(len(cp.errors) for cp in trajectory.checkpoints)
-            metrics.discoveries_found = trajectory.discoveries_created
-            
-            # Update resource usage
             if latest_checkpoint.resource_usage:
                 metrics.resource_usage = latest_checkpoint.resource_usage.copy()
-            
-            # Calculate throughput if we have checkpoints
-            if len(trajectory.checkpoints) > 1:
-                checkpoint_rate = len(trajectory.checkpoints) / (metrics.elapsed_time / 60)  # per minute
-                metrics.throughput = checkpoint_rate
-            
-            # Estimate remaining time
-            if metrics.progress_percentage > 0:
-                remaining_progress = 100 - metrics.progress_percentage
-                time_per_percent = metrics.elapsed_time / metrics.progress_percentage
-                metrics.estimated_remaining = remaining_progress * time_per_percent
-        
-        monitor_data['last_update'] = current_time
-        monitor_data['checkpoint_count'] = len(trajectory.checkpoints) if trajectory else 0
+        
+        metrics.error_count = sum(len(cp.errors) for cp in trajectory.checkpoints)
+        metrics.discoveries_found = trajectory.discoveries_created
+        self.active_monitors[session_id]['checkpoint_count'] = len(trajectory.checkpoints)
+        self._update_time_metrics(session_id)
+    
+    def _fold_event(self, session_id: str, event: SessionEvent):
+        """Update metrics for a monitored session from one event."""
+        
+        monitor_data = self.active_monitors[session_id]
+        metrics = self.session_metrics[session_id]
+        data = event.data
+        
+        if event.kind == 'checkpoint':
+            metrics.phase = data.get('phase', metrics.phase)
+            metrics.progress_percentage = data.get('progress_percentage', metrics.progress_percentage)
+            metrics.error_count += len(data.get('errors') or [])
+            monitor_data['checkpoint_count'] += 1
+            monitor_data['phase_history'].append(metrics.phase)
+        elif event.kind == 'error':
+            metrics.error_count += 1
+        elif event.kind == 'discovery':
+            metrics.discoveries_found += 1
+        elif event.kind == 'progress':
+            progress = data.get('progress') or {}
+            metrics.phase = progress.get('phase', metrics.phase)
+            details = data.get('data') or {}
+            metrics.progress_percentage = details.get('progress_percentage', metrics.progress_percentage)
+        elif event.kind == 'complete':
+            metrics.phase = 'session_complete'
+            metrics.progress_percentage = 100.0
+            metrics.discoveries_found = max(metrics.discoveries_found, data.get('discoveries_created', 0))
+        
+        if data.get('resource_usage'):
+            metrics.resource_usage = dict(data['resource_usage'])
+        
+        monitor_data['last_update'] = time.time()
+    
+    def _update_time_metrics(self, session_id: str):
+        """Update the metrics derived from elapsed time."""
+        
+        monitor_data = self.active_monitors[session_id]
+        metrics = self.session_metrics[session_id]
+        metrics.elapsed_time = time.time() - monitor_data['start_time']
+        
+        # Calculate throughput if we have checkpoints
+        if monitor_data['checkpoint_count'] > 1 and metrics.elapsed_time > 0:
+            metrics.throughput = monitor_data['checkpoint_count'] / (metrics.elapsed_time / 60)  # per minute
+        
+        # Estimate remaining time
+        if metrics.progress_percentage > 0:
+            remaining_progress = 100 - metrics.progress_percentage
+            time_per_percent = metrics.elapsed_time / metrics.progress_percentage
+            metrics.estimated_remaining = remaining_progress * time_per_percent
     
     async def _update_progress_display(self, session_id: str):
         """Update the progress bar display for a session."""
@@ -0,0 +1,95 @@
+"""
+Declarative registry of Spark CLI commands.
+
+Commands are described by name, module and class, and are imported and constructed
+only when first dispatched. `spark help` and `spark version` therefore never pay for
+the exploration engine, the learning analyzers or their dependencies.
+"""
+
+import importlib
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Tuple
+
+from spark.cli.errors import SparkCommandUnavailableError
+
+
+@dataclass(frozen=True)
+class CommandSpec:
+    """Where a command lives and how it's listed in `spark help`."""
+    name: str
+    module: str
+    class_name: str
+    description: str
+    status: str = "✅"
+
+
+COMMAND_SPECS: Tuple[CommandSpec, ...] = (
+    CommandSpec('learn', 'spark.cli.commands.learn', 'LearnCommand',
+                "Start/stop background learning from git and files", "🚧"),
+    CommandSpec('status', 'spark.cli.commands.status', 'StatusCommand',
+                "Display learning progress and detected patterns", "🚧"),
+    CommandSpec('explore', 'spark.cli.commands.explore', 'ExploreCommand',
+                "Plan and schedule autonomous exploration", "🚧"),
+    CommandSpec('morning', 'spark.cli.commands.morning', 'MorningCommand',
+                "Browse overnight discoveries", "⏳"),
+    CommandSpec('show', 'spark.cli.commands.show', 'ShowCommand',
+                "Browse historical discoveries and patterns"),
+    CommandSpec('rate', 'spark.cli.commands.rate', 'RateCommand',
+                "Rate and provide feedback for discoveries"),
+    CommandSpec('daemon', 'spark.cli.commands.daemon', 'DaemonCommand',
+                "Keep Spark resident for fast commands"),
+)
+
+
+class CommandRegistry(Mapping):
+    """
+    Mapping of command names to command instances, resolved on first access.
+
+    Membership tests and iteration only consult the specs; indexing imports the
+    command's module and constructs it once. A command that fails to load raises
+    SparkCommandUnavailableError rather than silently disappearing.
+    """
+
+    def __init__(self, specs: Tuple[CommandSpec, ...] = COMMAND_SPECS):
+        self.specs: Dict[str, CommandSpec] = {spec.name: spec for spec in specs}
+        self._instances: Dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._instances:
+            spec = self.specs[name]  # KeyError for unknown commands
+            try:
+                module = importlib.import_module(spec.module)
+                command_class = getattr(module, spec.class_name)
+                self._instances[name] = command_class()
+            except Exception as e:
+                raise SparkCommandUnavailableError(name, e) from e
+        return self._instances[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.specs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.specs)
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def loaded(self) -> Dict[str, Any]:
+        """Commands constructed so far, by name."""
+        return dict(self._instances)
+
+    def load_all(self) -> List[SparkCommandUnavailableError]:
+        """
+        Construct every command, e.g. to keep them warm in a long-running process.
+
+        Returns:
+            Errors of the commands that couldn't be loaded
+        """
+        errors = []
+        for name in self.specs:
+            try:
+                self[name]
+            except SparkCommandUnavailableError as e:
+                errors.append(e)
+        return errors
@@ -11,10 +11,12 @@ from .dashboard import (
     DashboardMetrics,
     create_dashboard
 )
+from .renderer import DiffRenderer
 
 __all__ = [
     'InteractiveDashboard',
     'DashboardConfig', 
     'DashboardMetrics',
-    'create_dashboard'
+    'create_dashboard',
+    'DiffRenderer'
 ]
\ No newline at end of file
@@ -13,7 +13,7 @@ import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Set
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from collections import defaultdict, deque
 import json
 import logging
@@ -26,19 +26,14 @@ except ImportError:
     BLESSED_AVAILABLE = False
     blessed = None
 
-try:
-    import psutil
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
-    psutil = None
-
 from spark.cli.errors import SparkLearningError
+from spark.core.resource_sampler import PSUTIL_AVAILABLE, get_resource_sampler
 from spark.learning.style_analyzer import MultiLanguageStyleAnalyzer
 from spark.learning.confidence_scorer import MultiDimensionalConfidenceScorer
 from spark.learning.file_monitor import FileSystemMonitor
 from spark.learning.preference_mapper import PreferenceMapper
 from spark.storage.pattern_storage import PatternStorage
+from spark.cli.ui.renderer import DiffRenderer
 
 
 @dataclass
@@ -53,6 +48,7 @@ class DashboardConfig:
     compact_mode: bool = False
     auto_scroll: bool = True
     theme: str = "default"  # default, dark, light
+    database_path: Optional[Path] = None  # Pattern database; the storage default if None
 
 
 @dataclass
@@ -110,6 +106,7 @@ class InteractiveDashboard:
             )
         
         self.term = blessed.Terminal()
+        self.renderer = DiffRenderer(self.term)
         self.running = False
         self.paused = False
         
@@ -118,7 +115,7 @@ class InteractiveDashboard:
         self.confidence_scorer = MultiDimensionalConfidenceScorer()
         self.preference_mapper = PreferenceMapper()
         self.file_monitor: Optional[FileSystemMonitor] = None
-        self.pattern_storage = PatternStorage()
+        self.project_path: Optional[Path] = None
         
         # Dashboard state
         self.metrics = DashboardMetrics()
@@ -126,6 +123,15 @@ class InteractiveDashboard:
         self.last_update = datetime.now()
         self.update_thread: Optional[threading.Thread] = None
         
+        # Change notification: data sources request refreshes of the parts they affect
+        # and wake the update thread; the main loop redraws when the display changed
+        self._pending_refresh: Set[str] = set()
+        self._pending_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._display_changed = threading.Event()
+        self._database_stamp: Optional[tuple] = None
+        self._preference_profile: Optional[Dict[str, Any]] = None
+        
         # Display state
         self.current_view = "main"  # main, patterns, sessions, preferences, logs, help
         self.selected_index = 0
@@ -166,10 +172,13 @@ class InteractiveDashboard:
     def initialize(self, project_path: Path, watch_paths: List[Path] = None) -> bool:
         """Initialize dashboard with project monitoring."""
         try:
+            self.project_path = project_path
+            
             # Initialize file monitoring
             self.file_monitor = FileSystemMonitor(
                 pattern_update_callback=self._on_pattern_update
             )
+            self.file_monitor.add_change_listener(self._on_file_change)
             
             # Add project path to monitoring
             if not self.file_monitor.add_path(project_path, recursive=True):
@@ -189,7 +198,7 @@ class InteractiveDashboard:
             self._load_existing_patterns()
             
             # Initial metrics update
-            self._update_metrics()
+            self._update_metrics(refresh={'files'})
             
             self._log("Dashboard initialized successfully", "INFO", "dashboard")
             return True
@@ -230,6 +239,7 @@ class InteractiveDashboard:
             return
         
         self.running = False
+        self._wakeup.set()
         
         # Stop file monitoring
         if self.file_monitor:
@@ -247,18 +257,23 @@ class InteractiveDashboard:
     
     def _main_loop(self) -> None:
         """Main dashboard interaction loop."""
+        next_tick = 0.0
         while self.running:
             try:
-                # Clear screen and render
-                self._render_dashboard()
+                # Redraw when the data or the view changed, on resize, and once a second
+                # for the clocks; the renderer only rewrites the lines that differ
+                now = time.time()
+                resized = self.renderer.size != (self.term.width, self.term.height)
+                if self._display_changed.is_set() or resized or now >= next_tick:
+                    self._display_changed.clear()
+                    self._render_dashboard()
+                    next_tick = int(now) + 1
                 
                 # Handle input with timeout
-                key = self.term.inkey(timeout=0.5)
+                key = self.term.inkey(timeout=min(0.25, max(0.0, next_tick - time.time())))
                 if key:
                     self._handle_input(key)
-                
-                # Rate limiting
-                time.sleep(0.1)
+                    self._display_changed.set()
                 
             except Exception as e:
                 self._log(f"Main loop error: {e}", "ERROR", "dashboard")
@@ -288,8 +303,8 @@ class InteractiveDashboard:
         # Footer
         output.extend(self._render_footer())
         
-        # Output to terminal
-        print(self.term.clear + self.term.home + "\n".join(output), end="")
+        # Output the lines that changed since the last frame
+        self.renderer.render(output)
     
     def _render_header(self) -> List[str]:
         """Render dashboard header."""
@@ -529,7 +544,8 @@ class InteractiveDashboard:
             self._log(f"Dashboard {'paused' if self.paused else 'resumed'}", "INFO", "dashboard")
         
         elif key_str == "r":  # Refresh
-            self._update_metrics()
+            self._request_refresh('patterns', 'files')
+            self.renderer.invalidate()
             self._log("Dashboard refreshed", "INFO", "dashboard")
         
         elif key_str == "c":  # Toggle compact mode
@@ -546,53 +562,102 @@ class InteractiveDashboard:
             self.selected_index += 1
     
     def _background_update_loop(self) -> None:
-        """Background thread for updating metrics."""
+        """Background thread applying data changes to the metrics."""
         while self.running:
             try:
-                if not self.paused:
-                    self._update_metrics()
-                    self.last_update = datetime.now()
+                # Woken early by change notifications; the timeout picks up new
+                # resource samples and database writes from other processes
+                self._wakeup.wait(timeout=self.config.refresh_interval)
+                self._wakeup.clear()
+                if not self.running:
+                    break
                 
-                time.sleep(self.config.refresh_interval)
+                if not self.paused:
+                    with self._pending_lock:
+                        refresh = self._pending_refresh
+                        self._pending_refresh = set()
+                    if self._database_changed():
+                        refresh.add('patterns')
+                    self._update_metrics(refresh)
                 
             except Exception as e:
                 self._log(f"Background update error: {e}", "ERROR", "dashboard")
     
-    def _update_metrics(self) -> None:
-        """Update dashboard metrics."""
+    def _request_refresh(self, *parts: str) -> None:
+        """Ask the update thread to reload parts of the metrics ('patterns', 'files')."""
+        with self._pending_lock:
+            self._pending_refresh.update(parts)
+        self._wakeup.set()
+    
+    def _update_metrics(self, refresh: Optional[Set[str]] = None) -> None:
+        """
+        Update dashboard metrics.
+        
+        Args:
+            refresh: Data sources to reload: 'patterns' (pattern storage) and 'files'
+                (file monitor). Session and performance metrics are always updated.
+        """
+        refresh = refresh or set()
+        before = asdict(self.metrics)
         try:
-            # Update pattern confidence metrics
-            self._update_pattern_metrics()
-            
-            # Update session metrics
-            self._update_session_metrics()
+            if 'patterns' in refresh:
+                self._update_pattern_metrics()
+                self._update_exploration_metrics()
             
-            # Update file monitoring metrics
-            self._update_monitoring_metrics()
+            if 'files' in refresh:
+                self._update_monitoring_metrics()
             
-            # Update performance metrics
+            # Session duration and resource usage change continuously
+            self._update_session_metrics()
             self._update_performance_metrics()
             
-            # Update exploration suggestions
-            self._update_exploration_metrics()
-            
         except Exception as e:
             self._log(f"Error updating metrics: {e}", "ERROR", "dashboard")
+        
+        if asdict(self.metrics) != before:
+            self.last_update = datetime.now()
+            self._display_changed.set()
+    
+    def _open_storage(self) -> PatternStorage:
+        if self.config.database_path:
+            return PatternStorage(self.config.database_path)
+        return PatternStorage()
+    
+    def _database_changed(self) -> bool:
+        """Whether the pattern database was written since the last check."""
+        if not self.config.database_path:
+            return False
+        stamp = []
+        for path in (self.config.database_path, Path(f"{self.config.database_path}-wal")):
+            try:
+                stat = path.stat()
+                stamp.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamp.append(None)
+        stamp = tuple(stamp)
+        changed = self._database_stamp is not None and stamp != self._database_stamp
+        self._database_stamp = stamp
+        return changed
     
     def _update_pattern_metrics(self) -> None:
-        """Update pattern confidence metrics."""
-        # TODO: Implement when pattern storage integration is complete
-        self.metrics.total_patterns = 25  # Placeholder
-        self.metrics.high_confidence_patterns = 18  # Placeholder
-        
-        # Placeholder pattern confidence data
+        """Update pattern confidence metrics from pattern storage."""
+        with self._open_storage() as storage:
+            patterns = storage.get_patterns(min_confidence=0.0)
+            profiles = storage.get_preference_profiles(str(self.project_path)) if self.project_path else []
+        
+        confidence_by_type = defaultdict(list)
+        for pattern in patterns:
+            confidence_by_type[pattern['pattern_type']].append(pattern['confidence_score'])
+        
+        self.metrics.total_patterns = len(patterns)
+        self.metrics.high_confidence_patterns = sum(
+            1 for pattern in patterns if pattern['confidence_score'] >= 0.7
+        )
         self.metrics.pattern_confidence = {
-            "Style Patterns": 0.85,
-            "Naming Conventions": 0.72,
-            "Error Handling": 0.91,
-            "Testing Patterns": 0.63,
-            "Documentation": 0.45
+            f"{pattern_type.replace('_', ' ').title()} Patterns": sum(scores) / len(scores)
+            for pattern_type, scores in sorted(confidence_by_type.items())
         }
+        self._preference_profile = profiles[0] if profiles else None  # Latest profile
     
     def _update_session_metrics(self) -> None:
         """Update development session metrics."""
@@ -601,10 +666,11 @@ class InteractiveDashboard:
             current_session = rhythm.get('current_session', {})
             
             self.metrics.current_session_active = current_session.get('active', False)
-            self.metrics.session_duration = current_session.get('duration', 0)
+            self.metrics.session_duration = round(current_session.get('duration', 0), 1)
             self.metrics.session_changes = current_session.get('changes', 0)
-            # Placeholder for files count
-            self.metrics.session_files = max(1, self.metrics.session_changes // 3)
+            
+            session = self.file_monitor.current_session
+            self.metrics.session_files = len(session.files_modified) if session else 0
     
     def _update_monitoring_metrics(self) -> None:
         """Update file monitoring metrics."""
@@ -613,20 +679,14 @@ class InteractiveDashboard:
             self.metrics.files_watched = len(self.file_monitor.monitored_paths)
             self.metrics.events_processed = stats.events_processed
             self.metrics.last_activity = stats.last_activity
+            self.metrics.processing_latency = stats.event_processing_time_ms
     
     def _update_performance_metrics(self) -> None:
         """Update performance metrics."""
-        if PSUTIL_AVAILABLE:
-            try:
-                process = psutil.Process()
-                self.metrics.cpu_usage = process.cpu_percent()
-                self.metrics.memory_usage = process.memory_info().rss / 1024 / 1024  # MB
-                
-                # Placeholder for processing latency
-                self.metrics.processing_latency = 1.2
-                
-            except Exception as e:
-                self._log(f"Error updating performance metrics: {e}", "WARNING", "dashboard")
+        latest = get_resource_sampler().latest()
+        # Rounded to the displayed precision so noise doesn't count as a change
+        self.metrics.cpu_usage = round(latest['cpu_percent'], 1)
+        self.metrics.memory_usage = round(latest['memory_mb'], 1)
     
     def _update_exploration_metrics(self) -> None:
         """Update exploration readiness metrics."""
@@ -634,16 +694,22 @@ class InteractiveDashboard:
         if self.metrics.pattern_confidence:
             confidence_values = list(self.metrics.pattern_confidence.values())
             self.metrics.exploration_readiness = sum(confidence_values) / len(confidence_values)
+        else:
+            self.metrics.exploration_readiness = 0.0
         
-        # Placeholder suggestions
-        self.metrics.suggested_technologies = ["FastAPI", "Pytest", "Pydantic"]
-        self.metrics.learning_trajectory = "progressive"
+        # Suggestions and trajectory come from the latest preference profile
+        profile = self._preference_profile or {}
+        suggestions = profile.get('next_learning_suggestions') or profile.get('technology_preferences') or []
+        self.metrics.suggested_technologies = [str(item) for item in suggestions][:3]
+        self.metrics.learning_trajectory = profile.get('learning_style') or profile.get('adoption_style') or "stable"
     
     def _load_existing_patterns(self) -> None:
         """Load existing patterns from storage."""
         try:
-            # TODO: Implement when storage integration is ready
-            self._log("Loaded existing patterns", "INFO", "dashboard")
+            self._database_changed()  # Baseline for detecting later writes
+            self._update_pattern_metrics()
+            self._update_exploration_metrics()
+            self._log(f"Loaded {self.metrics.total_patterns} existing patterns", "INFO", "dashboard")
         except Exception as e:
             self._log(f"Error loading patterns: {e}", "WARNING", "dashboard")
     
@@ -651,13 +717,15 @@ class InteractiveDashboard:
         """Handle pattern update callback from file monitor."""
         try:
             self._log(f"Pattern update triggered by {len(events)} file changes", "INFO", "monitor")
-            
-            # Trigger pattern re-analysis
-            # TODO: Integrate with pattern analysis pipeline
+            self._request_refresh('patterns')
             
         except Exception as e:
             self._log(f"Error handling pattern update: {e}", "ERROR", "monitor")
     
+    def _on_file_change(self, event) -> None:
+        """Handle a single file change reported by the file monitor."""
+        self._request_refresh('files')
+    
     def _log(self, message: str, level: str, component: str) -> None:
         """Add entry to dashboard log."""
         entry = LogEntry(
@@ -667,6 +735,7 @@ class InteractiveDashboard:
             component=component
         )
         self.log_entries.append(entry)
+        self._display_changed.set()
         
         # Also log to standard logger
         getattr(self.logger, level.lower(), self.logger.info)(f"[{component}] {message}")
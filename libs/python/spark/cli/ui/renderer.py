@@ -0,0 +1,89 @@
+"""
+Retained-mode terminal renderer for full-screen Spark views.
+
+The renderer keeps the last frame it drew. Each new frame is compared line by line
+with it, and only the rows that changed are rewritten (cursor move, text, clear to end
+of line). The screen is cleared and fully redrawn only for the first frame, after a
+resize, or after invalidate(). An unchanged frame writes nothing at all, which keeps
+idle dashboards quiet over SSH.
+"""
+
+import sys
+from typing import List, Optional, Sequence, TextIO, Tuple
+
+
+class DiffRenderer:
+    """Draws frames of lines on a blessed terminal, writing only what changed."""
+
+    def __init__(self, term, stream: Optional[TextIO] = None):
+        """
+        Initialize the renderer.
+
+        Args:
+            term: blessed Terminal to draw on
+            stream: Output stream (stdout if None)
+        """
+        self.term = term
+        self.stream = stream or sys.stdout
+        self._frame: List[str] = []
+        self._size: Optional[Tuple[int, int]] = None
+
+        # Counters for diagnostics
+        self.frames_rendered = 0
+        self.lines_written = 0
+
+    @property
+    def size(self) -> Optional[Tuple[int, int]]:
+        """(width, height) the current frame was drawn for."""
+        return self._size
+
+    def invalidate(self) -> None:
+        """Force a full redraw on the next render."""
+        self._frame = []
+        self._size = None
+
+    def render(self, lines: Sequence[str]) -> int:
+        """
+        Draw a frame.
+
+        Args:
+            lines: Rows of the frame, top to bottom; may contain terminal sequences
+
+        Returns:
+            Number of rows rewritten
+        """
+        term = self.term
+        size = (term.width, term.height)
+        rows = [self._fit(line, size[0]) for line in lines[:size[1]]]
+
+        output = []
+        previous = self._frame
+        if size != self._size:
+            output.append(term.home + term.clear)
+            previous = []
+            self._size = size
+
+        changed = 0
+        for row, line in enumerate(rows):
+            if row < len(previous) and previous[row] == line:
+                continue
+            output.append(term.move_yx(row, 0) + line + term.normal + term.clear_eol)
+            changed += 1
+
+        # Blank the rows the previous frame used below this one
+        for row in range(len(rows), len(previous)):
+            output.append(term.move_yx(row, 0) + term.clear_eol)
+
+        self._frame = rows
+        self.frames_rendered += 1
+        if output:
+            self.stream.write("".join(output))
+            self.stream.flush()
+            self.lines_written += changed
+        return changed
+
+    def _fit(self, line: str, width: int) -> str:
+        """Clip a line to the terminal width so it never wraps onto the next row."""
+        if self.term.length(line) <= width:
+            return line
+        return self.term.truncate(line, width)
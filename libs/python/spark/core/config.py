@@ -27,6 +27,7 @@ except ImportError:
     tomli_w = None
 
 from spark.cli.errors import SparkConfigurationError, SparkInitializationError
+from spark.core.repo_discovery import RepositoryDiscovery, default_search_paths
 
 
 @dataclass
@@ -211,8 +212,14 @@ class SparkConfig:
         """Check if Spark configuration has been initialized."""
         return self.config_file.exists() and self.config_dir.is_dir()
     
-    def initialize(self) -> None:
-        """Initialize Spark configuration directory and files."""
+    def initialize(self, discover_repositories: bool = True) -> None:
+        """
+        Initialize Spark configuration directory and files.
+        
+        Args:
+            discover_repositories: Search for git repositories to monitor; pass False
+                when the caller already chose the repositories
+        """
         try:
             # Create config directory
             self.config_dir.mkdir(parents=True, exist_ok=True)
@@ -224,7 +231,8 @@ class SparkConfig:
             (self.config_dir / "backups").mkdir(exist_ok=True)
             
             # Discover git repositories
-            self._discover_repositories()
+            if discover_repositories:
+                self._discover_repositories()
             
             # Save default configuration
             self.save()
@@ -237,35 +245,8 @@ class SparkConfig:
     
     def _discover_repositories(self) -> None:
         """Automatically discover git repositories to monitor."""
-        common_code_dirs = [
-            Path.home() / "Code",
-            Path.home() / "code", 
-            Path.home() / "Projects",
-            Path.home() / "projects",
-            Path.home() / "Development",
-            Path.home() / "dev",
-            Path.home() / "src",
-            Path.home() / "workspace",
-            Path.home() / "Documents",
-        ]
-        
-        discovered_repos = []
-        
-        for base_dir in common_code_dirs:
-            if base_dir.exists():
-                # Look for git repositories up to 2 levels deep
-                for item in base_dir.rglob(".git"):
-                    if item.is_dir():
-                        repo_path = str(item.parent)
-                        if repo_path not in discovered_repos:
-                            discovered_repos.append(repo_path)
-                            
-                        # Don't go too deep to avoid performance issues
-                        if len(discovered_repos) >= 20:
-                            break
-            
-            if len(discovered_repos) >= 20:
-                break
+        discovery = RepositoryDiscovery(default_search_paths(), max_repos=20)
+        discovered_repos = [str(repo) for repo in discovery.discover()]
         
         self.config.repositories = discovered_repos[:10]  # Limit to 10 for initial setup
     
@@ -0,0 +1,300 @@
+"""
+Push-based event bus for exploration sessions.
+
+SessionManager and ExplorationOrchestrator publish typed session events (checkpoint,
+step, progress, discovery, error, complete) as they happen. Subscribers receive them
+from an asyncio queue, so a monitor waits without polling or re-reading trajectories.
+
+Other processes can subscribe over a local Unix socket: EventBusServer forwards events
+to connected clients as JSON lines, and subscribe_remote yields them on the client side.
+This is how `spark status --watch` attaches to an exploration running in the background.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+EVENT_KINDS = ('checkpoint', 'step', 'progress', 'discovery', 'error', 'complete')
+
+
+def default_socket_path() -> Path:
+    """Default path of the event socket of background explorations."""
+    return Path.home() / ".spark" / "events.sock"
+
+
+@dataclass
+class SessionEvent:
+    """An event published for an exploration session."""
+    kind: str  # One of EVENT_KINDS
+    session_id: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), default=str)
+
+    @classmethod
+    def from_json(cls, line: str) -> 'SessionEvent':
+        return cls(**json.loads(line))
+
+
+class Subscription:
+    """Async iterator over the events matching a subscription.
+
+    Events are buffered in a bounded queue. A subscriber that falls behind loses its
+    oldest events rather than slowing down publishers; `dropped` counts them.
+    """
+
+    def __init__(
+        self,
+        bus: 'EventBus',
+        session_id: Optional[str] = None,
+        kinds: Optional[Iterable[str]] = None,
+        max_queue: int = 1000
+    ):
+        self.bus = bus
+        self.session_id = session_id
+        self.kinds: Optional[Set[str]] = set(kinds) if kinds else None
+        self.dropped = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._loop = asyncio.get_running_loop()
+        self._closed = False
+
+    def matches(self, event: SessionEvent) -> bool:
+        return (
+            (self.session_id is None or event.session_id == self.session_id)
+            and (self.kinds is None or event.kind in self.kinds)
+        )
+
+    def _deliver(self, event: Optional[SessionEvent]):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    def put(self, event: Optional[SessionEvent]):
+        """Queue an event; safe to call from any thread."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._deliver(event)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._deliver, event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[SessionEvent]:
+        """
+        Wait for the next event.
+
+        Returns:
+            The next event, or None on timeout or once the subscription is closed
+        """
+        if self._closed and self._queue.empty():
+            return None
+        try:
+            event = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event is None:
+            self._closed = True
+        return event
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self):
+        """Stop receiving events; pending iteration ends after the queued events."""
+        self.bus.unsubscribe(self)
+        self.put(None)
+
+    def __aiter__(self) -> 'Subscription':
+        return self
+
+    async def __anext__(self) -> SessionEvent:
+        event = await self.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+
+class EventBus:
+    """In-process publish/subscribe hub for session events."""
+
+    def __init__(self):
+        self._subscriptions: List[Subscription] = []
+
+    def subscribe(
+        self,
+        session_id: Optional[str] = None,
+        kinds: Optional[Iterable[str]] = None,
+        max_queue: int = 1000
+    ) -> Subscription:
+        """
+        Subscribe to session events. Must be called from a running event loop.
+
+        Args:
+            session_id: Only receive events of this session (all sessions if None)
+            kinds: Only receive these event kinds (all kinds if None)
+            max_queue: Number of undelivered events kept for a slow subscriber
+
+        Returns:
+            Subscription to iterate over with `async for`
+        """
+        subscription = Subscription(self, session_id, kinds, max_queue)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def publish(self, event: SessionEvent):
+        """Deliver an event to matching subscribers without blocking."""
+        for subscription in list(self._subscriptions):
+            if subscription.matches(event):
+                subscription.put(event)
+
+    def emit(self, kind: str, session_id: str, data: Optional[Dict[str, Any]] = None):
+        """Publish an event built from its parts."""
+        if self._subscriptions:
+            self.publish(SessionEvent(kind=kind, session_id=session_id, data=data or {}))
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+
+_event_bus: Optional[EventBus] = None
+
+
+def get_event_bus() -> EventBus:
+    """Get the process-wide event bus."""
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = EventBus()
+    return _event_bus
+
+
+class EventBusServer:
+    """Serves events of a bus to other processes over a Unix socket.
+
+    A client connects, sends one JSON line {"session_id": ..., "kinds": [...]} (both
+    optional), and then receives matching events as JSON lines until it disconnects.
+    """
+
+    def __init__(self, bus: Optional[EventBus] = None, path: Optional[Path] = None):
+        self.bus = bus or get_event_bus()
+        self.path = Path(path) if path else default_socket_path()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clients: Set[asyncio.Task] = set()
+
+    async def start(self) -> bool:
+        """
+        Start listening.
+
+        Returns:
+            False if another live process is already serving on the socket
+        """
+        if self.path.exists():
+            if await _socket_alive(self.path):
+                return False
+            self.path.unlink()  # Left behind by a process that exited without cleanup
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._server = await asyncio.start_unix_server(self._handle_client, path=str(self.path))
+        return True
+
+    async def close(self):
+        if self._server is None:
+            return
+        self._server.close()
+        for task in list(self._clients):
+            task.cancel()
+        await self._server.wait_closed()
+        self._server = None
+        self.path.unlink(missing_ok=True)
+
+    async def __aenter__(self) -> 'EventBusServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._clients.add(task)
+        subscription = None
+        disconnected = None
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+            request = json.loads(line)
+            subscription = self.bus.subscribe(request.get('session_id'), request.get('kinds'))
+
+            # Clients send nothing after the request; EOF means they went away
+            disconnected = asyncio.ensure_future(reader.read())
+            disconnected.add_done_callback(lambda _: subscription.close())
+
+            async for event in subscription:
+                writer.write(event.to_json().encode('utf-8') + b'\n')
+                await writer.drain()
+        except (asyncio.CancelledError, ConnectionError, ValueError):
+            pass
+        finally:
+            if disconnected:
+                disconnected.cancel()
+            if subscription:
+                subscription.close()
+            self._clients.discard(task)
+            writer.close()
+
+
+async def subscribe_remote(
+    path: Optional[Path] = None,
+    session_id: Optional[str] = None,
+    kinds: Optional[Iterable[str]] = None
+) -> AsyncIterator[SessionEvent]:
+    """
+    Subscribe to the events of another process over its Unix socket.
+
+    Args:
+        path: Socket path (default_socket_path() if None)
+        session_id: Only receive events of this session
+        kinds: Only receive these event kinds
+
+    Yields:
+        Events until the serving process closes the connection
+    """
+    reader, writer = await asyncio.open_unix_connection(str(path or default_socket_path()))
+    try:
+        request = {'session_id': session_id, 'kinds': list(kinds) if kinds else None}
+        writer.write(json.dumps(request).encode('utf-8') + b'\n')
+        await writer.drain()
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            try:
+                yield SessionEvent.from_json(line)
+            except (ValueError, TypeError):
+                logger.debug(f"Skipping malformed event: {line!r}")
+    finally:
+        writer.close()
+
+
+async def _socket_alive(path: Path) -> bool:
+    try:
+        _, writer = await asyncio.open_unix_connection(str(path))
+    except (ConnectionError, OSError):
+        return False
+    writer.close()
+    return True
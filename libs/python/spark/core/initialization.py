@@ -12,6 +12,7 @@ from typing import List, Tuple, Dict, Any
 import shutil
 
 from spark.core.config import SparkConfig, SparkConfiguration
+from spark.core.repo_discovery import RepositoryDiscovery, default_search_paths
 from spark.cli.terminal import SparkConsole, SparkTheme
 from spark.cli.errors import SparkInitializationError
 
@@ -55,9 +56,9 @@ class SparkInitializer:
             else:
                 self.console.console.print("ℹ️ No git repositories found. You can add them later with 'spark learn --add <path>'")
             
-            # Initialize configuration
+            # Initialize configuration (repositories were chosen above)
             self.console.console.print("⚙️ [bold]Initializing configuration...[/bold]")
-            self.config.initialize()
+            self.config.initialize(discover_repositories=False)
             
             # Setup complete
             self._show_completion()
@@ -149,54 +150,23 @@ Let's get you set up in just a few moments...
     
     async def _discover_and_validate_repositories(self) -> List[str]:
         """Discover and validate git repositories."""
-        discovered = []
+        discovery = RepositoryDiscovery(default_search_paths(include_cwd=True), max_repos=15)
+        validations: List[Tuple[Path, asyncio.Task]] = []
         
-        # Common development directories
-        search_paths = [
-            Path.home() / "Code",
-            Path.home() / "code",
-            Path.home() / "Projects",
-            Path.home() / "projects",
-            Path.home() / "Development", 
-            Path.home() / "dev",
-            Path.home() / "src",
-            Path.home() / "workspace",
-            Path.home() / "Documents",
-            Path.cwd(),  # Current directory
-        ]
+        with self.console.create_spinner("Scanning for git repositories...") as spinner:
+            spinner.add_task("Scanning for git repositories...")
+            
+            # Validate repositories while the scan continues, and list them as they're found
+            async for repo_path in discovery.aiter_repositories():
+                validations.append((repo_path, asyncio.create_task(self._validate_git_repository(repo_path))))
+                spinner.console.print(f"  📂 [cyan]{self._get_relative_path(repo_path)}[/cyan]")
+            
+            valid = await asyncio.gather(*(task for _, task in validations))
         
-        with self.console.create_spinner("Scanning for git repositories..."):
-            for search_path in search_paths:
-                if not search_path.exists():
-                    continue
-                
-                # Look for .git directories
-                try:
-                    for git_dir in search_path.rglob(".git"):
-                        if git_dir.is_dir():
-                            repo_path = git_dir.parent
-                            
-                            # Validate it's a proper git repository
-                            if await self._validate_git_repository(repo_path):
-                                repo_str = str(repo_path)
-                                if repo_str not in discovered:
-                                    discovered.append(repo_str)
-                                    
-                                    # Don't scan too deep or take too long
-                                    if len(discovered) >= 15:
-                                        break
-                        
-                        # Limit search depth and time
-                        if len(discovered) >= 15:
-                            break
-                            
-                except (PermissionError, OSError):
-                    # Skip inaccessible directories
-                    continue
-                
-                if len(discovered) >= 15:
-                    break
+        if discovery.timed_out:
+            self.console.console.print("ℹ️ Stopped scanning early; add other repositories with 'spark learn --add <path>'")
         
+        discovered = [str(repo_path) for (repo_path, _), ok in zip(validations, valid) if ok]
         return discovered[:10]  # Return top 10
     
     async def _validate_git_repository(self, repo_path: Path) -> bool:
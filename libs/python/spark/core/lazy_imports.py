@@ -0,0 +1,63 @@
+"""
+Deferred imports for heavy optional dependencies.
+
+litellm and the CUA agent stack take seconds to import, and most CLI invocations
+never touch them. Modules check whether such a dependency is installed with
+module_available() (which does not import it) and either import it where it's used
+or bind it with lazy_module(), which imports it on first attribute access.
+"""
+
+import importlib
+import importlib.machinery
+import importlib.util
+from types import ModuleType
+from typing import Any, Optional
+
+
+def module_available(name: str) -> bool:
+    """
+    Whether a module can be found, without importing it or its parent packages.
+
+    Every component of a dotted name is looked up, so a top-level name that only
+    resolves to a namespace package (e.g. a source checkout on sys.path) doesn't count
+    as the submodule being installed. Transitive import errors only surface when the
+    module is actually imported, so callers still handle ImportError at the point of use.
+    """
+    parts = name.split('.')
+    try:
+        spec = importlib.util.find_spec(parts[0])
+        for depth in range(1, len(parts)):
+            if spec is None or spec.submodule_search_locations is None:
+                return False
+            spec = importlib.machinery.PathFinder.find_spec(
+                '.'.join(parts[:depth + 1]), list(spec.submodule_search_locations)
+            )
+    except (ImportError, ValueError):
+        return False
+    return spec is not None
+
+
+class LazyModule(ModuleType):
+    """Module placeholder that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module: Optional[ModuleType] = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+
+def lazy_module(name: str) -> Optional[LazyModule]:
+    """
+    Bind an optional module without importing it.
+
+    Returns:
+        A LazyModule for the module, or None if it isn't installed
+    """
+    return LazyModule(name) if module_available(name) else None
@@ -0,0 +1,210 @@
+"""
+Bounded, parallel discovery of git repositories.
+
+Walks the usual code directories under the home directory looking for git
+repositories, without letting a single huge directory stall first-run setup:
+
+- Each base directory is walked breadth-first up to a fixed depth, so shallow
+  repositories are found first.
+- Dependency, build and cache directories (node_modules, .venv, target, ...) and
+  hidden directories are never entered, and symlinks are not followed.
+- A repository's own tree is never searched for further repositories.
+- Base directories are scanned concurrently, and the whole search stops at a deadline
+  or once enough repositories were found.
+
+Repositories are yielded as they are found, so callers can show progress.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Directories under the home directory where code usually lives
+DEFAULT_SEARCH_DIRS = (
+    "Code", "code", "Projects", "projects", "Development", "dev", "src", "workspace", "Documents",
+)
+
+# Directories that hold dependencies, build output or caches rather than projects
+PRUNED_DIRS = frozenset({
+    "node_modules", "bower_components", "vendor", "venv", "env", "site-packages",
+    "__pycache__", "build", "dist", "target", "out", "DerivedData", "Pods",
+    "Library", "Applications", "Pictures", "Movies", "Music",
+})
+
+
+def default_search_paths(include_cwd: bool = False) -> List[Path]:
+    """
+    The existing common code directories under the home directory.
+
+    Args:
+        include_cwd: Also search the current working directory
+    """
+    home = Path.home()
+    paths = [home / name for name in DEFAULT_SEARCH_DIRS]
+    if include_cwd:
+        paths.append(Path.cwd())
+
+    # ~/Code and ~/code are the same directory on case-insensitive file systems
+    unique, seen = [], set()
+    for path in paths:
+        try:
+            resolved = path.resolve()
+        except OSError:
+            continue
+        if resolved not in seen and resolved.is_dir():
+            seen.add(resolved)
+            unique.append(path)
+    return unique
+
+
+class RepositoryDiscovery:
+    """Finds git repositories under a set of base directories."""
+
+    def __init__(
+        self,
+        search_paths: Iterable[Path],
+        max_depth: int = 3,
+        max_repos: int = 20,
+        timeout: float = 10.0,
+        max_workers: int = 4,
+        pruned_dirs: Iterable[str] = PRUNED_DIRS
+    ):
+        """
+        Configure a search.
+
+        Args:
+            search_paths: Base directories to search
+            max_depth: Deepest directory level below a base directory that can be a
+                repository (1 finds ~/Code/repo, 2 also ~/Code/org/repo, ...)
+            max_repos: Stop after finding this many repositories
+            timeout: Stop searching after this many seconds
+            max_workers: Number of base directories scanned concurrently
+            pruned_dirs: Directory names that are never entered
+        """
+        self.search_paths = [Path(path) for path in search_paths]
+        self.max_depth = max_depth
+        self.max_repos = max_repos
+        self.timeout = timeout
+        self.max_workers = max(1, max_workers)
+        self.pruned_dirs = frozenset(pruned_dirs)
+
+        self.timed_out = False
+        self.directories_scanned = 0
+        self._stop = threading.Event()
+
+    def cancel(self) -> None:
+        """Stop a running search."""
+        self._stop.set()
+
+    def discover(self) -> List[Path]:
+        """Run the search to completion and return the repositories found."""
+        return list(self.iter_repositories())
+
+    def iter_repositories(self) -> Iterator[Path]:
+        """Yield repositories as they are found."""
+        self._stop = threading.Event()
+        self.timed_out = False
+        self.directories_scanned = 0
+        if not self.search_paths:
+            return
+
+        found: queue.Queue = queue.Queue()
+        deadline = time.monotonic() + self.timeout
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(self.search_paths)),
+            thread_name_prefix="spark-repo-discovery"
+        )
+        futures = [executor.submit(self._scan, path, found) for path in self.search_paths]
+
+        seen: Set[Path] = set()
+        try:
+            while len(seen) < self.max_repos and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timed_out = True
+                    logger.info(f"Repository discovery stopped after {self.timeout}s")
+                    break
+                try:
+                    repo = found.get(timeout=min(remaining, 0.1))
+                except queue.Empty:
+                    if all(future.done() for future in futures) and found.empty():
+                        break
+                    continue
+
+                key = repo.resolve()
+                if key not in seen:  # Base directories may overlap (e.g. the cwd)
+                    seen.add(key)
+                    yield repo
+        finally:
+            self._stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def aiter_repositories(self) -> AsyncIterator[Path]:
+        """Yield repositories as they are found, without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        found: asyncio.Queue = asyncio.Queue()
+
+        def produce():
+            try:
+                for repo in self.iter_repositories():
+                    loop.call_soon_threadsafe(found.put_nowait, repo)
+            finally:
+                loop.call_soon_threadsafe(found.put_nowait, None)
+
+        producer = loop.run_in_executor(None, produce)
+        try:
+            while (repo := await found.get()) is not None:
+                yield repo
+        finally:
+            self.cancel()
+            await producer
+
+    def _scan(self, base: Path, found: queue.Queue) -> None:
+        """Breadth-first walk of one base directory, reporting repositories to found."""
+        level = [base]
+        for depth in range(self.max_depth + 1):
+            next_level = []
+            for directory in level:
+                if self._stop.is_set():
+                    return
+                subdirectories = self._list_directory(directory)
+                if subdirectories is None:
+                    found.put(directory)  # A repository; don't search inside it
+                elif depth < self.max_depth:
+                    next_level.extend(subdirectories)
+            if not next_level:
+                return
+            level = next_level
+
+    def _list_directory(self, directory: Path) -> Optional[List[Path]]:
+        """
+        List the subdirectories worth searching.
+
+        Returns:
+            None if the directory is a git repository, else its searchable subdirectories
+        """
+        self.directories_scanned += 1
+        subdirectories = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name == ".git":
+                        return None  # A directory, or a file in worktrees and submodules
+                    if entry.name.startswith(".") or entry.name in self.pruned_dirs:
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirectories.append(Path(entry.path))
+                    except OSError:
+                        continue
+        except OSError:
+            return []  # Unreadable; skip it
+        return subdirectories
@@ -0,0 +1,266 @@
+"""
+Shared background sampler of process and system resources.
+
+A single daemon thread samples psutil at a fixed cadence into fixed-size NumPy ring
+buffers. Consumers (the scheduler, session recording, dashboards) read from the buffers
+instead of calling psutil themselves, so they never block on it: the latest values are
+O(1), and windowed means, percentiles and peaks only touch the requested window.
+
+Per-session statistics are taken between two positions of the sampler: remember
+position() when a session starts and pass it to summarize() later.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+# Sampled metrics, in ring buffer column order
+METRICS = (
+    'cpu_percent',           # This process
+    'memory_mb',             # This process, RSS
+    'threads_count',         # This process
+    'io_read_mb',            # This process (or the system disks where unsupported), cumulative
+    'io_write_mb',           # Same, cumulative
+    'system_cpu_percent',
+    'system_memory_mb',
+    'system_memory_percent',
+    'battery_percent',
+    'temperature_celsius',
+)
+
+# Cumulative counters, summarized as the increase over a window instead of mean/peak
+COUNTERS = ('io_read_mb', 'io_write_mb')
+
+# Values reported before the first sample or without psutil
+DEFAULTS = {
+    'cpu_percent': 0.0,
+    'memory_mb': 0.0,
+    'threads_count': 1.0,
+    'io_read_mb': 0.0,
+    'io_write_mb': 0.0,
+    'system_cpu_percent': 0.0,
+    'system_memory_mb': 0.0,
+    'system_memory_percent': 0.0,
+    'battery_percent': 100.0,
+    'temperature_celsius': 0.0,
+}
+
+_COLUMNS = {metric: i for i, metric in enumerate(METRICS)}
+
+
+class ResourceSampler:
+    """Samples resources on a background thread into ring buffers."""
+
+    def __init__(self, interval: float = 1.0, capacity: int = 3600, sensor_every: int = 10):
+        """
+        Initialize the sampler. Call start() to begin sampling.
+
+        Args:
+            interval: Seconds between samples
+            capacity: Number of samples kept (one hour at the default interval)
+            sensor_every: Read battery and temperature sensors every this many samples
+        """
+        self.interval = interval
+        self.capacity = capacity
+        self.sensor_every = max(1, sensor_every)
+
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._values = np.zeros((capacity, len(METRICS)), dtype=np.float64)
+        self._count = 0  # Total samples taken; the next one goes to _count % capacity
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._process = psutil.Process() if PSUTIL_AVAILABLE else None
+        self._sensors = (DEFAULTS['battery_percent'], DEFAULTS['temperature_celsius'])
+
+    def start(self) -> None:
+        """Start the sampling thread if it isn't running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="spark-resource-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the sampling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def _run(self) -> None:
+        if not PSUTIL_AVAILABLE:
+            logger.warning("psutil not available, resource readings will use defaults")
+            return
+
+        # cpu_percent(None) measures since the previous call; the first call starts the window
+        self._process.cpu_percent(None)
+        psutil.cpu_percent(None)
+
+        tick = 0
+        while not self._stop.wait(self.interval if tick else 0.1):
+            try:
+                row = self._sample(read_sensors=tick % self.sensor_every == 0)
+            except Exception as e:
+                logger.debug(f"Resource sample failed: {e}")
+                continue
+            with self._lock:
+                index = self._count % self.capacity
+                self._times[index] = time.time()
+                self._values[index] = row
+                self._count += 1
+            tick += 1
+
+    def _sample(self, read_sensors: bool) -> List[float]:
+        process = self._process
+        with process.oneshot():
+            cpu_percent = process.cpu_percent(None)
+            memory_mb = process.memory_info().rss / 1024 / 1024
+            threads_count = process.num_threads()
+
+        try:
+            io = process.io_counters()
+        except (AttributeError, psutil.Error):
+            io = psutil.disk_io_counters()  # Not available per process on macOS
+        io_read_mb = io.read_bytes / 1024 / 1024 if io else 0.0
+        io_write_mb = io.write_bytes / 1024 / 1024 if io else 0.0
+
+        memory = psutil.virtual_memory()
+
+        if read_sensors:
+            self._sensors = _read_sensors()
+        battery_percent, temperature_celsius = self._sensors
+
+        return [
+            cpu_percent,
+            memory_mb,
+            threads_count,
+            io_read_mb,
+            io_write_mb,
+            psutil.cpu_percent(None),
+            memory.used / 1024 / 1024,
+            memory.percent,
+            battery_percent,
+            temperature_celsius,
+        ]
+
+    def position(self) -> int:
+        """Number of samples taken so far; marks a point in time for summarize()."""
+        return self._count
+
+    def latest(self) -> Dict[str, float]:
+        """Most recent value of every metric."""
+        with self._lock:
+            if self._count == 0:
+                return dict(DEFAULTS)
+            row = self._values[(self._count - 1) % self.capacity].copy()
+        return dict(zip(METRICS, row.tolist()))
+
+    def _rows(self, start: int) -> np.ndarray:
+        """Samples taken since position start that are still buffered, oldest first."""
+        with self._lock:
+            start = max(start, self._count - self.capacity)
+            if start >= self._count:
+                return np.empty((0, len(METRICS)))
+            indices = np.arange(start, self._count) % self.capacity
+            return self._values[indices]
+
+    def window(self, seconds: float) -> np.ndarray:
+        """Samples of the last given seconds as an (N, len(METRICS)) array, oldest first."""
+        with self._lock:
+            available = min(self._count, self.capacity)
+            if available == 0:
+                return np.empty((0, len(METRICS)))
+            indices = np.arange(self._count - available, self._count) % self.capacity
+            times = self._times[indices]
+            first = np.searchsorted(times, time.time() - seconds)
+            return self._values[indices[first:]]
+
+    def mean(self, metric: str, seconds: float) -> float:
+        """Mean of a metric over the last given seconds (its latest value if no samples)."""
+        values = self.window(seconds)[:, _COLUMNS[metric]]
+        return float(values.mean()) if len(values) else self.latest()[metric]
+
+    def percentile(self, metric: str, q: float, seconds: float) -> float:
+        """Percentile q (0-100) of a metric over the last given seconds."""
+        values = self.window(seconds)[:, _COLUMNS[metric]]
+        return float(np.percentile(values, q)) if len(values) else self.latest()[metric]
+
+    def peak(self, metric: str, seconds: float) -> float:
+        """Maximum of a metric over the last given seconds."""
+        values = self.window(seconds)[:, _COLUMNS[metric]]
+        return float(values.max()) if len(values) else self.latest()[metric]
+
+    def summarize(self, start: int) -> Dict[str, float]:
+        """
+        Summarize the samples taken since a position returned by position().
+
+        Returns:
+            '<metric>_avg' and '<metric>_peak' for this process's gauges, the increase of
+            the I/O counters, and the number of samples summarized
+        """
+        rows = self._rows(start)
+        summary: Dict[str, float] = {'samples': float(len(rows))}
+        if len(rows) == 0:
+            return summary
+
+        for metric in ('cpu_percent', 'memory_mb', 'threads_count'):
+            column = rows[:, _COLUMNS[metric]]
+            summary[f'{metric}_avg'] = float(column.mean())
+            summary[f'{metric}_peak'] = float(column.max())
+        for metric in COUNTERS:
+            column = rows[:, _COLUMNS[metric]]
+            summary[metric] = float(column[-1] - column[0])
+        return summary
+
+
+def _read_sensors():
+    """Read battery percentage and CPU temperature where the platform reports them."""
+    battery_percent = DEFAULTS['battery_percent']
+    try:
+        battery = psutil.sensors_battery()
+        if battery:
+            battery_percent = battery.percent
+    except (AttributeError, OSError):
+        pass
+
+    temperature_celsius = DEFAULTS['temperature_celsius']
+    try:
+        temps = psutil.sensors_temperatures()
+        if temps:
+            # Get first available CPU temperature
+            for name, entries in temps.items():
+                if ('cpu' in name.lower() or 'core' in name.lower()) and entries:
+                    temperature_celsius = entries[0].current
+                    break
+    except (AttributeError, OSError):
+        pass
+
+    return battery_percent, temperature_celsius
+
+
+_sampler: Optional[ResourceSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_resource_sampler() -> ResourceSampler:
+    """Get the process-wide sampler, starting it on first use."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = ResourceSampler()
+            _sampler.start()
+    return _sampler
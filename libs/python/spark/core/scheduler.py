@@ -3,14 +3,20 @@ Exploration scheduling system with cron-like capabilities.
 
 This module provides cross-platform scheduling for autonomous exploration sessions
 with resource management and adaptive time control.
+
+The scheduler keeps a min-heap of next run times and sleeps until the earliest one,
+waking early when tasks are added, paused or resumed. Due tasks are launched
+concurrently under a global cap and gated on readings of the shared resource sampler.
 """
 
 import asyncio
+import heapq
 import json
+import os
 import uuid
 import time
 import platform
-from typing import Dict, List, Optional, Callable, Any, Set
+from typing import Dict, List, Optional, Callable, Any, Set, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field, asdict
 from enum import Enum
@@ -18,6 +24,7 @@ from pathlib import Path
 import logging
 
 from spark.core.config import SparkConfig
+from spark.core.resource_sampler import ResourceSampler, get_resource_sampler
 
 
 class ScheduleType(Enum):
@@ -116,77 +123,58 @@ class ScheduledTask:
 
 
 class ResourceMonitor:
-    """Monitors system resources for exploration scheduling."""
+    """Monitors system resources for exploration scheduling.
     
-    def __init__(self):
+    Readings come from the shared resource sampler, so checks never block on psutil.
+    CPU usage is averaged over a short window so a momentary spike doesn't hold tasks back.
+    """
+    
+    def __init__(self, sampler: Optional[ResourceSampler] = None, cpu_window: float = 10.0):
+        """
+        Initialize ResourceMonitor.
+        
+        Args:
+            sampler: Resource sampler to read from (the process-wide sampler if None)
+            cpu_window: Seconds of CPU samples averaged when checking the CPU limit
+        """
         self.logger = logging.getLogger(__name__)
+        self.sampler = sampler or get_resource_sampler()
+        self.cpu_window = cpu_window
+    
+    async def get_readings(self) -> Dict[str, Any]:
+        """Get current system resource readings."""
+        
+        latest = self.sampler.latest()
+        return {
+            'cpu_percent': self.sampler.mean('system_cpu_percent', self.cpu_window),
+            'memory_percent': latest['system_memory_percent'],
+            'memory_mb': int(latest['system_memory_mb']),
+            'battery_percent': latest['battery_percent'],
+            'temperature_celsius': latest['temperature_celsius']
+        }
     
     async def check_resources(self, limits: ResourceLimits) -> Dict[str, Any]:
         """Check current system resources against limits."""
         
-        try:
-            import psutil
-        except ImportError:
-            # Fallback if psutil not available
-            self.logger.warning("psutil not available, using basic resource monitoring")
-            return {
-                'cpu_percent': 0.0,
-                'memory_percent': 0.0,
-                'memory_mb': 0,
-                'battery_percent': 100,
-                'temperature_celsius': 0,
-                'within_limits': True,
-                'limiting_factors': []
-            }
-        
-        # Get current resource usage
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        
-        # Battery status (may not be available on desktop)
-        battery_percent = 100
-        try:
-            battery = psutil.sensors_battery()
-            if battery:
-                battery_percent = battery.percent
-        except (AttributeError, OSError):
-            pass
-        
-        # Temperature (may not be available on all systems)
-        temperature_celsius = 0
-        try:
-            temps = psutil.sensors_temperatures()
-            if temps:
-                # Get first available CPU temperature
-                for name, entries in temps.items():
-                    if 'cpu' in name.lower() or 'core' in name.lower():
-                        if entries:
-                            temperature_celsius = entries[0].current
-                            break
-        except (AttributeError, OSError):
-            pass
+        readings = await self.get_readings()
         
         # Check limits
         limiting_factors = []
         
-        if cpu_percent > limits.max_cpu_percent:
-            limiting_factors.append(f"CPU usage ({cpu_percent:.1f}% > {limits.max_cpu_percent}%)")
+        if readings['cpu_percent'] > limits.max_cpu_percent:
+            limiting_factors.append(f"CPU usage ({readings['cpu_percent']:.1f}% > {limits.max_cpu_percent}%)")
         
-        if memory.used // (1024 * 1024) > limits.max_memory_mb:
-            limiting_factors.append(f"Memory usage ({memory.used // (1024 * 1024)}MB > {limits.max_memory_mb}MB)")
+        if readings['memory_mb'] > limits.max_memory_mb:
+            limiting_factors.append(f"Memory usage ({readings['memory_mb']}MB > {limits.max_memory_mb}MB)")
         
-        if limits.min_battery_percent > 0 and battery_percent < limits.min_battery_percent:
-            limiting_factors.append(f"Battery low ({battery_percent}% < {limits.min_battery_percent}%)")
+        if limits.min_battery_percent > 0 and readings['battery_percent'] < limits.min_battery_percent:
+            limiting_factors.append(f"Battery low ({readings['battery_percent']}% < {limits.min_battery_percent}%)")
         
-        if limits.max_temperature_celsius > 0 and temperature_celsius > limits.max_temperature_celsius:
-            limiting_factors.append(f"Temperature high ({temperature_celsius}°C > {limits.max_temperature_celsius}°C)")
+        if limits.max_temperature_celsius > 0 and readings['temperature_celsius'] > limits.max_temperature_celsius:
+            limiting_factors.append(f"Temperature high ({readings['temperature_celsius']}°C > {limits.max_temperature_celsius}°C)")
         
         return {
-            'cpu_percent': cpu_percent,
-            'memory_percent': memory.percent,
-            'memory_mb': memory.used // (1024 * 1024),
-            'battery_percent': battery_percent,
-            'temperature_celsius': temperature_celsius,
+            **readings,
             'within_limits': len(limiting_factors) == 0,
             'limiting_factors': limiting_factors
         }
@@ -215,6 +203,7 @@ class SessionManager:
     def __init__(self):
         self.active_sessions: Dict[str, Dict[str, Any]] = {}
         self.session_history: List[Dict[str, Any]] = []
+        self.session_tasks: Dict[str, asyncio.Task] = {}
         self.logger = logging.getLogger(__name__)
     
     async def start_session(
@@ -248,7 +237,7 @@ class SessionManager:
         
         try:
             # Execute task in background
-            asyncio.create_task(self._execute_session(session_id))
+            self.session_tasks[session_id] = asyncio.create_task(self._execute_session(session_id))
             return True
             
         except Exception as e:
@@ -312,6 +301,13 @@ class SessionManager:
             history_entry.pop('task_function', None)  # Remove non-serializable function
             self.session_history.append(history_entry)
             self.active_sessions.pop(session_id, None)
+            self.session_tasks.pop(session_id, None)
+    
+    async def wait_session(self, session_id: str):
+        """Wait until a session has finished, however it ends."""
+        task = self.session_tasks.get(session_id)
+        if task:
+            await asyncio.wait([task])
     
     async def stop_session(self, session_id: str) -> bool:
         """Stop an active session."""
@@ -331,6 +327,10 @@ class SessionManager:
         self.session_history.append(history_entry)
         self.active_sessions.pop(session_id)
         
+        task = self.session_tasks.pop(session_id, None)
+        if task:
+            task.cancel()
+        
         self.logger.info(f"Stopped session: {session_id}")
         return True
     
@@ -351,7 +351,17 @@ class SessionManager:
 class ExplorationScheduler:
     """Main scheduler for autonomous exploration sessions."""
     
-    def __init__(self, config: Optional[SparkConfig] = None):
+    # Delay before retrying a task that was held back by resource limits
+    RESOURCE_RETRY_MINUTES = 10
+    
+    def __init__(self, config: Optional[SparkConfig] = None, max_concurrent_tasks: int = 4):
+        """
+        Initialize ExplorationScheduler.
+        
+        Args:
+            config: Spark configuration
+            max_concurrent_tasks: Maximum number of scheduled tasks running at once
+        """
         self.config = config or SparkConfig()
         self.tasks: Dict[str, ScheduledTask] = {}
         self.resource_monitor = ResourceMonitor()
@@ -361,6 +371,20 @@ class ExplorationScheduler:
         # Scheduler state
         self.is_running = False
         self.scheduler_task: Optional[asyncio.Task] = None
+        self.max_concurrent_tasks = max_concurrent_tasks
+        
+        # (next run timestamp, sequence, task id); entries whose task was removed, paused
+        # or rescheduled since are skipped when they reach the top
+        self._heap: List[Tuple[float, int, str]] = []
+        self._heap_sequence = 0
+        self._scheduled_at: Dict[str, float] = {}
+        self._wakeup = asyncio.Event()
+        
+        # Tasks launched and not finished yet, and their runners
+        self._running_tasks: Set[str] = set()
+        self._runners: Set[asyncio.Task] = set()
+        self._concurrency: Optional[asyncio.Semaphore] = None
+        self._sessions_changed: Optional[asyncio.Condition] = None
         
         # Task registry
         self.task_functions: Dict[str, Callable] = {}
@@ -368,14 +392,22 @@ class ExplorationScheduler:
         # Persistence
         self.storage_path = Path.home() / ".spark" / "scheduler.json"
         self.storage_path.parent.mkdir(exist_ok=True)
+        self._saved_data: Optional[str] = None
         
         # Load persisted tasks
         self._load_tasks()
+        for task in self.tasks.values():
+            self._schedule(task)
     
     def register_task_function(self, name: str, function: Callable):
         """Register a function that can be called by scheduled tasks."""
         self.task_functions[name] = function
         self.logger.info(f"Registered task function: {name}")
+        
+        # Tasks skipped while their function was missing can run now
+        for task in self.tasks.values():
+            if task.task_args.get('task_function_name') == name:
+                self._schedule(task)
     
     async def add_task(
         self,
@@ -407,6 +439,7 @@ class ExplorationScheduler:
         task.next_run = self._calculate_next_run(task)
         
         self.tasks[task_id] = task
+        self._schedule(task)
         self._save_tasks()
         
         self.logger.info(f"Added scheduled task: {name} ({task_id})")
@@ -427,6 +460,8 @@ class ExplorationScheduler:
                 await self.session_manager.stop_session(session['session_id'])
         
         del self.tasks[task_id]
+        self._scheduled_at.pop(task_id, None)
+        self._wakeup.set()
         self._save_tasks()
         
         self.logger.info(f"Removed scheduled task: {task.name} ({task_id})")
@@ -439,6 +474,8 @@ class ExplorationScheduler:
             return False
         
         self.tasks[task_id].status = ScheduleStatus.PAUSED
+        self._scheduled_at.pop(task_id, None)
+        self._wakeup.set()
         self._save_tasks()
         return True
     
@@ -452,6 +489,7 @@ class ExplorationScheduler:
         if task.status == ScheduleStatus.PAUSED:
             task.status = ScheduleStatus.PENDING
             task.next_run = self._calculate_next_run(task)
+            self._schedule(task)
             self._save_tasks()
             return True
         
@@ -464,6 +502,8 @@ class ExplorationScheduler:
             return
         
         self.is_running = True
+        self._concurrency = asyncio.Semaphore(self.max_concurrent_tasks)
+        self._sessions_changed = asyncio.Condition()
         self.scheduler_task = asyncio.create_task(self._scheduler_loop())
         self.logger.info("Exploration scheduler started")
     
@@ -482,47 +522,77 @@ class ExplorationScheduler:
             except asyncio.CancelledError:
                 pass
         
+        # Stop tasks waiting for a slot or running
+        for runner in list(self._runners):
+            runner.cancel()
+        
         # Stop all active sessions
         for session_id in list(self.session_manager.active_sessions.keys()):
             await self.session_manager.stop_session(session_id)
         
         self.logger.info("Exploration scheduler stopped")
     
+    def _schedule(self, task: ScheduledTask):
+        """Queue a task at its next run time and wake the scheduler loop."""
+        if task.next_run and task.status != ScheduleStatus.PAUSED:
+            deadline = task.next_run.timestamp()
+            if self._scheduled_at.get(task.id) != deadline:
+                self._scheduled_at[task.id] = deadline
+                self._heap_sequence += 1
+                heapq.heappush(self._heap, (deadline, self._heap_sequence, task.id))
+        self._wakeup.set()
+    
+    def _is_current(self, entry: Tuple[float, int, str]) -> bool:
+        """Whether a heap entry still matches its task's schedule."""
+        task = self.tasks.get(entry[2])
+        return (
+            task is not None
+            and task.status != ScheduleStatus.PAUSED
+            and task.next_run is not None
+            and task.next_run.timestamp() == entry[0]
+            and self._scheduled_at.get(task.id) == entry[0]
+        )
+    
     async def _scheduler_loop(self):
-        """Main scheduler loop."""
+        """Main scheduler loop: sleep until the earliest deadline, then launch due tasks."""
         
         self.logger.info("Scheduler loop started")
         
         try:
             while self.is_running:
-                # Check for tasks ready to run
-                await self._check_and_run_tasks()
+                self._wakeup.clear()
+                self._launch_due_tasks()
+                
+                # Drop outdated entries so the top of the heap is the real next deadline
+                while self._heap and not self._is_current(self._heap[0]):
+                    heapq.heappop(self._heap)
                 
-                # Wait before next check (every minute)
-                await asyncio.sleep(60)
+                timeout = max(0.0, self._heap[0][0] - time.time()) if self._heap else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
                 
         except asyncio.CancelledError:
             self.logger.info("Scheduler loop cancelled")
         except Exception as e:
             self.logger.error(f"Scheduler loop error: {e}")
     
-    async def _check_and_run_tasks(self):
-        """Check for tasks that should run and execute them."""
-        
-        now = datetime.now()
+    def _launch_due_tasks(self):
+        """Start a runner for every task whose next run time has passed."""
         
-        for task_id, task in self.tasks.items():
-            # Skip if paused or not scheduled
-            if task.status == ScheduleStatus.PAUSED:
-                continue
-            
-            # Skip if not time to run yet
-            if not task.next_run or now < task.next_run:
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not self._is_current(entry):
                 continue
+            task = self.tasks[entry[2]]
+            del self._scheduled_at[task.id]
             
-            # Skip if already running
-            active_sessions = self.session_manager.get_active_sessions()
-            if any(s['task_id'] == task_id for s in active_sessions):
+            # Skip this occurrence if the previous one is still running
+            if task.id in self._running_tasks:
+                task.next_run = self._calculate_next_run(task)
+                self._schedule(task)
                 continue
             
             # Check if task function is available
@@ -531,19 +601,41 @@ class ExplorationScheduler:
                 self.logger.warning(f"Task function not found for task {task.name}: {task_function_name}")
                 continue
             
-            # Check resource availability
-            resources = await self.resource_monitor.check_resources(task.resource_limits)
-            if not resources['within_limits']:
-                self.logger.info(f"Delaying task {task.name} due to resource constraints: {', '.join(resources['limiting_factors'])}")
-                # Reschedule for 10 minutes later
-                task.next_run = now + timedelta(minutes=10)
-                continue
-            
-            # Execute the task
-            await self._execute_task(task)
+            self._running_tasks.add(task.id)
+            runner = asyncio.create_task(self._run_task(task))
+            self._runners.add(runner)
+            runner.add_done_callback(self._runners.discard)
+    
+    async def _run_task(self, task: ScheduledTask):
+        """Run one occurrence of a task once a slot and resources are available."""
+        
+        try:
+            async with self._concurrency:
+                # Check resource availability
+                resources = await self.resource_monitor.check_resources(task.resource_limits)
+                if not resources['within_limits']:
+                    self.logger.info(f"Delaying task {task.name} due to resource constraints: {', '.join(resources['limiting_factors'])}")
+                    task.next_run = datetime.now() + timedelta(minutes=self.RESOURCE_RETRY_MINUTES)
+                    self._schedule(task)
+                    self._save_tasks()
+                    return
+                
+                # Respect the task's own limit on concurrent sessions
+                async with self._sessions_changed:
+                    await self._sessions_changed.wait_for(
+                        lambda: len(self.session_manager.active_sessions) < task.resource_limits.max_concurrent_sessions
+                    )
+                    session_id = await self._execute_task(task)
+                
+                if session_id:
+                    await self.session_manager.wait_session(session_id)
+        finally:
+            self._running_tasks.discard(task.id)
+            async with self._sessions_changed:
+                self._sessions_changed.notify_all()
     
-    async def _execute_task(self, task: ScheduledTask):
-        """Execute a scheduled task."""
+    async def _execute_task(self, task: ScheduledTask) -> Optional[str]:
+        """Execute a scheduled task, returning its session id if it started."""
         
         session_id = f"scheduled_{task.id}_{int(time.time())}"
         task_function_name = task.task_args.get('task_function_name')
@@ -551,7 +643,7 @@ class ExplorationScheduler:
         
         if not task_function:
             self.logger.error(f"Task function not found: {task_function_name}")
-            return
+            return None
         
         self.logger.info(f"Executing scheduled task: {task.name}")
         
@@ -580,7 +672,9 @@ class ExplorationScheduler:
             backoff_minutes = min(60, task.failure_count * 10)
             task.next_run = datetime.now() + timedelta(minutes=backoff_minutes)
         
+        self._schedule(task)
         self._save_tasks()
+        return session_id if success else None
     
     def _calculate_next_run(self, task: ScheduledTask) -> Optional[datetime]:
         """Calculate the next run time for a task."""
@@ -653,16 +747,23 @@ class ExplorationScheduler:
         return None
     
     def _save_tasks(self):
-        """Persist tasks to storage."""
+        """Persist tasks to storage if they changed since the last save."""
         
         try:
             tasks_data = {
                 task_id: task.to_dict()
                 for task_id, task in self.tasks.items()
             }
+            serialized = json.dumps(tasks_data, indent=2, default=str)
+            if serialized == self._saved_data:
+                return
             
-            with open(self.storage_path, 'w') as f:
-                json.dump(tasks_data, f, indent=2, default=str)
+            # Write to a temporary file first so a crash never leaves a truncated file
+            tmp_path = self.storage_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w') as f:
+                f.write(serialized)
+            os.replace(tmp_path, self.storage_path)
+            self._saved_data = serialized
                 
         except Exception as e:
             self.logger.error(f"Failed to save tasks: {e}")
@@ -675,7 +776,8 @@ class ExplorationScheduler:
                 return
             
             with open(self.storage_path, 'r') as f:
-                tasks_data = json.load(f)
+                self._saved_data = f.read()
+            tasks_data = json.loads(self._saved_data)
             
             for task_id, task_dict in tasks_data.items():
                 try:
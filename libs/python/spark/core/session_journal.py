@@ -0,0 +1,94 @@
+"""
+Append-only journal for session trajectories.
+
+Each change to a session (checkpoint, step, error, resource sample) is appended to the
+journal as one framed record instead of rewriting the whole trajectory, so recording
+cost stays constant as sessions grow. The journal is periodically compacted into a
+snapshot, and a trajectory is recovered by loading the snapshot and replaying the
+journal written after it.
+
+Record framing is one line per record: an 8 hex digit CRC32 of the payload, a space,
+and the JSON payload. A torn or corrupt record (e.g. after a crash mid-write) ends
+the readable journal.
+"""
+
+import json
+import os
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+
+class SessionJournal:
+    """Append-only writer for one journal file, with batched fsync."""
+
+    def __init__(self, path: Path, fsync_interval: float = 1.0):
+        """
+        Initialize the journal, appending to the file if it exists.
+
+        Args:
+            path: Journal file path
+            fsync_interval: Minimum seconds between fsyncs of appended records
+        """
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self._file = open(path, 'ab')
+        self._last_sync = time.monotonic()
+        self.bytes_written = 0
+
+    def append(self, kind: str, data: Dict[str, Any]) -> None:
+        """
+        Append a record.
+
+        Every record is handed to the OS immediately, so it survives the process being
+        killed; fsyncs, which protect against power loss, are batched.
+        """
+        payload = json.dumps({'kind': kind, 'data': data}, separators=(',', ':'), default=str).encode('utf-8')
+        frame = b'%08x ' % zlib.crc32(payload) + payload + b'\n'
+        self._file.write(frame)
+        self.bytes_written += len(frame)
+        self.sync(fsync=time.monotonic() - self._last_sync >= self.fsync_interval)
+
+    def sync(self, fsync: bool = True) -> None:
+        """Flush appended records to the OS and optionally to disk."""
+        self._file.flush()
+        if fsync:
+            os.fsync(self._file.fileno())
+            self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    @staticmethod
+    def read(path: Path, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Read complete records from a journal.
+
+        Args:
+            path: Journal file path
+            offset: Byte offset to start reading from, as returned by a previous read
+
+        Returns:
+            Tuple of (records as {'kind', 'data'} dicts, offset after the last complete record)
+        """
+        records: List[Dict[str, Any]] = []
+        if not path.exists():
+            return records, offset
+
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Record still being written, or torn by a crash
+                checksum, _, payload = line[:-1].partition(b' ')
+                try:
+                    if int(checksum, 16) != zlib.crc32(payload):
+                        break
+                    records.append(json.loads(payload))
+                except ValueError:
+                    break
+                offset += len(line)
+        return records, offset
@@ -3,27 +3,32 @@ Session management with comprehensive trajectory recording.
 
 This module provides session management capabilities with CUA trajectory integration
 for complete exploration session recording, state persistence, and analytics.
+
+Trajectories are persisted as a snapshot (trajectory_<id>.json) plus an append-only
+journal of the changes made since (trajectory_<id>.<generation>.journal). Recording a
+checkpoint or step appends one record, and the journal is compacted into a new snapshot
+once it outgrows the previous one, so persistence cost stays proportional to what changed.
 """
 
+import os
 import uuid
 import json
 import time
 import asyncio
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple
+from functools import lru_cache
 from datetime import datetime, timedelta
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
 
 from spark.discovery.models import ExplorationSession, ExplorationResult, ExplorationStatus
+from spark.core.session_journal import SessionJournal
+from spark.core.event_bus import EventBus, get_event_bus
+from spark.core.resource_sampler import get_resource_sampler
+from spark.core.lazy_imports import module_available
 
-# Import CUA components for trajectory recording
-try:
-    from agent.agent.callbacks import TrajectorySaverCallback
-    from agent.agent.callbacks.base import BaseCallback
-    CUA_AVAILABLE = True
-except ImportError:
-    CUA_AVAILABLE = False
-    BaseCallback = object
+# CUA components for trajectory recording are imported when a callback is first created
+CUA_AVAILABLE = module_available('agent.agent.callbacks')
 
 
 @dataclass
@@ -49,13 +54,40 @@ class SessionTrajectory:
     checkpoints: List[SessionCheckpoint] = field(default_factory=list)
     cua_trajectory_path: Optional[str] = None  # Path to CUA trajectory file
     total_duration: Optional[float] = None
-    resource_totals: Dict[str, float] = field(default_factory=dict)
+    resource_totals: Dict[str, float] = field(default_factory=dict)  # Averages, peaks and I/O over the session
     outcome: Optional[str] = None  # 'completed', 'failed', 'cancelled'
     discoveries_created: int = 0
     quality_metrics: Dict[str, float] = field(default_factory=dict)
 
 
-class SparkTrajectoryCallback(BaseCallback if CUA_AVAILABLE else object):
+def _checkpoint_to_dict(checkpoint: SessionCheckpoint) -> Dict[str, Any]:
+    checkpoint_dict = asdict(checkpoint)
+    checkpoint_dict['timestamp'] = checkpoint.timestamp.isoformat()
+    return checkpoint_dict
+
+
+def _checkpoint_from_dict(checkpoint_dict: Dict[str, Any]) -> SessionCheckpoint:
+    checkpoint_dict = dict(checkpoint_dict)
+    checkpoint_dict['timestamp'] = datetime.fromisoformat(checkpoint_dict['timestamp'])
+    return SessionCheckpoint(**checkpoint_dict)
+
+
+def _apply_journal_record(trajectory: SessionTrajectory, record: Dict[str, Any]):
+    """Apply one journal record to a trajectory, mirroring what SessionManager did in memory."""
+    kind, data = record['kind'], record['data']
+    current_checkpoint = trajectory.checkpoints[-1] if trajectory.checkpoints else None
+
+    if kind == 'checkpoint':
+        trajectory.checkpoints.append(_checkpoint_from_dict(data))
+    elif kind == 'step' and current_checkpoint:
+        current_checkpoint.intermediate_results.append(data)
+    elif kind == 'error' and current_checkpoint:
+        current_checkpoint.errors.append(data['error'])
+    elif kind == 'resource':
+        trajectory.resource_totals = dict(data)
+
+
+class SparkTrajectoryCallback:
     """Custom callback for Spark-specific trajectory recording."""
     
     def __init__(self, session_manager: 'SessionManager', session_id: str):
@@ -93,29 +125,48 @@ class SparkTrajectoryCallback(BaseCallback if CUA_AVAILABLE else object):
             )
 
 
+@lru_cache(maxsize=None)
+def _cua_trajectory_callback_class() -> type:
+    """SparkTrajectoryCallback on top of the CUA callback base, imported on first use."""
+    from agent.agent.callbacks.base import BaseCallback
+    return type('SparkTrajectoryCallback', (SparkTrajectoryCallback, BaseCallback), {})
+
+
 class SessionManager:
     """Manages exploration sessions with comprehensive trajectory recording."""
     
-    def __init__(self, storage_dir: Optional[Path] = None):
+    # Compact a journal once it is larger than both this and the last snapshot
+    COMPACT_MIN_BYTES = 256 * 1024
+    
+    def __init__(self, storage_dir: Optional[Path] = None, event_bus: Optional[EventBus] = None):
         """
         Initialize SessionManager.
         
         Args:
             storage_dir: Directory for storing session data and trajectories
+            event_bus: Bus to publish session events on (the process-wide bus if None)
         """
         self.storage_dir = storage_dir or Path.home() / ".spark" / "sessions"
+        self.event_bus = event_bus or get_event_bus()
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         
         # Active sessions tracking
         self.active_sessions: Dict[str, SessionTrajectory] = {}
         self.session_callbacks: Dict[str, List[Callable]] = {}
         
-        # Performance monitoring
+        # Performance monitoring; sessions are summarized from this sampler position onwards
         self.resource_monitors: Dict[str, asyncio.Task] = {}
+        self.resource_sampler = get_resource_sampler()
+        self._resource_marks: Dict[str, int] = {}
         
         # CUA trajectory integration
         self.cua_trajectory_dir = self.storage_dir / "trajectories"
         self.cua_trajectory_dir.mkdir(exist_ok=True)
+        
+        # Open journals of active sessions, with their generation and last snapshot size
+        self.journals: Dict[str, SessionJournal] = {}
+        self._journal_generations: Dict[str, int] = {}
+        self._snapshot_sizes: Dict[str, int] = {}
     
     async def start_session_recording(
         self,
@@ -144,6 +195,7 @@ class SessionManager:
         # Store in active sessions
         self.active_sessions[session_id] = trajectory
         self.session_callbacks[session_id] = []
+        self._resource_marks[session_id] = self.resource_sampler.position()
         
         # Create initial checkpoint
         initial_checkpoint = SessionCheckpoint(
@@ -162,6 +214,7 @@ class SessionManager:
         )
         
         trajectory.checkpoints.append(initial_checkpoint)
+        self._publish_checkpoint(initial_checkpoint)
         
         # Set up CUA trajectory recording if enabled
         if enable_cua_trajectory and CUA_AVAILABLE:
@@ -175,7 +228,7 @@ class SessionManager:
                 self._monitor_session_resources(session_id, checkpoint_interval)
             )
         
-        # Save initial state
+        # Save initial state and start journaling changes
         await self._save_trajectory(trajectory)
         
         return trajectory
@@ -223,13 +276,12 @@ class SessionManager:
         )
         
         trajectory.checkpoints.append(checkpoint)
+        self._journal(session_id, 'checkpoint', _checkpoint_to_dict(checkpoint))
+        self._publish_checkpoint(checkpoint)
         
         # Notify callbacks
         await self._notify_checkpoint_callbacks(session_id, checkpoint)
         
-        # Save updated trajectory
-        await self._save_trajectory(trajectory)
-        
         return checkpoint
     
     async def record_step(self, session_id: str, step_type: str, step_data: Dict[str, Any]):
@@ -252,6 +304,8 @@ class SessionManager:
         if current_checkpoint:
             # Add to intermediate results of current checkpoint
             current_checkpoint.intermediate_results.append(step_record)
+            self._journal(session_id, 'step', step_record)
+            self.event_bus.emit('step', session_id, step_record)
         else:
             # Create a micro-checkpoint for the step
             await self.create_checkpoint(
@@ -261,6 +315,17 @@ class SessionManager:
                 intermediate_results=[step_record]
             )
     
+    async def record_error(self, session_id: str, error: str):
+        """Record an error against the current checkpoint of a session."""
+        
+        trajectory = self.active_sessions.get(session_id)
+        if not trajectory or not trajectory.checkpoints:
+            return  # Silently ignore if session not active
+        
+        trajectory.checkpoints[-1].errors.append(error)
+        self._journal(session_id, 'error', {'error': error})
+        self.event_bus.emit('error', session_id, {'error': error})
+    
     async def complete_session_recording(
         self,
         session_id: str,
@@ -304,9 +369,20 @@ class SessionManager:
         if session_id in self.resource_monitors:
             self.resource_monitors[session_id].cancel()
             del self.resource_monitors[session_id]
+        if session_id in self._resource_marks:
+            trajectory.resource_totals = self.resource_sampler.summarize(self._resource_marks.pop(session_id))
         
-        # Final save
+        # Final save: fold the journal into a snapshot and stop journaling
         await self._save_trajectory(trajectory)
+        self._close_journal(session_id)
+        
+        self.event_bus.emit('complete', session_id, {
+            'outcome': outcome,
+            'total_duration': trajectory.total_duration,
+            'discoveries_created': discoveries_count,
+            'quality_metrics': trajectory.quality_metrics,
+            'resource_usage': final_checkpoint.resource_usage
+        })
         
         # Move from active to archived
         archived_trajectory = trajectory
@@ -326,6 +402,19 @@ class SessionManager:
         # Try to load from storage
         return await self._load_trajectory(session_id)
     
+    def read_session_journal(self, session_id: str, generation: int, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Read journal records of a session without loading its trajectory.
+        
+        Readers poll with the returned offset to receive only new records. The generation
+        is the one recorded in the snapshot; once the journal is compacted, reload the
+        snapshot and continue from offset 0 of the new generation.
+        
+        Returns:
+            Tuple of (records as {'kind', 'data'} dicts, offset to resume from)
+        """
+        return SessionJournal.read(self._journal_path(session_id, generation), offset)
+    
     async def get_session_analytics(self, session_id: str) -> Dict[str, Any]:
         """Get comprehensive analytics for a session."""
         
@@ -377,7 +466,12 @@ class SessionManager:
         """Get a CUA trajectory callback for the session."""
         if not CUA_AVAILABLE:
             return None
-        return SparkTrajectoryCallback(self, session_id)
+        try:
+            callback_class = _cua_trajectory_callback_class()
+        except ImportError as e:
+            print(f"CUA trajectory recording unavailable: {e}")
+            return None
+        return callback_class(self, session_id)
     
     async def _monitor_session_resources(self, session_id: str, interval: int):
         """Monitor resource usage for a session."""
@@ -385,12 +479,12 @@ class SessionManager:
             while session_id in self.active_sessions:
                 resource_usage = await self._get_current_resource_usage()
                 
-                # Store resource totals
+                # Summarize the session so far: averages and peaks, not sums of samples
                 trajectory = self.active_sessions[session_id]
-                for metric, value in resource_usage.items():
-                    if metric not in trajectory.resource_totals:
-                        trajectory.resource_totals[metric] = 0
-                    trajectory.resource_totals[metric] += value
+                mark = self._resource_marks.get(session_id, self.resource_sampler.position())
+                trajectory.resource_totals = self.resource_sampler.summarize(mark)
+                self._journal(session_id, 'resource', trajectory.resource_totals)
+                self.event_bus.emit('progress', session_id, {'resource_usage': resource_usage})
                 
                 await asyncio.sleep(interval)
                 
@@ -399,17 +493,12 @@ class SessionManager:
     
     async def _get_current_resource_usage(self) -> Dict[str, float]:
         """Get current resource usage metrics."""
-        import psutil
-        
-        try:
-            process = psutil.Process()
-            return {
-                'cpu_percent': process.cpu_percent(),
-                'memory_mb': process.memory_info().rss / 1024 / 1024,
-                'threads_count': process.num_threads()
-            }
-        except Exception:
-            return {'cpu_percent': 0.0, 'memory_mb': 0.0, 'threads_count': 1}
+        latest = self.resource_sampler.latest()
+        return {
+            'cpu_percent': latest['cpu_percent'],
+            'memory_mb': latest['memory_mb'],
+            'threads_count': int(latest['threads_count'])
+        }
     
     async def _calculate_session_metrics(
         self,
@@ -444,9 +533,54 @@ class SessionManager:
         
         return metrics
     
+    def _publish_checkpoint(self, checkpoint: SessionCheckpoint):
+        self.event_bus.emit('checkpoint', checkpoint.session_id, {
+            'phase': checkpoint.phase,
+            'progress_percentage': checkpoint.progress_percentage,
+            'resource_usage': checkpoint.resource_usage,
+            'errors': checkpoint.errors
+        })
+    
+    def _snapshot_path(self, session_id: str) -> Path:
+        return self.storage_dir / f"trajectory_{session_id}.json"
+    
+    def _journal_path(self, session_id: str, generation: int) -> Path:
+        return self.storage_dir / f"trajectory_{session_id}.{generation}.journal"
+    
+    def _journal(self, session_id: str, kind: str, data: Dict[str, Any]):
+        """Append a record to the session's journal, compacting it once it outgrows the snapshot."""
+        journal = self.journals.get(session_id)
+        if journal is None:
+            return
+        
+        journal.append(kind, data)
+        
+        # Compacting only once the journal is as large as the snapshot keeps the total
+        # cost of snapshots linear in the session length
+        if journal.bytes_written > max(self.COMPACT_MIN_BYTES, self._snapshot_sizes.get(session_id, 0)):
+            self._write_snapshot(self.active_sessions[session_id])
+    
+    def _close_journal(self, session_id: str):
+        journal = self.journals.pop(session_id, None)
+        if journal:
+            journal.close()
+            journal.path.unlink(missing_ok=True)
+        self._journal_generations.pop(session_id, None)
+        self._snapshot_sizes.pop(session_id, None)
+    
     async def _save_trajectory(self, trajectory: SessionTrajectory):
-        """Save trajectory to persistent storage."""
-        trajectory_file = self.storage_dir / f"trajectory_{trajectory.session_id}.json"
+        """Save trajectory to persistent storage as a new snapshot."""
+        self._write_snapshot(trajectory)
+    
+    def _write_snapshot(self, trajectory: SessionTrajectory):
+        """Write a snapshot of the trajectory and start a new journal generation after it."""
+        session_id = trajectory.session_id
+        generation = self._journal_generations.get(session_id, -1) + 1
+        
+        # Persist buffered records first, so the old generation stays complete until replaced
+        old_journal = self.journals.get(session_id)
+        if old_journal:
+            old_journal.sync()
         
         # Convert to serializable format
         trajectory_dict = asdict(trajectory)
@@ -459,12 +593,30 @@ class SessionManager:
         if trajectory_dict['end_time']:
             trajectory_dict['end_time'] = trajectory_dict['end_time'].isoformat()
         
-        with open(trajectory_file, 'w') as f:
-            json.dump(trajectory_dict, f, indent=2)
+        trajectory_dict['_journal'] = {'generation': generation}
+        
+        # Write to a temporary file first so a crash never leaves a partial snapshot
+        trajectory_file = self._snapshot_path(session_id)
+        tmp_file = trajectory_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(trajectory_dict, f, indent=2, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, trajectory_file)
+        
+        self._journal_generations[session_id] = generation
+        self._snapshot_sizes[session_id] = trajectory_file.stat().st_size
+        
+        # Switch to the new generation; the old journal is covered by the snapshot now
+        if session_id in self.active_sessions:
+            self.journals[session_id] = SessionJournal(self._journal_path(session_id, generation))
+        if old_journal:
+            old_journal.close()
+            old_journal.path.unlink(missing_ok=True)
     
     async def _load_trajectory(self, session_id: str) -> Optional[SessionTrajectory]:
-        """Load trajectory from persistent storage."""
-        trajectory_file = self.storage_dir / f"trajectory_{session_id}.json"
+        """Load trajectory from persistent storage, replaying its journal over the snapshot."""
+        trajectory_file = self._snapshot_path(session_id)
         
         if not trajectory_file.exists():
             return None
@@ -473,21 +625,28 @@ class SessionManager:
             with open(trajectory_file, 'r') as f:
                 trajectory_dict = json.load(f)
             
+            # Snapshots written before journaling have no generation
+            generation = trajectory_dict.pop('_journal', {}).get('generation', 0)
+            
             # Handle datetime deserialization
             trajectory_dict['start_time'] = datetime.fromisoformat(trajectory_dict['start_time'])
             if trajectory_dict['end_time']:
                 trajectory_dict['end_time'] = datetime.fromisoformat(trajectory_dict['end_time'])
             
-            for checkpoint_dict in trajectory_dict['checkpoints']:
-                checkpoint_dict['timestamp'] = datetime.fromisoformat(checkpoint_dict['timestamp'])
-            
             # Reconstruct objects
             checkpoints = [
-                SessionCheckpoint(**cp_dict) for cp_dict in trajectory_dict['checkpoints']
+                _checkpoint_from_dict(cp_dict) for cp_dict in trajectory_dict['checkpoints']
             ]
             trajectory_dict['checkpoints'] = checkpoints
             
-            return SessionTrajectory(**trajectory_dict)
+            trajectory = SessionTrajectory(**trajectory_dict)
+            
+            # Replay the tail recorded after the snapshot; a torn last record is dropped
+            records, _ = SessionJournal.read(self._journal_path(session_id, generation))
+            for record in records:
+                _apply_journal_record(trajectory, record)
+            
+            return trajectory
             
         except Exception as e:
             print(f"Error loading trajectory for session {session_id}: {e}")
@@ -8,10 +8,13 @@ into existing projects with comprehensive backup and rollback capabilities.
 import os
 import json
 import shutil
+import tempfile
 import subprocess
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from enum import Enum
 
@@ -25,6 +28,7 @@ class IntegrationStrategy(Enum):
     PARTIAL = "partial"                  # Apply only selected parts
     DOCUMENTATION = "documentation"      # Generate integration guide without changes
     PREVIEW = "preview"                  # Show what would be changed (dry-run)
+    WORKTREE = "worktree"                # Apply and test in an isolated git worktree
 
 
 class IntegrationStatus(Enum):
@@ -46,6 +50,10 @@ class IntegrationConfig:
     branch_prefix: str = "spark-integration"
     confirmation_required: bool = True
     max_file_changes: int = 50  # Safety limit
+    test_command: Optional[List[str]] = None  # Run after applying changes, e.g. ["pytest", "-q"]
+    worktree_root: Optional[str] = None  # Where worktrees are created (.spark/worktrees)
+    keep_worktree: bool = False  # Keep the worktree checked out after a worktree integration
+    promote_on_success: bool = False  # Fast-forward the checkout to a passing worktree integration
     
 
 @dataclass
@@ -70,6 +78,16 @@ class IntegrationBackup:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class IntegrationWorktree:
+    """Isolated git worktree a discovery is applied and tested in."""
+    path: str
+    branch: str
+    base_commit: str
+    commit_hash: str
+    promoted: bool = False
+
+
 @dataclass
 class IntegrationResult:
     """Result of integration attempt."""
@@ -83,6 +101,15 @@ class IntegrationResult:
     started_at: datetime = field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
     can_rollback: bool = True
+    worktree: Optional[IntegrationWorktree] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+# `git status --porcelain` codes of paths with unresolved merge conflicts
+UNMERGED_STATUS_CODES = frozenset({'DD', 'AU', 'UD', 'UA', 'DU', 'AA', 'UU'})
+
+# Strategies that never modify the working tree before integration completes
+_ISOLATED_STRATEGIES = frozenset({IntegrationStrategy.PREVIEW, IntegrationStrategy.WORKTREE})
 
 
 class SafeIntegrator:
@@ -101,7 +128,8 @@ class SafeIntegrator:
         """Integrate a discovery using specified strategy."""
         
         config = config or IntegrationConfig()
-        integration_id = f"integration_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # Unique even for integrations started in the same second by integrate_discoveries
+        integration_id = f"integration_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
         
         result = IntegrationResult(
             integration_id=integration_id,
@@ -113,8 +141,8 @@ class SafeIntegrator:
         try:
             result.status = IntegrationStatus.IN_PROGRESS
             
-            # Create backup if required
-            if config.create_backup:
+            # Create backup if required; isolated strategies leave the checkout alone
+            if config.create_backup and config.strategy not in _ISOLATED_STRATEGIES:
                 result.backup = self._create_backup(integration_id, discovery)
             
             # Execute integration strategy
@@ -128,6 +156,8 @@ class SafeIntegrator:
                 result = self._generate_documentation(discovery, config, result)
             elif config.strategy == IntegrationStrategy.PREVIEW:
                 result = self._preview_integration(discovery, config, result)
+            elif config.strategy == IntegrationStrategy.WORKTREE:
+                result = self._integrate_worktree(discovery, config, result)
             
             result.status = IntegrationStatus.COMPLETED
             result.completed_at = datetime.now()
@@ -138,7 +168,7 @@ class SafeIntegrator:
             result.completed_at = datetime.now()
             
             # Attempt automatic rollback on failure
-            if result.backup and config.create_backup:
+            if result.worktree or (result.backup and config.create_backup):
                 try:
                     self.rollback_integration(result)
                     result.status = IntegrationStatus.ROLLED_BACK
@@ -147,9 +177,115 @@ class SafeIntegrator:
         
         return result
     
+    def integrate_discoveries(
+        self,
+        discoveries: List[Discovery],
+        config: Optional[IntegrationConfig] = None,
+        max_workers: int = 4
+    ) -> List[IntegrationResult]:
+        """
+        Integrate several discoveries.
+        
+        With the worktree strategy each discovery is applied and tested in its own
+        worktree in parallel; passing integrations are then promoted one at a time, each
+        replayed onto the previous. Other strategies share the working tree and run in order.
+        """
+        
+        config = config or IntegrationConfig(strategy=IntegrationStrategy.WORKTREE)
+        if config.strategy != IntegrationStrategy.WORKTREE:
+            return [self.integrate_discovery(discovery, config) for discovery in discoveries]
+        
+        isolated_config = replace(config, promote_on_success=False)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            results = list(executor.map(
+                lambda discovery: self.integrate_discovery(discovery, isolated_config),
+                discoveries
+            ))
+        
+        if config.promote_on_success:
+            for result in results:
+                if result.status != IntegrationStatus.COMPLETED:
+                    continue
+                try:
+                    self.promote_integration(result, config)
+                except Exception as e:
+                    # The integration branch is kept for merging by hand
+                    result.status = IntegrationStatus.FAILED
+                    result.error_message = str(e)
+        
+        return results
+    
+    def promote_integration(
+        self,
+        integration_result: IntegrationResult,
+        config: Optional[IntegrationConfig] = None
+    ) -> str:
+        """
+        Bring a worktree integration into the current checkout.
+        
+        Fast-forwards when the checkout is still at the commit the integration was
+        based on. Otherwise the integration is first cherry-picked onto the current
+        commit inside its worktree (and re-tested), so conflicts never reach the
+        user's files.
+        
+        Returns:
+            The promoted commit hash
+        """
+        
+        worktree = integration_result.worktree
+        if not worktree:
+            raise ValueError("Integration has no worktree to promote")
+        if integration_result.status != IntegrationStatus.COMPLETED:
+            raise ValueError(f"Integration {integration_result.integration_id} did not complete")
+        if worktree.promoted:
+            return worktree.commit_hash
+        
+        try:
+            head = self._git('rev-parse', 'HEAD')
+            if head != worktree.base_commit:
+                if not os.path.exists(worktree.path):
+                    self._git('worktree', 'add', worktree.path, worktree.branch)
+                
+                self._git('reset', '--hard', head, cwd=worktree.path)
+                try:
+                    self._git('cherry-pick', worktree.commit_hash, cwd=worktree.path)
+                except subprocess.CalledProcessError as e:
+                    # Leave the branch as it was, for merging by hand
+                    subprocess.run(['git', 'cherry-pick', '--abort'], cwd=worktree.path, capture_output=True)
+                    self._git('reset', '--hard', worktree.commit_hash, cwd=worktree.path)
+                    details = e.stderr.strip().splitlines()
+                    raise Exception(f"Integration conflicts with {head[:8]}: {details[0] if details else e}")
+                
+                worktree.base_commit = head
+                worktree.commit_hash = self._git('rev-parse', 'HEAD', cwd=worktree.path)
+                if config and config.run_tests:
+                    self._run_integration_tests(integration_result, config, self._worktree_project_dir(worktree))
+            
+            self._git('merge', '--ff-only', worktree.commit_hash)
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Failed to promote integration: {e.stderr.strip()}")
+        
+        worktree.promoted = True
+        integration_result.metadata['promoted_commit'] = worktree.commit_hash
+        self._remove_worktree(worktree, delete_branch=True)
+        
+        return worktree.commit_hash
+    
     def rollback_integration(self, integration_result: IntegrationResult) -> bool:
         """Rollback a completed integration."""
         
+        worktree = integration_result.worktree
+        if worktree:
+            try:
+                if worktree.promoted:
+                    # Other commits may follow it by now; undo it without rewriting history
+                    self._git('revert', '--no-edit', worktree.commit_hash)
+                else:
+                    self._remove_worktree(worktree, delete_branch=True)
+                return True
+            except subprocess.CalledProcessError as e:
+                raise Exception(f"Rollback failed: {e.stderr.strip()}")
+        
         if not integration_result.backup:
             raise ValueError("No backup available for rollback")
         
@@ -180,7 +316,7 @@ class SafeIntegrator:
             'estimated_changes': len(result.files_changed),
             'integration_strategy': result.strategy_used.value,
             'safety_checks': self._run_safety_checks(discovery),
-            'recommendations': self._get_integration_recommendations(discovery)
+            'recommendations': self.get_integration_recommendations(discovery)
         }
     
     def get_integration_recommendations(self, discovery: Discovery) -> Dict[str, Any]:
@@ -226,8 +362,10 @@ class SafeIntegrator:
                     original_content=self._read_file_safely(file_path)
                 )
                 
-                # Copy file to backup directory
-                backup_file_path = backup_dir / Path(file_path).name
+                # Copy file to backup directory, keeping its path so same-named files don't collide
+                rel_path = Path(os.path.relpath(file_path, self.project_root)).as_posix()
+                backup_file_path = backup_dir / "files" / rel_path.replace("../", "__/")
+                backup_file_path.parent.mkdir(parents=True, exist_ok=True)
                 shutil.copy2(file_path, backup_file_path)
                 file_change.backup_path = str(backup_file_path)
                 
@@ -278,7 +416,7 @@ class SafeIntegrator:
         
         # Run tests if configured
         if config.run_tests:
-            self._run_integration_tests(result)
+            self._run_integration_tests(result, config)
         
         # Auto-commit if configured
         if config.auto_commit:
@@ -302,12 +440,71 @@ class SafeIntegrator:
         result = self._integrate_direct(discovery, config, result)
         
         # Add branch information to result
-        result.metadata = result.metadata or {}
         result.metadata['feature_branch'] = branch_name
         result.metadata['original_branch'] = result.backup.original_branch if result.backup else 'main'
         
         return result
     
+    def _integrate_worktree(
+        self,
+        discovery: Discovery,
+        config: IntegrationConfig,
+        result: IntegrationResult
+    ) -> IntegrationResult:
+        """
+        Integrate in a temporary git worktree, leaving the current checkout untouched.
+        
+        The discovery is committed onto the current commit straight into the object
+        store, then checked out in a worktree sharing it, where tests run. Rolling
+        back only deletes the worktree and its branch.
+        """
+        
+        base_commit = self._get_current_commit_hash()
+        if not base_commit:
+            raise Exception("Worktree integration requires a git repository with at least one commit")
+        
+        artifacts = self._collect_artifacts(discovery)
+        # One branch per integration: unpromoted branches outlive their worktrees, so
+        # re-integrating a discovery must not collide with an earlier attempt
+        suffix = result.integration_id.removeprefix('integration_')
+        branch_name = self._unique_branch_name(f"{config.branch_prefix}-{discovery.id[:8]}-{suffix}")
+        worktree_path = self._worktree_root(config) / branch_name.replace('/', '-')
+        
+        try:
+            commit_hash = self._create_integration_commit(discovery, artifacts, base_commit)
+            self._git('worktree', 'add', '-b', branch_name, str(worktree_path), commit_hash)
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Failed to create worktree {worktree_path}: {e.stderr.strip()}")
+        
+        worktree = IntegrationWorktree(
+            path=str(worktree_path),
+            branch=branch_name,
+            base_commit=base_commit,
+            commit_hash=commit_hash
+        )
+        result.worktree = worktree
+        result.files_changed.extend(
+            str(self.project_root / path) for path in dict.fromkeys(a.file_path for a in artifacts)
+        )
+        result.metadata.update({
+            'feature_branch': branch_name,
+            'original_branch': self._get_current_branch(),
+            'worktree_path': str(worktree_path),
+            'integration_commit': commit_hash
+        })
+        
+        # Run tests in the worktree if configured
+        if config.run_tests:
+            self._run_integration_tests(result, config, self._worktree_project_dir(worktree))
+        
+        if config.promote_on_success:
+            self.promote_integration(result, config)
+        elif not config.keep_worktree:
+            # The branch keeps the integration; the checked-out files are no longer needed
+            self._remove_worktree(worktree, delete_branch=False)
+        
+        return result
+    
     def _integrate_partial(
         self,
         discovery: Discovery,
@@ -383,7 +580,7 @@ class SafeIntegrator:
             'preview_only': True,
             'would_create_files': len([f for f in result.files_changed if not os.path.exists(f)]),
             'would_modify_files': len([f for f in result.files_changed if os.path.exists(f)]),
-            'estimated_lines_changed': self._estimate_lines_changed(discovery)
+            'estimated_lines_changed': self._count_lines_changed(discovery)
         }
         
         return result
@@ -391,9 +588,12 @@ class SafeIntegrator:
     def _run_safety_checks(self, discovery: Discovery) -> Dict[str, Any]:
         """Run safety checks before integration."""
         
+        # One `git status` answers both working tree checks
+        status = self._get_git_status()
+        
         checks = {
-            'git_repo_clean': self._is_git_repo_clean(),
-            'no_merge_conflicts': self._check_merge_conflicts(),
+            'git_repo_clean': self._is_git_repo_clean(status),
+            'no_merge_conflicts': self._check_merge_conflicts(status),
             'tests_passing': self._are_tests_passing(),
             'disk_space_sufficient': self._check_disk_space(),
             'file_count_reasonable': len(self._identify_affected_files(discovery)) < 50
@@ -411,7 +611,7 @@ class SafeIntegrator:
         risk_level = discovery.integration_risk
         
         if risk_level == 'high' or total_artifacts > 10:
-            return IntegrationStrategy.FEATURE_BRANCH
+            return IntegrationStrategy.WORKTREE  # Test in isolation before touching the checkout
         elif risk_level == 'low' and total_artifacts <= 3:
             return IntegrationStrategy.DIRECT
         else:
@@ -535,8 +735,8 @@ Generated: {datetime.now().isoformat()}
         
         return guide
     
-    def _is_git_repo_clean(self) -> bool:
-        """Check if git repository has no uncommitted changes."""
+    def _get_git_status(self) -> Optional[List[str]]:
+        """`git status --porcelain` lines, or None outside a git repository."""
         try:
             result = subprocess.run(
                 ['git', 'status', '--porcelain'],
@@ -545,13 +745,22 @@ Generated: {datetime.now().isoformat()}
                 text=True,
                 check=True
             )
-            return len(result.stdout.strip()) == 0
-        except subprocess.CalledProcessError:
-            return False
+            return result.stdout.splitlines()
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            return None
     
-    def _check_merge_conflicts(self) -> bool:
+    def _is_git_repo_clean(self, status: Optional[List[str]] = None) -> bool:
+        """Check if git repository has no uncommitted changes."""
+        status = self._get_git_status() if status is None else status
+        return status is not None and len(status) == 0
+    
+    def _check_merge_conflicts(self, status: Optional[List[str]] = None) -> bool:
         """Check for existing merge conflicts."""
-        # Simple check for conflict markers
+        status = self._get_git_status() if status is None else status
+        if status is not None:
+            return not any(line[:2] in UNMERGED_STATUS_CODES for line in status)
+        
+        # Outside git, look for conflict markers
         conflict_markers = ['<<<<<<<', '>>>>>>>', '=======']
         
         for root, dirs, files in os.walk(self.project_root):
@@ -602,11 +811,142 @@ Generated: {datetime.now().isoformat()}
         except subprocess.CalledProcessError as e:
             raise Exception(f"Failed to create branch {branch_name}: {e}")
     
-    def _run_integration_tests(self, result: IntegrationResult):
+    def _run_integration_tests(
+        self,
+        result: IntegrationResult,
+        config: Optional[IntegrationConfig] = None,
+        cwd: Optional[Path] = None
+    ):
         """Run tests after integration."""
-        # Placeholder for test execution
-        # In full implementation, would run project-specific test commands
-        pass
+        if not config or not config.test_command:
+            return  # No test command configured
+        
+        completed = subprocess.run(
+            config.test_command,
+            cwd=cwd or self.project_root,
+            capture_output=True,
+            text=True
+        )
+        result.metadata['tests_passed'] = completed.returncode == 0
+        if completed.returncode != 0:
+            output = (completed.stdout + completed.stderr).strip()
+            raise Exception(f"Integration tests failed ({' '.join(config.test_command)}): {output[-1000:]}")
+    
+    def _git(
+        self,
+        *args: str,
+        cwd: Optional[str] = None,
+        input: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None
+    ) -> str:
+        """Run a git command and return its output; raises CalledProcessError."""
+        result = subprocess.run(
+            ['git', *args],
+            cwd=cwd or self.project_root,
+            input=input,
+            env=env,
+            capture_output=True,
+            encoding='utf-8',
+            check=True
+        )
+        return result.stdout.strip()
+    
+    def _collect_artifacts(self, discovery: Discovery) -> List[Any]:
+        """All code artifacts of a discovery, in application order."""
+        return [
+            artifact for exploration_result in discovery.exploration_results
+            for artifact in exploration_result.code_artifacts
+        ]
+    
+    def _create_integration_commit(self, discovery: Discovery, artifacts: List[Any], base_commit: str) -> str:
+        """
+        Commit artifacts onto base_commit without touching any working tree.
+        
+        Contents are written as blobs and assembled in a temporary index, so even
+        large repositories aren't checked out or copied.
+        """
+        
+        toplevel = Path(self._git('rev-parse', '--show-toplevel')).resolve()
+        
+        # Later artifacts for the same path win, as when writing them in order
+        blobs: Dict[str, str] = {}
+        for artifact in artifacts:
+            target_path = (self.project_root / artifact.file_path).resolve()
+            try:
+                rel_path = target_path.relative_to(toplevel).as_posix()
+            except ValueError:
+                raise Exception(f"Artifact {artifact.file_path} is outside the repository")
+            blobs[rel_path] = self._git('hash-object', '-w', '--stdin', input=artifact.content)
+        
+        # Keep the mode (e.g. executable) of files that already exist
+        modes = {}
+        if blobs:
+            for entry in self._git('ls-tree', '-r', '-z', base_commit, '--', *blobs).split('\0'):
+                if entry:
+                    info, path = entry.split('\t', 1)
+                    modes[path] = info.split()[0]
+        
+        with tempfile.TemporaryDirectory(prefix="spark-index-") as index_dir:
+            env = dict(os.environ, GIT_INDEX_FILE=os.path.join(index_dir, "index"))
+            self._git('read-tree', base_commit, env=env)
+            self._git('update-index', '-z', '--index-info', env=env, input=''.join(
+                f"{modes.get(path, '100644')} {blob}\t{path}\0" for path, blob in blobs.items()
+            ))
+            tree = self._git('write-tree', env=env)
+        
+        commit_message = f"integrate: {discovery.title}\n\nIntegrated discovery {discovery.id[:8]} via Spark platform\nFiles changed: {len(blobs)}"
+        return self._git('commit-tree', tree, '-p', base_commit, '-m', commit_message)
+    
+    def _count_lines_changed(self, discovery: Discovery) -> int:
+        """Lines a discovery would add and remove, diffed in the object store when possible."""
+        base_commit = self._get_current_commit_hash()
+        if base_commit:
+            try:
+                commit_hash = self._create_integration_commit(
+                    discovery, self._collect_artifacts(discovery), base_commit
+                )
+                numstat = self._git('diff', '--numstat', base_commit, commit_hash)
+                return sum(
+                    int(count)
+                    for line in numstat.splitlines()
+                    for count in line.split('\t')[:2]
+                    if count.isdigit()  # '-' for binary files
+                )
+            except Exception:
+                pass
+        return self._estimate_lines_changed(discovery)
+    
+    def _unique_branch_name(self, base: str) -> str:
+        """The first of base, base-2, base-3, ... that isn't an existing branch."""
+        name, attempt = base, 1
+        while subprocess.run(
+            ['git', 'rev-parse', '--verify', '--quiet', f'refs/heads/{name}'],
+            cwd=self.project_root,
+            capture_output=True
+        ).returncode == 0:
+            attempt += 1
+            name = f"{base}-{attempt}"
+        return name
+    
+    def _worktree_root(self, config: IntegrationConfig) -> Path:
+        """Directory integration worktrees are created in."""
+        root = Path(config.worktree_root) if config.worktree_root else self.project_root / ".spark" / "worktrees"
+        root.mkdir(parents=True, exist_ok=True)
+        return root
+    
+    def _worktree_project_dir(self, worktree: IntegrationWorktree) -> Path:
+        """The project root's counterpart inside a worktree."""
+        toplevel = Path(self._git('rev-parse', '--show-toplevel')).resolve()
+        return Path(worktree.path) / self.project_root.resolve().relative_to(toplevel)
+    
+    def _remove_worktree(self, worktree: IntegrationWorktree, delete_branch: bool):
+        """Delete an integration worktree and optionally its branch."""
+        if os.path.exists(worktree.path):
+            self._git('worktree', 'remove', '--force', worktree.path)
+        else:
+            self._git('worktree', 'prune')
+        if delete_branch:
+            subprocess.run(['git', 'branch', '-D', worktree.branch], cwd=self.project_root, capture_output=True)
     
     def _commit_changes(self, discovery: Discovery, result: IntegrationResult):
         """Commit integration changes."""
@@ -14,15 +14,12 @@ from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 
-# Optional dependency for Claude integration; guard at import time
-try:
-    import litellm  # type: ignore
-    LITELLM_AVAILABLE = True
-except Exception:  # ImportError and any env import issues
-    litellm = None  # type: ignore
-    LITELLM_AVAILABLE = False
-
 from spark.discovery.models import CodeArtifact, ExplorationResult, ExplorationStatus
+from spark.core.lazy_imports import lazy_module
+
+# Optional dependency for Claude integration; imported on the first request
+litellm = lazy_module('litellm')
+LITELLM_AVAILABLE = litellm is not None
 
 
 @dataclass
@@ -8,7 +8,7 @@ code generation, validation, discovery creation, and CUA agent integration for f
 import uuid
 import time
 import asyncio
-from typing import List, Optional, Dict, Any, Callable
+from typing import List, Optional, Dict, Any, Callable, TYPE_CHECKING
 from datetime import datetime
 from pathlib import Path
 
@@ -19,23 +19,14 @@ from spark.discovery.models import (
 from spark.exploration.generator import CodeGenerator, MockCodeGenerator, ClaudeCodeGenerator, GenerationRequest
 from spark.exploration.validator import CodeValidator, ValidationResult
 from spark.storage.discovery_storage import DiscoveryStorage
+from spark.core.event_bus import EventBus, get_event_bus
+from spark.core.lazy_imports import module_available
 
-# Import CUA agent components
-# Optional CUA agent components
-try:
+if TYPE_CHECKING:
     from agent.agent.agent import ComputerAgent
-    from agent.agent.callbacks import (
-        LoggingCallback,
-        TrajectorySaverCallback,
-        BudgetManagerCallback,
-    )
-    from agent.agent.computers import make_computer_handler
-    CUA_AVAILABLE = True
-except Exception:  # ImportError and any transitive import failures
-    ComputerAgent = None  # type: ignore
-    LoggingCallback = TrajectorySaverCallback = BudgetManagerCallback = None  # type: ignore
-    make_computer_handler = None  # type: ignore
-    CUA_AVAILABLE = False
+
+# Optional CUA agent components; the agent stack is imported when an agent is first created
+CUA_AVAILABLE = module_available('agent.agent.agent')
 
 
 class ExplorationOrchestrator:
@@ -48,7 +39,8 @@ class ExplorationOrchestrator:
         validator: Optional[CodeValidator] = None,
         patterns: Optional[Dict[str, Any]] = None,
         model: str = "anthropic/claude-3-5-sonnet-20241022",
-        use_cua_agent: bool = False
+        use_cua_agent: bool = False,
+        event_bus: Optional[EventBus] = None
     ):
         """
         Initialize ExplorationOrchestrator.
@@ -60,6 +52,7 @@ class ExplorationOrchestrator:
             patterns: User coding patterns for context-aware generation
             model: Claude model for autonomous exploration
             use_cua_agent: Whether to enable CUA agent integration for autonomous operation
+            event_bus: Bus to publish session events on (the process-wide bus if None)
         """
         self.storage = storage or DiscoveryStorage()
         self.patterns = patterns or {}
@@ -80,13 +73,14 @@ class ExplorationOrchestrator:
         self.validator = validator or CodeValidator()
         
         # CUA agent components (initialized when needed)
-        self.cua_agent: Optional[ComputerAgent] = None
+        self.cua_agent: Optional['ComputerAgent'] = None
         self.computer_handler = None
         self.session_callbacks: List[Callable] = []
         self.active_sessions: Dict[str, Dict[str, Any]] = {}
         
         # Progress tracking
         self.progress_callbacks: List[Callable[[str, Dict[str, Any]], None]] = []
+        self.event_bus = event_bus or get_event_bus()
     
     async def start_manual_exploration(
         self,
@@ -126,6 +120,16 @@ class ExplorationOrchestrator:
             
             session.exploration_results.append(exploration_result)
             
+            await self._emit_progress_update(session.id, 'approach_completed', {
+                'approach': approach,
+                'success': exploration_result.success,
+                'completed_approaches': i + 1,
+                'total_approaches': len(approaches),
+                'progress_percentage': (i + 1) / len(approaches) * 100
+            })
+            if not exploration_result.success and exploration_result.error_message:
+                self.event_bus.emit('error', session.id, {'error': exploration_result.error_message})
+            
             # Save result
             self.storage.save_exploration_result(exploration_result, session.id)
             
@@ -142,6 +146,7 @@ class ExplorationOrchestrator:
         # Save discoveries
         for discovery in session.discoveries:
             self.storage.save_discovery(discovery)
+        self._publish_discoveries(session.id, session.discoveries)
         
         # Update session
         self.storage.save_exploration_session(session)
@@ -517,6 +522,7 @@ class ExplorationOrchestrator:
             # Save discoveries to storage
             for discovery in discoveries:
                 self.storage.save_discovery(discovery)
+            self._publish_discoveries(session_id, discoveries)
             
             # Update progress
             self.active_sessions[session_id]['progress'].update({
@@ -558,6 +564,14 @@ class ExplorationOrchestrator:
             return  # Already initialized
         
         try:
+            from agent.agent.agent import ComputerAgent
+            from agent.agent.callbacks import (
+                LoggingCallback,
+                TrajectorySaverCallback,
+                BudgetManagerCallback,
+            )
+            from agent.agent.computers import make_computer_handler
+            
             # Create computer handler
             self.computer_handler = await make_computer_handler()
             
@@ -768,6 +782,21 @@ Respond with a structured analysis.
                 callback(event_type, update_data)
             except Exception as e:
                 print(f"Progress callback error: {e}")
+        
+        # Publish to event bus subscribers
+        event_data = {key: value for key, value in update_data.items() if key != 'session_id'}
+        self.event_bus.emit('progress', session_id, event_data)
+        if 'error' in data:
+            self.event_bus.emit('error', session_id, {'error': data['error'], 'event_type': event_type})
+    
+    def _publish_discoveries(self, session_id: str, discoveries: List[Discovery]):
+        """Publish one discovery event per discovery created in a session."""
+        for discovery in discoveries:
+            self.event_bus.emit('discovery', session_id, {
+                'discovery_id': discovery.id,
+                'title': discovery.title,
+                'overall_score': discovery.overall_score()
+            })
     
     def add_progress_callback(self, callback: Callable[[str, Dict[str, Any]], None]):
         """Add a progress callback for real-time exploration tracking."""
@@ -11,23 +11,21 @@ import asyncio
 import tempfile
 import os
 import re
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
 from dataclasses import dataclass, field
 from pathlib import Path
 
-import litellm
-
 from spark.discovery.models import CodeArtifact, ExplorationResult
 from spark.exploration.validator import ExecutionResult, ValidationResult
+from spark.core.lazy_imports import LazyModule, module_available
 
-# Import CUA components for sandboxed test execution
-try:
-    from agent.agent.computers import make_computer_handler
+if TYPE_CHECKING:
     from agent.agent.computers.base import AsyncComputerHandler
-    CUA_AVAILABLE = True
-except ImportError:
-    CUA_AVAILABLE = False
-    AsyncComputerHandler = None
+
+litellm = LazyModule('litellm')
+
+# CUA components for sandboxed test execution are imported when first used
+CUA_AVAILABLE = module_available('agent.agent.computers')
 
 
 @dataclass
@@ -62,7 +60,9 @@ class TestOrchestrator:
         self, 
         model: str = "anthropic/claude-3-5-sonnet-20241022",
         enable_execution: bool = True,
-        enable_cua: bool = True
+        enable_cua: bool = True,
+        computer: Optional[Any] = None,
+        test_timeout: float = 300.0
     ):
         """
         Initialize TestOrchestrator.
@@ -71,11 +71,15 @@ class TestOrchestrator:
             model: Claude model to use for test generation
             enable_execution: Whether to actually execute generated tests
             enable_cua: Whether to use CUA computer interface for test execution
+            computer: CUA Computer (or computer handler) used for sandboxed execution
+            test_timeout: Seconds after which a sandboxed test run is terminated
         """
         self.model = model
         self.enable_execution = enable_execution
         self.enable_cua = enable_cua and CUA_AVAILABLE
-        self.computer_handler: Optional[AsyncComputerHandler] = None
+        self.computer = computer
+        self.test_timeout = test_timeout
+        self.computer_handler: Optional['AsyncComputerHandler'] = None
         
         # Ensure API key is available for test generation
         if not os.getenv('ANTHROPIC_API_KEY'):
@@ -303,13 +307,24 @@ Include all necessary imports and setup code.
         
         if not self.computer_handler:
             try:
-                self.computer_handler = await make_computer_handler()
+                from agent.agent.computers import make_computer_handler
+            except Exception:
+                # The CUA stack is on the path but can't be imported; run without it
+                self.enable_cua = False
+                return await self._execute_tests_with_subprocess(source_code, test_code)
+            try:
+                self.computer_handler = await make_computer_handler(self.computer)
             except Exception as e:
                 return ExecutionResult(
                     success=False,
                     error_message=f"Could not initialize CUA computer handler: {e}"
                 )
         
+        # Prefer running the tests as a streamed process inside the VM, which gives real output and exit codes
+        interface = getattr(self.computer_handler, 'interface', None)
+        if interface is not None and hasattr(interface, 'start_process'):
+            return await self._execute_tests_with_process(interface, source_code, test_code)
+        
         try:
             start_time = time.time()
             
@@ -323,27 +338,8 @@ Include all necessary imports and setup code.
                     f.write(source_code)
                 
                 # Write combined test code (import source + tests)
-                combined_test_code = f"""
-# Import the source code to test
-import sys
-sys.path.insert(0, '{temp_dir}')
-
-try:
-    from source import *
-except ImportError:
-    # Handle modules that don't export everything
-    import source
-except Exception as e:
-    print(f"Warning: Could not import source code: {{e}}")
-
-{test_code}
-
-if __name__ == '__main__':
-    unittest.main(verbosity=2)
-"""
-                
                 with open(test_file, 'w') as f:
-                    f.write(combined_test_code)
+                    f.write(self._build_test_runner(temp_dir, test_code))
                 
                 # Execute using CUA
                 await self.computer_handler.type(f"cd {temp_dir}")
@@ -371,6 +367,68 @@ if __name__ == '__main__':
                 execution_time=time.time() - start_time if 'start_time' in locals() else 0
             )
     
+    async def _execute_tests_with_process(self, interface: Any, source_code: str, test_code: str) -> ExecutionResult:
+        """Execute tests as a background process in the CUA computer, streaming its output."""
+        
+        start_time = time.time()
+        remote_dir = f"/tmp/spark-tests-{uuid.uuid4().hex[:8]}"
+        
+        try:
+            await interface.create_dir(remote_dir)
+            await interface.write_text(f"{remote_dir}/source.py", source_code)
+            await interface.write_text(
+                f"{remote_dir}/test_source.py", self._build_test_runner(remote_dir, test_code)
+            )
+            
+            process = await interface.start_process(
+                "python3 test_source.py", cwd=remote_dir, timeout=self.test_timeout
+            )
+            result = await process.communicate()
+            
+            return ExecutionResult(
+                success=result.returncode == 0,
+                exit_code=result.returncode,
+                stdout=result.stdout,
+                stderr=result.stderr,
+                execution_time=time.time() - start_time,
+                error_message=(
+                    f"Test execution timed out after {self.test_timeout}s" if process.timed_out else None
+                )
+            )
+            
+        except Exception as e:
+            return ExecutionResult(
+                success=False,
+                error_message=f"CUA test execution failed: {str(e)}",
+                execution_time=time.time() - start_time
+            )
+        finally:
+            try:
+                await interface.run_command(f"rm -rf {remote_dir}")
+            except Exception:
+                pass
+    
+    def _build_test_runner(self, test_dir: str, test_code: str) -> str:
+        """Combine generated tests with an import of the source module under test."""
+        return f"""
+# Import the source code to test
+import sys
+sys.path.insert(0, '{test_dir}')
+
+try:
+    from source import *
+except ImportError:
+    # Handle modules that don't export everything
+    import source
+except Exception as e:
+    print(f"Warning: Could not import source code: {{e}}")
+
+{test_code}
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
+"""
+    
     async def _execute_tests_with_subprocess(self, source_code: str, test_code: str) -> ExecutionResult:
         """Execute tests using subprocess in restricted environment."""
         
@@ -13,20 +13,19 @@ import asyncio
 import time
 import sys
 import os
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
 from dataclasses import dataclass, field
 from pathlib import Path
 
 from spark.discovery.models import CodeArtifact, ExplorationResult
 
-# Import CUA components for sandboxed execution
-try:
-    from agent.agent.computers import make_computer_handler
+from spark.core.lazy_imports import module_available
+
+if TYPE_CHECKING:
     from agent.agent.computers.base import AsyncComputerHandler
-    CUA_AVAILABLE = True
-except ImportError:
-    CUA_AVAILABLE = False
-    AsyncComputerHandler = None
+
+# CUA components for sandboxed execution are imported when first used
+CUA_AVAILABLE = module_available('agent.agent.computers')
 
 
 @dataclass
@@ -75,7 +74,7 @@ class CodeValidator:
         """
         self.enable_execution = enable_execution and CUA_AVAILABLE if enable_cua else enable_execution
         self.enable_cua = enable_cua and CUA_AVAILABLE
-        self.computer_handler: Optional[AsyncComputerHandler] = None
+        self.computer_handler: Optional['AsyncComputerHandler'] = None
         
         self.unsafe_patterns = [
             r'import\s+os',
@@ -221,6 +220,12 @@ class CodeValidator:
         """Execute code using CUA computer interface for maximum safety."""
         
         if not self.computer_handler:
+            try:
+                from agent.agent.computers import make_computer_handler
+            except Exception:
+                # The CUA stack is on the path but can't be imported; run without it
+                self.enable_cua = False
+                return await self._execute_with_subprocess(code, language)
             try:
                 self.computer_handler = await make_computer_handler()
             except Exception as e:
@@ -108,6 +108,7 @@ class FileSystemMonitor:
         self.observer = Observer()
         self.event_handler = SparkFileEventHandler(self)
         self.pattern_update_callback = pattern_update_callback
+        self.change_listeners: List[Callable[[FileChangeEvent], None]] = []
         
         # Configuration
         self.monitored_paths: Set[Path] = set()
@@ -181,6 +182,14 @@ class FileSystemMonitor:
             self.logger.error(f"Failed to add path {path}: {e}")
             return False
     
+    def add_change_listener(self, listener: Callable[[FileChangeEvent], None]) -> None:
+        """
+        Call a listener for every monitored file change as it happens.
+        
+        Listeners run on the watchdog thread and should return quickly.
+        """
+        self.change_listeners.append(listener)
+    
     def remove_path(self, path: Path) -> bool:
         """Remove a path from monitoring."""
         try:
@@ -280,6 +289,12 @@ class FileSystemMonitor:
             # Update current session
             self._update_current_session(event)
             
+            for listener in list(self.change_listeners):
+                try:
+                    listener(event)
+                except Exception as e:
+                    self.logger.error(f"Error in change listener: {e}")
+            
             self.logger.debug(f"File event: {event_type} - {path}")
             
         except Exception as e:
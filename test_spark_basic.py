@@ -88,6 +88,45 @@ def test_cli_help():
         print(f"  ❌ CLI error: {e}")
         return False
 
+def test_status_forwards_args():
+    """Test that `spark status` passes its flags to the status command."""
+    print("\n👀 Testing status argument forwarding...")
+    
+    try:
+        import asyncio
+        from spark.cli.main import SparkCLI
+        
+        class RecordingStatusCommand:
+            def __init__(self):
+                self.calls = []
+            
+            async def execute(self, args):
+                self.calls.append(list(args))
+                return 0
+        
+        async def no_initialization():
+            return True
+        
+        cli = SparkCLI()
+        status = RecordingStatusCommand()
+        cli.commands._instances['status'] = status
+        cli._initialize_if_needed = no_initialization
+        
+        asyncio.run(cli.run(['status', '--watch']))
+        asyncio.run(cli.run(['status', '--watch', 'session-1']))
+        asyncio.run(cli.run([]))
+        
+        if status.calls != [['--watch'], ['--watch', 'session-1'], []]:
+            print(f"  ❌ Status command received {status.calls}")
+            return False
+        
+        print("  ✅ status --watch reaches the watch path")
+        return True
+        
+    except Exception as e:
+        print(f"  ❌ Status forwarding error: {e}")
+        return False
+
 def test_terminal():
     """Test terminal formatting."""
     print("\n🎨 Testing terminal formatting...")
@@ -129,6 +168,7 @@ def main():
         test_imports,
         test_config,
         test_cli_help,
+        test_status_forwards_args,
         test_terminal
     ]
     
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Import-time budget for light Spark commands.
+
+Runs `python -X importtime -m spark <command>` for commands that shouldn't need the
+exploration or learning engines and checks that they stay within an import-time
+budget and don't import heavy modules. Set SPARK_IMPORT_BUDGET_MS to change the
+budget (default 400ms of imports).
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+# Add the libs/python directory to the child's Python path
+LIBS_PATH = Path(__file__).parent / "libs" / "python"
+
+BUDGET_MS = float(os.environ.get("SPARK_IMPORT_BUDGET_MS", "400"))
+
+# Modules a light command must never pull in
+HEAVY_MODULES = (
+    "litellm",
+    "agent",
+    "watchdog",
+    "numpy",
+    "psutil",
+    "spark.cli.commands",
+    "spark.core.session_manager",
+    "spark.discovery",
+    "spark.exploration",
+    "spark.learning",
+)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    Parse `-X importtime` output.
+
+    Returns:
+        (module, nesting level, cumulative microseconds) of every import, in log order
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name[1:]  # One space separates the column from the name
+        level = (len(name) - len(name.lstrip(" "))) // 2
+        imports.append((name.strip(), level, int(cumulative)))
+    return imports
+
+
+def measure_command(args: List[str]) -> List[Tuple[str, int, int]]:
+    """Run a spark command with -X importtime and return its imports."""
+    env = dict(os.environ, PYTHONPATH=str(LIBS_PATH), SPARK_NO_DAEMON="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "spark", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=60,
+    )
+    assert result.returncode == 0, f"spark {' '.join(args)} failed:\n{result.stderr[-2000:]}"
+    return parse_importtime(result.stderr)
+
+
+def check_light_command(args: List[str]) -> None:
+    imports = measure_command(args)
+    top_level = {name: us for name, level, us in imports if level == 0}
+    total_ms = sum(top_level.values()) / 1000
+    slowest = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:5]
+    print(f"  spark {' '.join(args)}: {total_ms:.0f}ms of imports "
+          f"(slowest: {', '.join(f'{name} {us / 1000:.0f}ms' for name, us in slowest)})")
+
+    heavy = sorted(
+        name for name, _, _ in imports
+        if any(name == module or name.startswith(module + ".") for module in HEAVY_MODULES)
+    )
+    assert not heavy, f"spark {' '.join(args)} imports heavy modules: {', '.join(heavy)}"
+    assert total_ms <= BUDGET_MS, f"spark {' '.join(args)} spent {total_ms:.0f}ms importing (budget {BUDGET_MS:.0f}ms)"
+
+
+def test_version_import_budget():
+    """spark version stays within the import budget."""
+    check_light_command(["version"])
+
+
+def test_help_import_budget():
+    """spark help stays within the import budget."""
+    check_light_command(["help"])
+
+
+def main():
+    """Run all import-time checks."""
+    print("⏱️  Spark import-time budget")
+    print("=" * 50)
+
+    failed = 0
+    for test in (test_version_import_budget, test_help_import_budget):
+        try:
+            test()
+            print(f"  ✅ {test.__doc__}")
+        except AssertionError as e:
+            print(f"  ❌ {e}")
+            failed += 1
+
+    print("\n" + "=" * 50)
+    print("🎉 Light commands are within budget." if failed == 0 else "⚠️  Import budget exceeded.")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""
+Backup system tests: incremental snapshots, garbage collection, legacy restores and
+exclude patterns.
+
+Backups are made of a throwaway project directory; no git repository is needed.
+"""
+
+import importlib.util
+import os
+import time
+import pytest
+from datetime import datetime
+from pathlib import Path
+
+# core/backup_system.py lives at the repository root, where "core" would clash with
+# the cua-core package; load the module from its file
+_spec = importlib.util.spec_from_file_location(
+    "backup_system", Path(__file__).parent.parent / "core" / "backup_system.py"
+)
+backup_system = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(backup_system)
+
+BackupMetadata = backup_system.BackupMetadata
+BackupSystem = backup_system.BackupSystem
+BackupType = backup_system.BackupType
+
+# Old enough for the stat cache to trust and for garbage collection to consider
+OLD = time.time() - 2 * backup_system.GC_GRACE_SECONDS
+
+
+def write(path: Path, content: str, mtime: float = OLD) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def age_blobs(system: BackupSystem) -> None:
+    for blob in system.objects_dir.glob("??/*"):
+        os.utime(blob, (OLD, OLD))
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    write(root / "main.py", "print('main')\n")
+    write(root / "lib" / "util.py", "def util():\n    pass\n")
+    write(root / "README.md", "# Project\n")
+    return root
+
+
+class TestIncrementalSnapshots:
+    def test_unchanged_files_reuse_cached_hashes(self, project, monkeypatch):
+        """Only files modified since the previous snapshot are read again"""
+        system = BackupSystem(str(project))
+        first = system.create_project_snapshot("first")
+        first_files = system._load_manifest(system.backup_root / first.backup_id)['files']
+
+        write(project / "main.py", "print('changed')\n", mtime=time.time())
+        write(project / "new.py", "x = 1\n", mtime=time.time())
+
+        stored = []
+        store_blob = system._store_blob
+        monkeypatch.setattr(system, "_store_blob", lambda path: stored.append(path) or store_blob(path))
+        entries = system._store_files(
+            system._list_project_files([".spark/backups/*"]), system._load_stat_cache()
+        )
+
+        assert sorted(Path(path).name for path in stored) == ["main.py", "new.py"]
+        assert entries["lib/util.py"] == first_files["lib/util.py"]
+        assert entries["README.md"] == first_files["README.md"]
+        assert entries["main.py"]["hash"] != first_files["main.py"]["hash"]
+        assert system._blob_path(entries["new.py"]["hash"]).read_text() == "x = 1\n"
+
+    def test_racy_entries_are_not_trusted(self, project):
+        """Files modified just before a snapshot are hashed again by the next one"""
+        write(project / "main.py", "print('fresh')\n", mtime=time.time())
+        system = BackupSystem(str(project))
+        system.create_project_snapshot()
+
+        stat_cache = system._load_stat_cache()
+        assert "main.py" not in stat_cache
+        assert {"lib/util.py", "README.md"} <= set(stat_cache)
+
+    def test_identical_contents_are_stored_once(self, project):
+        """Files with the same contents share one blob"""
+        write(project / "copy.md", "# Project\n")
+        system = BackupSystem(str(project))
+        metadata = system.create_project_snapshot()
+
+        files = system._load_manifest(system.backup_root / metadata.backup_id)['files']
+        assert files["copy.md"]["hash"] == files["README.md"]["hash"]
+        assert len(list(system.objects_dir.glob("??/*"))) == 3
+        assert system.verify_backup_integrity(metadata.backup_id, deep=True)
+
+
+class TestGarbageCollection:
+    def test_grace_period_keeps_recent_blobs(self, project):
+        """Unreferenced blobs are only removed once older than the grace period"""
+        system = BackupSystem(str(project))
+        dropped = system.create_integration_backup("dropped", [str(project / "main.py"), str(project / "README.md")])
+        system.create_integration_backup("kept", [str(project / "README.md")])
+        main_blob = system._blob_path(
+            system._load_manifest(system.backup_root / dropped.backup_id)['files']["main.py"]["hash"]
+        )
+        system.delete_backup(dropped.backup_id)
+
+        assert system.collect_garbage() == {'blobs_removed': 0, 'bytes_freed': 0}
+        assert main_blob.exists()
+
+        age_blobs(system)
+        stats = system.collect_garbage()
+
+        assert stats == {'blobs_removed': 1, 'bytes_freed': len("print('main')\n")}
+        assert not main_blob.exists()
+        assert len(list(system.objects_dir.glob("??/*"))) == 1  # README.md is still referenced
+
+    def test_reused_blobs_survive_collection_before_manifest(self, project):
+        """Blobs reused through the stat cache are marked in use before their manifest exists"""
+        system = BackupSystem(str(project))
+        first = system.create_project_snapshot("first")
+        age_blobs(system)
+
+        # Reuse every blob for a snapshot whose manifest isn't written yet, while the
+        # only backup referencing them is deleted
+        entries = system._store_files(
+            system._list_project_files([".spark/backups/*"]), system._load_stat_cache()
+        )
+        system.delete_backup(first.backup_id)
+
+        assert system.collect_garbage() == {'blobs_removed': 0, 'bytes_freed': 0}
+        assert all(system._blob_path(entry['hash']).exists() for entry in entries.values())
+
+    def test_unreadable_manifest_stops_collection(self, project):
+        """Nothing is removed while any manifest can't be read"""
+        system = BackupSystem(str(project))
+        dropped = system.create_integration_backup("dropped", [str(project / "main.py")])
+        kept = system.create_integration_backup("kept", [str(project / "README.md")])
+        system.delete_backup(dropped.backup_id)
+        (system.backup_root / kept.backup_id / backup_system.MANIFEST_NAME).write_text("{")
+        age_blobs(system)
+
+        assert system.collect_garbage() == {'blobs_removed': 0, 'bytes_freed': 0}
+        assert len(list(system.objects_dir.glob("??/*"))) == 2
+
+
+class TestLegacyRestore:
+    def make_legacy_backup(self, project: Path, backup_type: BackupType, layout: str) -> str:
+        """Write a backup the way it was stored before the object store: plain copies."""
+        system = BackupSystem(str(project))
+        backup_id = f"legacy_{layout}"
+        backup_dir = system.backup_root / backup_id
+        write(backup_dir / layout / "main.py", "print('backed up')\n")
+        write(backup_dir / layout / "lib" / "util.py", "def util():\n    return 1\n")
+        system._save_backup_metadata(BackupMetadata(
+            backup_id=backup_id,
+            backup_type=backup_type,
+            created_at=datetime(2024, 1, 1),
+            size_bytes=0,
+            file_count=2,
+            checksum=system._calculate_backup_checksum(backup_dir)
+        ))
+        return backup_id
+
+    def test_restore_legacy_snapshot(self, project):
+        """A snapshot/ directory backup restores every file"""
+        backup_id = self.make_legacy_backup(project, BackupType.SNAPSHOT, "snapshot")
+        system = BackupSystem(str(project))  # Loads the backup from its metadata
+
+        assert system.verify_backup_integrity(backup_id)
+        assert system.restore_from_backup(backup_id, create_pre_restore_backup=False)
+        assert (project / "main.py").read_text() == "print('backed up')\n"
+        assert (project / "lib" / "util.py").read_text() == "def util():\n    return 1\n"
+
+    def test_restore_legacy_files_selectively(self, project):
+        """A files/ directory backup restores only the requested files"""
+        backup_id = self.make_legacy_backup(project, BackupType.INTEGRATION, "files")
+        system = BackupSystem(str(project))
+
+        assert system.restore_from_backup(
+            backup_id, file_paths=[str(project / "lib" / "util.py")], create_pre_restore_backup=False
+        )
+        assert (project / "lib" / "util.py").read_text() == "def util():\n    return 1\n"
+        assert (project / "main.py").read_text() == "print('main')\n"
+
+    def test_corrupted_legacy_backup_is_refused(self, project):
+        """A legacy backup whose files changed fails its checksum"""
+        backup_id = self.make_legacy_backup(project, BackupType.SNAPSHOT, "snapshot")
+        system = BackupSystem(str(project))
+        write(system.backup_root / backup_id / "snapshot" / "main.py", "tampered\n")
+
+        with pytest.raises(ValueError):
+            system.restore_from_backup(backup_id, create_pre_restore_backup=False)
+        assert (project / "main.py").read_text() == "print('main')\n"
+
+
+class TestExcludePatterns:
+    def test_git_directory_excluded_but_not_github(self, project):
+        """'.git/*' excludes the .git directory only, not .github or .gitignore"""
+        write(project / ".git" / "config", "[core]\n")
+        write(project / ".git" / "objects" / "ab" / "cdef", "blob\n")
+        write(project / ".github" / "workflows" / "ci.yml", "on: push\n")
+        write(project / ".gitignore", "*.pyc\n")
+        write(project / "cache.pyc", "bytecode")
+        system = BackupSystem(str(project))
+        metadata = system.create_project_snapshot()
+
+        files = set(system._load_manifest(system.backup_root / metadata.backup_id)['files'])
+        assert files == {
+            ".github/workflows/ci.yml",
+            ".gitignore",
+            "README.md",
+            "lib/util.py",
+            "main.py",
+        }
+
+    def test_exclude_pattern_matching(self):
+        """Directory patterns match whole path components"""
+        patterns = backup_system._compile_exclude_patterns((".git/*", "*.pyc", "build"))
+        is_excluded = backup_system._is_excluded
+
+        assert is_excluded(".git", patterns)
+        assert is_excluded(".git/HEAD", patterns)
+        assert not is_excluded(".github/workflows/ci.yml", patterns)
+        assert not is_excluded(".gitignore", patterns)
+        assert is_excluded("pkg/module.pyc", patterns)
+        assert is_excluded("build", patterns)
+        assert not is_excluded("build/output.txt", patterns)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,125 @@
+"""
+Trajectory storage tests for the "store" layout (ContentAddressedStore).
+
+Only the local filesystem is used; no computer or model is needed.
+"""
+
+import os
+import pytest
+from pathlib import Path
+import sys
+
+# Add paths to sys.path if needed
+pythonpath = os.environ.get("PYTHONPATH", "")
+for path in pythonpath.split(":"):
+    if path and path not in sys.path:
+        sys.path.insert(0, path)  # Insert at beginning to prioritize
+        print(f"Added to sys.path: {path}")
+
+from agent.callbacks import TrajectorySaverCallback
+from agent.callbacks.trajectory_store import ContentAddressedStore, TurnDirectoryStore
+
+SCREENSHOT_A = b"\x89PNG\r\n\x1a\nscreenshot-a"
+SCREENSHOT_B = b"\x89PNG\r\n\x1a\nscreenshot-b"
+
+# (turn, index, name, artifact) in the order a run saves them
+ARTIFACTS = [
+    (0, 0, "screenshot", SCREENSHOT_A),
+    (0, 1, "api_result", {"kwargs": {"model": "test"}, "result": {"output": []}}),
+    (1, 2, "screenshot", SCREENSHOT_A),
+    (1, 3, "screenshot_action", SCREENSHOT_B),
+]
+
+
+def tree(root: Path) -> dict:
+    """Relative path -> contents of every file under root."""
+    return {
+        str(path.relative_to(root)): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+class TestContentAddressedStore:
+    async def test_saver_store_layout_writes_events(self, tmp_path):
+        """The saver's "store" layout logs events in order and stores each image once"""
+        saver = TrajectorySaverCallback(str(tmp_path), layout="store")
+        assert isinstance(saver.store, ContentAddressedStore)
+
+        await saver.on_run_start({"model": "anthropic/claude-test"}, [])
+        await saver.on_screenshot(SCREENSHOT_A)
+        await saver.on_api_end({"model": "test"}, {"output": []})
+        await saver.on_screenshot(SCREENSHOT_A)
+        await saver.on_screenshot(SCREENSHOT_B, "screenshot_action")
+        await saver.on_run_end({}, [], [])
+
+        events = list(saver.store.iter_events(saver.trajectory_id))
+        assert [event["name"] for event in events] == ["screenshot", "api_result", "screenshot", "screenshot_action"]
+        assert [event["index"] for event in events] == [0, 1, 2, 3]
+        assert events[1]["data"] == {"kwargs": {"model": "test"}, "result": {"output": []}}
+
+        # Identical screenshots share one stored image
+        assert events[0]["image"] == events[2]["image"] != events[3]["image"]
+        assert len(list((tmp_path / "images").rglob("*.png"))) == 2
+        assert saver.store.read_image(events[0]["image"]) == SCREENSHOT_A
+        assert saver.store.read_image(events[3]["image"]) == SCREENSHOT_B
+        assert (tmp_path / saver.trajectory_id / "metadata.json").exists()
+        await saver.store.close()
+
+    async def test_images_dedupe_across_trajectories(self, tmp_path):
+        """A screenshot already stored by another trajectory isn't written again"""
+        store = ContentAddressedStore(tmp_path)
+        await store.save_artifact("first", 0, 0, "screenshot", SCREENSHOT_A)
+        await store.flush()
+        image = next((tmp_path / "images").rglob("*.png"))
+        written_at = image.stat().st_mtime_ns
+
+        # A fresh store only knows the image from disk
+        other = ContentAddressedStore(tmp_path)
+        await other.save_artifact("second", 0, 0, "screenshot", SCREENSHOT_A)
+        await other.flush()
+
+        assert list((tmp_path / "images").rglob("*.png")) == [image]
+        assert image.stat().st_mtime_ns == written_at
+        assert next(other.iter_events("second"))["image"] == next(store.iter_events("first"))["image"]
+        await store.close()
+        await other.close()
+
+    async def test_iter_events_stops_at_torn_line(self, tmp_path):
+        """A line cut short by an interrupted run ends the event log"""
+        store = ContentAddressedStore(tmp_path)
+        for turn, index, name, artifact in ARTIFACTS[:2]:
+            await store.save_artifact("run", turn, index, name, artifact)
+        await store.close()
+
+        with open(tmp_path / "run" / "events.jsonl", "a") as f:
+            f.write('{"turn": 1, "index": 2, "na')
+
+        assert [event["name"] for event in store.iter_events("run")] == ["screenshot", "api_result"]
+        assert list(store.iter_events("missing")) == []
+
+    async def test_export_turns_round_trip(self, tmp_path):
+        """Exporting the store gives the same files as saving with the turns layout"""
+        store = ContentAddressedStore(tmp_path / "store")
+        reference = TurnDirectoryStore(tmp_path / "reference")
+        for target in (store, reference):
+            await target.save_metadata("run", {"trajectory_id": "run", "status": "completed"})
+            for turn, index, name, artifact in ARTIFACTS:
+                await target.save_artifact("run", turn, index, name, artifact)
+            await target.close()
+
+        exported = store.export_turns("run", tmp_path / "exported")
+
+        assert exported == tmp_path / "exported" / "run"
+        assert tree(exported) == tree(tmp_path / "reference" / "run")
+        assert sorted(tree(exported)) == [
+            "metadata.json",
+            "turn_000/0000_screenshot.png",
+            "turn_000/0001_api_result.json",
+            "turn_001/0002_screenshot.png",
+            "turn_001/0003_screenshot_action.png",
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])